@@ -0,0 +1,317 @@
+"""
+End-to-end Benchmark Suite
+Seeds deterministic synthetic companies (1k / 10k / 100k / 1M ledgers) in the
+configured database (PostgreSQL or SQLite, see DB_BACKEND), times the main
+workflow steps and writes the results to JSON so releases and backends can be
+compared.
+
+Usage:
+    python benchmark_suite.py --sizes 1k,10k --output benchmark_results/run.json
+    python benchmark_suite.py --sizes 100k --steps import,mapping,validate_balance
+    DB_BACKEND=sqlite python benchmark_suite.py --sizes 1k,10k
+    python benchmark_suite.py --sizes 1k --steps load_frame --tenants 1,10,50 --tenant-ledgers 10k
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from config.settings import APP_VERSION
+from config.database import initialize_database, get_connection
+from config.db_connection import get_dialect
+from config.instrumentation import track_action
+from models.trial_balance import TrialBalance
+from models.tb_validation import validate_trial_balance
+from models.company_info import CompanyInfo
+from models.company_data import prefetch_company
+from models.financial_statements import (BalanceSheetGenerator, ProfitLossGenerator,
+                                         CashFlowGenerator, NotesGenerator)
+from models.excel_exporter import ExcelExporter
+from models.pdf_exporter import PDFExporter
+from utils.synthetic_data import (seed_company, generate_ledgers, delete_company, parse_size,
+                                  create_empty_company)
+from utils.default_master_data import initialize_default_master_data_for_company
+
+ALL_STEPS = ['seed_master_data', 'import', 'load_ledgers', 'stream_ledgers', 'load_frame', 'mapping',
+             'load_company', 'validate_balance', 'validate_rules', 'balance_sheet', 'profit_loss', 'cash_flow', 'notes', 'excel_export',
+             'pdf_export']
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+
+def timed_step(results, name, func):
+    """Run one step, recording wall time, query count and DB time; failures are recorded, not raised"""
+    print(f"   {name:<20}", end='', flush=True)
+    with track_action(f"benchmark:{name}") as trace:
+        started = time.perf_counter()
+        try:
+            value = func()
+            status, error = 'ok', None
+        except Exception as e:
+            value = None
+            status, error = 'error', f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - started
+
+    results[name] = {
+        'status': status,
+        'seconds': round(seconds, 4),
+        'query_count': trace.query_count,
+        'db_time_ms': round(trace.db_time_ms, 3),
+        'cache_hits': trace.cache_hits,
+        'cache_misses': trace.cache_misses,
+    }
+    if error:
+        results[name]['error'] = error
+        print(f"❌ {seconds:8.3f}s  {error}")
+    else:
+        print(f"✓ {seconds:8.3f}s  ({trace.query_count} queries)")
+    return value
+
+
+def run_size(size_label, seed, steps, keep=False):
+    """Seed one synthetic company and run the selected steps against it"""
+    ledger_count = parse_size(size_label)
+    print(f"\n▶ {size_label}: {ledger_count:,} ledgers")
+
+    started = time.perf_counter()
+    company = seed_company(ledger_count, seed)
+    entries, ledger_groupings = generate_ledgers(company['groupings'], ledger_count, seed)
+    setup_seconds = time.perf_counter() - started
+    company_id = company['company_id']
+    print(f"   setup                {setup_seconds:8.3f}s  (company {company_id})")
+
+    step_results = {}
+    state = {}
+
+    try:
+        if 'import' in steps:
+            timed_step(step_results, 'import',
+                       lambda: TrialBalance.bulk_import(company_id, entries, import_batch_id=1))
+
+        if 'load_ledgers' in steps or 'mapping' in steps:
+            state['ledgers'] = timed_step(step_results, 'load_ledgers',
+                                          lambda: TrialBalance.get_by_company(company_id))
+
+        if 'stream_ledgers' in steps:
+            def stream_totals():
+                totals = {}
+                for batch in TrialBalance.iter_batches(company_id, columns=['type_bs_pl', 'closing_balance_cy']):
+                    for type_bs_pl, closing in zip(batch['type_bs_pl'], batch['closing_balance_cy']):
+                        totals[type_bs_pl] = totals.get(type_bs_pl, 0) + (closing or 0)
+                return totals
+            timed_step(step_results, 'stream_ledgers', stream_totals)
+
+        if 'load_frame' in steps:
+            timed_step(step_results, 'load_frame', lambda: len(TrialBalance.get_frame(company_id)))
+
+        if 'mapping' in steps and state.get('ledgers'):
+            def map_all():
+                mappings = []
+                for ledger in state['ledgers']:
+                    grouping = ledger_groupings.get(ledger.ledger_name)
+                    if grouping:
+                        mappings.append((ledger.tb_id, grouping['major_head_id'], grouping['minor_head_id'],
+                                         grouping['grouping_id'], grouping['type_bs_pl']))
+                return TrialBalance.bulk_update_mapping(mappings, company_id)
+            timed_step(step_results, 'mapping', map_all)
+        state.pop('ledgers', None)
+
+        if 'load_company' in steps:
+            def load_company():
+                results, errors = prefetch_company(company_id)
+                if errors:
+                    raise RuntimeError(', '.join(f"{name}: {error}" for name, error in errors.items()))
+                return results
+            timed_step(step_results, 'load_company', load_company)
+
+        if 'validate_balance' in steps:
+            timed_step(step_results, 'validate_balance', lambda: TrialBalance.validate_balance(company_id))
+
+        if 'validate_rules' in steps:
+            timed_step(step_results, 'validate_rules', lambda: len(validate_trial_balance(company_id)))
+
+        if 'balance_sheet' in steps:
+            state['bs'] = timed_step(step_results, 'balance_sheet',
+                                     lambda: BalanceSheetGenerator(company_id).generate())
+        if 'profit_loss' in steps:
+            state['pl'] = timed_step(step_results, 'profit_loss',
+                                     lambda: ProfitLossGenerator(company_id).generate())
+        if 'cash_flow' in steps:
+            state['cf'] = timed_step(step_results, 'cash_flow',
+                                     lambda: CashFlowGenerator(company_id).generate())
+        if 'notes' in steps:
+            state['notes'] = timed_step(step_results, 'notes',
+                                        lambda: NotesGenerator(company_id).generate_all_notes())
+
+        if 'excel_export' in steps and all(state.get(key) is not None for key in ('bs', 'pl', 'cf', 'notes')):
+            def export():
+                company_info = CompanyInfo.get_by_id(company_id)
+                exporter = ExcelExporter(company_info.entity_name, str(company_info.fy_end_date))
+                exporter.create_workbook(state['bs'], state['pl'], state['cf'], state['notes'])
+                with tempfile.TemporaryDirectory() as tmp:
+                    exporter.save(os.path.join(tmp, 'benchmark.xlsx'))
+            timed_step(step_results, 'excel_export', export)
+
+        if 'pdf_export' in steps and all(state.get(key) is not None for key in ('bs', 'pl', 'cf', 'notes')):
+            def export_pdf():
+                company_info = CompanyInfo.get_by_id(company_id)
+                exporter = PDFExporter(company_info.entity_name, str(company_info.fy_end_date))
+                with tempfile.TemporaryDirectory() as tmp:
+                    return exporter.export(os.path.join(tmp, 'benchmark.pdf'),
+                                           state['bs'], state['pl'], state['cf'], state['notes'])
+            timed_step(step_results, 'pdf_export', export_pdf)
+
+    finally:
+        if not keep:
+            delete_company(company_id)
+
+    return {
+        'size': size_label,
+        'ledgers': ledger_count,
+        'seed': seed,
+        'company_id': company_id if keep else None,
+        'setup_seconds': round(setup_seconds, 4),
+        'steps': step_results,
+    }
+
+
+def run_master_data_seeding(companies):
+    """Time default master data seeding for fresh companies (independent of ledger count)"""
+    print(f"\n▶ default master data: {companies} companies")
+    step_results = {}
+    company_ids = []
+    try:
+        for i in range(companies):
+            company_id = create_empty_company(f"Master Data Benchmark {i + 1}")
+            company_ids.append(company_id)
+            timed_step(step_results, f"seed_master_data_{i + 1}",
+                       lambda: initialize_default_master_data_for_company(company_id))
+    finally:
+        for company_id in company_ids:
+            delete_company(company_id)
+
+    seconds = [result['seconds'] for result in step_results.values() if result['status'] == 'ok']
+    return {
+        'companies': companies,
+        'mean_seconds': round(sum(seconds) / len(seconds), 4) if seconds else None,
+        'max_seconds': max(seconds) if seconds else None,
+        'steps': step_results,
+    }
+
+
+def run_tenant_scaling(tenant_counts, ledger_size, seed):
+    """
+    Time one company's trial balance reads, a full reload and deleting a company while
+    other companies (tenants) with the same number of ledgers are added around it -
+    with per-company partitions the timings should stay flat as the tenant count grows
+    """
+    ledger_count = parse_size(ledger_size)
+    print(f"\n▶ tenant scaling: {ledger_count:,} ledgers per company, tenants {tenant_counts}")
+    probe = seed_company(ledger_count, seed=seed)
+    company_id = probe['company_id']
+    entries, _ = generate_ledgers(probe['groupings'], ledger_count, seed=seed)
+    tenant_ids = []
+    results = []
+    try:
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+        for tenants in sorted(tenant_counts):
+            while len(tenant_ids) + 1 < tenants:
+                tenant_id = create_empty_company(f"Tenant Benchmark {len(tenant_ids) + 1}")
+                tenant_ids.append(tenant_id)
+                TrialBalance.bulk_import(tenant_id, entries, import_batch_id=1)
+            print(f"  {tenants} companies, {tenants * ledger_count:,} ledgers in total")
+
+            step_results = {}
+            timed_step(step_results, 'load_frame', lambda: len(TrialBalance.get_frame(company_id)))
+            timed_step(step_results, 'validate_balance', lambda: TrialBalance.validate_balance(company_id))
+
+            def reload():
+                TrialBalance.delete_by_company(company_id)
+                return TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+            timed_step(step_results, 'reload', reload)
+
+            scratch = seed_company(ledger_count, seed=seed + tenants)
+            TrialBalance.bulk_import(scratch['company_id'], entries, import_batch_id=1)
+            timed_step(step_results, 'delete_company', lambda: delete_company(scratch['company_id']))
+            results.append({'tenants': tenants, 'total_ledgers': tenants * ledger_count, 'steps': step_results})
+    finally:
+        for tenant_id in [company_id] + tenant_ids:
+            delete_company(tenant_id)
+
+    return {'ledgers_per_company': ledger_count, 'seed': seed, 'results': results}
+
+
+def server_version():
+    """Database engine and version string"""
+    conn = get_connection()
+    try:
+        return get_dialect().server_version(conn.cursor())
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Financial Automation end-to-end benchmark")
+    parser.add_argument('--sizes', default='1k,10k,100k,1m',
+                        help="Comma separated ledger counts (1k, 10k, 100k, 1m or integers)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for the synthetic data")
+    parser.add_argument('--steps', default=','.join(ALL_STEPS),
+                        help=f"Comma separated steps to run ({', '.join(ALL_STEPS)})")
+    parser.add_argument('--output', help="JSON results file (default: benchmark_results/<version>_<timestamp>.json)")
+    parser.add_argument('--seed-companies', type=int, default=5,
+                        help="Fresh companies to time default master data seeding on (seed_master_data step)")
+    parser.add_argument('--tenants', default='',
+                        help="Comma separated company counts for the tenant scaling run (e.g. 1,10,50; default: skip)")
+    parser.add_argument('--tenant-ledgers', default='10k', help="Ledgers per company in the tenant scaling run (1k, 10k, 100k or an integer)")
+    parser.add_argument('--keep', action='store_true', help="Keep the synthetic companies after the run")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    steps = [step.strip() for step in args.steps.split(',') if step.strip()]
+    unknown = set(steps) - set(ALL_STEPS)
+    if unknown:
+        parser.error(f"Unknown steps: {', '.join(sorted(unknown))}")
+
+    print("=" * 70)
+    print(f"  Financial Automation Benchmark - v{APP_VERSION}")
+    print("=" * 70)
+
+    initialize_database()
+
+    report = {
+        'app_version': APP_VERSION,
+        'started_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'backend': get_dialect().name,
+        'database': server_version(),
+        'seed': args.seed,
+        'steps': steps,
+    }
+    if 'seed_master_data' in steps:
+        report['master_data_seeding'] = run_master_data_seeding(args.seed_companies)
+    report['results'] = [run_size(size, args.seed, steps, keep=args.keep) for size in sizes]
+    tenant_counts = [int(count) for count in args.tenants.split(',') if count.strip()]
+    if tenant_counts:
+        report['tenant_scaling'] = run_tenant_scaling(tenant_counts, args.tenant_ledgers, args.seed)
+    report['finished_at'] = datetime.now().isoformat()
+
+    output = args.output
+    if not output:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"benchmark_{APP_VERSION}_{timestamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+    print(f"\n✅ Results written to {output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Async data access - runs the blocking model calls concurrently with asyncio
+
+Each call runs on a shared worker pool and takes its own connection (from the
+PostgreSQL pool, or the worker thread's SQLite connection), so independent
+queries overlap their network round-trips instead of queueing behind each other.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.settings import POOL_MAX_CONN
+from config.instrumentation import current_action, joined_action
+
+# Leave pool connections for the UI thread and import workers
+MAX_DB_WORKERS = max(POOL_MAX_CONN - 2, 1)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool (threads keep their SQLite connection between calls)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_DB_WORKERS, thread_name_prefix='db-worker')
+        return _executor
+
+
+def _run_in_action(action, func):
+    with joined_action(action):
+        return func()
+
+
+async def run_query(func: Callable, *args, **kwargs) -> Any:
+    """
+    Await a blocking model call on the worker pool
+
+    Statements it executes are counted against the caller's running action.
+
+    Usage:
+        ledgers = await run_query(TrialBalance.get_by_company, company_id)
+    """
+    call = functools.partial(_run_in_action, current_action(), functools.partial(func, *args, **kwargs))
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+
+async def gather_datasets(loaders: Dict[str, Callable[[], Any]],
+                          on_result: Optional[Callable[[str, Any, Optional[Exception]], None]] = None
+                          ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Run independent loaders concurrently
+
+    Args:
+        loaders: {name: callable without arguments}
+        on_result: Called as on_result(name, value, error) as each loader finishes
+
+    Returns:
+        tuple: ({name: value} of the loaders that succeeded, {name: exception} of those that failed)
+    """
+    async def load(name, loader):
+        try:
+            value, error = await run_query(loader), None
+        except Exception as e:
+            value, error = None, e
+        if on_result:
+            on_result(name, value, error)
+        return name, value, error
+
+    results, errors = {}, {}
+    for name, value, error in await asyncio.gather(*(load(name, loader) for name, loader in loaders.items())):
+        if error is None:
+            results[name] = value
+        else:
+            errors[name] = error
+    return results, errors
@@ -0,0 +1,117 @@
+"""
+Change listener - receives the data change notifications other clients' writes
+raise (PostgreSQL LISTEN/NOTIFY, see bump_data_version in config.dialects)
+"""
+
+import json
+import select
+import threading
+from collections import namedtuple
+
+import psycopg2
+import psycopg2.extensions
+
+from config.settings import POSTGRES_CONFIG, CHANGE_NOTIFY_CHANNEL
+from config.db_connection import get_dialect, is_own_backend
+
+# One committed write: rows of `table` belonging to `company_id` changed.
+# `own` is True when the write came from this client's connection pool.
+DataChange = namedtuple('DataChange', ['company_id', 'table', 'operation', 'version', 'own'])
+
+
+def parse_notification(notify):
+    """DataChange from a psycopg2 Notify, or None if the payload is not one of ours"""
+    try:
+        payload = json.loads(notify.payload)
+        return DataChange(int(payload['company_id']), payload['table'], payload['operation'],
+                          int(payload['version']), is_own_backend(notify.pid))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class ChangeListener:
+    """
+    Background thread with a dedicated (unpooled) connection that LISTENs for data changes
+
+    Usage:
+        listener = ChangeListener(on_change)
+        listener.start()
+        ...
+        listener.stop()
+    """
+
+    def __init__(self, callback, channel=CHANGE_NOTIFY_CHANNEL, poll_interval=1.0, retry_interval=5.0):
+        """
+        Args:
+            callback: Called as callback(DataChange) on the listener thread
+            channel: NOTIFY channel
+            poll_interval: Seconds between checks for stop()
+            retry_interval: Seconds to wait before reconnecting after the connection drops
+        """
+        self.callback = callback
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._listening = threading.Event()
+
+    def start(self):
+        """Start listening; returns False on backends without notifications (embedded SQLite)"""
+        if get_dialect().name != 'postgresql':
+            return False
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='change-listener', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop listening and close the connection"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._listening.clear()
+
+    def wait_until_listening(self, timeout=None):
+        """Block until LISTEN is active (notifications committed before that are not delivered)"""
+        return self._listening.wait(timeout)
+
+    def _connect(self):
+        conn = psycopg2.connect(
+            host=POSTGRES_CONFIG['host'],
+            port=POSTGRES_CONFIG['port'],
+            database=POSTGRES_CONFIG['database'],
+            user=POSTGRES_CONFIG['user'],
+            password=POSTGRES_CONFIG['password']
+        )
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        conn.cursor().execute(f'LISTEN {self.channel}')
+        return conn
+
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                self._listening.set()
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        change = parse_notification(conn.notifies.pop(0))
+                        if change is None:
+                            continue
+                        try:
+                            self.callback(change)
+                        except Exception as e:
+                            print(f"❌ Change listener callback failed: {e}")
+            except psycopg2.Error as e:
+                self._listening.clear()
+                print(f"⚠️ Change listener disconnected ({e}), retrying in {self.retry_interval:.0f}s")
+                self._stop.wait(self.retry_interval)
+            finally:
+                if conn is not None:
+                    conn.close()
@@ -1,9 +1,20 @@
-"""Database initialization and management - PostgreSQL only"""
+"""Database initialization and management - PostgreSQL or embedded SQLite"""
 
-from .db_connection import get_connection, release_connection
+from .db_connection import get_connection, release_connection, get_dialect
+from .settings import CHANGE_NOTIFY_CHANNEL
+
+# Tables the generated statements are built from - writes to them bump the company's data version
+# (and notify other PostgreSQL clients on CHANGE_NOTIFY_CHANNEL)
+VERSIONED_TABLES = ('company_info', 'major_heads', 'minor_heads', 'groupings', 'trial_balance',
+                    'adjustments', 'ppe_schedule', 'cwip_schedule', 'investments', 'inventories')
+
+# Tables list-partitioned by company_id on PostgreSQL - a company's ledgers and journal
+# lines live in their own partitions, so clearing or dropping a company is a TRUNCATE or
+# DROP of one table instead of a DELETE through everyone's rows
+PARTITIONED_TABLES = ('trial_balance', 'trial_balance_branches', 'gl_journal_lines')
 
 def initialize_database():
-    """Initialize the PostgreSQL database with all required tables"""
+    """Initialize the database with all required tables (DDL is adapted by the active dialect)"""
     
     conn = get_connection()
     cursor = conn.cursor()
@@ -117,10 +128,13 @@ def initialize_database():
         )
     ''')
     
-    # Trial Balance table
-    cursor.execute('''
+    # Trial Balance table, one partition per company on PostgreSQL. A trial_balance
+    # created before it was partitioned is moved into the partitioned table.
+    dialect = get_dialect()
+    legacy_tb = dialect.rename_unpartitioned(cursor, 'trial_balance')
+    cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS trial_balance (
-            tb_id SERIAL PRIMARY KEY,
+            {dialect.partitioned_serial_key('tb_id', 'company_id')},
             company_id INTEGER NOT NULL,
             ledger_name VARCHAR(500) NOT NULL,
             opening_balance_cy DECIMAL(15,2) DEFAULT 0,
@@ -143,8 +157,83 @@ def initialize_database():
             FOREIGN KEY (major_head_id) REFERENCES major_heads(major_head_id),
             FOREIGN KEY (minor_head_id) REFERENCES minor_heads(minor_head_id),
             FOREIGN KEY (grouping_id) REFERENCES groupings(grouping_id)
+        ) {dialect.partition_by_list('company_id')}
+    ''')
+    if legacy_tb:
+        dialect.move_rows(cursor, legacy_tb, 'trial_balance', 'company_id')
+        print("✓ Trial balance moved into per-company partitions")
+    # Deleting a company's heads and groupings checks the foreign keys above against
+    # every company's ledgers - without these that is a scan of each partition per row.
+    # Partial, so importing unmapped ledgers costs no index maintenance.
+    for column in ('major_head_id', 'minor_head_id', 'grouping_id'):
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_trial_balance_{column}
+            ON trial_balance ({column}) WHERE {column} IS NOT NULL
+        ''')
+    
+    # Audit adjustment journals over imported trial balances. Only 'applied' entries
+    # reach the statements (TrialBalance adjusted reads); tb_id is not a foreign key
+    # so imports keep their bulk path - the rows go with their trial balance rows.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS adjustments (
+            adjustment_id SERIAL PRIMARY KEY,
+            company_id INTEGER NOT NULL,
+            tb_id INTEGER NOT NULL,
+            batch_name VARCHAR(100) NOT NULL,
+            period VARCHAR(2) NOT NULL DEFAULT 'CY',
+            debit DECIMAL(15,2) DEFAULT 0,
+            credit DECIMAL(15,2) DEFAULT 0,
+            narration TEXT,
+            status VARCHAR(20) NOT NULL DEFAULT 'proposed',
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW(),
+            FOREIGN KEY (company_id) REFERENCES company_info(company_id)
         )
     ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adjustments_status
+        ON adjustments (company_id, status, tb_id)
+    ''')
+    
+    # Branch share of trial balance rows imported from one file per branch (a ledger
+    # merged across branches has a row per branch). No foreign key on tb_id, as for
+    # adjustments - the rows go with their trial balance rows.
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS trial_balance_branches (
+            company_id INTEGER NOT NULL,
+            import_batch_id INTEGER,
+            tb_id INTEGER NOT NULL,
+            branch VARCHAR(255) NOT NULL,
+            closing_balance_cy DECIMAL(15,2) DEFAULT 0,
+            closing_balance_py DECIMAL(15,2) DEFAULT 0,
+            FOREIGN KEY (company_id) REFERENCES company_info(company_id)
+        ) {dialect.partition_by_list('company_id')}
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_trial_balance_branches
+        ON trial_balance_branches (company_id, tb_id)
+    ''')
+    
+    # General ledger journal lines behind imported trial balances (drill-down),
+    # one partition per company on PostgreSQL. No foreign key: lines are loaded in
+    # millions and an RI check per row would nearly double the COPY time.
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS gl_journal_lines (
+            company_id INTEGER NOT NULL,
+            import_batch_id INTEGER,
+            line_no INTEGER NOT NULL,
+            ledger_name VARCHAR(500) NOT NULL,
+            posting_date DATE NOT NULL,
+            voucher_no VARCHAR(100),
+            narration TEXT,
+            debit DECIMAL(15,2) DEFAULT 0,
+            credit DECIMAL(15,2) DEFAULT 0
+        ) {dialect.partition_by_list('company_id')}
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_gl_journal_ledger
+        ON gl_journal_lines (company_id, ledger_name, posting_date)
+    ''')
     
     # Share Capital table
     cursor.execute('''
@@ -207,6 +296,27 @@ def initialize_database():
         )
     ''')
     
+    # Fixed Asset Register - one row per asset, rolled up into ppe_schedule by asset class
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fixed_assets (
+            asset_id SERIAL PRIMARY KEY,
+            company_id INTEGER NOT NULL,
+            asset_code VARCHAR(100),
+            asset_name VARCHAR(500),
+            asset_class VARCHAR(255) NOT NULL,
+            cost DECIMAL(15,2) DEFAULT 0,
+            capitalization_date DATE NOT NULL,
+            disposal_date DATE,
+            depreciation_method VARCHAR(10) DEFAULT 'SLM',
+            useful_life_years DECIMAL(6,2) DEFAULT 0,
+            residual_value_pct DECIMAL(5,2) DEFAULT 5,
+            import_batch_id INTEGER,
+            created_at TIMESTAMP DEFAULT NOW(),
+            FOREIGN KEY (company_id) REFERENCES company_info(company_id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_fixed_assets_company ON fixed_assets (company_id)')
+    
     # CWIP Schedule table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS cwip_schedule (
@@ -413,9 +523,58 @@ def initialize_database():
         )
     ''')
     
+    # Change counter per company, bumped by triggers on every table the statements read
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            company_id INTEGER PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )
+    ''')
+    for statement in get_dialect().data_version_triggers(VERSIONED_TABLES, CHANGE_NOTIFY_CHANNEL):
+        cursor.execute(statement)
+    
+    # Generated statements, reused while the company's data version is unchanged
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS statement_cache (
+            company_id INTEGER PRIMARY KEY,
+            data_version BIGINT NOT NULL,
+            payload TEXT NOT NULL,
+            generated_at TIMESTAMP DEFAULT NOW()
+        )
+    ''')
+    
     conn.commit()
     conn.close()
-    print("✓ PostgreSQL database initialized successfully!")
+    print(f"✓ {'SQLite' if get_dialect().name == 'sqlite' else 'PostgreSQL'} database initialized successfully!")
+
+
+def create_company_partitions(cursor, company_id):
+    """Create a company's partitions of the PARTITIONED_TABLES (no-op on SQLite)"""
+    dialect = get_dialect()
+    for table in PARTITIONED_TABLES:
+        dialect.ensure_list_partition(cursor, table, company_id)
+
+
+def clear_company_partitions(cursor, company_id, drop=False):
+    """
+    Remove every row a company has in the PARTITIONED_TABLES - TRUNCATE (or DROP) of
+    its partitions on PostgreSQL, DELETE on SQLite. The caller commits.
+    
+    Args:
+        drop: Drop the partitions as well (the company is being deleted)
+    """
+    dialect = get_dialect()
+    partitioned = False
+    for table in PARTITIONED_TABLES:
+        if drop:
+            partitioned = dialect.drop_list_partition(cursor, table, company_id)
+        else:
+            partitioned = dialect.truncate_list_partition(cursor, table, company_id)
+        if not partitioned:
+            cursor.execute(f'DELETE FROM {table} WHERE company_id = %s', (company_id,))
+    if partitioned and not drop:
+        # TRUNCATE fires no row or statement triggers - bump the version they would have
+        dialect.bump_data_version(cursor, company_id, 'trial_balance', CHANGE_NOTIFY_CHANNEL)
 
 
 def initialize_default_master_data():
@@ -1,46 +1,340 @@
 """
-Database connection layer - PostgreSQL only
+Database connection layer - PostgreSQL server or embedded SQLite (DB_BACKEND setting)
 """
 
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
 import psycopg2
+import psycopg2.extensions
 from psycopg2 import pool
 from contextlib import contextmanager
-from config.settings import POSTGRES_CONFIG, POOL_MIN_CONN, POOL_MAX_CONN
+from config.settings import (DB_BACKEND, POSTGRES_CONFIG, POOL_MIN_CONN, POOL_MAX_CONN,
+                             SQL_INSTRUMENTATION_ENABLED, SQLITE_PATH, SQLITE_CACHE_SIZE_KB,
+                             SQLITE_MMAP_SIZE, SQLITE_BUSY_TIMEOUT_MS, STREAM_ITERSIZE)
+from config.instrumentation import InstrumentedCursor, record_query
+from config.dialects import get_dialect_class, check_sqlite_version, SQLiteDialect
+
+# Active SQL dialect
+_dialect = get_dialect_class(DB_BACKEND)()
+_sqlite_dialect = _dialect if isinstance(_dialect, SQLiteDialect) else SQLiteDialect()
 
 # Global connection pool
 _pg_pool = None
+_pg_pool_lock = threading.Lock()
+_returning = threading.local()  # Set while this thread is inside putconn()
+_own_backend_pids = set()  # Server pids of our pooled connections (to recognise our own NOTIFYs)
+_closing_pool = False
 
+# Embedded SQLite - one connection per thread
+_sqlite_local = threading.local()
+_sqlite_connections = []
+_sqlite_lock = threading.Lock()
 
-def get_connection():
+# Database session of the background job running on this thread (see db_session)
+_session_local = threading.local()
+
+# NUMERIC columns read as float on cursors passed to numeric_as_float() - money is
+# Decimal everywhere else on PostgreSQL (SQLite stores NUMERIC as REAL and reads float)
+NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, 'NUMERIC_AS_FLOAT',
+    lambda value, cursor: float(value) if value is not None else None)
+
+
+def get_dialect():
+    """SQL dialect of the configured backend"""
+    return _dialect
+
+
+def numeric_as_float(cursor):
+    """Read NUMERIC columns on this cursor as float - for columnar reads that fill float64 arrays"""
+    if _dialect.name == 'postgresql':
+        psycopg2.extensions.register_type(NUMERIC_AS_FLOAT, cursor)
+    return cursor
+
+
+def is_own_backend(pid):
+    """True if a PostgreSQL server process id belongs to one of this client's pooled connections"""
+    return pid in _own_backend_pids
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """Connection whose close() hands it back to the pool.
+
+    Models call conn.close() when they are done; without this the pool
+    would run out after POOL_MAX_CONN calls.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.backend_pid = self.get_backend_pid()
+        self.checked_out = False  # Set by get_connection(), cleared when handed back (under _pg_pool_lock)
+        _own_backend_pids.add(self.backend_pid)
+
+    def close(self):
+        if (_pg_pool is not None and not _closing_pool and not self.closed
+                and not getattr(_returning, 'active', False)):
+            with _pg_pool_lock:
+                if not self.checked_out:
+                    return  # Already returned (close() called twice)
+                self.checked_out = False
+            _untrack(self)
+            _returning.active = True
+            try:
+                _pg_pool.putconn(self)
+                return
+            except pool.PoolError:
+                pass  # Not checked out from this pool - close for real
+            finally:
+                _returning.active = False
+        # Also reached when putconn() discards a connection above POOL_MIN_CONN -
+        # re-entering the (locked) pool from here would deadlock
+        _own_backend_pids.discard(self.backend_pid)
+        super().close()
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    """sqlite3 cursor that accepts application (%s) SQL and records it like InstrumentedCursor"""
+
+    def execute(self, sql, parameters=None):
+        sql = _sqlite_dialect.adapt(sql)
+        if not SQL_INSTRUMENTATION_ENABLED:
+            return super().execute(sql, parameters or ())
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters or ())
+        finally:
+            record_query(sql, parameters, self.rowcount, (time.perf_counter() - started) * 1000)
+
+    def executemany(self, sql, seq_of_parameters):
+        sql = _sqlite_dialect.adapt(sql)
+        seq_of_parameters = list(seq_of_parameters)
+        if not SQL_INSTRUMENTATION_ENABLED:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_query(sql, f"{len(seq_of_parameters)} param sets", self.rowcount,
+                         (time.perf_counter() - started) * 1000)
+
+
+class SQLiteConnection(sqlite3.Connection):
+    """Per-thread SQLite connection shared by nested get_connection() calls.
+
+    close() only releases a checkout; when the last one is released any
+    uncommitted work is rolled back, like putconn() on the PostgreSQL pool.
+    A checkout taken while an outer one has uncommitted work opens a
+    SAVEPOINT: its commit() releases into the outer transaction and its
+    rollback() returns to the savepoint, so only the outermost level ever
+    commits or rolls back the outer work.
     """
-    Get a PostgreSQL database connection from the pool
-    
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.savepoints = {}  # checkout depth -> savepoint name
+
+    def cursor(self, factory=SQLiteCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=None):
+        return self.cursor().execute(sql, parameters)
+
+    def checkout(self):
+        """Take a checkout (see get_connection)"""
+        self.checkouts += 1
+        if self.checkouts > 1 and self.in_transaction:
+            name = f"nested_{self.checkouts}"
+            self.execute(f"SAVEPOINT {name}")
+            self.savepoints[self.checkouts] = name
+
+    def commit(self):
+        name = self.savepoints.get(self.checkouts)
+        if name is None:
+            return super().commit()
+        # Keep the work for the outer level to commit; later work at this level gets a fresh savepoint
+        self.execute(f"RELEASE SAVEPOINT {name}")
+        self.execute(f"SAVEPOINT {name}")
+
+    def rollback(self):
+        name = self.savepoints.get(self.checkouts)
+        if name is None:
+            return super().rollback()
+        self.execute(f"ROLLBACK TO SAVEPOINT {name}")
+
+    def close(self):
+        if self.checkouts > 0:
+            name = self.savepoints.pop(self.checkouts, None)
+            if name is not None:
+                # Uncommitted work of this level only
+                self.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                self.execute(f"RELEASE SAVEPOINT {name}")
+            self.checkouts -= 1
+            if self.checkouts == 0 and self.in_transaction:
+                self.rollback()
+            return
+        super().close()
+
+    def close_for_real(self):
+        """Close the underlying database handle"""
+        self.checkouts = 0
+        self.savepoints = {}
+        super().close()
+
+
+class DBSession:
+    """Connections one background job has checked out (see db_session)"""
+
+    def __init__(self):
+        self.connections = []
+        self.inherited = getattr(_sqlite_local, 'conn', None)  # The thread's connection before the job
+        self._lock = threading.Lock()
+
+    def add(self, conn):
+        with self._lock:
+            if not any(c is conn for c in self.connections):
+                self.connections.append(conn)
+
+    def discard(self, conn):
+        with self._lock:
+            self.connections = [c for c in self.connections if c is not conn]
+
+    def interrupt(self):
+        """Abort the statement running on each of the job's connections (called from another thread)"""
+        with self._lock:
+            for conn in self.connections:
+                try:
+                    if isinstance(conn, SQLiteConnection):
+                        conn.interrupt()
+                    elif not conn.closed:
+                        conn.cancel()
+                except Exception as e:
+                    print(f"⚠️ Could not interrupt query: {e}")
+
+
+def _track(conn):
+    session = getattr(_session_local, 'session', None)
+    if session is not None:
+        session.add(conn)
+
+
+def _untrack(conn):
+    session = getattr(_session_local, 'session', None)
+    if session is not None:
+        session.discard(conn)
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+
+def _convert_timestamp(value):
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(list, json.dumps)  # "= ANY(%s)" parameters
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', _convert_date)
+sqlite3.register_converter('TIMESTAMP', _convert_timestamp)
+sqlite3.register_converter('BOOLEAN', lambda value: value not in (b'0', b''))
+sqlite3.register_converter('DECIMAL', float)
+
+
+def open_sqlite_connection(path):
+    """
+    Open an embedded SQLite database tuned for a single-user desktop
+
+    Args:
+        path: Database file (created if missing) or ':memory:'
+
     Returns:
-        psycopg2 connection object
+        SQLiteConnection
     """
-    global _pg_pool
-    
-    if _pg_pool is None:
+    check_sqlite_version()
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path, factory=SQLiteConnection, detect_types=sqlite3.PARSE_DECLTYPES,
+                           check_same_thread=False, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    # WAL lets readers run alongside the writer; NORMAL sync is durable across app crashes in WAL mode
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute(f'PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}')
+    conn.execute(f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}')
+    return conn
+
+
+def _get_sqlite_connection():
+    conn = getattr(_sqlite_local, 'conn', None)
+    if conn is None:
         try:
-            _pg_pool = pool.SimpleConnectionPool(
-                POOL_MIN_CONN,
-                POOL_MAX_CONN,
-                host=POSTGRES_CONFIG['host'],
-                port=POSTGRES_CONFIG['port'],
-                database=POSTGRES_CONFIG['database'],
-                user=POSTGRES_CONFIG['user'],
-                password=POSTGRES_CONFIG['password']
-            )
-            print(f"✓ PostgreSQL connection pool created successfully")
-            print(f"  Host: {POSTGRES_CONFIG['host']}")
-            print(f"  Database: {POSTGRES_CONFIG['database']}")
-            print(f"  User: {POSTGRES_CONFIG['user']}")
+            conn = open_sqlite_connection(SQLITE_PATH)
         except Exception as e:
-            print(f"❌ Failed to create PostgreSQL pool: {e}")
+            print(f"❌ Failed to open SQLite database: {e}")
             raise
-    
+        with _sqlite_lock:
+            if not _sqlite_connections:
+                print(f"✓ SQLite database opened (WAL mode)")
+                print(f"  Path: {SQLITE_PATH}")
+            _sqlite_connections.append(conn)
+        _sqlite_local.conn = conn
+    conn.checkout()
+    _track(conn)
+    return conn
+
+
+def get_connection():
+    """
+    Get a database connection (from the PostgreSQL pool, or this thread's SQLite connection)
+
+    Returns:
+        psycopg2 or sqlite3 connection object - call close() when done
+    """
+    global _pg_pool
+
+    if _dialect.name == 'sqlite':
+        return _get_sqlite_connection()
+
+    if _pg_pool is None:
+        with _pg_pool_lock:
+            if _pg_pool is None:  # Another thread may have created it meanwhile
+                try:
+                    _pg_pool = pool.ThreadedConnectionPool(
+                        POOL_MIN_CONN,
+                        POOL_MAX_CONN,
+                        host=POSTGRES_CONFIG['host'],
+                        port=POSTGRES_CONFIG['port'],
+                        database=POSTGRES_CONFIG['database'],
+                        user=POSTGRES_CONFIG['user'],
+                        password=POSTGRES_CONFIG['password'],
+                        connection_factory=PooledConnection,
+                        # Time every statement for the slow query log and per-action stats
+                        cursor_factory=InstrumentedCursor if SQL_INSTRUMENTATION_ENABLED else None
+                    )
+                    print(f"✓ PostgreSQL connection pool created successfully")
+                    print(f"  Host: {POSTGRES_CONFIG['host']}")
+                    print(f"  Database: {POSTGRES_CONFIG['database']}")
+                    print(f"  User: {POSTGRES_CONFIG['user']}")
+                except Exception as e:
+                    print(f"❌ Failed to create PostgreSQL pool: {e}")
+                    raise
+
     try:
         conn = _pg_pool.getconn()
+        with _pg_pool_lock:
+            conn.checked_out = True
+        _track(conn)
         return conn
     except Exception as e:
         print(f"❌ Failed to get connection from pool: {e}")
@@ -50,28 +344,76 @@ def get_connection():
 def release_connection(conn):
     """
     Release connection back to pool
-    
+
     Args:
         conn: Connection to release
     """
-    if _pg_pool and conn:
-        _pg_pool.putconn(conn)
+    if isinstance(conn, SQLiteConnection):
+        conn.close()
+    elif _pg_pool and conn:
+        conn.close()  # PooledConnection.close() hands it back to the pool
+
+
+def _close_sqlite_connection(conn):
+    with _sqlite_lock:
+        if conn in _sqlite_connections:
+            _sqlite_connections.remove(conn)
+    if getattr(_sqlite_local, 'conn', None) is conn:
+        del _sqlite_local.conn
+    conn.close_for_real()
+
+
+@contextmanager
+def db_session(token=None):
+    """
+    Database session of one background job, for the duration of the block
+
+    Connections the job checks out on this thread are tracked: cancelling the
+    token (config.jobs.CancelToken) aborts the statement running on them, and
+    any still checked out when the block ends are rolled back and returned.
+    On SQLite the connection the job opened is closed at the end, so the next
+    job on a reused pool thread opens its own.
+
+    Yields:
+        DBSession
+    """
+    session = getattr(_session_local, 'session', None)
+    if session is not None:
+        yield session  # Nested - part of the enclosing job
+        return
+
+    session = DBSession()
+    _session_local.session = session
+    remove_callback = token.on_cancel(session.interrupt) if token is not None else None
+    try:
+        yield session
+    finally:
+        if remove_callback:
+            remove_callback()
+        _session_local.session = None
+        for conn in session.connections:
+            if isinstance(conn, SQLiteConnection):
+                if conn is not session.inherited:
+                    _close_sqlite_connection(conn)
+            elif not conn.closed:
+                print("⚠️ Job left a database connection checked out - returned to the pool")
+                conn.close()  # putconn() rolls back what was not committed
 
 
 @contextmanager
 def get_db_cursor(commit=False):
     """
     Context manager for database operations
-    
+
     Args:
         commit: Whether to auto-commit
-    
+
     Yields:
         Database cursor
     """
     conn = get_connection()
     cursor = conn.cursor()
-    
+
     try:
         yield cursor
         if commit:
@@ -87,20 +429,20 @@ def get_db_cursor(commit=False):
 def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=False):
     """
     Execute a SQL query with automatic connection management
-    
+
     Args:
         query: SQL query string (use %s for parameters)
         params: Query parameters (tuple or dict)
         fetch_one: Return single row (default: False)
         fetch_all: Return all rows (default: False)
         commit: Auto-commit (default: False)
-    
+
     Returns:
         Query result based on fetch parameters, or lastrowid if INSERT with RETURNING
     """
     with get_db_cursor(commit=commit) as cursor:
         cursor.execute(query, params or ())
-        
+
         if fetch_one:
             return cursor.fetchone()
         elif fetch_all:
@@ -110,14 +452,62 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=F
             if 'RETURNING' in query.upper():
                 return cursor.fetchone()[0]
             return None
-        
+
         return None
 
 
+def stream_query(query, params=None, itersize=None, as_float=False):
+    """
+    Stream a large result set in chunks with bounded memory
+
+    Uses a server-side cursor on PostgreSQL; the connection is held until the
+    generator is exhausted or closed.
+
+    Args:
+        query: SQL query string (use %s for parameters)
+        params: Query parameters
+        itersize: Rows per chunk (default: STREAM_ITERSIZE)
+        as_float: NUMERIC columns as float instead of Decimal (see numeric_as_float)
+
+    Yields:
+        list of row tuples (at most itersize per chunk)
+    """
+    itersize = itersize or STREAM_ITERSIZE
+    conn = get_connection()
+    cursor = None
+    try:
+        cursor = _dialect.stream_cursor(conn, itersize)
+        if as_float:
+            numeric_as_float(cursor)
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(itersize)
+            if not rows:
+                break
+            yield rows
+    finally:
+        if cursor is not None:
+            cursor.close()
+        conn.close()
+
+
 def close_pool():
-    """Close connection pool (call on application shutdown)"""
-    global _pg_pool
+    """Close connection pool / SQLite connections (call on application shutdown)"""
+    global _pg_pool, _closing_pool
     if _pg_pool:
-        _pg_pool.closeall()
+        _closing_pool = True
+        try:
+            _pg_pool.closeall()
+        finally:
+            _closing_pool = False
         _pg_pool = None
         print("✓ PostgreSQL connection pool closed")
+
+    with _sqlite_lock:
+        connections = list(_sqlite_connections)
+        _sqlite_connections.clear()
+    for conn in connections:
+        conn.close_for_real()
+    _sqlite_local.__dict__.pop('conn', None)
+    if connections:
+        print("✓ SQLite database closed")
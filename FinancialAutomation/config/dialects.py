@@ -0,0 +1,472 @@
+"""
+SQL dialects - the differences between the PostgreSQL and embedded SQLite backends
+
+Application SQL is written once in PostgreSQL style (%s placeholders, NOW(),
+RETURNING, ON CONFLICT, "= ANY(%s)" with a list parameter). The active dialect
+adapts statements for its backend and provides the bulk-load strategies used by
+imports and seeding.
+"""
+
+import io
+import json
+import re
+import sqlite3
+import uuid
+
+# Tokens rewritten for SQLite. String literals are matched as a whole so NOW() inside
+# them is kept; %s / %% are still replaced there, as psycopg2 does.
+_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|=\s*ANY\(%s\)|%s|%%|NOW\(\)|SERIAL PRIMARY KEY", re.IGNORECASE)
+
+
+class Dialect:
+    """Base dialect - PostgreSQL syntax passes through unchanged"""
+
+    name = None
+    placeholder = '%s'
+
+    def adapt(self, sql):
+        """Translate an application statement into this dialect"""
+        return sql
+
+    def placeholders(self, count):
+        """Comma separated placeholders for one row of values"""
+        return ', '.join([self.placeholder] * count)
+
+    def upsert(self, table, columns, conflict_columns, update_columns=None):
+        """
+        INSERT ... ON CONFLICT statement (application style, pass through adapt())
+
+        Args:
+            table: Target table
+            columns: Inserted columns
+            conflict_columns: Columns of the unique constraint
+            update_columns: Columns to overwrite on conflict (default: all non-key columns)
+        """
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in conflict_columns]
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+               f"VALUES ({', '.join(['%s'] * len(columns))}) "
+               f"ON CONFLICT ({', '.join(conflict_columns)}) ")
+        if update_columns:
+            sql += "DO UPDATE SET " + ', '.join(f"{c} = excluded.{c}" for c in update_columns)
+        else:
+            sql += "DO NOTHING"
+        return sql
+
+    def bulk_insert(self, cursor, table, columns, rows):
+        """Insert many rows, returns the number of rows"""
+        raise NotImplementedError
+
+    def bulk_insert_frame(self, cursor, table, frame):
+        """Insert the rows of a pandas DataFrame whose columns are named after the table's"""
+        return self.bulk_insert(cursor, table, list(frame.columns), frame.itertuples(index=False, name=None))
+
+    def bulk_insert_returning(self, cursor, table, columns, rows, returning):
+        """Insert many rows, returns the RETURNING tuples (one per row)"""
+        raise NotImplementedError
+
+    def bulk_update(self, cursor, table, key_column, columns, rows, extra_set=None, company_id=None):
+        """
+        Update many rows by key
+
+        Args:
+            rows: Tuples of (key, *column values)
+            extra_set: Optional SQL assignments applied to every row (e.g. "is_mapped = 1")
+            company_id: Only update rows of this company (keeps partitioned tables to one partition)
+        """
+        raise NotImplementedError
+
+    def stream_cursor(self, conn, itersize):
+        """Cursor that fetches a large result set in chunks instead of all at once"""
+        return conn.cursor()
+
+    def partition_by_list(self, column):
+        """Clause ending a CREATE TABLE that list-partitions the table on column ('' if unsupported)"""
+        return ''
+
+    def partitioned_serial_key(self, column, partition_column):
+        """
+        Serial primary key definition for a table list-partitioned on partition_column
+        (a partitioned table's primary key must include its partition column)
+        """
+        return f"{column} SERIAL PRIMARY KEY"
+
+    def list_partition(self, table, value):
+        """Table that holds the rows of a list-partitioned table with this key value"""
+        return table
+
+    def ensure_list_partition(self, cursor, table, value):
+        """Create the partition of a list-partitioned table that holds rows with this key value (no-op if unsupported)"""
+
+    def truncate_list_partition(self, cursor, table, value):
+        """Empty the partition of one key value - False if unsupported (delete the rows instead)"""
+        return False
+
+    def drop_list_partition(self, cursor, table, value):
+        """Drop the partition of one key value - False if unsupported (delete the rows instead)"""
+        return False
+
+    def rename_unpartitioned(self, cursor, table):
+        """
+        Rename a table created before it was list-partitioned, so it can be created
+        again partitioned and refilled with move_rows()
+
+        Returns:
+            str: The table's new name, None if there is nothing to migrate
+        """
+        return None
+
+    def move_rows(self, cursor, source, table, partition_column):
+        """Copy every row of source into a list-partitioned table (creating its partitions), then drop source"""
+        raise NotImplementedError
+
+    def bump_data_version(self, cursor, company_id, table, notify_channel=None):
+        """Bump a company's data version for a change no trigger sees (TRUNCATE, DROP)"""
+        cursor.execute('''
+            INSERT INTO data_versions (company_id, version) VALUES (%s, 1)
+            ON CONFLICT (company_id) DO UPDATE SET version = data_versions.version + 1
+        ''', (company_id,))
+
+    def analyze(self, cursor, table):
+        """Refresh the planner statistics of a table after a bulk load (no-op if not needed)"""
+
+    def server_version(self, cursor):
+        """Database engine version string"""
+        raise NotImplementedError
+
+    def data_version_triggers(self, tables, notify_channel=None):
+        """
+        DDL for triggers that bump data_versions.version for every company whose
+        rows in the given tables are inserted, updated or deleted
+
+        Args:
+            tables: Tables to watch
+            notify_channel: Also NOTIFY listening clients on this channel (server backends only)
+        """
+        raise NotImplementedError
+
+
+class PostgresDialect(Dialect):
+    """PostgreSQL - COPY for plain bulk loads, multi-row VALUES when ids are needed"""
+
+    name = 'postgresql'
+
+    def __init__(self):
+        self._column_types = {}
+
+    def stream_cursor(self, conn, itersize):
+        # Named (server-side) cursor - rows stay on the server until fetched
+        cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}")
+        cursor.itersize = itersize
+        return cursor
+
+    def partition_by_list(self, column):
+        return f"PARTITION BY LIST ({column})"
+
+    def partitioned_serial_key(self, column, partition_column):
+        # Key column first, so lookups by key alone still use each partition's index
+        return f"{column} SERIAL, PRIMARY KEY ({column}, {partition_column})"
+
+    def list_partition(self, table, value):
+        return f"{table}_p{int(value)}"  # Interpolated into DDL - integer keys only
+
+    def ensure_list_partition(self, cursor, table, value):
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.list_partition(table, value)} PARTITION OF {table} "
+                       f"FOR VALUES IN ({int(value)})")
+
+    def truncate_list_partition(self, cursor, table, value):
+        partition = self.list_partition(table, value)
+        cursor.execute('SELECT to_regclass(%s)', (partition,))
+        if cursor.fetchone()[0] is not None:
+            cursor.execute(f"TRUNCATE {partition}")
+        return True
+
+    def drop_list_partition(self, cursor, table, value):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.list_partition(table, value)}")
+        return True
+
+    def rename_unpartitioned(self, cursor, table):
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', (table,))
+        row = cursor.fetchone()
+        if not row or row[0] != 'r':  # Missing, or already partitioned ('p')
+            return None
+        legacy = f"{table}_unpartitioned"
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        # The primary key index and serial sequences keep their names - free them for the new table
+        cursor.execute('''
+            SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'
+        ''', (legacy,))
+        for (constraint,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {constraint} TO {legacy}_pkey")
+        cursor.execute('''
+            SELECT s.relname FROM pg_depend d JOIN pg_class s ON s.oid = d.objid
+            WHERE d.refobjid = %s::regclass AND s.relkind = 'S'
+        ''', (legacy,))
+        for number, (sequence,) in enumerate(cursor.fetchall()):
+            cursor.execute(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_seq{number}")
+        return legacy
+
+    def move_rows(self, cursor, source, table, partition_column):
+        cursor.execute(f"SELECT DISTINCT {partition_column} FROM {source}")
+        for (value,) in cursor.fetchall():
+            self.ensure_list_partition(cursor, table, value)
+        # Columns of both tables, so an older source without newer columns still moves
+        cursor.execute('''
+            SELECT column_name FROM information_schema.columns WHERE table_name = %s
+            INTERSECT
+            SELECT column_name FROM information_schema.columns WHERE table_name = %s
+        ''', (source, table))
+        columns = ', '.join(sorted(name for (name,) in cursor.fetchall()))
+        cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {source}")
+        # Serial columns carry on after the moved keys
+        cursor.execute('''
+            SELECT column_name, pg_get_serial_sequence(%s, column_name)
+            FROM information_schema.columns
+            WHERE table_name = %s AND pg_get_serial_sequence(%s, column_name) IS NOT NULL
+        ''', (table, table, table))
+        for column, sequence in cursor.fetchall():
+            cursor.execute(f"SELECT setval(%s, COALESCE(MAX({column}), 0) + 1, false) FROM {table}", (sequence,))
+        cursor.execute(f"DROP TABLE {source}")
+
+    def bump_data_version(self, cursor, company_id, table, notify_channel=None):
+        cursor.execute('''
+            INSERT INTO data_versions (company_id, version) VALUES (%s, 1)
+            ON CONFLICT (company_id) DO UPDATE SET version = data_versions.version + 1
+            RETURNING version
+        ''', (company_id,))
+        version = cursor.fetchone()[0]
+        if notify_channel:
+            # Same payload as the trigger notifications
+            cursor.execute('SELECT pg_notify(%s, %s)', (notify_channel, json.dumps({
+                'company_id': company_id, 'table': table, 'operation': 'TRUNCATE', 'version': version})))
+
+    def analyze(self, cursor, table):
+        # Until autovacuum gets to it, freshly loaded rows have no statistics and the
+        # planner takes the table for empty - nested loops over a million rows.
+        # Rows of the current transaction are sampled too.
+        cursor.execute(f"ANALYZE {table}")
+
+    @staticmethod
+    def _copy_value(value):
+        """Render one value in COPY text format"""
+        if value is None:
+            return '\\N'
+        return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+
+    def bulk_insert(self, cursor, table, columns, rows):
+        buffer = io.StringIO()
+        count = 0
+        for row in rows:
+            buffer.write('\t'.join(self._copy_value(v) for v in row))
+            buffer.write('\n')
+            count += 1
+        if count:
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+        return count
+
+    def bulk_insert_frame(self, cursor, table, frame):
+        # pandas writes the COPY CSV in C - no Python call per value
+        if not len(frame):
+            return 0
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return len(frame)
+
+    def bulk_insert_returning(self, cursor, table, columns, rows, returning):
+        from psycopg2.extras import execute_values
+
+        rows = list(rows)
+        if not rows:
+            return []
+        return execute_values(cursor, f'''
+            INSERT INTO {table} ({', '.join(columns)}) VALUES %s
+            RETURNING {', '.join(returning)}
+        ''', rows, page_size=len(rows), fetch=True)
+
+    def column_types(self, cursor, table):
+        """{column: SQL type} of a table (looked up once per table)"""
+        types = self._column_types.get(table)
+        if types is None:
+            cursor.execute('''
+                SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+            ''', (table,))
+            types = self._column_types[table] = dict(cursor.fetchall())
+        return types
+
+    def bulk_update(self, cursor, table, key_column, columns, rows, extra_set=None, company_id=None):
+        from psycopg2.extras import execute_values
+
+        rows = list(rows)
+        if not rows:
+            return 0
+        assignments = [f"{c} = v.{c}" for c in columns]
+        if extra_set:
+            assignments.append(extra_set)
+        # VALUES columns are typed from their literals (NULLs and date strings would be
+        # text), so cast each one to its target column's type
+        types = self.column_types(cursor, table)
+        template = '(' + ', '.join(f"%s::{types[c]}" for c in [key_column] + list(columns)) + ')'
+        scope = f" AND t.company_id = {int(company_id)}" if company_id is not None else ''
+        execute_values(cursor, f'''
+            UPDATE {table} AS t
+            SET {', '.join(assignments)}
+            FROM (VALUES %s) AS v({key_column}, {', '.join(columns)})
+            WHERE t.{key_column} = v.{key_column}{scope}
+        ''', rows, template=template, page_size=1000)
+        return len(rows)
+
+    def server_version(self, cursor):
+        cursor.execute('SHOW server_version')
+        return f"PostgreSQL {cursor.fetchone()[0]}"
+
+    def data_version_triggers(self, tables, notify_channel=None):
+        # Statement-level triggers with transition tables: one version bump (and one
+        # notification) per company per statement, so a COPY of a million ledgers
+        # costs one upsert. Notifications reach listeners when the transaction commits.
+        notify = 'NULL;'
+        if notify_channel:
+            notify = f'''PERFORM pg_notify('{notify_channel}', json_build_object(
+                        'company_id', bumped.company_id, 'table', TG_TABLE_NAME,
+                        'operation', TG_OP, 'version', bumped.version)::text);'''
+        statements = [f'''
+            CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+            DECLARE
+                bumped RECORD;
+            BEGIN
+                FOR bumped IN
+                    INSERT INTO data_versions (company_id, version)
+                    SELECT DISTINCT company_id, 1 FROM changed_rows
+                    ON CONFLICT (company_id) DO UPDATE SET version = data_versions.version + 1
+                    RETURNING company_id, version
+                LOOP
+                    {notify}
+                END LOOP;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''']
+        for table in tables:
+            for event, transition in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+                name = f"{table}_data_version_{event.lower()}"
+                statements.append(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+                statements.append(f'''
+                    CREATE TRIGGER {name} AFTER {event} ON {table}
+                    REFERENCING {transition} TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE PROCEDURE bump_data_version()
+                ''')
+        return statements
+
+
+class SQLiteDialect(Dialect):
+    """Embedded SQLite - no network round-trips, so executemany is the bulk path"""
+
+    name = 'sqlite'
+    placeholder = '?'
+
+    # RETURNING and ON CONFLICT ... DO UPDATE need SQLite 3.35+
+    MIN_VERSION = (3, 35, 0)
+
+    def __init__(self):
+        self._cache = {}
+
+    @staticmethod
+    def _translate(match):
+        token = match.group(0)
+        upper = token.upper()
+        if token == '%s':
+            return '?'
+        if token == '%%':
+            return '%'
+        if upper == 'NOW()':
+            return 'CURRENT_TIMESTAMP'
+        if upper == 'SERIAL PRIMARY KEY':
+            return 'INTEGER PRIMARY KEY AUTOINCREMENT'
+        if token.startswith('='):
+            # No arrays - the list parameter is bound as JSON (see db_connection)
+            return 'IN (SELECT value FROM json_each(?))'
+        return token.replace('%s', '?').replace('%%', '%')  # string literal
+
+    def adapt(self, sql):
+        adapted = self._cache.get(sql)
+        if adapted is None:
+            adapted = _TOKEN_RE.sub(self._translate, sql)
+            if len(self._cache) < 2048:
+                self._cache[sql] = adapted
+        return adapted
+
+    def bulk_insert(self, cursor, table, columns, rows):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({self.placeholders(len(columns))})"
+        rows = rows if isinstance(rows, list) else list(rows)
+        cursor.executemany(sql, rows)
+        return len(rows)
+
+    def bulk_insert_returning(self, cursor, table, columns, rows, returning):
+        # SQLite does not guarantee RETURNING order for multi-row inserts;
+        # one statement per row costs nothing without a network hop
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({self.placeholders(len(columns))}) "
+               f"RETURNING {', '.join(returning)}")
+        results = []
+        for row in rows:
+            cursor.execute(sql, row)
+            results.append(cursor.fetchone())
+        return results
+
+    def bulk_update(self, cursor, table, key_column, columns, rows, extra_set=None, company_id=None):
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return 0
+        assignments = [f"{c} = ?" for c in columns]
+        if extra_set:
+            assignments.append(self.adapt(extra_set))
+        sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE {key_column} = ?"
+        params = [tuple(row[1:]) + (row[0],) for row in rows]
+        if company_id is not None:
+            sql += " AND company_id = ?"
+            params = [row + (company_id,) for row in params]
+        cursor.executemany(sql, params)
+        return len(params)
+
+    def server_version(self, cursor):
+        cursor.execute('SELECT sqlite_version()')
+        return f"SQLite {cursor.fetchone()[0]}"
+
+    def data_version_triggers(self, tables, notify_channel=None):
+        # SQLite only has row-level triggers; the upsert stays in-process.
+        # Embedded means single-user, so there is no one to notify.
+        statements = []
+        for table in tables:
+            for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+                statements.append(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_data_version_{event.lower()} AFTER {event} ON {table}
+                    BEGIN
+                        INSERT INTO data_versions (company_id, version) VALUES ({row}.company_id, 1)
+                        ON CONFLICT (company_id) DO UPDATE SET version = version + 1;
+                    END
+                ''')
+        return statements
+
+
+DIALECTS = {
+    PostgresDialect.name: PostgresDialect,
+    SQLiteDialect.name: SQLiteDialect,
+}
+
+
+def get_dialect_class(name):
+    """Dialect class for a backend name"""
+    try:
+        return DIALECTS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown database backend '{name}' (expected one of: {', '.join(DIALECTS)})")
+
+
+def check_sqlite_version():
+    """Raise if the bundled SQLite library is too old for the application SQL"""
+    if sqlite3.sqlite_version_info < SQLiteDialect.MIN_VERSION:
+        required = '.'.join(map(str, SQLiteDialect.MIN_VERSION))
+        raise RuntimeError(f"SQLite {required}+ is required (found {sqlite3.sqlite_version})")
@@ -0,0 +1,251 @@
+"""
+SQL instrumentation - times every statement executed through the connection pool
+and aggregates query counts / DB time (and reference cache hits) per UI action
+"""
+
+import hashlib
+import threading
+import time
+from collections import namedtuple, deque
+from contextlib import contextmanager
+from datetime import datetime
+from psycopg2.extensions import cursor as _base_cursor
+from config.settings import SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_FILE
+
+# One executed statement
+QueryRecord = namedtuple('QueryRecord', ['statement', 'params_fingerprint', 'rowcount', 'duration_ms', 'action'])
+
+# Slow query threshold in milliseconds (changeable at runtime)
+_slow_threshold_ms = SLOW_QUERY_THRESHOLD_MS
+
+# Keep the last N actions for the debug view
+MAX_ACTION_HISTORY = 50
+# Per action, keep at most N statements (counts and totals are always exact)
+MAX_QUERIES_PER_ACTION = 500
+
+_local = threading.local()
+_lock = threading.Lock()
+_trace_lock = threading.Lock()
+_action_history = deque(maxlen=MAX_ACTION_HISTORY)
+_action_listeners = []
+
+
+class ActionTrace:
+    """Queries executed while a UI action was running"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now()
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.wall_time_ms = 0.0
+        self.slow_query_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.queries = []
+
+    def add(self, record):
+        """Add a statement to this action (worker threads may add concurrently)"""
+        with _trace_lock:
+            self.query_count += 1
+            self.db_time_ms += record.duration_ms
+            if record.duration_ms >= _slow_threshold_ms:
+                self.slow_query_count += 1
+            if len(self.queries) < MAX_QUERIES_PER_ACTION:
+                self.queries.append(record)
+
+    def add_cache_lookup(self, hit):
+        """Count a reference cache lookup made during this action"""
+        with _trace_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def slowest(self, limit=5):
+        """Return the slowest recorded statements"""
+        return sorted(self.queries, key=lambda q: q.duration_ms, reverse=True)[:limit]
+
+    def summary(self):
+        """One-line summary for the status bar"""
+        summary = f"{self.name}: {self.query_count} queries, {self.db_time_ms:,.0f} ms DB / {self.wall_time_ms:,.0f} ms total"
+        if self.cache_hits:
+            summary += f", {self.cache_hits} cache hits"
+        return summary
+
+    def to_dict(self):
+        """Serializable form (used by the benchmark suite)"""
+        return {
+            'name': self.name,
+            'started_at': self.started_at.isoformat(),
+            'query_count': self.query_count,
+            'db_time_ms': round(self.db_time_ms, 3),
+            'wall_time_ms': round(self.wall_time_ms, 3),
+            'slow_query_count': self.slow_query_count,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
+
+
+def fingerprint_params(params):
+    """Short hash of the parameters so identical calls can be grouped without logging values"""
+    if params is None:
+        return None
+    return hashlib.sha1(repr(params).encode('utf-8', 'replace')).hexdigest()[:12]
+
+
+def set_slow_query_threshold(threshold_ms):
+    """Change the slow query threshold at runtime"""
+    global _slow_threshold_ms
+    _slow_threshold_ms = float(threshold_ms)
+
+
+def _action_stack():
+    if not hasattr(_local, 'actions'):
+        _local.actions = []
+    return _local.actions
+
+
+def current_action():
+    """Innermost action running on this thread, or None"""
+    stack = _action_stack()
+    return stack[-1] if stack else None
+
+
+def record_query(statement, params, rowcount, duration_ms):
+    """Record one executed statement against the running action and log it if slow"""
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+    statement = ' '.join(str(statement).split())
+
+    action = current_action()
+    record = QueryRecord(statement, fingerprint_params(params), rowcount, duration_ms,
+                         action.name if action else None)
+    if action:
+        action.add(record)
+
+    if duration_ms >= _slow_threshold_ms:
+        _log_slow_query(record)
+
+
+def record_cache_lookup(hit):
+    """Count a reference cache lookup against the running action (see config.reference_cache)"""
+    action = current_action()
+    if action:
+        action.add_cache_lookup(hit)
+
+
+def _log_slow_query(record):
+    """Print and optionally append a slow statement to the slow query log"""
+    message = (f"⚠️ Slow query ({record.duration_ms:,.1f} ms, {record.rowcount} rows"
+               f"{', action: ' + record.action if record.action else ''}): {record.statement[:300]}")
+    print(message)
+    if SLOW_QUERY_LOG_FILE:
+        try:
+            with _lock, open(SLOW_QUERY_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(f"{datetime.now().isoformat()}\t{record.duration_ms:.1f}\t{record.rowcount}\t"
+                        f"{record.params_fingerprint}\t{record.action or ''}\t{record.statement}\n")
+        except Exception as e:
+            print(f"❌ Failed to write slow query log: {e}")
+
+
+@contextmanager
+def track_action(name):
+    """
+    Aggregate all statements executed inside the block under a UI action name
+
+    Usage:
+        with track_action("Generate Statements"):
+            ...
+    """
+    trace = ActionTrace(name)
+    stack = _action_stack()
+    stack.append(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.wall_time_ms = (time.perf_counter() - started) * 1000
+        stack.pop()
+        # Nested actions are folded into their parent; only top-level ones are published
+        if stack:
+            stack[-1].query_count += trace.query_count
+            stack[-1].db_time_ms += trace.db_time_ms
+            stack[-1].slow_query_count += trace.slow_query_count
+            stack[-1].cache_hits += trace.cache_hits
+            stack[-1].cache_misses += trace.cache_misses
+        else:
+            with _lock:
+                _action_history.append(trace)
+            for listener in list(_action_listeners):
+                try:
+                    listener(trace)
+                except Exception as e:
+                    print(f"Action listener failed: {e}")
+
+
+@contextmanager
+def joined_action(trace):
+    """
+    Attribute statements executed on this thread to an action running on another
+    thread (used by worker pools). Nothing is published when the block ends.
+    """
+    if trace is None:
+        yield None
+        return
+    stack = _action_stack()
+    stack.append(trace)
+    try:
+        yield trace
+    finally:
+        stack.pop()
+
+
+def add_action_listener(callback):
+    """Register callback(trace) called when a top-level action finishes"""
+    _action_listeners.append(callback)
+
+
+def remove_action_listener(callback):
+    """Unregister an action listener"""
+    if callback in _action_listeners:
+        _action_listeners.remove(callback)
+
+
+def get_action_history():
+    """Most recent finished actions, newest last"""
+    with _lock:
+        return list(_action_history)
+
+
+def get_last_action():
+    """Most recently finished action, or None"""
+    with _lock:
+        return _action_history[-1] if _action_history else None
+
+
+class InstrumentedCursor(_base_cursor):
+    """psycopg2 cursor that times execute/executemany and records them"""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            record_query(query, vars, self.rowcount, (time.perf_counter() - started) * 1000)
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            record_query(query, f"{len(vars_list)} param sets", self.rowcount,
+                         (time.perf_counter() - started) * 1000)
+
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            record_query(sql, None, self.rowcount, (time.perf_counter() - started) * 1000)
@@ -0,0 +1,260 @@
+"""
+Long-running jobs - structured progress and cooperative cancellation
+
+A job is a function called with a JobContext first. It names what it is doing
+with context.stage() and counts work with context.advance() / context.update()
+or the progress callbacks from context.callback(), which the model functions
+accept as `progress=`. Each of those checks the job's CancelToken, so a
+cancelled job stops at the next step of its loop instead of running to the end.
+
+run_job() runs a job in its own database session (see db_connection.db_session);
+views/job_queue.py runs them on a QThreadPool and shows the queue. CPU-bound
+steps inside a job can fan out to worker processes with map_in_processes().
+"""
+
+import multiprocessing
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config.db_connection import db_session
+from config.instrumentation import track_action
+
+# Progress is reported at most this often (seconds) - loops may advance per row
+REPORT_INTERVAL = 0.1
+
+
+class JobCancelled(Exception):
+    """Raised inside a job at the first check after it was cancelled"""
+
+    def __init__(self, message="Cancelled"):
+        super().__init__(message)
+
+
+class CancelToken:
+    """Cancellation flag shared by a job and whoever may cancel it"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; callbacks registered with on_cancel() run on this thread"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️ Cancel callback failed: {e}")
+
+    def check(self):
+        """Raise JobCancelled if the job was cancelled"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def on_cancel(self, callback):
+        """
+        Call callback() when the job is cancelled (now, if it already was)
+
+        Returns:
+            function: removes the callback again
+        """
+        with self._lock:
+            already = self._event.is_set()
+            if not already:
+                self._callbacks.append(callback)
+        if already:
+            callback()
+
+        def remove():
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+        return remove
+
+
+class JobProgress(namedtuple('JobProgress', ['stage', 'done', 'total', 'unit', 'rate', 'elapsed'])):
+    """Where a job is: items done of total (None if unknown) in the current stage, items/second"""
+
+    __slots__ = ()
+
+    @property
+    def percent(self):
+        """0-100, or None while the stage total is unknown"""
+        if not self.total:
+            return None
+        return min(100, int(self.done * 100 / self.total))
+
+    def summary(self):
+        if self.total:
+            text = f"{self.stage}: {self.done:,} / {self.total:,} {self.unit}"
+        elif self.done:
+            text = f"{self.stage}: {self.done:,} {self.unit}"
+        else:
+            text = self.stage
+        if self.done and self.rate:
+            text += f" ({self.rate:,.0f} {self.unit}/s)"
+        return text
+
+
+class JobContext:
+    """Progress and cancellation of one running job, passed to the job function"""
+
+    def __init__(self, token=None, report=None, interval=REPORT_INTERVAL):
+        """
+        Args:
+            token: CancelToken (default: a new one)
+            report: Optional callback(JobProgress), called at most every `interval` seconds
+                and whenever a stage starts
+        """
+        self.token = token or CancelToken()
+        self.report = report
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.stage_name = "Starting"
+        self.stage_started = self.started
+        self.unit = 'rows'
+        self.done = 0
+        self.total = None
+        self._reported = 0.0
+        self._unreported = False  # An update was held back by the interval
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def check(self):
+        """Raise JobCancelled if the job was cancelled - call inside long loops"""
+        self.token.check()
+
+    @property
+    def progress(self):
+        now = time.perf_counter()
+        stage_time = now - self.stage_started
+        rate = self.done / stage_time if stage_time > 0 else 0.0
+        return JobProgress(self.stage_name, self.done, self.total, self.unit, rate, now - self.started)
+
+    def stage(self, name, total=None, unit='rows'):
+        """Start the next stage of the job (the rate is measured per stage)"""
+        self.check()
+        if self._unreported:
+            self._send(force=True)  # Where the previous stage ended
+        self.stage_name = name
+        self.stage_started = time.perf_counter()
+        self.unit = unit
+        self.done = 0
+        self.total = total
+        self._send(force=True)
+
+    def update(self, done, total=None):
+        """Set the items done in this stage (and the total, once known)"""
+        self.check()
+        self.done = done
+        if total is not None:
+            self.total = total
+        self._send()
+
+    def advance(self, count=1):
+        """Count `count` more items done in this stage"""
+        self.update(self.done + count)
+
+    def callback(self, total=None):
+        """
+        Progress callback for model functions - progress(done) or progress(done, total);
+        raises JobCancelled inside the caller's loop once the job is cancelled
+        """
+        if total is not None:
+            self.total = total
+
+        def progress(done, stage_total=None):
+            self.update(done, stage_total)
+        return progress
+
+    def finish(self):
+        """Report the final position (the last update may have been held back)"""
+        self._send(force=True)
+
+    def _send(self, force=False):
+        if self.report is None:
+            return
+        now = time.perf_counter()
+        if force or now - self._reported >= self.interval:
+            self._reported = now
+            self._unreported = False
+            self.report(self.progress)
+        else:
+            self._unreported = True
+
+
+def run_job(func, args=(), kwargs=None, token=None, report=None, action=None):
+    """
+    Run func(context, *args, **kwargs) in its own database session on this thread
+
+    Args:
+        token: CancelToken - cancelling it also aborts the running statement
+        report: Optional callback(JobProgress)
+        action: Name the job's statements are traced under (config.instrumentation)
+
+    Returns:
+        What func returns
+
+    Raises:
+        JobCancelled: The token was cancelled (including statements it interrupted)
+    """
+    context = JobContext(token, report)
+    try:
+        with db_session(context.token):
+            if action:
+                with track_action(action):
+                    result = func(context, *args, **(kwargs or {}))
+            else:
+                result = func(context, *args, **(kwargs or {}))
+    except JobCancelled:
+        raise
+    except Exception as e:
+        if context.cancelled:
+            raise JobCancelled() from e  # The interrupted statement's error
+        raise
+    context.finish()
+    return result
+
+
+def map_in_processes(func, jobs, max_workers, progress=None):
+    """
+    Run func(*job) for each job tuple in worker processes
+
+    Processes are spawned, not forked - the caller is usually a Qt worker thread.
+    If progress raises (JobCancelled from JobContext.callback()) or a call fails,
+    jobs not yet started are dropped; those running finish in the background.
+
+    Args:
+        func: Picklable module-level function
+        progress: Optional callback(jobs finished), called as each one finishes
+
+    Returns:
+        list: Results in job order
+    """
+    jobs = list(jobs)
+    results = {}
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = {pool.submit(func, *job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(len(results))
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return [results[index] for index in range(len(jobs))]
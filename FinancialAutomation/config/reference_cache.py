@@ -0,0 +1,179 @@
+"""
+Reference data cache - in-process read-through cache for rarely changing data
+(company info, licenses, master data hierarchy)
+
+Entries expire after a TTL and the least recently used ones are evicted when a
+cache is full. The model write methods invalidate their cache after committing;
+the TTL bounds how long another client's writes can stay unseen when change
+notifications are not available.
+"""
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import REFERENCE_CACHE_ENABLED, REFERENCE_CACHE_TTL_SECONDS, REFERENCE_CACHE_MAX_ENTRIES
+from config.instrumentation import record_cache_lookup
+
+_caches = {}
+
+
+def _detach(value):
+    """Copy of a cached value the caller can modify without changing the cache"""
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    if value is None or isinstance(value, (tuple, str, int, float, bool)):
+        return value
+    return copy.copy(value)  # Model objects only hold scalars
+
+
+class ReferenceCache:
+    """Thread-safe LRU cache whose entries expire after ttl_seconds"""
+
+    def __init__(self, name, max_entries=REFERENCE_CACHE_MAX_ENTRIES, ttl_seconds=REFERENCE_CACHE_TTL_SECONDS):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = REFERENCE_CACHE_ENABLED
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by invalidate() so loads that raced it are not stored
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, loader):
+        """
+        Cached value for key, calling loader() on a miss
+
+        None results are not cached (a record created later must not be hidden).
+        """
+        if not self.enabled:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    value = entry[1]
+                else:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+            generation = self._generation
+
+        record_cache_lookup(entry is not None)
+        if entry is not None:
+            return _detach(value)
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (time.monotonic() + self.ttl_seconds, _detach(value))
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return value
+
+    def invalidate(self):
+        """Drop every entry (called after writes to the underlying tables)"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def reset_stats(self):
+        """Zero the counters (entries are kept)"""
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+
+def get_cache(name):
+    """Named cache, created on first use"""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches.setdefault(name, ReferenceCache(name))
+    return cache
+
+
+def cached(name):
+    """
+    Make a model read method read-through on the named cache (keyed by its arguments)
+
+    Usage:
+        @staticmethod
+        @cached('company_info')
+        def get_by_id(company_id):
+            ...
+    """
+    def decorator(func):
+        cache = get_cache(name)
+        qualname = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (qualname, args, tuple(sorted(kwargs.items())))
+            return cache.get_or_load(key, lambda: func(*args, **kwargs))
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+COMPANY_CACHE = get_cache('company_info')
+LICENSE_CACHE = get_cache('licenses')
+MASTER_DATA_CACHE = get_cache('master_data')
+
+# Caches holding rows of each table (for change notifications and bulk writers)
+TABLE_CACHES = {
+    'company_info': (COMPANY_CACHE,),
+    'licenses': (LICENSE_CACHE,),
+    'major_heads': (MASTER_DATA_CACHE,),
+    'minor_heads': (MASTER_DATA_CACHE,),
+    'groupings': (MASTER_DATA_CACHE,),
+}
+
+
+def invalidate_tables(*tables):
+    """Invalidate the caches holding rows of the given tables"""
+    for cache in {cache for table in tables for cache in TABLE_CACHES.get(table, ())}:
+        cache.invalidate()
+
+
+def invalidate_all():
+    """Invalidate every reference cache"""
+    for cache in list(_caches.values()):
+        cache.invalidate()
+
+
+def get_cache_stats():
+    """{name: stats} for every reference cache"""
+    return {name: cache.stats() for name, cache in list(_caches.items())}
@@ -1,8 +1,9 @@
 """
-Application settings and configuration - PostgreSQL only
+Application settings and configuration
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -13,7 +14,10 @@ APP_NAME = "Financial Automation"
 APP_VERSION = "1.0.0"
 ORGANIZATION = "SMBC"
 
-# PostgreSQL Configuration (ONLY database type supported)
+# Database backend: 'postgresql' (server, multi-user) or 'sqlite' (embedded, single-user)
+DB_BACKEND = os.getenv('DB_BACKEND', 'postgresql').lower()
+
+# PostgreSQL Configuration
 POSTGRES_CONFIG = {
     'host': os.getenv('POSTGRES_HOST', 'localhost'),
     'port': int(os.getenv('POSTGRES_PORT', 5432)),
@@ -26,6 +30,31 @@ POSTGRES_CONFIG = {
 POOL_MIN_CONN = int(os.getenv('POSTGRES_MIN_CONN', 2))
 POOL_MAX_CONN = int(os.getenv('POSTGRES_MAX_CONN', 10))
 
+# Embedded SQLite Configuration (database file lives in the user's app data folder)
+if sys.platform == 'win32':
+    APP_DATA_DIR = os.path.join(os.getenv('APPDATA', os.path.expanduser('~')), 'FinancialAutomation')
+else:
+    APP_DATA_DIR = os.path.join(os.path.expanduser('~'), '.financialautomation')
+SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join(APP_DATA_DIR, 'financial_automation.db'))
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 65536))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 268435456))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+# Rows fetched per round-trip by streaming reads (server-side cursors)
+STREAM_ITERSIZE = int(os.getenv('STREAM_ITERSIZE', 2000))
+
+# Background jobs (imports, generation, exports) run at once - each holds its own database connection
+JOB_THREADS = int(os.getenv('JOB_THREADS', 2))
+
+# Multi-user change notifications (PostgreSQL LISTEN/NOTIFY) - clients refresh what other users changed
+CHANGE_NOTIFY_CHANNEL = os.getenv('CHANGE_NOTIFY_CHANNEL', 'data_changes')
+CHANGE_LISTENER_ENABLED = os.getenv('CHANGE_LISTENER', '1') == '1'
+
+# Reference data cache (company info, licenses, master data) - entries expire after the TTL
+REFERENCE_CACHE_ENABLED = os.getenv('REFERENCE_CACHE', '1') == '1'
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv('REFERENCE_CACHE_TTL_SECONDS', 300))
+REFERENCE_CACHE_MAX_ENTRIES = int(os.getenv('REFERENCE_CACHE_MAX_ENTRIES', 512))
+
 # Default Font Settings
 DEFAULT_FONT = "Bookman Old Style"
 DEFAULT_FONT_SIZE = 11
@@ -41,3 +70,13 @@ DEFAULT_DECIMAL_PLACES = 2
 # UI Settings
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 900
+
+# SQL Instrumentation Settings
+SQL_INSTRUMENTATION_ENABLED = os.getenv('SQL_INSTRUMENTATION', '1') == '1'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE', '')
+
+# License Settings
+LICENSE_TYPE_TRIAL = "Trial"
+LICENSE_TYPE_FULL = "Full"
+TRIAL_PERIOD_DAYS = 30
@@ -170,9 +170,10 @@ def demo_trial_balance_upload_and_selection():
     
     # Show sample entries
     print(f"\nSample Trial Balance Entries:")
+    sample_heads = MajorHead.get_many(entry.major_head_id for entry in tb_entries[:5])
     for i, entry in enumerate(tb_entries[:5], 1):
-        major_head = MajorHead.get_by_id(entry.major_head_id) if entry.major_head_id else None
-        major_head_desc = major_head.description if major_head else "Unmapped"
+        major_head = sample_heads.get(entry.major_head_id)
+        major_head_desc = major_head[3] if major_head else "Unmapped"  # description
         print(f"   {i}. {entry.ledger_name[:40]:<40} → {major_head_desc}")
     
     # Step 5: Initialize Selection Sheet
@@ -8,6 +8,7 @@ Description: Desktop application for automated drafting of Financial Statements
 
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QFont
 from views.login_window import LoginWindow
@@ -59,4 +60,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # Trial balance files are parsed in worker processes - needed in the frozen build
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,273 @@
+"""
+Adjustments Model
+Audit adjustment journals layered over imported trial balances. Entries are
+posted against trial balance rows in named batches; the statements read the
+base trial balance plus the net of every applied entry (see
+TrialBalance.get_frame(adjusted=True)), so applying or withdrawing a batch is a
+status change - the imported rows are never rewritten. A previous year entry on
+a balance sheet ledger restates the CY opening as well, so the restated PY
+closing still carries forward.
+"""
+
+from datetime import datetime
+from config.database import get_connection
+from config.db_connection import get_dialect
+
+
+class Adjustment:
+    """Model for adjustment journal entries against trial balance rows"""
+
+    PROPOSED = 'proposed'  # Entered, not in the statements
+    APPLIED = 'applied'    # Included in the adjusted trial balance
+    REJECTED = 'rejected'  # Kept for the audit trail only
+    STATUSES = (PROPOSED, APPLIED, REJECTED)
+
+    PERIODS = ('CY', 'PY')
+
+    # Column order used by bulk_create
+    INSERT_COLUMNS = ['company_id', 'tb_id', 'batch_name', 'period', 'debit', 'credit',
+                      'narration', 'status', 'created_at', 'updated_at']
+
+    # Net applied debits and credits per trial balance row, for one company (%s).
+    # Served by idx_adjustments_status (company_id, status, tb_id).
+    TOTALS_SQL = f'''
+        SELECT tb_id,
+               SUM(CASE WHEN period = 'CY' THEN debit ELSE 0 END) AS debit_cy,
+               SUM(CASE WHEN period = 'CY' THEN credit ELSE 0 END) AS credit_cy,
+               SUM(CASE WHEN period = 'PY' THEN debit ELSE 0 END) AS debit_py,
+               SUM(CASE WHEN period = 'PY' THEN credit ELSE 0 END) AS credit_py
+        FROM adjustments
+        WHERE company_id = %s AND status = '{APPLIED}'
+        GROUP BY tb_id
+    '''
+
+    # A PY entry on a balance sheet ledger restates its PY closing, which is also the CY opening
+    _PY_CARRIED = "CASE WHEN tb.type_bs_pl = 'BS' THEN COALESCE(adj.debit_py, 0) - COALESCE(adj.credit_py, 0) ELSE 0 END"
+
+    # Adjusted value of each affected trial balance column, with TOTALS_SQL joined as "adj"
+    OVERLAY = {
+        'opening_balance_cy': f'tb.opening_balance_cy + {_PY_CARRIED}',
+        'debit_cy': 'tb.debit_cy + COALESCE(adj.debit_cy, 0)',
+        'credit_cy': 'tb.credit_cy + COALESCE(adj.credit_cy, 0)',
+        'closing_balance_cy': 'tb.closing_balance_cy + COALESCE(adj.debit_cy, 0) - COALESCE(adj.credit_cy, 0)'
+                              f' + {_PY_CARRIED}',
+        'debit_py': 'tb.debit_py + COALESCE(adj.debit_py, 0)',
+        'credit_py': 'tb.credit_py + COALESCE(adj.credit_py, 0)',
+        'closing_balance_py': 'tb.closing_balance_py + COALESCE(adj.debit_py, 0) - COALESCE(adj.credit_py, 0)',
+    }
+
+    @staticmethod
+    def _check_status(status):
+        if status not in Adjustment.STATUSES:
+            raise ValueError(f"Unknown adjustment status: {status}")
+
+    @staticmethod
+    def _row(company_id, batch_name, entry, status, now):
+        period = str(entry.get('period') or 'CY').upper()
+        if period not in Adjustment.PERIODS:
+            raise ValueError(f"Adjustment period must be CY or PY, got {entry.get('period')!r}")
+        return (company_id, int(entry['tb_id']), batch_name, period,
+                float(entry.get('debit') or 0), float(entry.get('credit') or 0),
+                entry.get('narration'), status, now, now)
+
+    @staticmethod
+    def create(company_id, tb_id, batch_name, debit=0, credit=0, period='CY', narration=None,
+               status=PROPOSED):
+        """Create one adjustment entry, returns its adjustment_id"""
+        Adjustment._check_status(status)
+        row = Adjustment._row(company_id, batch_name, {
+            'tb_id': tb_id, 'period': period, 'debit': debit, 'credit': credit, 'narration': narration
+        }, status, datetime.now())
+
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+                INSERT INTO adjustments ({', '.join(Adjustment.INSERT_COLUMNS)})
+                VALUES ({', '.join(['%s'] * len(row))})
+                RETURNING adjustment_id
+            ''', row)
+
+            adjustment_id = cursor.fetchone()[0]
+            conn.commit()
+            return adjustment_id
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def bulk_create(company_id, batch_name, entries, status=PROPOSED):
+        """
+        Add a batch of adjustment entries in one transaction
+        entries: iterable of dicts with tb_id, debit, credit, period ('CY'/'PY') and narration
+        """
+        Adjustment._check_status(status)
+        now = datetime.now()
+        rows = [Adjustment._row(company_id, batch_name, entry, status, now) for entry in entries]
+
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            count = get_dialect().bulk_insert(cursor, 'adjustments', Adjustment.INSERT_COLUMNS, rows)
+
+            conn.commit()
+            return count
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def create_by_ledger(company_id, batch_name, entries, status=PROPOSED):
+        """
+        Add a batch whose entries name their ledger instead of a tb_id
+        entries: dicts with ledger_name, debit, credit, period and narration
+
+        Returns:
+            tuple: (entries added, sorted ledger names not in the trial balance)
+        """
+        from models.trial_balance import TrialBalance
+
+        frame = TrialBalance.get_frame(company_id, columns=['tb_id', 'ledger_name'])
+        tb_ids = dict(zip(frame['ledger_name'].tolist(), frame['tb_id'].tolist()))
+        matched, unknown = [], set()
+        for entry in entries:
+            name = str(entry.get('ledger_name') or '').strip()
+            if name in tb_ids:
+                matched.append(dict(entry, tb_id=tb_ids[name]))
+            else:
+                unknown.add(name)
+        if unknown:
+            return 0, sorted(unknown)
+        return Adjustment.bulk_create(company_id, batch_name, matched, status), []
+
+    @staticmethod
+    def set_status(company_id, batch_name, status, from_status=None):
+        """
+        Apply, withdraw or reject a batch (or only its entries in from_status)
+        Returns the number of entries changed.
+        """
+        Adjustment._check_status(status)
+        sql = 'UPDATE adjustments SET status = %s, updated_at = %s WHERE company_id = %s AND batch_name = %s'
+        params = [status, datetime.now(), company_id, batch_name]
+        if from_status:
+            sql += ' AND status = %s'
+            params.append(from_status)
+
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(sql, params)
+            count = cursor.rowcount
+
+            conn.commit()
+            return count
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def apply_batch(company_id, batch_name):
+        """Include a batch's proposed entries in the adjusted trial balance"""
+        return Adjustment.set_status(company_id, batch_name, Adjustment.APPLIED, Adjustment.PROPOSED)
+
+    @staticmethod
+    def withdraw_batch(company_id, batch_name):
+        """Take a batch's applied entries back out of the adjusted trial balance"""
+        return Adjustment.set_status(company_id, batch_name, Adjustment.PROPOSED, Adjustment.APPLIED)
+
+    @staticmethod
+    def get_batches(company_id):
+        """
+        Batches of a company with their totals
+
+        Returns:
+            list of (batch_name, status, entries, total_debit, total_credit) tuples,
+            one per batch and status
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT batch_name, status, COUNT(*), SUM(debit), SUM(credit)
+            FROM adjustments
+            WHERE company_id = %s
+            GROUP BY batch_name, status
+            ORDER BY MIN(adjustment_id), status
+        ''', (company_id,))
+
+        rows = [(name, status, count, float(debit or 0), float(credit or 0))
+                for name, status, count, debit, credit in cursor.fetchall()]
+        conn.close()
+        return rows
+
+    @staticmethod
+    def get_by_batch(company_id, batch_name):
+        """
+        Entries of one batch with their ledger names
+
+        Returns:
+            list of (adjustment_id, tb_id, ledger_name, period, debit, credit, narration, status) tuples
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT a.adjustment_id, a.tb_id, tb.ledger_name, a.period, a.debit, a.credit,
+                   a.narration, a.status
+            FROM adjustments a
+            LEFT JOIN trial_balance tb ON tb.tb_id = a.tb_id AND tb.company_id = a.company_id
+            WHERE a.company_id = %s AND a.batch_name = %s
+            ORDER BY a.adjustment_id
+        ''', (company_id, batch_name))
+
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+    @staticmethod
+    def delete_batch(company_id, batch_name):
+        """Delete every entry of a batch"""
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM adjustments WHERE company_id = %s AND batch_name = %s',
+                           (company_id, batch_name))
+            count = cursor.rowcount
+
+            conn.commit()
+            return count
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
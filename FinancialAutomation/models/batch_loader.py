@@ -0,0 +1,65 @@
+"""
+Batch Loader - coalesces the get_by_id lookups of one operation into one
+get_many query (WHERE id = ANY(%s)) per model, memoized for the operation
+"""
+
+from typing import Any, Dict, Iterable, List
+
+
+class BatchLoader:
+    """
+    Per-operation lookup cache for models with a get_many(ids) -> {id: record} method
+    (MajorHead, MinorHead, Grouping, PPE, CWIP, Investment)
+
+    Usage:
+        loader = BatchLoader()
+        loader.prime(MajorHead, [row.major_head_id for row in rows])  # queue ids
+        for row in rows:
+            major = loader.load(MajorHead, row.major_head_id)  # first load fetches all queued ids
+
+    Create one loader per operation - results are not refreshed after writes.
+    """
+
+    def __init__(self):
+        self._cache = {}    # model -> {id: record or None}
+        self._pending = {}  # model -> ids queued for the next query
+        self.query_count = 0
+
+    def prime(self, model, ids: Iterable):
+        """Queue ids to be fetched together with the next load of this model"""
+        cache = self._cache.setdefault(model, {})
+        pending = self._pending.setdefault(model, set())
+        for record_id in ids:
+            if record_id is not None:
+                record_id = int(record_id)
+                if record_id not in cache:
+                    pending.add(record_id)
+
+    def load(self, model, record_id) -> Any:
+        """Record with this id (same shape as model.get_by_id), None if missing"""
+        if record_id is None:
+            return None
+        record_id = int(record_id)
+        cache = self._cache.setdefault(model, {})
+        if record_id not in cache:
+            self.prime(model, [record_id])
+            self._flush(model)
+        return cache[record_id]
+
+    def load_many(self, model, ids: Iterable) -> List[Any]:
+        """Records for the ids, in order (None for missing ids)"""
+        ids = list(ids)
+        self.prime(model, ids)
+        self._flush(model)
+        cache = self._cache[model]
+        return [cache[int(record_id)] if record_id is not None else None for record_id in ids]
+
+    def _flush(self, model):
+        pending = self._pending.pop(model, None)
+        if not pending:
+            return
+        found: Dict[int, Any] = model.get_many(pending)
+        self.query_count += 1
+        cache = self._cache[model]
+        for record_id in pending:
+            cache[record_id] = found.get(record_id)  # Misses are memoized too
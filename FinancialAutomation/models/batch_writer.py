@@ -0,0 +1,60 @@
+"""
+Batch Writer - saves the new, edited and deleted rows of an input form in one
+transaction (one statement per kind of change instead of one commit per row)
+"""
+
+from typing import Iterable, List, Optional, Sequence
+
+from config.database import get_connection
+from config.db_connection import get_dialect
+
+
+def save_batch(table: str, key_column: str, company_id: int, columns: Sequence[str],
+               inserts: Iterable[Sequence] = (), updates: Iterable[Sequence] = (),
+               deletes: Iterable[int] = (), extra_set: Optional[str] = None) -> List[int]:
+    """
+    Apply a form's pending changes to a company's rows atomically
+
+    Args:
+        table: Schedule table (must have a company_id column)
+        key_column: Primary key column
+        company_id: Owner of the rows
+        columns: Columns written for inserted and updated rows
+        inserts: Value tuples in `columns` order
+        updates: (key, *values in `columns` order) tuples (only rows of this company are updated)
+        deletes: Keys to delete (only rows of this company are deleted)
+        extra_set: Optional SQL assignments for updated rows (e.g. "updated_at = NOW()")
+
+    Returns:
+        list: Keys assigned to the inserted rows, in insert order
+    """
+    inserts, updates, deletes = list(inserts), list(updates), [int(key) for key in deletes]
+    if not (inserts or updates or deletes):
+        return []
+
+    dialect = get_dialect()
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        if deletes:
+            cursor.execute(f'DELETE FROM {table} WHERE company_id = %s AND {key_column} = ANY(%s)',
+                           (company_id, deletes))
+        if updates:
+            dialect.bulk_update(cursor, table, key_column, list(columns), updates, extra_set=extra_set,
+                                company_id=company_id)
+        new_keys = []
+        if inserts:
+            rows = dialect.bulk_insert_returning(
+                cursor, table, ['company_id'] + list(columns),
+                [(company_id,) + tuple(values) for values in inserts], [key_column])
+            new_keys = [row[0] for row in rows]
+        conn.commit()
+        return new_keys
+
+    except Exception as e:
+        conn.rollback()
+        raise e
+
+    finally:
+        conn.close()
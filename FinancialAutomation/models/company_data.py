@@ -0,0 +1,73 @@
+"""
+Company Data - everything the tabs show for a company, loaded concurrently
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from config.async_db import gather_datasets
+from models.company_info import CompanyInfo
+from models.trial_balance import TrialBalance
+from models.master_data import MajorHead, MinorHead, Grouping
+from models.ppe import PPE
+from models.cwip import CWIP
+from models.investments import Investment
+from models.inventories import Inventory
+from models.selection_sheet import SelectionSheet
+
+# Columns shown in the Trial Balance tab
+TB_TABLE_COLUMNS = ['ledger_name', 'debit_cy', 'credit_cy', 'closing_balance_cy',
+                    'debit_py', 'credit_py', 'closing_balance_py', 'type_bs_pl', 'is_mapped', 'tb_id']
+
+
+def _load_selection_sheet(company_id):
+    SelectionSheet.initialize_default_notes(company_id)
+    return SelectionSheet.get_all_for_company(company_id)
+
+
+# Independent datasets: name -> loader(company_id)
+COMPANY_DATASETS = {
+    'company': CompanyInfo.get_by_id,
+    'tb_stats': TrialBalance.get_summary_stats,
+    'tb_frame': lambda company_id: TrialBalance.get_frame(company_id, columns=TB_TABLE_COLUMNS),
+    'major_heads': MajorHead.get_all_by_company,
+    'minor_heads': lambda company_id: MinorHead.get_all(company_id=company_id),
+    'groupings': lambda company_id: Grouping.get_all(company_id=company_id),
+    'ppe': PPE.get_all_by_company,
+    'cwip': CWIP.get_all_by_company,
+    'investments': Investment.get_all_by_company,
+    'inventories': Inventory.get_all_by_company,
+    'selection_sheet': _load_selection_sheet,
+}
+
+
+# Datasets to reload when a table changes (see config.change_listener)
+CHANGE_DATASETS = {
+    'company_info': ('company',),
+    'trial_balance': ('tb_frame', 'tb_stats'),
+    'major_heads': ('major_heads', 'minor_heads', 'groupings'),
+    'minor_heads': ('minor_heads', 'groupings'),
+    'groupings': ('groupings',),
+    'ppe_schedule': ('ppe',),
+    'cwip_schedule': ('cwip',),
+    'investments': ('investments',),
+    'inventories': ('inventories',),
+}
+
+
+def prefetch_company(company_id: int, on_result: Optional[Callable[[str, Any, Optional[Exception]], None]] = None,
+                     datasets: Optional[Iterable[str]] = None) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Load the datasets of a company concurrently (blocks until all have finished)
+
+    Args:
+        company_id: Company to load
+        on_result: Called as on_result(name, value, error) as each dataset arrives
+        datasets: Names to load (default: all of COMPANY_DATASETS)
+
+    Returns:
+        tuple: ({name: value}, {name: exception} for the datasets that failed)
+    """
+    names = list(datasets) if datasets is not None else list(COMPANY_DATASETS)
+    loaders = {name: (lambda loader=COMPANY_DATASETS[name]: loader(company_id)) for name in names}
+    return asyncio.run(gather_datasets(loaders, on_result))
@@ -1,6 +1,7 @@
 """Company Information Model - CRUD operations for company details and preferences"""
 
-from config.database import get_connection
+from config.database import get_connection, create_company_partitions, clear_company_partitions
+from config.reference_cache import cached, COMPANY_CACHE, invalidate_tables
 from datetime import datetime
 
 class CompanyInfo:
@@ -31,6 +32,7 @@ class CompanyInfo:
         self.rounding_level = rounding_level
     
     @staticmethod
+    @cached('company_info')
     def get_by_user_id(user_id):
         """Get company info for a specific user"""
         conn = get_connection()
@@ -73,6 +75,7 @@ class CompanyInfo:
         return None
     
     @staticmethod
+    @cached('company_info')
     def get_by_id(company_id):
         """Get company info by company ID"""
         conn = get_connection()
@@ -113,6 +116,7 @@ class CompanyInfo:
         return None
     
     @staticmethod
+    @cached('company_info')
     def get_all_by_user(user_id):
         """Get all companies for a specific user"""
         conn = get_connection()
@@ -186,14 +190,17 @@ class CompanyInfo:
                     default_font_size, show_zeros_as_blank, decimal_places, turnover, 
                     rounding_level, created_at, updated_at
                 ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING company_id
             ''', (user_id, entity_name, address, cin_no, fy_start_date, fy_end_date,
                   currency, units, number_format, negative_format, default_font,
-                  default_font_size, show_zeros_as_blank, decimal_places, turnover,
+                  default_font_size, bool(show_zeros_as_blank), decimal_places, turnover,
                   rounding_level, datetime.now(), datetime.now()))
             
             company_id = cursor.fetchone()[0]
+            create_company_partitions(cursor, company_id)
             conn.commit()
             conn.close()
+            COMPANY_CACHE.invalidate()
             return company_id
         
         except Exception as e:
@@ -226,19 +233,20 @@ class CompanyInfo:
             
             cursor.execute('''
                 UPDATE company_info
-                SET entity_name = ?, address = ?, cin_no = ?, fy_start_date = ?,
-                    fy_end_date = ?, currency = ?, units = ?, number_format = ?,
-                    negative_format = ?, default_font = ?, default_font_size = ?,
-                    show_zeros_as_blank = ?, decimal_places = ?, turnover = ?,
+                SET entity_name = %s, address = %s, cin_no = %s, fy_start_date = %s,
+                    fy_end_date = %s, currency = %s, units = %s, number_format = %s,
+                    negative_format = %s, default_font = %s, default_font_size = %s,
+                    show_zeros_as_blank = %s, decimal_places = %s, turnover = %s,
                     rounding_level = %s, updated_at = %s
                 WHERE company_id = %s
             ''', (entity_name, address, cin_no, fy_start_date, fy_end_date,
                   currency, units, number_format, negative_format, default_font,
-                  default_font_size, show_zeros_as_blank, decimal_places, turnover,
+                  default_font_size, bool(show_zeros_as_blank), decimal_places, turnover,
                   rounding_level, datetime.now(), company_id))
             
             conn.commit()
             conn.close()
+            COMPANY_CACHE.invalidate()
         
         except Exception as e:
             conn.close()
@@ -246,14 +254,22 @@ class CompanyInfo:
     
     @staticmethod
     def delete(company_id):
-        """Delete company information"""
+        """Delete company information (and its trial balance partitions)"""
         conn = get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('DELETE FROM company_info WHERE company_id = %s', (company_id,))
+        try:
+            clear_company_partitions(cursor, company_id, drop=True)
+            cursor.execute('DELETE FROM company_info WHERE company_id = %s', (company_id,))
+            conn.commit()
         
-        conn.commit()
-        conn.close()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        
+        finally:
+            conn.close()
+        invalidate_tables('company_info', 'major_heads', 'minor_heads', 'groupings')
     
     @staticmethod
     def validate_cin(cin):
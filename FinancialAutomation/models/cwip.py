@@ -5,6 +5,7 @@ Tracks ongoing construction projects with CY and PY comparative data
 from datetime import date
 from typing import List, Optional, Dict, Any
 from config.database import get_connection
+from models.batch_writer import save_batch
 
 
 class CWIP:
@@ -130,6 +131,31 @@ class CWIP:
             )
         return None
     
+    @staticmethod
+    def get_many(cwip_ids) -> Dict[int, 'CWIP']:
+        """Retrieve CWIP projects by ID in one query - returns {cwip_id: CWIP}"""
+        ids = [int(i) for i in set(cwip_ids) if i is not None]
+        if not ids:
+            return {}
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT cwip_id, company_id, project_name,
+                   opening_balance_cy, additions_cy, capitalized_cy, closing_balance_cy,
+                   opening_balance_py, additions_py, capitalized_py, closing_balance_py,
+                   project_start_date, expected_completion_date
+            FROM cwip_schedule
+            WHERE cwip_id = ANY(%s)
+        ''', (ids,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        # Columns are in constructor order
+        return {row[0]: CWIP(*row) for row in rows}
+    
     @staticmethod
     def create(
         company_id: int,
@@ -158,6 +184,7 @@ class CWIP:
                 opening_balance_py, additions_py, capitalized_py, closing_balance_py,
                 project_start_date, expected_completion_date
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING cwip_id
         ''', (
             company_id, project_name,
             opening_balance_cy, additions_cy, capitalized_cy, closing_balance_cy,
@@ -194,10 +221,10 @@ class CWIP:
         
         cursor.execute('''
             UPDATE cwip_schedule
-            SET project_name = ?,
-                opening_balance_cy = ?, additions_cy = ?, capitalized_cy = ?, closing_balance_cy = ?,
-                opening_balance_py = ?, additions_py = ?, capitalized_py = ?, closing_balance_py = ?,
-                project_start_date = ?, expected_completion_date = ?
+            SET project_name = %s,
+                opening_balance_cy = %s, additions_cy = %s, capitalized_cy = %s, closing_balance_cy = %s,
+                opening_balance_py = %s, additions_py = %s, capitalized_py = %s, closing_balance_py = %s,
+                project_start_date = %s, expected_completion_date = %s
             WHERE cwip_id = %s
         ''', (
             project_name,
@@ -227,6 +254,43 @@ class CWIP:
         
         return rows_affected > 0
     
+    # Columns written by save_batch (closing balances are derived)
+    SAVE_COLUMNS = [
+        'project_name',
+        'opening_balance_cy', 'additions_cy', 'capitalized_cy', 'closing_balance_cy',
+        'opening_balance_py', 'additions_py', 'capitalized_py', 'closing_balance_py',
+        'project_start_date', 'expected_completion_date'
+    ]
+    
+    @staticmethod
+    def _save_values(entry: Dict[str, Any]) -> tuple:
+        """SAVE_COLUMNS values for a dict of create()/update() arguments"""
+        cwip = CWIP(**{k: v for k, v in entry.items() if k != 'cwip_id'})
+        cwip.closing_balance_cy = cwip.calculate_closing_balance_cy()
+        cwip.closing_balance_py = cwip.calculate_closing_balance_py()
+        cwip.project_start_date = cwip.project_start_date or None  # Blank cells are no date
+        cwip.expected_completion_date = cwip.expected_completion_date or None
+        return tuple(getattr(cwip, column) for column in CWIP.SAVE_COLUMNS)
+    
+    @staticmethod
+    def save_batch(company_id: int, new_entries=(), changed_entries=(), deleted_ids=()) -> List[int]:
+        """
+        Save an input form's changes in one transaction
+        
+        Args:
+            new_entries: dicts of create() arguments
+            changed_entries: dicts of update() arguments (including cwip_id)
+            deleted_ids: CWIP IDs to delete
+        
+        Returns:
+            cwip_id of each new project, in order
+        """
+        return save_batch(
+            'cwip_schedule', 'cwip_id', company_id, CWIP.SAVE_COLUMNS,
+            inserts=[CWIP._save_values(entry) for entry in new_entries],
+            updates=[(entry['cwip_id'],) + CWIP._save_values(entry) for entry in changed_entries],
+            deletes=deleted_ids)
+    
     @staticmethod
     def get_schedule_iii_format(company_id: int) -> List[Dict[str, Any]]:
         """
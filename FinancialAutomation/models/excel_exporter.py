@@ -6,13 +6,17 @@ Generates multi-sheet workbook with formula-linked financials
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 
 
 class ExcelExporter:
     """Export financial statements to Excel with Schedule III formatting and formula linking"""
     
+    # Keys used to label / value the rows of list-style note data (PPE, CWIP, investments, inventories)
+    LIST_LABEL_KEYS = ('asset_class', 'project_name', 'particulars', 'name')
+    LIST_AMOUNT_KEYS = ('net_block_closing', 'closing_balance', 'carrying_amount', 'value', 'amount')
+    
     def __init__(self, company_name: str, fy_end: str):
         self.company_name = company_name
         self.fy_end = fy_end
@@ -40,14 +44,28 @@ class ExcelExporter:
         self.left_align = Alignment(horizontal='left', vertical='center')
         self.right_align = Alignment(horizontal='right', vertical='center')
     
-    def create_workbook(self, bs_data: Dict, pl_data: Dict, cf_data: Dict, notes: Dict) -> Workbook:
-        """Create complete workbook with all sheets and formula linking"""
+    def create_workbook(self, bs_data: Dict, pl_data: Dict, cf_data: Dict, notes: Dict,
+                        progress: Optional[Callable[[int, int], None]] = None) -> Workbook:
+        """
+        Create complete workbook with all sheets and formula linking
+        
+        Args:
+            progress: Optional callback(sheets done, sheets)
+        """
+        sheets = 3 + len(notes)
+        
+        def sheet_done(done):
+            if progress:
+                progress(done, sheets)
         
         # Create sheets in order
         self.create_balance_sheet(bs_data, notes)
+        sheet_done(1)
         self.create_profit_loss(pl_data, notes)
+        sheet_done(2)
         self.create_cash_flow(cf_data)
-        self.create_notes_sheets(notes)
+        sheet_done(3)
+        self.create_notes_sheets(notes, lambda done: sheet_done(3 + done))
         
         return self.wb
     
@@ -449,10 +467,12 @@ class ExcelExporter:
         
         return row
     
-    def create_notes_sheets(self, notes: Dict):
-        """Create individual sheets for each note"""
-        for note_num, note_data in sorted(notes.items()):
+    def create_notes_sheets(self, notes: Dict, progress: Optional[Callable[[int], None]] = None):
+        """Create individual sheets for each note (progress: optional callback(notes done))"""
+        for done, (note_num, note_data) in enumerate(sorted(notes.items()), 1):
             self._create_note_sheet(note_num, note_data)
+            if progress:
+                progress(done)
     
     def _create_note_sheet(self, note_num: int, note_data: Dict):
         """Create a single note sheet"""
@@ -519,50 +539,71 @@ class ExcelExporter:
         
         return ws
     
-    def _add_note_data_rows(self, ws, start_row: int, data: Dict, indent: int = 0) -> int:
-        """Add data rows for a note (handles nested structures)"""
+    def _add_note_data_rows(self, ws, start_row: int, data: Any, indent: int = 0) -> int:
+        """Add data rows for a note (handles nested structures and schedule lists)"""
         row = start_row
         
+        if isinstance(data, list):
+            # Schedule rows (e.g., PPE asset classes, CWIP projects)
+            for item in data:
+                if isinstance(item, dict):
+                    label, cy, py = self._list_item_values(item)
+                    row = self._add_note_item_row(ws, row, '  ' * indent + str(label), cy, py)
+            return row
+        
         for key, value in data.items():
-            if isinstance(value, dict):
-                if 'cy' in value and 'py' in value:
-                    # Simple data row
-                    ws[f'A{row}'] = '  ' * indent + self._format_line_item_name(key)
-                    ws[f'A{row}'].font = self.normal_font
-                    ws[f'A{row}'].alignment = self.left_align
-                    ws[f'A{row}'].border = self.border
-                    
-                    ws[f'B{row}'].border = self.border
-                    
-                    ws[f'C{row}'] = value['cy']
-                    ws[f'C{row}'].font = self.normal_font
-                    ws[f'C{row}'].alignment = self.right_align
-                    ws[f'C{row}'].number_format = '#,##0.00'
-                    ws[f'C{row}'].border = self.border
-                    
-                    ws[f'D{row}'] = value['py']
-                    ws[f'D{row}'].font = self.normal_font
-                    ws[f'D{row}'].alignment = self.right_align
-                    ws[f'D{row}'].number_format = '#,##0.00'
-                    ws[f'D{row}'].border = self.border
-                    
-                    row += 1
-                else:
-                    # Nested section (e.g., ageing breakdown)
-                    ws.merge_cells(f'A{row}:D{row}')
-                    cell = ws[f'A{row}']
-                    cell.value = '  ' * indent + self._format_line_item_name(key)
-                    cell.font = self.section_font
-                    cell.alignment = self.left_align
-                    cell.fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-                    cell.border = self.border
-                    row += 1
-                    
-                    # Recursively add nested data
-                    row = self._add_note_data_rows(ws, row, value, indent + 1)
+            if key.endswith('_py'):
+                continue  # Shown next to its _cy value
+            if isinstance(value, dict) and 'cy' in value and 'py' in value:
+                # Simple data row
+                row = self._add_note_item_row(ws, row, '  ' * indent + self._format_line_item_name(key),
+                                              value['cy'], value['py'])
+            elif isinstance(value, (dict, list)):
+                # Nested section (e.g., ageing breakdown)
+                ws.merge_cells(f'A{row}:D{row}')
+                cell = ws[f'A{row}']
+                cell.value = '  ' * indent + self._format_line_item_name(key)
+                cell.font = self.section_font
+                cell.alignment = self.left_align
+                cell.fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
+                cell.border = self.border
+                row += 1
+                
+                # Recursively add nested data
+                row = self._add_note_data_rows(ws, row, value, indent + 1)
+            elif key.endswith('_cy') and isinstance(value, (int, float)):
+                row = self._add_note_item_row(ws, row, '  ' * indent + self._format_line_item_name(key[:-3]),
+                                              value, data.get(key[:-3] + '_py'))
         
         return row
     
+    def _add_note_item_row(self, ws, row: int, label: str, cy, py) -> int:
+        """Add one line item with its current and previous year amounts"""
+        ws[f'A{row}'] = label
+        ws[f'A{row}'].font = self.normal_font
+        ws[f'A{row}'].alignment = self.left_align
+        ws[f'A{row}'].border = self.border
+        
+        ws[f'B{row}'].border = self.border
+        
+        for col, amount in (('C', cy), ('D', py)):
+            ws[f'{col}{row}'] = amount
+            ws[f'{col}{row}'].font = self.normal_font
+            ws[f'{col}{row}'].alignment = self.right_align
+            ws[f'{col}{row}'].number_format = '#,##0.00'
+            ws[f'{col}{row}'].border = self.border
+        
+        return row + 1
+    
+    @classmethod
+    def _list_item_values(cls, item: Dict) -> tuple:
+        """(label, cy, py) of one schedule row - the amounts are None if it has no closing figure"""
+        label = next((item[key] for key in cls.LIST_LABEL_KEYS if item.get(key)), '')
+        for key in cls.LIST_AMOUNT_KEYS:
+            if f'{key}_cy' in item:
+                return label, item[f'{key}_cy'], item.get(f'{key}_py')
+        return label, None, None
+    
     def _apply_row_formatting(self, ws, row: int, bold: bool = False, highlight: bool = False):
         """Apply standard row formatting"""
         font = self.total_font if bold else self.normal_font
@@ -581,7 +622,8 @@ class ExcelExporter:
             if fill:
                 ws[f'{col}{row}'].fill = fill
     
-    def _format_subsection_name(self, key: str) -> str:
+    @staticmethod
+    def _format_subsection_name(key: str) -> str:
         """Format subsection name for display"""
         mapping = {
             'non_current': 'Non-Current Assets',
@@ -592,7 +634,8 @@ class ExcelExporter:
         }
         return mapping.get(key, key.replace('_', ' ').title())
     
-    def _format_line_item_name(self, key: str) -> str:
+    @staticmethod
+    def _format_line_item_name(key: str) -> str:
         """Format line item name for display"""
         # Special mappings
         special_names = {
@@ -2,13 +2,22 @@
 Financial Statements Generator - Schedule III Compliant
 Generates Balance Sheet, P&L Statement, Cash Flow, and Notes to Accounts
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from models.ppe import PPE
 from models.cwip import CWIP
 from models.investments import Investment
 from models.trial_balance import TrialBalance
 from models.company_info import CompanyInfo
 from decimal import Decimal
+from datetime import datetime
+
+
+# Grouping name keywords of the Schedule III expense lines that make up purchases
+PURCHASE_GROUPINGS = {
+    'cost_of_materials_consumed': ['materials consumed', 'material consumption'],
+    'purchases_of_stock_in_trade': ['purchase of stock', 'purchases of stock'],
+    'changes_in_inventories': ['changes in inventor', 'change in inventor'],
+}
 
 
 class BalanceSheetGenerator:
@@ -251,7 +260,60 @@ class BalanceSheetGenerator:
             return {'cy': 0, 'py': 0, 'note': 11}
 
 
-class ProfitLossGenerator:
+class TrialBalanceTotals:
+    """Totals of the adjusted trial balance by grouping, for generators that read it directly"""
+    
+    _tb_frame = None
+    _grouping_names = None
+    
+    def _get_tb_frame(self):
+        """Columnar trial balance (with applied adjustments) and grouping names, loaded once per generator"""
+        if self._tb_frame is None:
+            from models.trial_balance import TrialBalance
+            from models.master_data import Grouping
+            
+            self._tb_frame = TrialBalance.get_frame(self.company_id, columns=[
+                'type_bs_pl', 'grouping_id', 'closing_balance_cy', 'closing_balance_py',
+                'debit_cy', 'debit_py', 'credit_cy', 'credit_py'], adjusted=True)
+            self._grouping_names = {row[0]: (row[3] or '').lower()
+                                    for row in Grouping.get_all(company_id=self.company_id)}
+        return self._tb_frame
+    
+    def _get_tb_total_by_grouping(self, search_terms: list, field='closing_balance', type_bs_pl=None) -> tuple:
+        """Helper method to get CY and PY totals from Trial Balance by grouping keywords
+        
+        Args:
+            search_terms: List of keywords to search in grouping name
+            field: Field to sum ('closing_balance', 'debit', 'credit')
+            type_bs_pl: Optional filter by BS or PL
+        
+        Returns:
+            tuple: (cy_total, py_total)
+        """
+        columns = {
+            'closing_balance': ('closing_balance_cy', 'closing_balance_py'),
+            'debit': ('debit_cy', 'debit_py'),
+            'credit': ('credit_cy', 'credit_py'),
+        }.get(field)
+        if not columns:
+            return (0, 0)
+        
+        frame = self._get_tb_frame()
+        
+        # Filter by type if specified
+        if type_bs_pl:
+            frame = frame.by_type(type_bs_pl)
+        
+        # Groupings whose name matches any search term
+        terms = [term.lower() for term in search_terms]
+        grouping_ids = [grouping_id for grouping_id, name in self._grouping_names.items()
+                        if any(term in name for term in terms)]
+        frame = frame.by_grouping(grouping_ids)
+        
+        return (frame.total(columns[0]), frame.total(columns[1]))
+    
+
+class ProfitLossGenerator(TrialBalanceTotals):
     """Generate Schedule III compliant Profit & Loss Statement"""
     
     def __init__(self, company_id: int):
@@ -336,11 +398,14 @@ class ProfitLossGenerator:
         depreciation_cy = sum(item.get('depreciation_for_year_cy', 0) for item in ppe_data)
         depreciation_py = sum(item.get('depreciation_for_year_py', 0) for item in ppe_data)
         
+        purchases = self._get_purchases()
+        
         # Other expenses from Trial Balance
         try:
             items = TrialBalance.get_by_company_and_year(self.company_id, 'CY')
             
             expenses = {
+                **purchases,
                 'depreciation': {'cy': depreciation_cy, 'py': depreciation_py},
                 'employee_benefits': {'cy': 0, 'py': 0},
                 'finance_costs': {'cy': 0, 'py': 0},
@@ -361,153 +426,138 @@ class ProfitLossGenerator:
             return expenses
         except:
             return {
+                **purchases,
                 'depreciation': {'cy': depreciation_cy, 'py': depreciation_py},
                 'employee_benefits': {'cy': 0, 'py': 0},
                 'finance_costs': {'cy': 0, 'py': 0},
                 'other_expenses': {'cy': 0, 'py': 0}
             }
+    
+    def _get_purchases(self) -> Dict[str, Dict[str, float]]:
+        """Cost of materials consumed, purchases of stock-in-trade and changes in inventories
+        from the mapped P&L ledgers - only the lines the trial balance has amounts for"""
+        lines = {}
+        for key, search_terms in PURCHASE_GROUPINGS.items():
+            cy, py = self._get_tb_total_by_grouping(search_terms, type_bs_pl='PL')
+            if cy or py:
+                lines[key] = {'cy': cy, 'py': py}
+        return lines
 
 
-class NotesGenerator:
+class NotesGenerator(TrialBalanceTotals):
     """Generate Notes to Accounts"""
     
     def __init__(self, company_id: int):
         self.company_id = company_id
         self.company = CompanyInfo.get_by_id(company_id)
+        self._tb_frame = None
+        self._grouping_names = None
     
-    def _get_tb_total_by_grouping(self, search_terms: list, field='closing_balance', type_bs_pl=None) -> tuple:
-        """Helper method to get CY and PY totals from Trial Balance by grouping keywords
-        
+    def generate_all_notes(self, progress: Optional[Callable[[int, int], None]] = None
+                           ) -> Dict[int, Dict[str, Any]]:
+        """
+        Generate all Schedule III required notes
+
         Args:
-            search_terms: List of keywords to search in grouping name
-            field: Field to sum ('closing_balance', 'debit', 'credit')
-            type_bs_pl: Optional filter by BS or PL
-        
-        Returns:
-            tuple: (cy_total, py_total)
+            progress: Optional callback(notes done, notes)
         """
-        from models.trial_balance import TrialBalance
-        from models.master_data import Grouping
-        
-        tb_items = TrialBalance.get_by_company(self.company_id)
-        cy_total = 0
-        py_total = 0
-        
-        for item in tb_items:
-            # Filter by type if specified
-            if type_bs_pl and item.type_bs_pl != type_bs_pl:
-                continue
-            
-            # Check if item has grouping mapping
-            if item.grouping_id:
-                grouping = Grouping.get_by_id(item.grouping_id)
-                if grouping:
-                    grouping_name = grouping.grouping_name.lower()
-                    # Check if any search term matches
-                    if any(term.lower() in grouping_name for term in search_terms):
-                        if field == 'closing_balance':
-                            cy_total += float(item.closing_balance_cy or 0)
-                            py_total += float(item.closing_balance_py or 0)
-                        elif field == 'debit':
-                            cy_total += float(item.debit_cy or 0)
-                            py_total += float(item.debit_py or 0)
-                        elif field == 'credit':
-                            cy_total += float(item.credit_cy or 0)
-                            py_total += float(item.credit_py or 0)
-        
-        return (cy_total, py_total)
-    
-    def generate_all_notes(self) -> Dict[int, Dict[str, Any]]:
-        """Generate all Schedule III required notes"""
+        builders = self.note_builders()
         notes = {}
+        for done, (note_num, build) in enumerate(builders, 1):
+            notes[note_num] = build()
+            if progress:
+                progress(done, len(builders))
+        return notes
+    
+    def note_builders(self) -> List[Tuple[int, Callable[[], Dict[str, Any]]]]:
+        """(note number, function generating the note) in note order"""
+        return [
+            # NON-CURRENT ASSETS
+            # Note 1: PPE
+            (1, self.generate_ppe_note),
         
-        # NON-CURRENT ASSETS
-        # Note 1: PPE
-        notes[1] = self.generate_ppe_note()
-        
-        # Note 2: CWIP
-        notes[2] = self.generate_cwip_note()
-        
-        # Note 3: Non-Current Investments
-        notes[3] = self.generate_investments_note(Investment.NON_CURRENT)
+            # Note 2: CWIP
+            (2, self.generate_cwip_note),
         
-        # Note 4: Loans (Non-Current)
-        notes[4] = self.generate_loans_note(is_current=False)
+            # Note 3: Non-Current Investments
+            (3, lambda: self.generate_investments_note(Investment.NON_CURRENT)),
         
-        # Note 5: Other Financial Assets (Non-Current)
-        notes[5] = self.generate_other_financial_assets_note(is_current=False)
+            # Note 4: Loans (Non-Current)
+            (4, lambda: self.generate_loans_note(is_current=False)),
         
-        # Note 6: Deferred Tax Assets
-        notes[6] = self.generate_deferred_tax_note()
+            # Note 5: Other Financial Assets (Non-Current)
+            (5, lambda: self.generate_other_financial_assets_note(is_current=False)),
         
-        # Note 7: Other Non-Current Assets
-        notes[7] = self.generate_other_noncurrent_assets_note()
+            # Note 6: Deferred Tax Assets
+            (6, self.generate_deferred_tax_note),
         
-        # CURRENT ASSETS
-        # Note 8: Inventories
-        notes[8] = self.generate_inventories_note()
+            # Note 7: Other Non-Current Assets
+            (7, self.generate_other_noncurrent_assets_note),
         
-        # Note 9: Current Investments
-        notes[9] = self.generate_investments_note(Investment.CURRENT)
+            # CURRENT ASSETS
+            # Note 8: Inventories
+            (8, self.generate_inventories_note),
         
-        # Note 10: Trade Receivables (WITH AGEING)
-        notes[10] = self.generate_trade_receivables_note()
+            # Note 9: Current Investments
+            (9, lambda: self.generate_investments_note(Investment.CURRENT)),
         
-        # Note 11: Cash and Cash Equivalents
-        notes[11] = self.generate_cash_note()
+            # Note 10: Trade Receivables (WITH AGEING)
+            (10, self.generate_trade_receivables_note),
         
-        # Note 12: Bank Balances other than Cash
-        notes[12] = self.generate_bank_balances_note()
+            # Note 11: Cash and Cash Equivalents
+            (11, self.generate_cash_note),
         
-        # Note 13: Loans (Current)
-        notes[13] = self.generate_loans_note(is_current=True)
+            # Note 12: Bank Balances other than Cash
+            (12, self.generate_bank_balances_note),
         
-        # Note 14: Other Financial Assets (Current)
-        notes[14] = self.generate_other_financial_assets_note(is_current=True)
+            # Note 13: Loans (Current)
+            (13, lambda: self.generate_loans_note(is_current=True)),
         
-        # Note 15: Other Current Assets
-        notes[15] = self.generate_other_current_assets_note()
+            # Note 14: Other Financial Assets (Current)
+            (14, lambda: self.generate_other_financial_assets_note(is_current=True)),
         
-        # EQUITY
-        # Note 16: Share Capital
-        notes[16] = self.generate_share_capital_note()
+            # Note 15: Other Current Assets
+            (15, self.generate_other_current_assets_note),
         
-        # Note 17: Other Equity
-        notes[17] = self.generate_other_equity_note()
+            # EQUITY
+            # Note 16: Share Capital
+            (16, self.generate_share_capital_note),
         
-        # NON-CURRENT LIABILITIES
-        # Note 18: Borrowings (Non-Current)
-        notes[18] = self.generate_borrowings_note(is_current=False)
+            # Note 17: Other Equity
+            (17, self.generate_other_equity_note),
         
-        # Note 19: Other Financial Liabilities (Non-Current)
-        notes[19] = self.generate_other_financial_liabilities_note(is_current=False)
+            # NON-CURRENT LIABILITIES
+            # Note 18: Borrowings (Non-Current)
+            (18, lambda: self.generate_borrowings_note(is_current=False)),
         
-        # Note 20: Provisions (Non-Current)
-        notes[20] = self.generate_provisions_note(is_current=False)
+            # Note 19: Other Financial Liabilities (Non-Current)
+            (19, lambda: self.generate_other_financial_liabilities_note(is_current=False)),
         
-        # Note 21: Deferred Tax Liabilities
-        notes[21] = self.generate_deferred_tax_liabilities_note()
+            # Note 20: Provisions (Non-Current)
+            (20, lambda: self.generate_provisions_note(is_current=False)),
         
-        # Note 22: Other Non-Current Liabilities
-        notes[22] = self.generate_other_noncurrent_liabilities_note()
+            # Note 21: Deferred Tax Liabilities
+            (21, self.generate_deferred_tax_liabilities_note),
         
-        # CURRENT LIABILITIES
-        # Note 23: Borrowings (Current)
-        notes[23] = self.generate_borrowings_note(is_current=True)
+            # Note 22: Other Non-Current Liabilities
+            (22, self.generate_other_noncurrent_liabilities_note),
         
-        # Note 24: Trade Payables (WITH AGEING)
-        notes[24] = self.generate_trade_payables_note()
+            # CURRENT LIABILITIES
+            # Note 23: Borrowings (Current)
+            (23, lambda: self.generate_borrowings_note(is_current=True)),
         
-        # Note 25: Other Financial Liabilities (Current)
-        notes[25] = self.generate_other_financial_liabilities_note(is_current=True)
+            # Note 24: Trade Payables (WITH AGEING)
+            (24, self.generate_trade_payables_note),
         
-        # Note 26: Other Current Liabilities
-        notes[26] = self.generate_other_current_liabilities_note()
+            # Note 25: Other Financial Liabilities (Current)
+            (25, lambda: self.generate_other_financial_liabilities_note(is_current=True)),
         
-        # Note 27: Provisions (Current)
-        notes[27] = self.generate_provisions_note(is_current=True)
+            # Note 26: Other Current Liabilities
+            (26, self.generate_other_current_liabilities_note),
         
-        return notes
+            # Note 27: Provisions (Current)
+            (27, lambda: self.generate_provisions_note(is_current=True)),
+        ]
     
     def generate_ppe_note(self) -> Dict[str, Any]:
         """Generate Note 1: Property, Plant and Equipment"""
@@ -793,18 +843,19 @@ class NotesGenerator:
 class CashFlowGenerator:
     """Generate Cash Flow Statement (Indirect Method) - Schedule III Compliant"""
     
-    def __init__(self, company_id: int):
+    def __init__(self, company_id: int, bs_data: Optional[Dict] = None, pl_data: Optional[Dict] = None):
         self.company_id = company_id
         self.company = CompanyInfo.get_by_id(company_id)
-        self.bs_gen = BalanceSheetGenerator(company_id)
-        self.pl_gen = ProfitLossGenerator(company_id)
+        # Reuse already generated statements when supplied instead of rebuilding them
+        self.bs_data = bs_data
+        self.pl_data = pl_data
     
     def generate(self) -> Dict[str, Any]:
         """Generate complete Cash Flow Statement using Indirect Method"""
         
         # Get Balance Sheet and P&L data
-        bs_data = self.bs_gen.generate()
-        pl_data = self.pl_gen.generate()
+        bs_data = self.bs_data if self.bs_data is not None else BalanceSheetGenerator(self.company_id).generate()
+        pl_data = self.pl_data if self.pl_data is not None else ProfitLossGenerator(self.company_id).generate()
         
         # A. Operating Activities
         operating = self.calculate_operating_activities(bs_data, pl_data)
@@ -978,3 +1029,47 @@ class CashFlowGenerator:
             'net_cash_cy': net_cash_cy,
             'net_cash_py': net_cash_py
         }
+
+
+class StatementSnapshot:
+    """One generation run of all statements for a company, shared by display, export and analysis"""
+    
+    def __init__(self, company_id: int, balance_sheet: Dict[str, Any], profit_loss: Dict[str, Any],
+                 cash_flow: Optional[Dict[str, Any]] = None, notes: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.company_id = company_id
+        self.balance_sheet = balance_sheet
+        self.profit_loss = profit_loss
+        self.cash_flow = cash_flow
+        self.notes = notes
+        self.generated_at = datetime.now()
+    
+    # Statements generated before the notes (progress steps)
+    STATEMENT_STEPS = 3
+    
+    @classmethod
+    def generate(cls, company_id: int, include_notes: bool = True,
+                 progress: Optional[Callable[[int, int], None]] = None) -> 'StatementSnapshot':
+        """
+        Generate BS and P&L once and derive Cash Flow from them
+
+        Args:
+            progress: Optional callback(steps done, steps) - one step per statement and note
+        """
+        notes_generator = NotesGenerator(company_id) if include_notes else None
+        steps = cls.STATEMENT_STEPS + (len(notes_generator.note_builders()) if include_notes else 0)
+        
+        def step(done):
+            if progress:
+                progress(done, steps)
+        
+        bs_data = BalanceSheetGenerator(company_id).generate()
+        step(1)
+        pl_data = ProfitLossGenerator(company_id).generate()
+        step(2)
+        cf_data = CashFlowGenerator(company_id, bs_data, pl_data).generate()
+        step(3)
+        notes = None
+        if include_notes:
+            notes = notes_generator.generate_all_notes(
+                lambda done, _total: step(cls.STATEMENT_STEPS + done))
+        return cls(company_id, bs_data, pl_data, cf_data, notes)
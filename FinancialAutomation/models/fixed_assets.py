@@ -0,0 +1,446 @@
+"""
+Fixed Asset Register Model
+Asset-level register with a vectorized depreciation engine (Companies Act
+Schedule II useful lives, SLM and WDV, pro-rata by capitalization and disposal
+dates), rolled up by asset class into ppe_schedule (Schedule III Note 1)
+"""
+
+import numpy as np
+from datetime import date, datetime
+from config.database import get_connection
+from config.db_connection import get_dialect, stream_query
+from models.company_info import CompanyInfo
+from models.ppe import PPE
+
+
+# Schedule II Part C useful lives in years (keys normalized by _class_key).
+# 0 means the class is not depreciated.
+SCHEDULE_II_USEFUL_LIVES = {
+    'land': 0,
+    'freehold land': 0,
+    'buildings': 60,
+    'building': 60,
+    'factory buildings': 30,
+    'factory building': 30,
+    'roads': 10,
+    'plant and machinery': 15,
+    'furniture and fixtures': 10,
+    'furniture': 10,
+    'vehicles': 8,
+    'motor vehicles': 8,
+    'motor cars': 8,
+    'motor cycles': 10,
+    'office equipment': 5,
+    'computers': 3,
+    'computer': 3,
+    'servers and networks': 6,
+    'electrical installations': 10,
+}
+
+DEFAULT_RESIDUAL_VALUE_PCT = 5.0  # Schedule II: residual value not more than 5% of cost
+DEPRECIATION_METHODS = ('SLM', 'WDV')
+
+_DATE_FORMATS = ('%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y')  # Accepted besides ISO (YYYY-MM-DD)
+
+# Register file headers (lower case, spaces as underscores) accepted for each column
+HEADER_ALIASES = {
+    'asset_no': 'asset_code',
+    'asset_number': 'asset_code',
+    'description': 'asset_name',
+    'asset_description': 'asset_name',
+    'class': 'asset_class',
+    'block_of_assets': 'asset_class',
+    'original_cost': 'cost',
+    'gross_block': 'cost',
+    'capitalisation_date': 'capitalization_date',
+    'date_of_capitalization': 'capitalization_date',
+    'date_of_capitalisation': 'capitalization_date',
+    'put_to_use_date': 'capitalization_date',
+    'date_put_to_use': 'capitalization_date',
+    'date_of_disposal': 'disposal_date',
+    'sale_date': 'disposal_date',
+    'method': 'depreciation_method',
+    'useful_life': 'useful_life_years',
+    'residual_value_%': 'residual_value_pct',
+    'residual_pct': 'residual_value_pct',
+}
+
+
+def register_column(header):
+    """Register column for a file header ('Date of Capitalisation' -> capitalization_date)"""
+    key = '_'.join(str(header).strip().lower().split())
+    return HEADER_ALIASES.get(key, key)
+
+
+def _class_key(asset_class):
+    """Normalized asset class for the Schedule II lookup"""
+    return ' '.join(str(asset_class).lower().replace('&', ' and ').split())
+
+
+def schedule_ii_useful_life(asset_class):
+    """Schedule II useful life of an asset class in years, None if not listed"""
+    return SCHEDULE_II_USEFUL_LIVES.get(_class_key(asset_class))
+
+
+def _to_date(value):
+    """date from a date, datetime, Timestamp or string (None for blanks)"""
+    if value is None or value != value or value == '':  # NaN and NaT are not equal to themselves
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()[:10]
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value}")
+
+
+def _to_number(value, default=None):
+    """float of a cell value (default for blanks)"""
+    if value is None or value != value or value == '':
+        return default
+    return float(str(value).replace(',', '')) if isinstance(value, str) else float(value)
+
+
+def _shift_years(day, years):
+    """Same day and month `years` later (Feb 29 becomes Feb 28)"""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+
+class FixedAsset:
+    """Model for the asset-level fixed asset register"""
+
+    IMPORT_COLUMNS = [
+        'company_id', 'asset_code', 'asset_name', 'asset_class', 'cost',
+        'capitalization_date', 'disposal_date', 'depreciation_method',
+        'useful_life_years', 'residual_value_pct', 'import_batch_id', 'created_at'
+    ]
+
+    REGISTER_COLUMNS = [
+        'asset_id', 'asset_class', 'cost', 'capitalization_date', 'disposal_date',
+        'depreciation_method', 'useful_life_years', 'residual_value_pct'
+    ]
+
+    @staticmethod
+    def _import_values(company_id, entry, import_batch_id, now):
+        """IMPORT_COLUMNS values for one register entry (validated, Schedule II defaults applied)"""
+        asset_class = str(entry.get('asset_class') or '').strip()
+        label = entry.get('asset_code') or entry.get('asset_name') or asset_class
+        if not asset_class:
+            raise ValueError(f"Asset {label}: asset class is required")
+
+        capitalized = _to_date(entry.get('capitalization_date'))
+        if capitalized is None:
+            raise ValueError(f"Asset {label}: capitalization date is required")
+        disposed = _to_date(entry.get('disposal_date'))
+        if disposed is not None and disposed < capitalized:
+            raise ValueError(f"Asset {label}: disposal date is before the capitalization date")
+
+        method = str(entry.get('depreciation_method') or 'SLM').strip().upper()
+        if method not in DEPRECIATION_METHODS:
+            raise ValueError(f"Asset {label}: depreciation method must be SLM or WDV, not {method}")
+
+        useful_life = _to_number(entry.get('useful_life_years'))
+        if useful_life is None:
+            useful_life = schedule_ii_useful_life(asset_class)
+            if useful_life is None:
+                raise ValueError(f"Asset {label}: no Schedule II useful life for asset class "
+                                 f"'{asset_class}' - give useful_life_years")
+
+        return (
+            company_id,
+            entry.get('asset_code'),
+            entry.get('asset_name'),
+            asset_class,
+            _to_number(entry.get('cost'), 0.0),
+            capitalized.isoformat(),
+            disposed.isoformat() if disposed else None,
+            method,
+            useful_life,
+            _to_number(entry.get('residual_value_pct'), DEFAULT_RESIDUAL_VALUE_PCT),
+            import_batch_id,
+            now
+        )
+
+    @staticmethod
+    def bulk_import(company_id, entries, import_batch_id=None, replace=False):
+        """
+        Bulk import register entries (COPY on PostgreSQL, executemany on SQLite)
+
+        Args:
+            entries: dicts with asset_class, cost, capitalization_date and optionally
+                asset_code, asset_name, disposal_date, depreciation_method (SLM/WDV),
+                useful_life_years (default: Schedule II) and residual_value_pct (default: 5)
+            replace: Delete the company's existing register first (same transaction)
+
+        Returns:
+            int: Number of assets imported
+        """
+        now = datetime.now()
+        rows = [FixedAsset._import_values(company_id, entry, import_batch_id, now) for entry in entries]
+
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            if replace:
+                cursor.execute('DELETE FROM fixed_assets WHERE company_id = %s', (company_id,))
+            count = get_dialect().bulk_insert(cursor, 'fixed_assets', FixedAsset.IMPORT_COLUMNS, rows)
+            conn.commit()
+            return count
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def count_by_company(company_id):
+        """Number of assets in a company's register"""
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM fixed_assets WHERE company_id = %s', (company_id,))
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    @staticmethod
+    def delete_by_company(company_id):
+        """Delete a company's register"""
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('DELETE FROM fixed_assets WHERE company_id = %s', (company_id,))
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
+
+    @staticmethod
+    def get_register(company_id, itersize=None):
+        """Load a company's register into an AssetRegister (streamed, no per-row objects)"""
+        sql = (f"SELECT {', '.join(FixedAsset.REGISTER_COLUMNS)} FROM fixed_assets "
+               f"WHERE company_id = %s ORDER BY asset_id")
+        return AssetRegister.from_batches(
+            dict(zip(FixedAsset.REGISTER_COLUMNS, zip(*rows)))
+            for rows in stream_query(sql, (company_id,), itersize, as_float=True))
+
+    @staticmethod
+    def rollup_to_schedule(company_id):
+        """
+        Depreciate the register for the company's CY and PY and write the class
+        totals into ppe_schedule (rows matched by asset class; classes without
+        register assets are left as entered)
+
+        Returns:
+            dict: asset class -> ppe_id (empty if the register is empty)
+        """
+        company = CompanyInfo.get_by_id(company_id)
+        if not company:
+            raise ValueError(f"Company {company_id} not found")
+
+        register = FixedAsset.get_register(company_id)
+        if not len(register):
+            return {}
+
+        fy_start = _to_date(company.fy_start_date)
+        fy_end = _to_date(company.fy_end_date)
+        totals = register.class_totals(fy_start, fy_end)
+
+        existing = {ppe.asset_class: ppe.ppe_id for ppe in PPE.get_all_by_company(company_id)}
+        new_entries, changed_entries = [], []
+        for entry in totals:
+            if entry['asset_class'] in existing:
+                changed_entries.append(dict(entry, ppe_id=existing[entry['asset_class']]))
+            else:
+                new_entries.append(entry)
+
+        new_ids = PPE.save_batch(company_id, new_entries, changed_entries)
+        existing.update(zip((entry['asset_class'] for entry in new_entries), new_ids))
+        return {entry['asset_class']: existing[entry['asset_class']] for entry in totals}
+
+
+class AssetRegister:
+    """
+    Columnar fixed asset register - one typed NumPy array per column
+
+    Dates are datetime64[D] (no disposal date is NaT), so a year of
+    depreciation for the whole register is a handful of array operations.
+    """
+
+    __slots__ = ('columns',)
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    @staticmethod
+    def _to_array(name, values):
+        """Convert one column of raw values to its typed array"""
+        count = len(values)
+        if name == 'asset_id':
+            return np.fromiter((v or 0 for v in values), dtype=np.int64, count=count)
+        if name in ('cost', 'useful_life_years', 'residual_value_pct'):
+            return np.fromiter((float(v or 0) for v in values), dtype=np.float64, count=count)
+        if name in ('capitalization_date', 'disposal_date'):
+            return np.array([str(v)[:10] if v else 'NaT' for v in values], dtype='datetime64[D]')
+        if name == 'depreciation_method':
+            return np.array([v or 'SLM' for v in values], dtype='U3')
+        if name == 'asset_class':
+            classes = np.empty(count, dtype=object)
+            classes[:] = [v or '' for v in values]
+            return classes
+        raise ValueError(f"Unknown fixed asset column: {name}")
+
+    @classmethod
+    def from_batches(cls, batches):
+        """Build a register from columnar batches (dicts of column -> values)"""
+        parts = {}
+        for batch in batches:
+            for name, values in batch.items():
+                parts.setdefault(name, []).append(cls._to_array(name, values))
+        if not parts:
+            return cls({name: cls._to_array(name, ()) for name in FixedAsset.REGISTER_COLUMNS})
+        return cls({name: np.concatenate(arrays) for name, arrays in parts.items()})
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build a register from import entries (validated as by FixedAsset.bulk_import)"""
+        now = datetime.now()
+        rows = [FixedAsset._import_values(None, entry, None, now) for entry in entries]
+        names = FixedAsset.IMPORT_COLUMNS
+        columns = {name: [row[names.index(name)] for row in rows]
+                   for name in FixedAsset.REGISTER_COLUMNS if name != 'asset_id'}
+        columns['asset_id'] = list(range(1, len(rows) + 1))
+        return cls.from_batches([columns])
+
+    def __len__(self):
+        return len(self.columns['cost'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def depreciate(self, fy_start, fy_end):
+        """
+        Depreciate every asset from its capitalization to the end of the CY
+
+        Each financial year is one vectorized step over the whole register.
+        Depreciation is charged pro-rata for the days in use (from the
+        capitalization date up to, not including, the disposal date) and stops
+        at cost less residual value. SLM charges (cost - residual) / life a
+        year; WDV charges rate x opening WDV with rate = 1 - (residual / cost) ^ (1 / life).
+
+        Args:
+            fy_start, fy_end: Current financial year (date)
+
+        Returns:
+            dict: 'cy' and 'py' -> per-asset arrays of opening_gross_block, additions,
+                disposals_gross, opening_acc_depreciation, depreciation_for_year and
+                acc_depr_on_disposals
+        """
+        cost = self.columns['cost']
+        capitalized = self.columns['capitalization_date']
+        disposed = self.columns['disposal_date']
+        life = self.columns['useful_life_years']
+        residual_pct = np.clip(self.columns['residual_value_pct'], 0.0, 100.0)
+        is_wdv = self.columns['depreciation_method'] == 'WDV'
+
+        depreciable = cost * (1.0 - residual_pct / 100.0)
+        has_life = life > 0
+        safe_life = np.where(has_life, life, 1.0)
+        slm_annual = np.where(has_life, depreciable / safe_life, 0.0)
+        wdv_rate = np.where(has_life, 1.0 - (residual_pct / 100.0) ** (1.0 / safe_life), 0.0)
+        # No disposal: in use beyond any financial year
+        in_use_until = np.where(np.isnat(disposed), np.datetime64('9999-12-31'), disposed)
+
+        first_year = capitalized.min().astype(object).year if len(self) else fy_start.year
+        years_back = max(fy_start.year - first_year + 1, 1)
+
+        accumulated = np.zeros(len(self))
+        results = {}
+        for back in range(years_back, -1, -1):
+            start = np.datetime64(_shift_years(fy_start, -back), 'D')
+            end = np.datetime64(_shift_years(fy_end, -back), 'D') + 1  # Exclusive
+            days_in_year = (end - start).astype(np.int64)
+
+            days_used = (np.minimum(in_use_until, end) - np.maximum(capitalized, start)).astype(np.int64)
+            fraction = np.clip(days_used, 0, None) / days_in_year
+            charge = np.where(is_wdv, (cost - accumulated) * wdv_rate, slm_annual) * fraction
+            charge = np.minimum(charge, np.maximum(depreciable - accumulated, 0.0))
+
+            if back <= 1:
+                held_at_open = (capitalized < start) & (in_use_until >= start)
+                added = (capitalized >= start) & (capitalized < end)
+                sold = (disposed >= start) & (disposed < end)  # NaT compares False
+                results['cy' if back == 0 else 'py'] = {
+                    'opening_gross_block': np.where(held_at_open, cost, 0.0),
+                    'additions': np.where(added, cost, 0.0),
+                    'disposals_gross': np.where(sold, cost, 0.0),
+                    'opening_acc_depreciation': np.where(held_at_open, accumulated, 0.0),
+                    'depreciation_for_year': charge,
+                    'acc_depr_on_disposals': np.where(sold, accumulated + charge, 0.0),
+                }
+            accumulated = accumulated + charge
+
+        return results
+
+    def class_totals(self, fy_start, fy_end):
+        """
+        Depreciate the register and total it by asset class
+
+        Returns:
+            list: PPE.save_batch entries, one per asset class (sorted by class)
+        """
+        years = self.depreciate(fy_start, fy_end)
+        classes, index = np.unique(self.columns['asset_class'].astype(str), return_inverse=True)
+
+        def total(values):
+            return np.bincount(index, weights=values, minlength=len(classes)).round(2)
+
+        sums = {f'{name}_{year}': total(values)
+                for year, columns in years.items() for name, values in columns.items()}
+
+        # Cost-weighted useful life and annual rate per class
+        cost = self.columns['cost']
+        life = self.columns['useful_life_years']
+        residual = np.clip(self.columns['residual_value_pct'], 0.0, 100.0) / 100.0
+        safe_life = np.where(life > 0, life, 1.0)
+        annual_rate = np.where(life > 0, np.where(
+            self.columns['depreciation_method'] == 'WDV',
+            1.0 - residual ** (1.0 / safe_life), (1.0 - residual) / safe_life), 0.0)
+        class_cost = np.bincount(index, weights=cost, minlength=len(classes))
+        weight = np.where(class_cost > 0, class_cost, 1.0)
+        mean_life = np.bincount(index, weights=cost * life, minlength=len(classes)) / weight
+        mean_rate = np.bincount(index, weights=cost * annual_rate, minlength=len(classes)) / weight * 100.0
+
+        entries = []
+        for i, asset_class in enumerate(classes.tolist()):
+            entry = {'asset_class': asset_class}
+            for year in ('cy', 'py'):
+                entry[f'opening_gross_block_{year}'] = float(sums[f'opening_gross_block_{year}'][i])
+                entry[f'additions_{year}'] = float(sums[f'additions_{year}'][i])
+                entry[f'disposals_gross_{year}'] = float(sums[f'disposals_gross_{year}'][i])
+                entry[f'opening_acc_depreciation_{year}'] = float(sums[f'opening_acc_depreciation_{year}'][i])
+                entry[f'depreciation_for_year_{year}'] = float(sums[f'depreciation_for_year_{year}'][i])
+                entry[f'acc_depr_on_disposals_{year}'] = float(sums[f'acc_depr_on_disposals_{year}'][i])
+            entry['useful_life_years'] = int(round(mean_life[i]))
+            entry['depreciation_rate'] = round(float(mean_rate[i]), 2)
+            entries.append(entry)
+        return entries
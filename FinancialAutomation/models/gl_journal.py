@@ -0,0 +1,473 @@
+"""
+GL Journal Model
+Builds trial balances from general ledger journal lines. Journal exports (CSV,
+Parquet or Excel - millions of lines) are read in chunks and summed per ledger
+and period with a vectorized group-by; the totals load through the bulk trial
+balance loader, and the lines can be kept in gl_journal_lines (one partition
+per company on PostgreSQL) for drill-down from any trial balance row.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from config.database import get_connection
+from config.db_connection import get_dialect
+from models.company_info import CompanyInfo
+from models.trial_balance import TrialBalance
+
+
+JOURNAL_CHUNK_ROWS = 250_000  # Lines read and aggregated at a time
+
+# Periods a line falls in, relative to the company's financial year
+PERIOD_BEFORE_PY = 0   # Builds the PY opening balance
+PERIOD_PY = 1
+PERIOD_CY = 2
+PERIOD_AFTER_CY = 3    # Ignored (counted)
+
+# Equity ledger the P&L of earlier years is carried into (created if the journal has none)
+SURPLUS_LEDGER = 'Surplus in Statement of Profit and Loss'
+
+_DATE_FORMATS = ('%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y')  # Accepted besides ISO (YYYY-MM-DD)
+
+# Journal file headers (lower case, spaces as underscores) accepted for each column
+HEADER_ALIASES = {
+    'ledger': 'ledger_name',
+    'account': 'ledger_name',
+    'account_name': 'ledger_name',
+    'gl_account': 'ledger_name',
+    'particulars': 'ledger_name',
+    'date': 'posting_date',
+    'voucher_date': 'posting_date',
+    'transaction_date': 'posting_date',
+    'txn_date': 'posting_date',
+    'document_date': 'posting_date',
+    'entry_date': 'posting_date',
+    'voucher': 'voucher_no',
+    'voucher_number': 'voucher_no',
+    'document_no': 'voucher_no',
+    'document_number': 'voucher_no',
+    'reference': 'voucher_no',
+    'ref_no': 'voucher_no',
+    'description': 'narration',
+    'memo': 'narration',
+    'remarks': 'narration',
+    'dr': 'debit',
+    'debit_amount': 'debit',
+    'dr_amount': 'debit',
+    'cr': 'credit',
+    'credit_amount': 'credit',
+    'cr_amount': 'credit',
+    'net_amount': 'amount',
+    'signed_amount': 'amount',
+    'type': 'type_bs_pl',
+    'bs/pl': 'type_bs_pl',
+    'bs_pl': 'type_bs_pl',
+}
+
+JOURNAL_COLUMNS = ('ledger_name', 'posting_date', 'voucher_no', 'narration',
+                   'debit', 'credit', 'amount', 'type_bs_pl')
+_TEXT_COLUMNS = ('ledger_name', 'voucher_no', 'narration', 'type_bs_pl')
+
+
+def journal_column(header):
+    """Journal column for a file header ('Voucher Date' -> posting_date)"""
+    key = '_'.join(str(header).strip().lower().split())
+    return HEADER_ALIASES.get(key, key)
+
+
+def _journal_columns(headers):
+    """{file header: journal column} for the recognized headers, raises if required ones are missing"""
+    columns = {}
+    for header in headers:
+        column = journal_column(header)
+        if column in JOURNAL_COLUMNS and column not in columns.values():
+            columns[header] = column
+
+    found = set(columns.values())
+    missing = [name for name in ('ledger_name', 'posting_date') if name not in found]
+    if not found & {'debit', 'credit', 'amount'}:
+        missing.append('debit/credit or amount')
+    if missing:
+        raise ValueError(f"Journal file has no column for: {', '.join(missing)}\n"
+                         f"(found: {', '.join(map(str, headers))})")
+    return columns
+
+
+def read_journal(file_path, chunk_rows=None):
+    """
+    Read a journal file in chunks
+
+    Yields:
+        DataFrame per chunk with the recognized columns renamed to JOURNAL_COLUMNS
+    """
+    chunk_rows = chunk_rows or JOURNAL_CHUNK_ROWS
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension in ('.csv', '.txt'):
+        columns = _journal_columns(pd.read_csv(file_path, nrows=0).columns)
+        chunks = pd.read_csv(file_path, usecols=list(columns), chunksize=chunk_rows, thousands=',',
+                             dtype={header: str for header, column in columns.items()
+                                    if column in _TEXT_COLUMNS})
+    elif extension == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Reading Parquet journals needs the pyarrow package (pip install pyarrow)")
+        parquet = pq.ParquetFile(file_path)
+        columns = _journal_columns(parquet.schema_arrow.names)
+        chunks = (batch.to_pandas() for batch in parquet.iter_batches(chunk_rows, columns=list(columns)))
+    elif extension in ('.xlsx', '.xls'):
+        # Excel cannot be streamed - read once, aggregate in chunks
+        frame = pd.read_excel(file_path)
+        columns = _journal_columns(frame.columns)
+        frame = frame[list(columns)]
+        chunks = (frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows))
+    else:
+        raise ValueError(f"Unsupported journal file '{os.path.basename(file_path)}' - use CSV, Parquet or Excel")
+
+    for chunk in chunks:
+        yield chunk.rename(columns=columns)
+
+
+def _parse_dates(values):
+    """datetime64 Series from dates, ISO strings or dd-mm-yyyy style strings (NaT if invalid)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.normalize()
+    parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    for fmt in _DATE_FORMATS:
+        retry = parsed.isna() & values.notna()
+        if not retry.any():
+            break
+        parsed[retry] = pd.to_datetime(values[retry], format=fmt, errors='coerce')
+    return parsed.dt.normalize()
+
+
+def parse_amounts(values):
+    """float array from numbers or text amounts ('1,234.50'; blanks and junk are 0)"""
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values.astype(str).str.replace(',', '', regex=False), errors='coerce')
+    return values.fillna(0).to_numpy(dtype=np.float64)
+
+
+def prepare_lines(chunk, first_line_no=1):
+    """
+    Normalize one chunk of journal lines
+
+    Args:
+        chunk: DataFrame with JOURNAL_COLUMNS names (see read_journal)
+        first_line_no: Line number of the chunk's first row in the file
+
+    Returns:
+        DataFrame of line_no, ledger_name, posting_date, voucher_no, narration,
+        debit, credit, type_bs_pl - lines without a ledger or a valid date dropped
+    """
+    count = len(chunk)
+    ledger_names = chunk['ledger_name'].fillna('').astype(str).str.strip()
+
+    if 'debit' in chunk or 'credit' in chunk:
+        debit = parse_amounts(chunk['debit']) if 'debit' in chunk else np.zeros(count)
+        credit = parse_amounts(chunk['credit']) if 'credit' in chunk else np.zeros(count)
+    else:
+        amount = parse_amounts(chunk['amount'])  # Signed: debits positive
+        debit, credit = np.clip(amount, 0, None), np.clip(-amount, 0, None)
+
+    if 'type_bs_pl' in chunk:
+        types = chunk['type_bs_pl'].fillna('').astype(str).str.strip().str.upper()
+        types = np.where(types.isin(['PL', 'P&L', 'P/L']), 'PL', 'BS')
+    else:
+        types = 'BS'
+
+    def text(name):
+        if name not in chunk:
+            return None
+        values = chunk[name].astype(object)
+        return values.where(values.notna(), None).to_numpy()
+
+    lines = pd.DataFrame({
+        'line_no': np.arange(first_line_no, first_line_no + count),
+        'ledger_name': ledger_names.to_numpy(),
+        'posting_date': _parse_dates(chunk['posting_date']).to_numpy(),
+        'voucher_no': text('voucher_no'),
+        'narration': text('narration'),
+        'debit': debit,
+        'credit': credit,
+        'type_bs_pl': types,
+    })
+    valid = (lines['ledger_name'] != '') & lines['posting_date'].notna()
+    return lines[valid] if not valid.all() else lines
+
+
+class JournalAggregator:
+    """
+    Per-ledger trial balance totals built from journal chunks
+
+    Each chunk is reduced to (ledger, period) debit and credit sums with one
+    group-by; the reduced chunks are combined when entries() is called, so
+    memory grows with the number of ledgers, not lines.
+    """
+
+    COMPACT_AFTER = 32  # Combine the reduced chunks once this many are held
+
+    def __init__(self, fy_start, fy_end):
+        cy_start = pd.Timestamp(fy_start).normalize()
+        cy_end = pd.Timestamp(fy_end).normalize()
+        py_start = cy_start - pd.DateOffset(years=1)
+        # Bucket edges: before PY | PY | CY | after CY
+        self.edges = np.array([py_start, cy_start, cy_end + pd.Timedelta(days=1)], dtype='datetime64[ns]')
+        self.partials = []
+        self.types = {}  # ledger -> 'BS' / 'PL' (first line seen)
+        self.line_count = 0
+        self.skipped = 0
+        self.after_year_end = 0
+
+    def periods(self, dates):
+        """PERIOD_* of each posting date"""
+        return np.searchsorted(self.edges, np.asarray(dates, dtype='datetime64[ns]'), side='right')
+
+    def add(self, chunk, first_line_no=None):
+        """
+        Aggregate one chunk of journal lines
+
+        Returns:
+            The prepared lines (see prepare_lines) for storing
+        """
+        if first_line_no is None:
+            first_line_no = self.line_count + self.skipped + 1
+        lines = prepare_lines(chunk, first_line_no)
+        self.skipped += len(chunk) - len(lines)
+        self.line_count += len(lines)
+
+        periods = self.periods(lines['posting_date'])
+        in_years = periods < PERIOD_AFTER_CY
+        self.after_year_end += int(len(periods) - in_years.sum())
+
+        current = lines[in_years].assign(period=periods[in_years])
+        self.partials.append(current.groupby(['ledger_name', 'period'], sort=False)[['debit', 'credit']].sum())
+        if len(self.partials) >= self.COMPACT_AFTER:
+            self.partials = [pd.concat(self.partials).groupby(level=[0, 1], sort=False).sum()]
+
+        new_types = current.drop_duplicates('ledger_name')
+        for name, type_bs_pl in zip(new_types['ledger_name'], new_types['type_bs_pl']):
+            self.types.setdefault(name, type_bs_pl)
+        return lines
+
+    def entries(self):
+        """
+        Trial balance entries (dicts for TrialBalance bulk loading), one per ledger
+
+        PY opening = all lines before the PY; closing = opening + debit - credit;
+        CY opening = PY closing. P&L ledgers open each year at nil - their net up to
+        the PY is carried into the opening of SURPLUS_LEDGER, and the PY net into
+        its CY opening, so a balanced journal gives a balanced trial balance.
+        """
+        if not self.partials:
+            return []
+        totals = pd.concat(self.partials).groupby(level=[0, 1]).sum().unstack('period', fill_value=0.0)
+        names = totals.index.to_numpy()
+        is_pl = np.array([self.types.get(name) == 'PL' for name in names], dtype=bool)
+
+        def column(name, period):
+            if (name, period) in totals.columns:
+                return totals[(name, period)].to_numpy(dtype=np.float64)
+            return np.zeros(len(names))
+
+        net_before_py = column('debit', PERIOD_BEFORE_PY) - column('credit', PERIOD_BEFORE_PY)
+        debit_py, credit_py = column('debit', PERIOD_PY), column('credit', PERIOD_PY)
+        debit_cy, credit_cy = column('debit', PERIOD_CY), column('credit', PERIOD_CY)
+        pl_before_py = net_before_py[is_pl].sum()
+        pl_py = (debit_py - credit_py)[is_pl].sum()
+
+        surplus = None
+        if round(pl_before_py, 2) or round(pl_py, 2):
+            surplus = np.flatnonzero((names == SURPLUS_LEDGER) & ~is_pl)
+            if not len(surplus):
+                names = np.append(names, SURPLUS_LEDGER)
+                is_pl = np.append(is_pl, False)
+                net_before_py, debit_py, credit_py, debit_cy, credit_cy = (
+                    np.append(values, 0.0) for values in (net_before_py, debit_py, credit_py, debit_cy, credit_cy))
+                surplus = [len(names) - 1]
+            surplus = surplus[0]
+
+        opening_py = np.where(is_pl, 0.0, net_before_py)
+        if surplus is not None:
+            opening_py[surplus] += pl_before_py
+        closing_py = opening_py + debit_py - credit_py
+        opening_cy = np.where(is_pl, 0.0, closing_py)
+        if surplus is not None:
+            opening_cy[surplus] += pl_py
+        closing_cy = opening_cy + debit_cy - credit_cy
+
+        return pd.DataFrame({
+            'ledger_name': names,
+            'opening_balance_cy': opening_cy.round(2),
+            'debit_cy': debit_cy.round(2),
+            'credit_cy': credit_cy.round(2),
+            'closing_balance_cy': closing_cy.round(2),
+            'opening_balance_py': opening_py.round(2),
+            'debit_py': debit_py.round(2),
+            'credit_py': credit_py.round(2),
+            'closing_balance_py': closing_py.round(2),
+            'type_bs_pl': np.where(is_pl, 'PL', 'BS'),
+            'is_mapped': 0,
+        }).to_dict('records')
+
+
+class GLJournal:
+    """Model for general ledger journal lines and their aggregation into trial balances"""
+
+    LINE_COLUMNS = ['company_id', 'import_batch_id', 'line_no', 'ledger_name', 'posting_date',
+                    'voucher_no', 'narration', 'debit', 'credit']
+
+    DRILLDOWN_COLUMNS = ['line_no', 'posting_date', 'voucher_no', 'narration', 'debit', 'credit']
+
+    @staticmethod
+    def import_file(company_id, file_path, import_batch_id, keep_lines=True, progress=None, chunk_rows=None):
+        """Import a CSV, Parquet or Excel journal as a trial balance batch (see import_chunks)"""
+        return GLJournal.import_chunks(company_id, read_journal(file_path, chunk_rows),
+                                       import_batch_id, keep_lines, progress)
+
+    @staticmethod
+    def import_chunks(company_id, chunks, import_batch_id, keep_lines=True, progress=None):
+        """
+        Aggregate journal chunks into a trial balance batch, in one transaction
+
+        Args:
+            chunks: DataFrames with JOURNAL_COLUMNS names (see read_journal)
+            keep_lines: Also store the lines in gl_journal_lines for drill-down
+            progress: Optional callback(lines read so far), called per chunk
+
+        Returns:
+            dict: ledgers, lines, skipped (no ledger or date), after_year_end (ignored lines)
+        """
+        company = CompanyInfo.get_by_id(company_id)
+        if not company:
+            raise ValueError(f"Company {company_id} not found")
+        aggregator = JournalAggregator(company.fy_start_date, company.fy_end_date)
+        dialect = get_dialect()
+
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            if keep_lines:
+                dialect.ensure_list_partition(cursor, 'gl_journal_lines', company_id)
+
+            for chunk in chunks:
+                lines = aggregator.add(chunk)
+                if keep_lines and len(lines):
+                    dialect.bulk_insert_frame(cursor, 'gl_journal_lines', pd.DataFrame({
+                        'company_id': company_id,
+                        'import_batch_id': import_batch_id,
+                        'line_no': lines['line_no'],
+                        'ledger_name': lines['ledger_name'],
+                        'posting_date': np.datetime_as_string(
+                            lines['posting_date'].to_numpy(dtype='datetime64[D]')),
+                        'voucher_no': lines['voucher_no'],
+                        'narration': lines['narration'],
+                        'debit': lines['debit'].round(2),
+                        'credit': lines['credit'].round(2),
+                    }, columns=GLJournal.LINE_COLUMNS))
+                if progress:
+                    progress(aggregator.line_count + aggregator.skipped)
+
+            entries = aggregator.entries()
+            if not entries:
+                raise ValueError("No journal lines with a ledger name and a valid date were found")
+            TrialBalance.insert_entries(cursor, company_id, entries, import_batch_id)
+
+            conn.commit()
+            return {
+                'ledgers': len(entries),
+                'lines': aggregator.line_count,
+                'skipped': aggregator.skipped,
+                'after_year_end': aggregator.after_year_end,
+            }
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def get_lines(company_id, ledger_name, date_from=None, date_to=None, import_batch_id=None, limit=None):
+        """
+        Journal lines of one ledger in date order
+
+        Returns:
+            list of DRILLDOWN_COLUMNS tuples
+        """
+        sql = (f"SELECT {', '.join(GLJournal.DRILLDOWN_COLUMNS)} FROM gl_journal_lines "
+               f"WHERE company_id = %s AND ledger_name = %s")
+        params = [company_id, ledger_name]
+        if date_from is not None:
+            sql += " AND posting_date >= %s"
+            params.append(date_from)
+        if date_to is not None:
+            sql += " AND posting_date <= %s"
+            params.append(date_to)
+        if import_batch_id is not None:
+            sql += " AND import_batch_id = %s"
+            params.append(import_batch_id)
+        sql += " ORDER BY posting_date, line_no"
+        if limit:
+            sql += " LIMIT %s"
+            params.append(int(limit))
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+    @staticmethod
+    def get_lines_for_tb(tb_id, year='cy', limit=None):
+        """
+        Journal lines behind a trial balance row
+
+        Args:
+            year: 'cy' or 'py' for that year's movements, None for every line
+
+        Returns:
+            list of DRILLDOWN_COLUMNS tuples (empty if the row was not built from a journal)
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT company_id, ledger_name, import_batch_id FROM trial_balance WHERE tb_id = %s',
+                       (int(tb_id),))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return []
+        company_id, ledger_name, import_batch_id = row
+
+        date_from = date_to = None
+        if year:
+            company = CompanyInfo.get_by_id(company_id)
+            cy_start = pd.Timestamp(company.fy_start_date)
+            cy_end = pd.Timestamp(company.fy_end_date)
+            if year == 'cy':
+                date_from, date_to = cy_start, cy_end
+            else:
+                date_from, date_to = cy_start - pd.DateOffset(years=1), cy_start - pd.Timedelta(days=1)
+            date_from, date_to = date_from.date(), date_to.date()
+        return GLJournal.get_lines(company_id, ledger_name, date_from, date_to, import_batch_id, limit)
+
+    @staticmethod
+    def count_by_company(company_id, import_batch_id=None):
+        """Number of stored journal lines"""
+        sql = 'SELECT COUNT(*) FROM gl_journal_lines WHERE company_id = %s'
+        params = [company_id]
+        if import_batch_id is not None:
+            sql += ' AND import_batch_id = %s'
+            params.append(import_batch_id)
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
@@ -92,6 +92,7 @@ class Inventory:
                 company_id, category, particulars,
                 quantity_cy, quantity_py, unit, value_cy, value_py
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING inventory_id
         ''', (company_id, category, particulars, quantity_cy, quantity_py, unit, value_cy, value_py))
         
         inventory_id = cursor.fetchone()[0]
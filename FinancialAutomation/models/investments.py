@@ -5,6 +5,7 @@ Classification: Non-Current (Notes 3, 4) and Current (Notes 13, 14)
 """
 from typing import List, Optional, Dict, Any
 from config.database import get_connection
+from models.batch_writer import save_batch
 
 
 class Investment:
@@ -163,6 +164,32 @@ class Investment:
             )
         return None
     
+    @staticmethod
+    def get_many(investment_ids) -> Dict[int, 'Investment']:
+        """Retrieve investments by ID in one query - returns {investment_id: Investment}"""
+        ids = [int(i) for i in set(investment_ids) if i is not None]
+        if not ids:
+            return {}
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT investment_id, company_id, investment_particulars, classification, investment_type,
+                   is_quoted, quantity_cy, quantity_py,
+                   cost_cy, cost_py, fair_value_cy, fair_value_py,
+                   carrying_amount_cy, carrying_amount_py,
+                   market_value_cy, market_value_py
+            FROM investments
+            WHERE investment_id = ANY(%s)
+        ''', (ids,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        # Columns are in constructor order
+        return {row[0]: Investment(*row[:5], bool(row[5]), *row[6:]) for row in rows}
+    
     @staticmethod
     def create(
         company_id: int,
@@ -193,6 +220,7 @@ class Investment:
                 carrying_amount_cy, carrying_amount_py,
                 market_value_cy, market_value_py
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING investment_id
         ''', (
             company_id, investment_particulars, classification, investment_type,
             is_quoted, quantity_cy, quantity_py,
@@ -231,11 +259,11 @@ class Investment:
         
         cursor.execute('''
             UPDATE investments
-            SET investment_particulars = ?, classification = ?, investment_type = ?,
-                is_quoted = ?, quantity_cy = ?, quantity_py = ?,
-                cost_cy = ?, cost_py = ?, fair_value_cy = ?, fair_value_py = ?,
-                carrying_amount_cy = ?, carrying_amount_py = ?,
-                market_value_cy = ?, market_value_py = ?,
+            SET investment_particulars = %s, classification = %s, investment_type = %s,
+                is_quoted = %s, quantity_cy = %s, quantity_py = %s,
+                cost_cy = %s, cost_py = %s, fair_value_cy = %s, fair_value_py = %s,
+                carrying_amount_cy = %s, carrying_amount_py = %s,
+                market_value_cy = %s, market_value_py = %s,
                 updated_at = NOW()
             WHERE investment_id = %s
         ''', (
@@ -267,6 +295,41 @@ class Investment:
         
         return rows_affected > 0
     
+    # Columns written by save_batch
+    SAVE_COLUMNS = [
+        'investment_particulars', 'classification', 'investment_type',
+        'is_quoted', 'quantity_cy', 'quantity_py',
+        'cost_cy', 'cost_py', 'fair_value_cy', 'fair_value_py',
+        'carrying_amount_cy', 'carrying_amount_py',
+        'market_value_cy', 'market_value_py'
+    ]
+    
+    @staticmethod
+    def _save_values(entry: Dict[str, Any]) -> tuple:
+        """SAVE_COLUMNS values for a dict of create()/update() arguments"""
+        investment = Investment(**{k: v for k, v in entry.items() if k != 'investment_id'})
+        investment.is_quoted = bool(investment.is_quoted)
+        return tuple(getattr(investment, column) for column in Investment.SAVE_COLUMNS)
+    
+    @staticmethod
+    def save_batch(company_id: int, new_entries=(), changed_entries=(), deleted_ids=()) -> List[int]:
+        """
+        Save an input form's changes in one transaction
+        
+        Args:
+            new_entries: dicts of create() arguments
+            changed_entries: dicts of update() arguments (including investment_id)
+            deleted_ids: Investment IDs to delete
+        
+        Returns:
+            investment_id of each new investment, in order
+        """
+        return save_batch(
+            'investments', 'investment_id', company_id, Investment.SAVE_COLUMNS,
+            inserts=[Investment._save_values(entry) for entry in new_entries],
+            updates=[(entry['investment_id'],) + Investment._save_values(entry) for entry in changed_entries],
+            deletes=deleted_ids, extra_set='updated_at = NOW()')
+    
     @staticmethod
     def get_schedule_iii_format(company_id: int, classification: str) -> Dict[str, List[Dict[str, Any]]]:
         """
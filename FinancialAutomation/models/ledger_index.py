@@ -0,0 +1,164 @@
+"""
+Ledger Index - prebuilt search index over trial balance ledger names and balances
+
+Built once per load and queried on every keystroke of the mapping dialog's filter:
+    cash          ledgers whose name contains "cash"
+    ^sundry       ledgers whose name starts with "sundry"
+    >100000       closing balance (absolute) above 1,00,000 - also >=, <, <=
+    1000..5000    closing balance (absolute) between 1,000 and 5,000
+Terms combine, e.g. "^sundry debtors >50000".
+"""
+
+import re
+from bisect import bisect_left
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# >=1,000  <500  >12.5
+_COMPARISON = re.compile(r'^(>=|<=|>|<)([\d,]+(?:\.\d+)?)$')
+# 1000..5,000
+_RANGE = re.compile(r'^([\d,]+(?:\.\d+)?)\.\.([\d,]+(?:\.\d+)?)$')
+
+# Names are joined on this separator for substring search; it never occurs in a normalized name
+_SEPARATOR = '\n'
+
+
+def normalize(text) -> str:
+    """Lowercase with runs of whitespace collapsed to one space"""
+    return ' '.join(str(text or '').lower().split())
+
+
+def _number(text: str) -> float:
+    return float(text.replace(',', ''))
+
+
+class LedgerQuery:
+    """A parsed filter: name text (prefix or substring) and an amount range"""
+
+    def __init__(self, text: str = '', prefix: bool = False,
+                 low: Optional[float] = None, high: Optional[float] = None,
+                 low_inclusive: bool = True, high_inclusive: bool = True):
+        self.text = text
+        self.prefix = prefix
+        self.low = low
+        self.high = high
+        self.low_inclusive = low_inclusive
+        self.high_inclusive = high_inclusive
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.text and self.low is None and self.high is None
+
+    @staticmethod
+    def parse(query: str) -> 'LedgerQuery':
+        """Split a filter string into amount terms and name text"""
+        parsed = LedgerQuery()
+        words = []
+        for word in str(query or '').split():
+            comparison = _COMPARISON.match(word)
+            between = _RANGE.match(word)
+            if comparison:
+                operator, value = comparison.group(1), _number(comparison.group(2))
+                if operator.startswith('>'):
+                    parsed.low, parsed.low_inclusive = value, operator == '>='
+                else:
+                    parsed.high, parsed.high_inclusive = value, operator == '<='
+            elif between:
+                low, high = sorted((_number(between.group(1)), _number(between.group(2))))
+                parsed.low, parsed.high = low, high
+                parsed.low_inclusive = parsed.high_inclusive = True
+            else:
+                words.append(word)
+
+        text = normalize(' '.join(words))
+        if text.startswith('^'):
+            parsed.prefix = True
+            text = text[1:].lstrip()
+        parsed.text = text
+        return parsed
+
+
+class LedgerIndex:
+    """
+    Search index over ledger names and closing balances, in row order
+
+    - Substring: all normalized names joined into one string with row start offsets;
+      each match position maps back to its row with one searchsorted over the offsets.
+    - Prefix: names sorted once; a prefix is a contiguous range found with two bisects.
+    - Amount: absolute closing balances sorted once; a range is two searchsorted calls.
+
+    search() returns a boolean numpy mask over the rows, or None when the query is empty
+    (every row matches).
+    """
+
+    def __init__(self, names: Sequence[str], amounts: Sequence[float]):
+        self.names = [normalize(name) for name in names]
+        self.size = len(self.names)
+
+        lengths = np.fromiter((len(name) + 1 for name in self.names), dtype=np.int64, count=self.size)
+        self.starts = np.zeros(self.size, dtype=np.int64)
+        if self.size:
+            np.cumsum(lengths[:-1], out=self.starts[1:])
+        self.text = _SEPARATOR.join(self.names)
+
+        self.sorted_rows = sorted(range(self.size), key=self.names.__getitem__)
+        self.sorted_names = [self.names[row] for row in self.sorted_rows]
+
+        self.amounts = np.abs(np.asarray(amounts, dtype=np.float64))
+        self.amount_order = np.argsort(self.amounts, kind='stable')
+        self.sorted_amounts = self.amounts[self.amount_order]
+
+    def _rows_mask(self, rows) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def prefix_rows(self, prefix: str) -> List[int]:
+        """Rows whose normalized name starts with prefix"""
+        prefix = normalize(prefix)
+        first = bisect_left(self.sorted_names, prefix)
+        # Every name with the prefix sorts before prefix + the highest code point
+        last = bisect_left(self.sorted_names, prefix + '\U0010ffff', first)
+        return self.sorted_rows[first:last]
+
+    def substring_mask(self, text: str) -> np.ndarray:
+        """Rows whose normalized name contains text"""
+        text = normalize(text)
+        if not text:
+            return np.ones(self.size, dtype=bool)
+        if self.text.count(text) > self.size // 8:
+            # Common text (one or two letters): testing each name beats mapping every match back
+            return np.fromiter((text in name for name in self.names), dtype=bool, count=self.size)
+        positions = np.fromiter((match.start() for match in re.finditer(re.escape(text), self.text)),
+                                dtype=np.int64)
+        mask = np.zeros(self.size, dtype=bool)
+        if len(positions):
+            mask[np.searchsorted(self.starts, positions, side='right') - 1] = True
+        return mask
+
+    def amount_mask(self, low=None, high=None, low_inclusive=True, high_inclusive=True) -> np.ndarray:
+        """Rows whose absolute closing balance lies in the range (None = unbounded)"""
+        first = 0 if low is None else np.searchsorted(
+            self.sorted_amounts, low, side='left' if low_inclusive else 'right')
+        last = self.size if high is None else np.searchsorted(
+            self.sorted_amounts, high, side='right' if high_inclusive else 'left')
+        return self._rows_mask(self.amount_order[first:max(first, last)])
+
+    def search(self, query) -> Optional[np.ndarray]:
+        """Boolean row mask for a filter string or LedgerQuery, None if it filters nothing"""
+        if not isinstance(query, LedgerQuery):
+            query = LedgerQuery.parse(query)
+        if query.is_empty:
+            return None
+
+        mask = None
+        if query.text:
+            if query.prefix:
+                mask = self._rows_mask(self.prefix_rows(query.text))
+            else:
+                mask = self.substring_mask(query.text)
+        if query.low is not None or query.high is not None:
+            amounts = self.amount_mask(query.low, query.high, query.low_inclusive, query.high_inclusive)
+            mask = amounts if mask is None else mask & amounts
+        return mask
@@ -3,6 +3,7 @@
 import secrets
 from datetime import datetime, timedelta
 from config.database import get_connection
+from config.reference_cache import cached, LICENSE_CACHE
 from config.settings import LICENSE_TYPE_TRIAL, LICENSE_TYPE_FULL, TRIAL_PERIOD_DAYS
 
 class License:
@@ -36,11 +37,13 @@ class License:
         cursor.execute('''
             INSERT INTO licenses (user_id, license_key, license_type, issue_date, expiry_date)
             VALUES (%s, %s, %s, %s, %s)
+            RETURNING license_id
         ''', (user_id, license_key, LICENSE_TYPE_TRIAL, issue_date, expiry_date))
         
         license_id = cursor.fetchone()[0]
         conn.commit()
         conn.close()
+        LICENSE_CACHE.invalidate()
         
         return license_id, license_key
     
@@ -56,36 +59,27 @@ class License:
         cursor.execute('''
             INSERT INTO licenses (user_id, license_key, license_type, issue_date, expiry_date)
             VALUES (%s, %s, %s, %s, %s)
+            RETURNING license_id
         ''', (user_id, license_key, LICENSE_TYPE_FULL, issue_date, expiry_date))
         
         license_id = cursor.fetchone()[0]
         conn.commit()
         conn.close()
+        LICENSE_CACHE.invalidate()
         
         return license_id, license_key
     
     @staticmethod
     def validate_license(user_id):
         """Validate if user has an active license"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT license_id, license_key, license_type, issue_date, expiry_date, is_active
-            FROM licenses
-            WHERE user_id = %s AND is_active = 1
-            ORDER BY license_id DESC
-            LIMIT 1
-        ''', (user_id,))
-        
-        result = cursor.fetchone()
-        conn.close()
+        # Expiry is checked on every call; only the license row is cached
+        license = License.get_user_license(user_id)
         
-        if not result:
+        if not license:
             return False, "No active license found"
         
-        license_type = result[2]
-        expiry_date = result[4]
+        license_type = license.license_type
+        expiry_date = license.expiry_date
         
         # Check if license has expired
         if expiry_date:
@@ -102,6 +96,7 @@ class License:
         return True, f"{license_type} license active"
     
     @staticmethod
+    @cached('licenses')
     def get_user_license(user_id):
         """Get the active license for a user"""
         conn = get_connection()
@@ -110,7 +105,7 @@ class License:
         cursor.execute('''
             SELECT license_id, user_id, license_key, license_type, issue_date, expiry_date, is_active
             FROM licenses
-            WHERE user_id = %s AND is_active = 1
+            WHERE user_id = %s AND is_active = TRUE
             ORDER BY license_id DESC
             LIMIT 1
         ''', (user_id,))
@@ -157,11 +152,12 @@ class License:
         # Update license to assign to this user
         cursor.execute('''
             UPDATE licenses
-            SET user_id = %s, is_active = 1
+            SET user_id = %s, is_active = TRUE
             WHERE license_key = %s
         ''', (user_id, license_key))
         
         conn.commit()
         conn.close()
+        LICENSE_CACHE.invalidate()
         
         return True, "License activated successfully"
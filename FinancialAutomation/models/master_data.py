@@ -1,6 +1,7 @@
 """Master data models for Major Heads, Minor Heads, and Groupings with CY & PY support"""
 
 from config.database import get_connection
+from config.reference_cache import cached, MASTER_DATA_CACHE
 
 class MajorHead:
     """
@@ -14,11 +15,12 @@ class MajorHead:
         self.company_id = company_id
         self.major_head_name = major_head_name
         self.category = category
-        self.opening_balance_cy = opening_balance_cy or 0.0
-        self.opening_balance_py = opening_balance_py or 0.0
+        self.opening_balance_cy = float(opening_balance_cy or 0)
+        self.opening_balance_py = float(opening_balance_py or 0)
         self.display_order = display_order
     
     @staticmethod
+    @cached('master_data')
     def get_all_by_company(company_id):
         """Get all active major heads for a company"""
         conn = get_connection()
@@ -28,7 +30,7 @@ class MajorHead:
             SELECT major_head_id, company_id, major_head_name, category,
                    opening_balance_cy, opening_balance_py, display_order
             FROM major_heads
-            WHERE company_id = %s AND is_active = 1
+            WHERE company_id = %s AND is_active = TRUE
             ORDER BY display_order, major_head_name
         ''', (company_id,))
         
@@ -61,6 +63,7 @@ class MajorHead:
         return []
     
     @staticmethod
+    @cached('master_data')
     def get_by_id(major_head_id):
         """Get major head by ID - returns tuple"""
         conn = get_connection()
@@ -70,7 +73,7 @@ class MajorHead:
             SELECT major_head_id, major_head_name, category, 
                    COALESCE(category, '') as description
             FROM major_heads
-            WHERE major_head_id = %s AND is_active = 1
+            WHERE major_head_id = %s AND is_active = TRUE
         ''', (major_head_id,))
         
         result = cursor.fetchone()
@@ -78,6 +81,28 @@ class MajorHead:
         
         return result
     
+    @staticmethod
+    def get_many(major_head_ids):
+        """Get major heads by ID in one query - returns {major_head_id: tuple as get_by_id}"""
+        ids = [int(i) for i in set(major_head_ids) if i is not None]
+        if not ids:
+            return {}
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT major_head_id, major_head_name, category, 
+                   COALESCE(category, '') as description
+            FROM major_heads
+            WHERE major_head_id = ANY(%s) AND is_active = TRUE
+        ''', (ids,))
+        
+        results = cursor.fetchall()
+        conn.close()
+        
+        return {row[0]: row for row in results}
+    
     @staticmethod
     def get_by_name(name):
         """Get major head by name"""
@@ -87,7 +112,7 @@ class MajorHead:
         cursor.execute('''
             SELECT major_head_id, major_head_name, category, display_order
             FROM major_heads
-            WHERE major_head_name = %s AND is_active = 1
+            WHERE major_head_name = %s AND is_active = TRUE
         ''', (name,))
         
         result = cursor.fetchone()
@@ -127,12 +152,14 @@ class MajorHead:
                 INSERT INTO major_heads (company_id, major_head_name, category, 
                                         opening_balance_cy, opening_balance_py, display_order)
                 VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING major_head_id
             ''', (company_id, major_head_name, category or description or '', 
                   opening_balance_cy or 0.0, opening_balance_py or 0.0, display_order))
             
             major_head_id = cursor.fetchone()[0]
             conn.commit()
             conn.close()
+            MASTER_DATA_CACHE.invalidate()
             return major_head_id
         except Exception as e:
             conn.close()
@@ -149,20 +176,21 @@ class MajorHead:
             if opening_balance_cy is not None and opening_balance_py is not None:
                 cursor.execute('''
                     UPDATE major_heads
-                    SET major_head_name = ?, category = ?, 
-                        opening_balance_cy = ?, opening_balance_py = ?
+                    SET major_head_name = %s, category = %s, 
+                        opening_balance_cy = %s, opening_balance_py = %s
                     WHERE major_head_id = %s
                 ''', (major_head_name, category or description or '', 
                       opening_balance_cy, opening_balance_py, major_head_id))
             else:
                 cursor.execute('''
                     UPDATE major_heads
-                    SET major_head_name = ?, category = ?
+                    SET major_head_name = %s, category = %s
                     WHERE major_head_id = %s
                 ''', (major_head_name, category or description or '', major_head_id))
             
             conn.commit()
             conn.close()
+            MASTER_DATA_CACHE.invalidate()
         except Exception as e:
             conn.close()
             raise e
@@ -175,12 +203,13 @@ class MajorHead:
         
         cursor.execute('''
             UPDATE major_heads
-            SET is_active = 0
+            SET is_active = FALSE
             WHERE major_head_id = %s
         ''', (major_head_id,))
         
         conn.commit()
         conn.close()
+        MASTER_DATA_CACHE.invalidate()
 
 
 class MinorHead:
@@ -193,11 +222,12 @@ class MinorHead:
         self.company_id = company_id
         self.minor_head_name = minor_head_name
         self.major_head_id = major_head_id
-        self.opening_balance_cy = opening_balance_cy or 0.0
-        self.opening_balance_py = opening_balance_py or 0.0
+        self.opening_balance_cy = float(opening_balance_cy or 0)
+        self.opening_balance_py = float(opening_balance_py or 0)
         self.display_order = display_order
     
     @staticmethod
+    @cached('master_data')
     def get_all(company_id=None, major_head_id=None):
         """Get all active minor heads, optionally filtered by company and major head - returns tuples"""
         conn = get_connection()
@@ -209,7 +239,7 @@ class MinorHead:
                        opening_balance_cy, opening_balance_py,
                        CAST(minor_head_id AS TEXT) as code, '' as description
                 FROM minor_heads
-                WHERE company_id = %s AND major_head_id = %s AND is_active = 1
+                WHERE company_id = %s AND major_head_id = %s AND is_active = TRUE
                 ORDER BY display_order, minor_head_name
             ''', (company_id, major_head_id))
         elif company_id:
@@ -218,7 +248,7 @@ class MinorHead:
                        opening_balance_cy, opening_balance_py,
                        CAST(minor_head_id AS TEXT) as code, '' as description
                 FROM minor_heads
-                WHERE company_id = %s AND is_active = 1
+                WHERE company_id = %s AND is_active = TRUE
                 ORDER BY major_head_id, display_order, minor_head_name
             ''', (company_id,))
         elif major_head_id:
@@ -227,7 +257,7 @@ class MinorHead:
                        opening_balance_cy, opening_balance_py,
                        CAST(minor_head_id AS TEXT) as code, '' as description
                 FROM minor_heads
-                WHERE major_head_id = %s AND is_active = 1
+                WHERE major_head_id = %s AND is_active = TRUE
                 ORDER BY display_order, minor_head_name
             ''', (major_head_id,))
         else:
@@ -236,7 +266,7 @@ class MinorHead:
                        opening_balance_cy, opening_balance_py,
                        CAST(minor_head_id AS TEXT) as code, '' as description
                 FROM minor_heads
-                WHERE is_active = 1
+                WHERE is_active = TRUE
                 ORDER BY company_id, major_head_id, display_order, minor_head_name
             ''')
         
@@ -246,6 +276,7 @@ class MinorHead:
         return results
     
     @staticmethod
+    @cached('master_data')
     def get_by_id(minor_head_id):
         """Get minor head by ID - returns tuple"""
         conn = get_connection()
@@ -255,7 +286,7 @@ class MinorHead:
             SELECT minor_head_id, major_head_id, minor_head_name, 
                    CAST(minor_head_id AS TEXT) as code, '' as description
             FROM minor_heads
-            WHERE minor_head_id = %s AND is_active = 1
+            WHERE minor_head_id = %s AND is_active = TRUE
         ''', (minor_head_id,))
         
         result = cursor.fetchone()
@@ -263,6 +294,28 @@ class MinorHead:
         
         return result
     
+    @staticmethod
+    def get_many(minor_head_ids):
+        """Get minor heads by ID in one query - returns {minor_head_id: tuple as get_by_id}"""
+        ids = [int(i) for i in set(minor_head_ids) if i is not None]
+        if not ids:
+            return {}
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT minor_head_id, major_head_id, minor_head_name, 
+                   CAST(minor_head_id AS TEXT) as code, '' as description
+            FROM minor_heads
+            WHERE minor_head_id = ANY(%s) AND is_active = TRUE
+        ''', (ids,))
+        
+        results = cursor.fetchall()
+        conn.close()
+        
+        return {row[0]: row for row in results}
+    
     @staticmethod
     def get_by_name_and_major(name, major_head_id):
         """Get minor head by name and major head"""
@@ -272,7 +325,7 @@ class MinorHead:
         cursor.execute('''
             SELECT minor_head_id, minor_head_name, major_head_id, display_order
             FROM minor_heads
-            WHERE minor_head_name = %s AND major_head_id = %s AND is_active = 1
+            WHERE minor_head_name = %s AND major_head_id = %s AND is_active = TRUE
         ''', (name, major_head_id))
         
         result = cursor.fetchone()
@@ -302,12 +355,14 @@ class MinorHead:
                 INSERT INTO minor_heads (company_id, minor_head_name, major_head_id, 
                                         opening_balance_cy, opening_balance_py, display_order)
                 VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING minor_head_id
             ''', (company_id, minor_head_name, major_head_id, 
                   opening_balance_cy or 0.0, opening_balance_py or 0.0, display_order))
             
             minor_head_id = cursor.fetchone()[0]
             conn.commit()
             conn.close()
+            MASTER_DATA_CACHE.invalidate()
             return minor_head_id
         except Exception as e:
             conn.close()
@@ -337,6 +392,7 @@ class MinorHead:
             
             conn.commit()
             conn.close()
+            MASTER_DATA_CACHE.invalidate()
         except Exception as e:
             conn.close()
             raise e
@@ -349,12 +405,13 @@ class MinorHead:
         
         cursor.execute('''
             UPDATE minor_heads
-            SET is_active = 0
+            SET is_active = FALSE
             WHERE minor_head_id = %s
         ''', (minor_head_id,))
         
         conn.commit()
         conn.close()
+        MASTER_DATA_CACHE.invalidate()
 
 
 class Grouping:
@@ -368,11 +425,12 @@ class Grouping:
         self.grouping_name = grouping_name
         self.minor_head_id = minor_head_id
         self.major_head_id = major_head_id
-        self.opening_balance_cy = opening_balance_cy or 0.0
-        self.opening_balance_py = opening_balance_py or 0.0
+        self.opening_balance_cy = float(opening_balance_cy or 0)
+        self.opening_balance_py = float(opening_balance_py or 0)
         self.display_order = display_order
     
     @staticmethod
+    @cached('master_data')
     def get_all(company_id=None, minor_head_id=None, major_head_id=None):
         """Get all active groupings, optionally filtered - returns tuples"""
         conn = get_connection()
@@ -384,7 +442,7 @@ class Grouping:
                        opening_balance_cy, opening_balance_py,
                        CAST(grouping_id AS TEXT) as code, '' as description
                 FROM groupings
-                WHERE company_id = %s AND minor_head_id = %s AND is_active = 1
+                WHERE company_id = %s AND minor_head_id = %s AND is_active = TRUE
                 ORDER BY display_order, grouping_name
             ''', (company_id, minor_head_id))
         elif company_id and major_head_id:
@@ -393,7 +451,7 @@ class Grouping:
                        opening_balance_cy, opening_balance_py,
                        CAST(grouping_id AS TEXT) as code, '' as description
                 FROM groupings
-                WHERE company_id = %s AND major_head_id = %s AND is_active = 1
+                WHERE company_id = %s AND major_head_id = %s AND is_active = TRUE
                 ORDER BY minor_head_id, display_order, grouping_name
             ''', (company_id, major_head_id))
         elif company_id:
@@ -402,7 +460,7 @@ class Grouping:
                        opening_balance_cy, opening_balance_py,
                        CAST(grouping_id AS TEXT) as code, '' as description
                 FROM groupings
-                WHERE company_id = %s AND is_active = 1
+                WHERE company_id = %s AND is_active = TRUE
                 ORDER BY major_head_id, minor_head_id, display_order, grouping_name
             ''', (company_id,))
         elif minor_head_id:
@@ -411,7 +469,7 @@ class Grouping:
                        opening_balance_cy, opening_balance_py,
                        CAST(grouping_id AS TEXT) as code, '' as description
                 FROM groupings
-                WHERE minor_head_id = %s AND is_active = 1
+                WHERE minor_head_id = %s AND is_active = TRUE
                 ORDER BY display_order, grouping_name
             ''', (minor_head_id,))
         elif major_head_id:
@@ -420,7 +478,7 @@ class Grouping:
                        opening_balance_cy, opening_balance_py,
                        CAST(grouping_id AS TEXT) as code, '' as description
                 FROM groupings
-                WHERE major_head_id = %s AND is_active = 1
+                WHERE major_head_id = %s AND is_active = TRUE
                 ORDER BY minor_head_id, display_order, grouping_name
             ''', (major_head_id,))
         else:
@@ -429,7 +487,7 @@ class Grouping:
                        opening_balance_cy, opening_balance_py,
                        CAST(grouping_id AS TEXT) as code, '' as description
                 FROM groupings
-                WHERE is_active = 1
+                WHERE is_active = TRUE
                 ORDER BY company_id, major_head_id, minor_head_id, display_order, grouping_name
             ''')
         
@@ -439,6 +497,7 @@ class Grouping:
         return results
     
     @staticmethod
+    @cached('master_data')
     def get_by_id(grouping_id):
         """Get grouping by ID - returns tuple"""
         conn = get_connection()
@@ -448,7 +507,7 @@ class Grouping:
             SELECT grouping_id, minor_head_id, grouping_name, 
                    CAST(grouping_id AS TEXT) as code, '' as description
             FROM groupings
-            WHERE grouping_id = %s AND is_active = 1
+            WHERE grouping_id = %s AND is_active = TRUE
         ''', (grouping_id,))
         
         result = cursor.fetchone()
@@ -456,6 +515,28 @@ class Grouping:
         
         return result
     
+    @staticmethod
+    def get_many(grouping_ids):
+        """Get groupings by ID in one query - returns {grouping_id: tuple as get_by_id}"""
+        ids = [int(i) for i in set(grouping_ids) if i is not None]
+        if not ids:
+            return {}
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT grouping_id, minor_head_id, grouping_name, 
+                   CAST(grouping_id AS TEXT) as code, '' as description
+            FROM groupings
+            WHERE grouping_id = ANY(%s) AND is_active = TRUE
+        ''', (ids,))
+        
+        results = cursor.fetchall()
+        conn.close()
+        
+        return {row[0]: row for row in results}
+    
     @staticmethod
     def get_by_name(name, minor_head_id=None, major_head_id=None):
         """Get grouping by name"""
@@ -466,19 +547,19 @@ class Grouping:
             cursor.execute('''
                 SELECT grouping_id, grouping_name, minor_head_id, major_head_id, display_order
                 FROM groupings
-                WHERE grouping_name = %s AND minor_head_id = %s AND is_active = 1
+                WHERE grouping_name = %s AND minor_head_id = %s AND is_active = TRUE
             ''', (name, minor_head_id))
         elif major_head_id:
             cursor.execute('''
                 SELECT grouping_id, grouping_name, minor_head_id, major_head_id, display_order
                 FROM groupings
-                WHERE grouping_name = %s AND major_head_id = %s AND is_active = 1
+                WHERE grouping_name = %s AND major_head_id = %s AND is_active = TRUE
             ''', (name, major_head_id))
         else:
             cursor.execute('''
                 SELECT grouping_id, grouping_name, minor_head_id, major_head_id, display_order
                 FROM groupings
-                WHERE grouping_name = %s AND is_active = 1
+                WHERE grouping_name = %s AND is_active = TRUE
             ''', (name,))
         
         result = cursor.fetchone()
@@ -518,12 +599,14 @@ class Grouping:
                 INSERT INTO groupings (company_id, grouping_name, minor_head_id, major_head_id,
                                       opening_balance_cy, opening_balance_py, display_order)
                 VALUES (%s, %s, %s, %s, %s, %s, %s)
+                RETURNING grouping_id
             ''', (company_id, grouping_name, minor_head_id, major_head_id,
                   opening_balance_cy or 0.0, opening_balance_py or 0.0, display_order))
             
             grouping_id = cursor.fetchone()[0]
             conn.commit()
             conn.close()
+            MASTER_DATA_CACHE.invalidate()
             return grouping_id
         except Exception as e:
             conn.close()
@@ -550,20 +633,21 @@ class Grouping:
             if opening_balance_cy is not None and opening_balance_py is not None:
                 cursor.execute('''
                     UPDATE groupings
-                    SET grouping_name = ?, minor_head_id = ?, major_head_id = ?,
-                        opening_balance_cy = ?, opening_balance_py = ?
+                    SET grouping_name = %s, minor_head_id = %s, major_head_id = %s,
+                        opening_balance_cy = %s, opening_balance_py = %s
                     WHERE grouping_id = %s
                 ''', (grouping_name, minor_head_id, major_head_id, 
                       opening_balance_cy, opening_balance_py, grouping_id))
             else:
                 cursor.execute('''
                     UPDATE groupings
-                    SET grouping_name = ?, minor_head_id = ?, major_head_id = ?
+                    SET grouping_name = %s, minor_head_id = %s, major_head_id = %s
                     WHERE grouping_id = %s
                 ''', (grouping_name, minor_head_id, major_head_id, grouping_id))
             
             conn.commit()
             conn.close()
+            MASTER_DATA_CACHE.invalidate()
         except Exception as e:
             conn.close()
             raise e
@@ -576,9 +660,10 @@ class Grouping:
         
         cursor.execute('''
             UPDATE groupings
-            SET is_active = 0
+            SET is_active = FALSE
             WHERE grouping_id = %s
         ''', (grouping_id,))
         
         conn.commit()
         conn.close()
+        MASTER_DATA_CACHE.invalidate()
@@ -0,0 +1,345 @@
+"""
+PDF Exporter for Schedule III Financial Statements
+Renders Balance Sheet, P&L, Cash Flow and Notes straight from the statement
+dictionaries. Sections are laid out in parallel worker threads (QPicture pages)
+and written to the PDF page by page, so memory stays bounded for large note sets.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterable, Callable, List
+
+from PyQt5.QtCore import Qt, QRectF, QMarginsF
+from PyQt5.QtGui import (QGuiApplication, QPdfWriter, QPainter, QPicture, QFont, QFontMetrics,
+                         QPageSize, QPageLayout, QColor)
+
+from models.excel_exporter import ExcelExporter
+
+_app = None
+
+
+def _ensure_gui_application():
+    """Fonts need a QGuiApplication - create one when exporting without the UI (benchmarks, scripts)"""
+    global _app
+    if QGuiApplication.instance() is None:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')  # no window is ever shown
+        _app = QGuiApplication([])
+
+
+class PDFExporter:
+    """Export financial statements to a multi-page A4 PDF"""
+
+    RESOLUTION = 72        # 1 device unit = 1 point
+    MARGIN = 36            # 0.5 inch
+    ROW_HEIGHT = 14
+    FOOTER_HEIGHT = 20
+    NOTE_WIDTH = 40
+    AMOUNT_WIDTH = 105
+
+    def __init__(self, company_name: str, fy_end: str, max_workers: Optional[int] = None):
+        self.company_name = company_name
+        self.fy_end = fy_end
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 1)
+
+        page = QPageSize(QPageSize.A4).sizePoints()
+        self.page_width = page.width() - 2 * self.MARGIN
+        self.page_height = page.height() - 2 * self.MARGIN
+        self.body_height = self.page_height - self.FOOTER_HEIGHT
+
+        _ensure_gui_application()
+        self.title_font = self._font(13, bold=True)
+        self.section_font = self._font(9, bold=True)
+        self.normal_font = self._font(9)
+        self.footer_font = self._font(7)
+
+    @staticmethod
+    def _font(pixel_size: int, bold: bool = False) -> QFont:
+        # Pixel sizes so QPicture pages replay at the same size on the PDF device
+        font = QFont('Bookman Old Style')
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export(self, filename: str, bs_data: Dict, pl_data: Dict, cf_data: Dict, notes: Dict,
+               note_numbers: Optional[Iterable[int]] = None,
+               progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Write the statements and notes to a PDF file
+
+        Args:
+            note_numbers: Notes to include (default: all)
+            progress: Optional callback(sections_done, sections_total)
+
+        Returns:
+            int: Number of pages written
+        """
+        if note_numbers is None:
+            note_numbers = sorted(notes)
+        sections = [(self._balance_sheet_section, (bs_data,)),
+                    (self._profit_loss_section, (pl_data,)),
+                    (self._cash_flow_section, (cf_data,))]
+        sections += [(self._note_section, (num, notes[num])) for num in note_numbers if num in notes]
+
+        writer = QPdfWriter(filename)
+        writer.setPageSize(QPageSize(QPageSize.A4))
+        writer.setResolution(self.RESOLUTION)
+        writer.setPageMargins(QMarginsF(self.MARGIN, self.MARGIN, self.MARGIN, self.MARGIN), QPageLayout.Point)
+        writer.setTitle(f"{self.company_name} - Financial Statements {self.fy_end}")
+        writer.setCreator('Financial Automation')
+
+        painter = QPainter(writer)
+        pages_written = 0
+        try:
+            # Keep a bounded window of sections in flight; pages are written in order
+            window = self.max_workers * 2
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = deque()
+                done = 0
+                for builder, args in sections:
+                    pending.append(executor.submit(self._render_section, builder, args))
+                    if len(pending) >= window:
+                        pages_written = self._write_pages(writer, painter, pending.popleft().result(),
+                                                          pages_written)
+                        done += 1
+                        if progress:
+                            progress(done, len(sections))
+                while pending:
+                    pages_written = self._write_pages(writer, painter, pending.popleft().result(),
+                                                      pages_written)
+                    done += 1
+                    if progress:
+                        progress(done, len(sections))
+        finally:
+            painter.end()
+
+        return pages_written
+
+    def _write_pages(self, writer: QPdfWriter, painter: QPainter, pages: List[QPicture], pages_written: int) -> int:
+        """Append rendered pages to the PDF with the running footer"""
+        for picture in pages:
+            if pages_written:
+                writer.newPage()
+            pages_written += 1
+            painter.drawPicture(0, 0, picture)
+
+            painter.setFont(self.footer_font)
+            painter.setPen(QColor('#666666'))
+            footer = QRectF(0, self.page_height - self.ROW_HEIGHT, self.page_width, self.ROW_HEIGHT)
+            painter.drawText(footer, Qt.AlignLeft | Qt.AlignVCenter, self.company_name)
+            painter.drawText(footer, Qt.AlignRight | Qt.AlignVCenter, f"Page {pages_written}")
+        return pages_written
+
+    # ------------------------------------------------------------------
+    # Page rendering (runs in worker threads)
+    # ------------------------------------------------------------------
+
+    def _render_section(self, builder: Callable, args: tuple) -> List[QPicture]:
+        """Lay out one section into page pictures; the header row repeats on continuation pages"""
+        title, subtitle, columns, rows = builder(*args)
+        pages = []
+        painter = None
+        y = 0
+
+        for row in rows:
+            if painter is None or y + self.ROW_HEIGHT > self.body_height:
+                if painter is not None:
+                    painter.end()
+                picture = QPicture()
+                pages.append(picture)
+                painter = QPainter(picture)
+                y = self._draw_heading(painter, title if len(pages) == 1 else f"{title} (continued)", subtitle)
+                y = self._draw_row(painter, y, ('header', columns[0], columns[1], columns[2], columns[3], 0))
+            y = self._draw_row(painter, y, row)
+
+        if painter is None:
+            picture = QPicture()
+            pages.append(picture)
+            painter = QPainter(picture)
+            self._draw_heading(painter, title, subtitle)
+        painter.end()
+        return pages
+
+    def _draw_heading(self, painter: QPainter, title: str, subtitle: Optional[str]) -> float:
+        painter.setPen(QColor('#000000'))
+        painter.setFont(self.title_font)
+        painter.drawText(QRectF(0, 0, self.page_width, 20), Qt.AlignCenter, self.company_name)
+        painter.setFont(self.section_font)
+        painter.drawText(QRectF(0, 20, self.page_width, 16), Qt.AlignCenter, title)
+        y = 36
+        if subtitle:
+            painter.setFont(self.normal_font)
+            painter.drawText(QRectF(0, y, self.page_width, 14), Qt.AlignCenter, subtitle)
+            y += 14
+        return y + 8
+
+    def _draw_row(self, painter: QPainter, y: float, row: tuple) -> float:
+        """Draw one (style, label, note, cy, py, indent) row"""
+        style, label, note, cy, py, indent = row
+        height = self.ROW_HEIGHT
+        if style == 'blank':
+            return y + height / 2
+
+        amount_x = self.page_width - 2 * self.AMOUNT_WIDTH
+        note_x = amount_x - self.NOTE_WIDTH
+
+        if style == 'header':
+            painter.fillRect(QRectF(0, y, self.page_width, height), QColor('#4472C4'))
+            painter.setPen(QColor('#FFFFFF'))
+            font = self.section_font
+        elif style == 'section':
+            painter.fillRect(QRectF(0, y, self.page_width, height), QColor('#E7E6E6'))
+            painter.setPen(QColor('#000000'))
+            font = self.section_font
+        elif style == 'total':
+            painter.fillRect(QRectF(0, y, self.page_width, height), QColor('#FFD966'))
+            painter.setPen(QColor('#000000'))
+            font = self.section_font
+        else:
+            painter.setPen(QColor('#000000'))
+            font = self.section_font if style == 'subtotal' else self.normal_font
+        painter.setFont(font)
+
+        text_x = 4 + 12 * indent
+        label_rect = QRectF(text_x, y, note_x - text_x - 4, height)
+        label = QFontMetrics(font).elidedText(str(label), Qt.ElideRight, int(label_rect.width()))
+        painter.drawText(label_rect, Qt.AlignLeft | Qt.AlignVCenter, label)
+
+        if note not in (None, ''):
+            painter.drawText(QRectF(note_x, y, self.NOTE_WIDTH, height), Qt.AlignCenter, str(note))
+        for x, value in ((amount_x, cy), (amount_x + self.AMOUNT_WIDTH, py)):
+            if value is not None:
+                text = value if isinstance(value, str) else f"{value:,.2f}"
+                painter.drawText(QRectF(x, y, self.AMOUNT_WIDTH - 4, height), Qt.AlignRight | Qt.AlignVCenter, text)
+
+        if style in ('subtotal', 'total'):
+            painter.setPen(QColor('#000000'))
+            painter.drawLine(int(amount_x), int(y), int(self.page_width), int(y))
+        return y + height
+
+    # ------------------------------------------------------------------
+    # Section layouts: (title, subtitle, column headers, rows)
+    # ------------------------------------------------------------------
+
+    def _balance_sheet_section(self, bs_data: Dict):
+        rows = []
+        for section_name, section_key, subsections in (
+                ('ASSETS', 'assets', ['non_current', 'current']),
+                ('EQUITY AND LIABILITIES', 'equity_and_liabilities',
+                 ['equity', 'non_current_liabilities', 'current_liabilities'])):
+            section_data = bs_data[section_key]
+            rows.append(('section', section_name, None, None, None, 0))
+            for subsection_key in subsections:
+                if subsection_key not in section_data:
+                    continue
+                subsection = section_data[subsection_key]
+                subsection_name = ExcelExporter._format_subsection_name(subsection_key)
+                rows.append(('item', subsection_name, None, None, None, 0))
+                for key, value in subsection.items():
+                    if isinstance(value, dict) and 'cy' in value and 'py' in value:
+                        rows.append(('item', ExcelExporter._format_line_item_name(key),
+                                     value.get('note'), value['cy'], value['py'], 1))
+                if 'total_cy' in subsection and 'total_py' in subsection:
+                    rows.append(('subtotal', f'Total {subsection_name}', None,
+                                 subsection['total_cy'], subsection['total_py'], 0))
+            rows.append(('total', f'TOTAL {section_name}', None,
+                         section_data['total_cy'], section_data['total_py'], 0))
+            rows.append(('blank', '', None, None, None, 0))
+
+        return (f'BALANCE SHEET AS AT {self.fy_end}', None,
+                ('Particulars', 'Note', 'Current Year', 'Previous Year'), rows)
+
+    def _profit_loss_section(self, pl_data: Dict):
+        rows = [
+            ('item', 'I. Revenue from Operations', None, pl_data['revenue']['cy'], pl_data['revenue']['py'], 0),
+            ('item', 'II. Other Income', None, pl_data['other_income']['cy'], pl_data['other_income']['py'], 0),
+            ('subtotal', 'III. Total Income (I + II)', None, pl_data['total_income_cy'], pl_data['total_income_py'], 0),
+            ('blank', '', None, None, None, 0),
+            ('section', 'IV. EXPENSES', None, None, None, 0),
+        ]
+        for key, value in pl_data['expenses'].items():
+            if isinstance(value, dict) and 'cy' in value:
+                rows.append(('item', ExcelExporter._format_line_item_name(key), None, value['cy'], value['py'], 1))
+        rows += [
+            ('subtotal', 'Total Expenses (IV)', None, pl_data['total_expenses_cy'], pl_data['total_expenses_py'], 0),
+            ('blank', '', None, None, None, 0),
+            ('subtotal', 'V. Profit/(Loss) before Tax (III - IV)', None,
+             pl_data['profit_before_tax_cy'], pl_data['profit_before_tax_py'], 0),
+            ('item', 'VI. Tax Expense', None, pl_data['tax_cy'], pl_data['tax_py'], 0),
+            ('total', 'VII. Profit/(Loss) for the Year (V - VI)', None,
+             pl_data['profit_after_tax_cy'], pl_data['profit_after_tax_py'], 0),
+        ]
+        return (f'STATEMENT OF PROFIT AND LOSS FOR THE YEAR ENDED {self.fy_end}', None,
+                ('Particulars', 'Note', 'Current Year', 'Previous Year'), rows)
+
+    def _cash_flow_section(self, cf_data: Dict):
+        rows = []
+        for section_name, key in (('A. CASH FLOW FROM OPERATING ACTIVITIES', 'operating_activities'),
+                                  ('B. CASH FLOW FROM INVESTING ACTIVITIES', 'investing_activities'),
+                                  ('C. CASH FLOW FROM FINANCING ACTIVITIES', 'financing_activities')):
+            section_data = dict(cf_data[key])
+            net_cash = (section_data.pop('net_cash_cy', 0), section_data.pop('net_cash_py', 0))
+            rows.append(('section', section_name, None, None, None, 0))
+            rows += self._data_rows(section_data, 1)
+            rows.append(('subtotal', f'Net Cash from {section_name.split("FROM")[-1].strip().title()}',
+                         None, net_cash[0], net_cash[1], 0))
+            rows.append(('blank', '', None, None, None, 0))
+        rows += [
+            ('total', 'Net Increase/(Decrease) in Cash and Cash Equivalents (A+B+C)', None,
+             cf_data['net_increase_cy'], cf_data['net_increase_py'], 0),
+            ('item', 'Cash and Cash Equivalents at Beginning of Year', None,
+             cf_data['opening_cash_cy'], cf_data['opening_cash_py'], 0),
+            ('total', 'Cash and Cash Equivalents at End of Year', None,
+             cf_data['closing_cash_cy'], cf_data['closing_cash_py'], 0),
+        ]
+        return (f'CASH FLOW STATEMENT FOR THE YEAR ENDED {self.fy_end}', '(Indirect Method)',
+                ('Particulars', '', 'Current Year', 'Previous Year'), rows)
+
+    def _note_section(self, note_num: int, note_data: Dict):
+        rows = self.note_rows(note_data)
+        return (note_data.get('title', f'Note {note_num}'), None,
+                ('Particulars', '', 'Current Year', 'Previous Year'), rows)
+
+    @classmethod
+    def note_rows(cls, note_data: Dict) -> list:
+        """Display rows (style, label, note, cy, py, indent) of one note, ending with its total"""
+        rows = cls._data_rows(note_data.get('data') or {}, 0)
+        rows.append(('total', 'TOTAL', None, note_data.get('total_cy', 0), note_data.get('total_py', 0), 0))
+        return rows
+
+    @classmethod
+    def _data_rows(cls, data: Any, indent: int) -> list:
+        """Rows for nested note / cash flow data: {cy, py} pairs, *_cy/*_py keys, sections and lists"""
+        rows = []
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    rows.append(cls._list_item_row(item, indent))
+            return rows
+
+        for key, value in data.items():
+            if key.endswith('_py'):
+                continue
+            if isinstance(value, dict) and 'cy' in value and 'py' in value:
+                rows.append(('item', cls._label(key), None, value['cy'], value['py'], indent))
+            elif isinstance(value, (dict, list)):
+                rows.append(('section', cls._label(key), None, None, None, indent))
+                rows += cls._data_rows(value, indent + 1)
+            elif key.endswith('_cy') and isinstance(value, (int, float)):
+                rows.append(('item', cls._label(key[:-3]), None,
+                             value, data.get(key[:-3] + '_py'), indent))
+        return rows
+
+    @staticmethod
+    def _label(key: str) -> str:
+        # Field keys (snake_case) get display names; category names are already readable
+        return ExcelExporter._format_line_item_name(key) if key.islower() else key
+
+    @staticmethod
+    def _list_item_row(item: Dict, indent: int) -> tuple:
+        label, cy, py = ExcelExporter._list_item_values(item)
+        return ('item', label, None, cy, py, indent)
@@ -1,6 +1,7 @@
 """Property, Plant & Equipment (PPE) Model - Schedule III Note 1"""
 
 from config.database import get_connection
+from models.batch_writer import save_batch
 from datetime import datetime
 
 class PPE:
@@ -22,28 +23,28 @@ class PPE:
         self.asset_class = asset_class
         
         # Current Year
-        self.opening_gross_block_cy = opening_gross_block_cy or 0.0
-        self.additions_cy = additions_cy or 0.0
-        self.disposals_gross_cy = disposals_gross_cy or 0.0
-        self.closing_gross_block_cy = closing_gross_block_cy or 0.0
+        self.opening_gross_block_cy = float(opening_gross_block_cy or 0)
+        self.additions_cy = float(additions_cy or 0)
+        self.disposals_gross_cy = float(disposals_gross_cy or 0)
+        self.closing_gross_block_cy = float(closing_gross_block_cy or 0)
         
-        self.opening_acc_depreciation_cy = opening_acc_depreciation_cy or 0.0
-        self.depreciation_for_year_cy = depreciation_for_year_cy or 0.0
-        self.acc_depr_on_disposals_cy = acc_depr_on_disposals_cy or 0.0
-        self.closing_acc_depreciation_cy = closing_acc_depreciation_cy or 0.0
+        self.opening_acc_depreciation_cy = float(opening_acc_depreciation_cy or 0)
+        self.depreciation_for_year_cy = float(depreciation_for_year_cy or 0)
+        self.acc_depr_on_disposals_cy = float(acc_depr_on_disposals_cy or 0)
+        self.closing_acc_depreciation_cy = float(closing_acc_depreciation_cy or 0)
         
         # Previous Year
-        self.opening_gross_block_py = opening_gross_block_py or 0.0
-        self.additions_py = additions_py or 0.0
-        self.disposals_gross_py = disposals_gross_py or 0.0
-        self.closing_gross_block_py = closing_gross_block_py or 0.0
+        self.opening_gross_block_py = float(opening_gross_block_py or 0)
+        self.additions_py = float(additions_py or 0)
+        self.disposals_gross_py = float(disposals_gross_py or 0)
+        self.closing_gross_block_py = float(closing_gross_block_py or 0)
         
-        self.opening_acc_depreciation_py = opening_acc_depreciation_py or 0.0
-        self.depreciation_for_year_py = depreciation_for_year_py or 0.0
-        self.acc_depr_on_disposals_py = acc_depr_on_disposals_py or 0.0
-        self.closing_acc_depreciation_py = closing_acc_depreciation_py or 0.0
+        self.opening_acc_depreciation_py = float(opening_acc_depreciation_py or 0)
+        self.depreciation_for_year_py = float(depreciation_for_year_py or 0)
+        self.acc_depr_on_disposals_py = float(acc_depr_on_disposals_py or 0)
+        self.closing_acc_depreciation_py = float(closing_acc_depreciation_py or 0)
         
-        self.depreciation_rate = depreciation_rate or 0.0
+        self.depreciation_rate = float(depreciation_rate or 0)
         self.useful_life_years = useful_life_years or 0
     
     def calculate_closing_gross_block_cy(self):
@@ -127,6 +128,34 @@ class PPE:
             return PPE(*row)
         return None
     
+    @staticmethod
+    def get_many(ppe_ids):
+        """Get PPE entries by ID in one query - returns {ppe_id: PPE}"""
+        ids = [int(i) for i in set(ppe_ids) if i is not None]
+        if not ids:
+            return {}
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT ppe_id, company_id, asset_class,
+                   opening_gross_block_cy, additions_cy, disposals_gross_cy, closing_gross_block_cy,
+                   opening_acc_depreciation_cy, depreciation_for_year_cy,
+                   acc_depr_on_disposals_cy, closing_acc_depreciation_cy,
+                   opening_gross_block_py, additions_py, disposals_gross_py, closing_gross_block_py,
+                   opening_acc_depreciation_py, depreciation_for_year_py,
+                   acc_depr_on_disposals_py, closing_acc_depreciation_py,
+                   depreciation_rate, useful_life_years
+            FROM ppe_schedule
+            WHERE ppe_id = ANY(%s)
+        ''', (ids,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return {row[0]: PPE(*row) for row in rows}
+    
     @staticmethod
     def create(company_id, asset_class, 
                opening_gross_block_cy=0.0, additions_cy=0.0, disposals_gross_cy=0.0,
@@ -159,6 +188,7 @@ class PPE:
                     acc_depr_on_disposals_py, closing_acc_depreciation_py,
                     depreciation_rate, useful_life_years
                 ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING ppe_id
             ''', (company_id, asset_class,
                   opening_gross_block_cy, additions_cy, disposals_gross_cy, closing_gross_block_cy,
                   opening_acc_depreciation_cy, depreciation_for_year_cy,
@@ -201,16 +231,16 @@ class PPE:
         try:
             cursor.execute('''
                 UPDATE ppe_schedule SET
-                    asset_class = ?,
-                    opening_gross_block_cy = ?, additions_cy = ?, disposals_gross_cy = ?,
-                    closing_gross_block_cy = ?,
-                    opening_acc_depreciation_cy = ?, depreciation_for_year_cy = ?,
-                    acc_depr_on_disposals_cy = ?, closing_acc_depreciation_cy = ?,
-                    opening_gross_block_py = ?, additions_py = ?, disposals_gross_py = ?,
-                    closing_gross_block_py = ?,
-                    opening_acc_depreciation_py = ?, depreciation_for_year_py = ?,
-                    acc_depr_on_disposals_py = ?, closing_acc_depreciation_py = ?,
-                    depreciation_rate = ?, useful_life_years = ?,
+                    asset_class = %s,
+                    opening_gross_block_cy = %s, additions_cy = %s, disposals_gross_cy = %s,
+                    closing_gross_block_cy = %s,
+                    opening_acc_depreciation_cy = %s, depreciation_for_year_cy = %s,
+                    acc_depr_on_disposals_cy = %s, closing_acc_depreciation_cy = %s,
+                    opening_gross_block_py = %s, additions_py = %s, disposals_gross_py = %s,
+                    closing_gross_block_py = %s,
+                    opening_acc_depreciation_py = %s, depreciation_for_year_py = %s,
+                    acc_depr_on_disposals_py = %s, closing_acc_depreciation_py = %s,
+                    depreciation_rate = %s, useful_life_years = %s,
                     updated_at = NOW()
                 WHERE ppe_id = %s
             ''', (asset_class,
@@ -246,6 +276,47 @@ class PPE:
         finally:
             conn.close()
     
+    # Columns written by save_batch (closing values are derived)
+    SAVE_COLUMNS = [
+        'asset_class',
+        'opening_gross_block_cy', 'additions_cy', 'disposals_gross_cy', 'closing_gross_block_cy',
+        'opening_acc_depreciation_cy', 'depreciation_for_year_cy',
+        'acc_depr_on_disposals_cy', 'closing_acc_depreciation_cy',
+        'opening_gross_block_py', 'additions_py', 'disposals_gross_py', 'closing_gross_block_py',
+        'opening_acc_depreciation_py', 'depreciation_for_year_py',
+        'acc_depr_on_disposals_py', 'closing_acc_depreciation_py',
+        'depreciation_rate', 'useful_life_years'
+    ]
+    
+    @staticmethod
+    def _save_values(entry):
+        """SAVE_COLUMNS values for a dict of create()/update() arguments"""
+        ppe = PPE(**{k: v for k, v in entry.items() if k != 'ppe_id'})
+        ppe.closing_gross_block_cy = ppe.calculate_closing_gross_block_cy()
+        ppe.closing_acc_depreciation_cy = ppe.calculate_closing_acc_depreciation_cy()
+        ppe.closing_gross_block_py = ppe.calculate_closing_gross_block_py()
+        ppe.closing_acc_depreciation_py = ppe.calculate_closing_acc_depreciation_py()
+        return tuple(getattr(ppe, column) for column in PPE.SAVE_COLUMNS)
+    
+    @staticmethod
+    def save_batch(company_id, new_entries=(), changed_entries=(), deleted_ids=()):
+        """
+        Save an input form's changes in one transaction
+        
+        Args:
+            new_entries: dicts of create() arguments
+            changed_entries: dicts of update() arguments (including ppe_id)
+            deleted_ids: PPE IDs to delete
+        
+        Returns:
+            list: ppe_id of each new entry, in order
+        """
+        return save_batch(
+            'ppe_schedule', 'ppe_id', company_id, PPE.SAVE_COLUMNS,
+            inserts=[PPE._save_values(entry) for entry in new_entries],
+            updates=[(entry['ppe_id'],) + PPE._save_values(entry) for entry in changed_entries],
+            deletes=deleted_ids, extra_set='updated_at = NOW()')
+    
     @staticmethod
     def get_schedule_iii_format(company_id):
         """
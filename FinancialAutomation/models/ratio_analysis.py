@@ -0,0 +1,254 @@
+"""
+Ratio Analysis - Schedule III (Division I) Additional Regulatory Information
+Computes the prescribed ratios for CY and PY from already generated statements
+and flags variances above 25% that require an explanation in the notes.
+"""
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import numpy as np
+
+
+# Schedule III requires explanation for any change in a ratio of more than 25%
+VARIANCE_THRESHOLD = 25.0
+
+# P&L expense lines that make up purchases (Schedule III Part II)
+PURCHASE_LINES = ('cost_of_materials_consumed', 'purchases_of_stock_in_trade', 'changes_in_inventories')
+
+# Column positions in the (companies x years) component matrices
+CY = 0
+PY = 1
+
+# Ratio definitions in Schedule III order
+RATIO_DEFINITIONS = [
+    {'key': 'current_ratio', 'name': 'Current Ratio', 'unit': 'times',
+     'numerator': 'current_assets', 'denominator': 'current_liabilities',
+     'formula': 'Current Assets / Current Liabilities'},
+    {'key': 'debt_equity_ratio', 'name': 'Debt-Equity Ratio', 'unit': 'times',
+     'numerator': 'total_debt', 'denominator': 'equity',
+     'formula': 'Total Debt / Shareholders\' Equity'},
+    {'key': 'debt_service_coverage_ratio', 'name': 'Debt Service Coverage Ratio', 'unit': 'times',
+     'numerator': 'earnings_for_debt_service', 'denominator': 'debt_service',
+     'formula': '(PAT + Depreciation + Finance Costs) / (Finance Costs + Current Borrowings)'},
+    {'key': 'return_on_equity', 'name': 'Return on Equity Ratio', 'unit': '%',
+     'numerator': 'profit_after_tax', 'denominator': 'average_equity',
+     'formula': 'Profit After Tax / Average Shareholders\' Equity'},
+    {'key': 'inventory_turnover', 'name': 'Inventory Turnover Ratio', 'unit': 'times',
+     'numerator': 'revenue', 'denominator': 'average_inventories',
+     'formula': 'Revenue from Operations / Average Inventory'},
+    {'key': 'trade_receivables_turnover', 'name': 'Trade Receivables Turnover Ratio', 'unit': 'times',
+     'numerator': 'revenue', 'denominator': 'average_trade_receivables',
+     'formula': 'Revenue from Operations / Average Trade Receivables'},
+    {'key': 'trade_payables_turnover', 'name': 'Trade Payables Turnover Ratio', 'unit': 'times',
+     'numerator': 'purchases', 'denominator': 'average_trade_payables',
+     'formula': 'Purchases (Materials Consumed + Stock-in-Trade ± Change in Inventories) / Average Trade Payables'},
+    {'key': 'net_capital_turnover', 'name': 'Net Capital Turnover Ratio', 'unit': 'times',
+     'numerator': 'revenue', 'denominator': 'working_capital',
+     'formula': 'Revenue from Operations / Working Capital'},
+    {'key': 'net_profit_ratio', 'name': 'Net Profit Ratio', 'unit': '%',
+     'numerator': 'profit_after_tax', 'denominator': 'revenue',
+     'formula': 'Profit After Tax / Revenue from Operations'},
+    {'key': 'return_on_capital_employed', 'name': 'Return on Capital Employed', 'unit': '%',
+     'numerator': 'ebit', 'denominator': 'capital_employed',
+     'formula': 'Earnings Before Interest and Tax / Capital Employed'},
+    {'key': 'return_on_investment', 'name': 'Return on Investment', 'unit': '%',
+     'numerator': 'other_income', 'denominator': 'investments',
+     'formula': 'Other Income / Investments'},
+]
+
+
+def _pair(node: Optional[Dict[str, Any]]) -> Tuple[float, float]:
+    """Read a {'cy': x, 'py': y} node from the statement dictionaries"""
+    if not node:
+        return (0.0, 0.0)
+    return (float(node.get('cy', 0) or 0), float(node.get('py', 0) or 0))
+
+
+def _totals(node: Optional[Dict[str, Any]]) -> Tuple[float, float]:
+    """Read total_cy/total_py from a statement section"""
+    if not node:
+        return (0.0, 0.0)
+    return (float(node.get('total_cy', 0) or 0), float(node.get('total_py', 0) or 0))
+
+
+def _purchases(expenses: Dict[str, Any]) -> Tuple[float, float]:
+    """Purchases from the P&L lines - NaN (ratio not computed) if the P&L shows none of them"""
+    lines = [_pair(expenses[key]) for key in PURCHASE_LINES if expenses.get(key)]
+    if not lines:
+        return (np.nan, np.nan)
+    return (sum(line[CY] for line in lines), sum(line[PY] for line in lines))
+
+
+def _borrowing_items(items: List[Dict[str, Any]]) -> Tuple[float, float]:
+    """Sum mapped liability items that look like borrowings"""
+    cy_total = 0.0
+    py_total = 0.0
+    for item in items or []:
+        particulars = str(item.get('particulars', '')).lower()
+        if 'borrow' in particulars or 'loan' in particulars:
+            cy_total += abs(float(item.get('amount_cy', 0) or 0))
+            py_total += abs(float(item.get('amount_py', 0) or 0))
+    return (cy_total, py_total)
+
+
+def extract_components(bs_data: Dict[str, Any], pl_data: Dict[str, Any],
+                       notes: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[str, Tuple[float, float]]:
+    """
+    Pull the raw (CY, PY) amounts needed for the ratios out of generated statements.
+    No database access - works purely on the generator outputs.
+
+    Args:
+        bs_data: Output of BalanceSheetGenerator.generate()
+        pl_data: Output of ProfitLossGenerator.generate()
+        notes: Optional output of NotesGenerator.generate_all_notes(), used for borrowings
+
+    Returns:
+        dict: component name -> (cy, py)
+    """
+    assets = bs_data.get('assets', {})
+    non_current_assets = assets.get('non_current', {})
+    current_assets = assets.get('current', {})
+    equity_liab = bs_data.get('equity_and_liabilities', {})
+    non_current_liab = equity_liab.get('non_current_liabilities', {})
+    current_liab = equity_liab.get('current_liabilities', {})
+    expenses = pl_data.get('expenses', {})
+
+    # Borrowings - prefer Notes 18/23, fall back to mapped liability items
+    if notes and (18 in notes or 23 in notes):
+        non_current_borrowings = _totals(notes.get(18))
+        current_borrowings = _totals(notes.get(23))
+    else:
+        non_current_borrowings = _borrowing_items(non_current_liab.get('items', []))
+        current_borrowings = _borrowing_items(current_liab.get('items', []))
+
+    return {
+        'current_assets': _totals(current_assets),
+        'current_liabilities': _totals(current_liab),
+        'inventories': _pair(current_assets.get('inventories')),
+        'trade_receivables': _pair(current_assets.get('trade_receivables')),
+        'trade_payables': _pair(current_liab.get('trade_payables')),
+        'investments': tuple(a + b for a, b in zip(_pair(non_current_assets.get('investments')),
+                                                   _pair(current_assets.get('investments')))),
+        'equity': _totals(equity_liab.get('equity')),
+        'non_current_borrowings': non_current_borrowings,
+        'current_borrowings': current_borrowings,
+        'revenue': _pair(pl_data.get('revenue')),
+        'other_income': _pair(pl_data.get('other_income')),
+        'depreciation': _pair(expenses.get('depreciation')),
+        'finance_costs': _pair(expenses.get('finance_costs')),
+        'purchases': _purchases(expenses),
+        'profit_before_tax': (float(pl_data.get('profit_before_tax_cy', 0) or 0),
+                              float(pl_data.get('profit_before_tax_py', 0) or 0)),
+        'profit_after_tax': (float(pl_data.get('profit_after_tax_cy', 0) or 0),
+                             float(pl_data.get('profit_after_tax_py', 0) or 0)),
+    }
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division returning NaN where the denominator is zero"""
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _average(closing: np.ndarray) -> np.ndarray:
+    """Average balance per year - CY uses PY closing as opening, PY has no opening so uses closing"""
+    average = closing.copy()
+    average[:, CY] = (closing[:, CY] + closing[:, PY]) / 2
+    return average
+
+
+class RatioAnalyzer:
+    """Compute Schedule III ratios for one or many companies in a single vectorised pass"""
+
+    def __init__(self, threshold: float = VARIANCE_THRESHOLD):
+        self.threshold = threshold
+
+    def analyze(self, bs_data: Dict[str, Any], pl_data: Dict[str, Any],
+                notes: Optional[Dict[int, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Analyze a single company's generated statements"""
+        return self.analyze_batch([(bs_data, pl_data, notes)])[0]
+
+    def analyze_snapshot(self, snapshot) -> List[Dict[str, Any]]:
+        """Analyze a StatementSnapshot without regenerating statements"""
+        return self.analyze(snapshot.balance_sheet, snapshot.profit_loss, snapshot.notes)
+
+    def analyze_batch(self, statements: Sequence[Tuple]) -> List[List[Dict[str, Any]]]:
+        """
+        Analyze many companies at once.
+
+        Args:
+            statements: Sequence of (bs_data, pl_data) or (bs_data, pl_data, notes) tuples
+
+        Returns:
+            list: One list of ratio rows per company, in input order
+        """
+        if not statements:
+            return []
+
+        components = [extract_components(*entry) for entry in statements]
+        ratios, variances = self.compute(self.build_matrix(components))
+
+        results = []
+        for index in range(len(components)):
+            rows = []
+            for definition in RATIO_DEFINITIONS:
+                key = definition['key']
+                variance = variances[key][index]
+                rows.append({
+                    'key': key,
+                    'name': definition['name'],
+                    'formula': definition['formula'],
+                    'unit': definition['unit'],
+                    'cy': self._to_python(ratios[key][index, CY]),
+                    'py': self._to_python(ratios[key][index, PY]),
+                    'variance_pct': self._to_python(variance),
+                    'requires_explanation': bool(not np.isnan(variance) and abs(variance) > self.threshold)
+                })
+            results.append(rows)
+        return results
+
+    @staticmethod
+    def build_matrix(components: List[Dict[str, Tuple[float, float]]]) -> Dict[str, np.ndarray]:
+        """Stack per-company components into (companies x [CY, PY]) arrays"""
+        names = components[0].keys()
+        return {
+            name: np.array([component[name] for component in components], dtype=float)
+            for name in names
+        }
+
+    def compute(self, matrix: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """
+        Compute every ratio and its CY vs PY variance across all companies.
+
+        Returns:
+            tuple: (ratios {key: (n x 2) array}, variances {key: (n,) array of % change})
+        """
+        derived = dict(matrix)
+        derived['total_debt'] = matrix['non_current_borrowings'] + matrix['current_borrowings']
+        derived['earnings_for_debt_service'] = (matrix['profit_after_tax'] + matrix['depreciation'] +
+                                                matrix['finance_costs'])
+        derived['debt_service'] = matrix['finance_costs'] + matrix['current_borrowings']
+        derived['working_capital'] = matrix['current_assets'] - matrix['current_liabilities']
+        derived['ebit'] = matrix['profit_before_tax'] + matrix['finance_costs']
+        derived['capital_employed'] = matrix['equity'] + derived['total_debt']
+        derived['average_equity'] = _average(matrix['equity'])
+        derived['average_inventories'] = _average(matrix['inventories'])
+        derived['average_trade_receivables'] = _average(matrix['trade_receivables'])
+        derived['average_trade_payables'] = _average(matrix['trade_payables'])
+
+        ratios = {}
+        variances = {}
+        for definition in RATIO_DEFINITIONS:
+            values = _safe_divide(derived[definition['numerator']], derived[definition['denominator']])
+            if definition['unit'] == '%':
+                values = values * 100
+            ratios[definition['key']] = values
+            variances[definition['key']] = _safe_divide(values[:, CY] - values[:, PY],
+                                                        np.abs(values[:, PY])) * 100
+        return ratios, variances
+
+    @staticmethod
+    def _to_python(value) -> Optional[float]:
+        """Convert numpy scalar to float, NaN (not computable) to None"""
+        if np.isnan(value):
+            return None
+        return round(float(value), 4)
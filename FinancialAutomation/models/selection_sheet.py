@@ -3,8 +3,9 @@ Selection Sheet Model
 Manages note selection for financial statements based on Trial Balance analysis
 """
 
+import numpy as np
 from config.database import get_connection
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Callable
 
 
 class SelectionSheet:
@@ -153,45 +154,57 @@ class SelectionSheet:
         return [SelectionSheet(*row) for row in results]
     
     @staticmethod
-    def update_system_recommendations(company_id: int):
-        """Update system recommendations based on Trial Balance major heads"""
+    def update_system_recommendations(company_id: int, progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Update system recommendations based on Trial Balance major heads
+        
+        Args:
+            progress: Optional callback(notes updated, notes) - may raise to stop
+                (the updates so far are rolled back)
+        """
         from models.trial_balance import TrialBalance
         
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Get all major heads from Trial Balance
-        tb_entries = TrialBalance.get_by_company(company_id)
-        major_heads = set()
-        
-        for entry in tb_entries:
-            if entry.major_head_id:
-                from models.master_data import MajorHead
-                major_head = MajorHead.get_by_id(entry.major_head_id)
-                if major_head:
-                    major_heads.add(major_head.major_head_name)
-        
-        # Update recommendations based on linked major heads
-        cursor.execute('''
-            SELECT selection_id, linked_major_head
-            FROM selection_sheet
-            WHERE company_id = %s
-        ''', (company_id,))
-        
-        for selection_id, linked_major_head in cursor.fetchall():
-            if linked_major_head and linked_major_head in major_heads:
-                recommendation = 'Yes'
-            else:
-                recommendation = 'No'
+        try:
+            # Get all major heads from Trial Balance (distinct ids looked up in one query)
+            from models.master_data import MajorHead
+            frame = TrialBalance.get_frame(company_id, columns=['major_head_id'])
+            major_head_ids = [int(major_head_id) for major_head_id in np.unique(frame['major_head_id'])
+                              if major_head_id]
+            major_heads = {major_head[1] for major_head in MajorHead.get_many(major_head_ids).values()}  # major_head_name
             
+            # Update recommendations based on linked major heads
             cursor.execute('''
-                UPDATE selection_sheet
-                SET system_recommendation = %s
-                WHERE selection_id = %s
-            ''', (recommendation, selection_id))
+                SELECT selection_id, linked_major_head
+                FROM selection_sheet
+                WHERE company_id = %s
+            ''', (company_id,))
+            
+            rows = cursor.fetchall()
+            for done, (selection_id, linked_major_head) in enumerate(rows, 1):
+                if linked_major_head and linked_major_head in major_heads:
+                    recommendation = 'Yes'
+                else:
+                    recommendation = 'No'
+                
+                cursor.execute('''
+                    UPDATE selection_sheet
+                    SET system_recommendation = %s
+                    WHERE selection_id = %s
+                ''', (recommendation, selection_id))
+                if progress:
+                    progress(done, len(rows))
+            
+            conn.commit()
         
-        conn.commit()
-        conn.close()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        
+        finally:
+            conn.close()
     
     @staticmethod
     def update_user_selection(selection_id: int, user_selection: str):
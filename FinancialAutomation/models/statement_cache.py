@@ -0,0 +1,129 @@
+"""
+Statement Cache - generated statements persisted per company and data version
+The data version is a per-company change counter bumped by triggers on every
+table the statements are built from (see config.database.VERSIONED_TABLES).
+"""
+
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from config.database import get_connection
+from config.db_connection import get_dialect
+from config.settings import APP_VERSION
+from models.financial_statements import StatementSnapshot
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode(obj):
+    if '__date__' in obj:
+        return date.fromisoformat(obj['__date__'])
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+class StatementCache:
+    """Persistent cache of StatementSnapshot outputs"""
+
+    @staticmethod
+    def get_data_version(company_id: int) -> int:
+        """Current data version of a company (0 if nothing was ever written)"""
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT version FROM data_versions WHERE company_id = %s', (company_id,))
+        result = cursor.fetchone()
+        conn.close()
+
+        return result[0] if result else 0
+
+    @staticmethod
+    def load(company_id: int) -> Optional[StatementSnapshot]:
+        """Cached statements if they were generated at the current data version, else None"""
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT c.payload, c.generated_at
+            FROM statement_cache c
+            LEFT JOIN data_versions v ON v.company_id = c.company_id
+            WHERE c.company_id = %s AND c.data_version = COALESCE(v.version, 0)
+        ''', (company_id,))
+        result = cursor.fetchone()
+        conn.close()
+
+        if not result:
+            return None
+
+        payload = json.loads(result[0], object_hook=_decode)
+        if payload.get('app_version') != APP_VERSION:
+            return None  # Generated by another release - layouts may differ
+        notes = payload['notes']
+        snapshot = StatementSnapshot(
+            company_id, payload['balance_sheet'], payload['profit_loss'], payload['cash_flow'],
+            {int(note_num): note for note_num, note in notes.items()} if notes is not None else None)
+        snapshot.generated_at = result[1]
+        return snapshot
+
+    @staticmethod
+    def save(snapshot: StatementSnapshot, data_version: int):
+        """
+        Store generated statements
+
+        Args:
+            snapshot: Generated statements
+            data_version: Version read BEFORE generating, so changes made meanwhile invalidate it
+        """
+        payload = json.dumps({
+            'app_version': APP_VERSION,
+            'balance_sheet': snapshot.balance_sheet,
+            'profit_loss': snapshot.profit_loss,
+            'cash_flow': snapshot.cash_flow,
+            'notes': snapshot.notes,
+        }, default=_encode)
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                get_dialect().upsert('statement_cache', ['company_id', 'data_version', 'payload', 'generated_at'],
+                                     ['company_id']),
+                (snapshot.company_id, data_version, payload, snapshot.generated_at))
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            conn.close()
+
+    @staticmethod
+    def get_or_generate(company_id: int, progress=None) -> StatementSnapshot:
+        """Cached statements when the data has not changed, otherwise generate (progress: see
+        StatementSnapshot.generate) and cache them"""
+        snapshot = StatementCache.load(company_id)
+        if snapshot is None:
+            data_version = StatementCache.get_data_version(company_id)
+            snapshot = StatementSnapshot.generate(company_id, progress=progress)
+            StatementCache.save(snapshot, data_version)
+        return snapshot
+
+    @staticmethod
+    def invalidate(company_id: int):
+        """Drop the cached statements of a company"""
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('DELETE FROM statement_cache WHERE company_id = %s', (company_id,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,267 @@
+"""
+Trial Balance File Import
+Reads trial balance files (CSV or Excel) into the trial balance, one file or
+many - e.g. one per branch. Files are parsed in parallel worker processes, each
+with the shared column mapping or the mapping detected for its header layout;
+ledgers can be merged by name across files, keeping each branch's share.
+"""
+
+import os
+import pandas as pd
+from config.database import get_connection
+from config.db_connection import get_dialect
+from config.jobs import map_in_processes
+from models.gl_journal import parse_amounts
+from models.trial_balance import TrialBalance, TrialBalanceFrame
+
+TB_FIELDS = ('ledger_name',) + TrialBalanceFrame.AMOUNT_COLUMNS
+
+# Header fragments recognized for each trial balance field
+COLUMN_RULES = {
+    'ledger_name': ['ledger', 'account', 'particulars', 'name', 'ledger name', 'account name'],
+    'opening_balance_cy': ['opening cy', 'opening balance cy', 'ob cy', 'opening current'],
+    'debit_cy': ['debit cy', 'dr cy', 'debit current', 'dr current', 'debit'],
+    'credit_cy': ['credit cy', 'cr cy', 'credit current', 'cr current', 'credit'],
+    'closing_balance_cy': ['closing cy', 'closing balance cy', 'cb cy', 'closing current', 'balance'],
+    'opening_balance_py': ['opening py', 'opening balance py', 'ob py', 'opening previous'],
+    'debit_py': ['debit py', 'dr py', 'debit previous', 'dr previous'],
+    'credit_py': ['credit py', 'cr py', 'credit previous', 'cr previous'],
+    'closing_balance_py': ['closing py', 'closing balance py', 'cb py', 'closing previous'],
+}
+
+# Columns of trial_balance_branches, after company_id, import_batch_id and tb_id
+BRANCH_AMOUNTS = ('closing_balance_cy', 'closing_balance_py')
+
+# Rough single-process read speed (bytes/second) by file type. Starting worker
+# processes costs about a second, so files are only read in parallel when reading
+# them one after another would take longer than PARALLEL_MIN_SECONDS.
+READ_RATES = {'.csv': 25_000_000, '.txt': 25_000_000, '.xlsx': 750_000, '.xls': 750_000}
+PARALLEL_MIN_SECONDS = 2.0
+
+
+def _normalize_header(header):
+    return ' '.join(str(header).strip().lower().split())
+
+
+def header_signature(headers):
+    """Key of a file's column layout - files with the same headers share a mapping"""
+    return tuple(sorted(_normalize_header(header) for header in headers))
+
+
+def detect_mapping(headers):
+    """
+    {field: header} for the headers matching COLUMN_RULES. Longer rules are tried
+    first and each header is used once, so 'Debit PY' is not taken for debit_cy.
+    """
+    normalized = {header: _normalize_header(header) for header in headers}
+    rules = sorted(((rule, field) for field, field_rules in COLUMN_RULES.items() for rule in field_rules),
+                   key=lambda item: -len(item[0]))
+    mapping = {}
+    for exact in (True, False):
+        for rule, field in rules:
+            if field in mapping:
+                continue
+            for header, text in normalized.items():
+                if header not in mapping.values() and (text == rule if exact else rule in text):
+                    mapping[field] = header
+                    break
+    return mapping
+
+
+def branch_name(file_path):
+    """Branch label of a file - its name without the extension"""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def read_tb_file(file_path, branch, mapping=None, mappings=None):
+    """
+    Read one trial balance file (runs in a worker process)
+
+    Args:
+        mapping: {field: header} used when the file has all of its headers
+        mappings: {header_signature: mapping} for other layouts (detected if missing)
+
+    Returns:
+        tuple: (DataFrame of TB_FIELDS and branch, signature, mapping used)
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in ('.csv', '.txt'):
+        headers = list(pd.read_csv(file_path, nrows=0).columns)
+    elif extension in ('.xlsx', '.xls'):
+        frame = pd.read_excel(file_path)
+        headers = list(frame.columns)
+    else:
+        raise ValueError(f"Unsupported trial balance file '{os.path.basename(file_path)}' - use CSV or Excel")
+
+    signature = header_signature(headers)
+    if mapping and all(header in headers for header in mapping.values() if header):
+        used = mapping
+    else:
+        used = (mappings or {}).get(signature) or detect_mapping(headers)
+    used = {field: header for field, header in used.items() if header}
+    if 'ledger_name' not in used:
+        raise ValueError(f"{os.path.basename(file_path)}: no ledger name column "
+                         f"(found: {', '.join(map(str, headers))})")
+
+    if extension in ('.csv', '.txt'):
+        frame = pd.read_csv(file_path, usecols=sorted(set(used.values()), key=headers.index),
+                            dtype={used['ledger_name']: str})
+    names = frame[used['ledger_name']]
+    names = names.where(names.notna(), '').astype(str).str.strip()
+    result = pd.DataFrame({'ledger_name': names})
+    for field in TrialBalanceFrame.AMOUNT_COLUMNS:
+        result[field] = parse_amounts(frame[used[field]]) if field in used else 0.0
+    result = result[(names != '') & (names.str.lower() != 'nan')]
+    result['branch'] = branch
+    return result.reset_index(drop=True), signature, used
+
+
+def estimated_read_seconds(file_paths):
+    """Time to read the files in one process, from their sizes (see READ_RATES)"""
+    return sum(os.path.getsize(path) / READ_RATES.get(os.path.splitext(path)[1].lower(), READ_RATES['.xlsx'])
+               for path in file_paths)
+
+
+def read_tb_files(file_paths, mapping=None, mappings=None, branches=None, max_workers=None, progress=None):
+    """
+    Read many trial balance files in parallel worker processes
+
+    Args:
+        branches: {file_path: branch} (default: the file names)
+        max_workers: Worker processes (default: one per file up to the CPU count, none
+            if the files are quicker to read in this process - see PARALLEL_MIN_SECONDS)
+        progress: Optional callback(files read, files) - JobContext.callback() stops
+            a cancelled import between files
+
+    Returns:
+        tuple: (DataFrame of every file's rows in file order, {signature: mapping} used)
+    """
+    file_paths = list(file_paths)
+    branches = branches or {}
+    jobs = [(path, branches.get(path) or branch_name(path), mapping, mappings) for path in file_paths]
+    if max_workers is None and estimated_read_seconds(file_paths) < PARALLEL_MIN_SECONDS:
+        max_workers = 1
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            results.append(read_tb_file(*job))
+            if progress:
+                progress(len(results), len(jobs))
+    else:
+        files_read = (lambda done: progress(done, len(jobs))) if progress else None
+        results = map_in_processes(read_tb_file, jobs, workers, files_read)
+
+    frames = [frame for frame, _, _ in results]
+    layouts = {signature: used for _, signature, used in results}
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=TB_FIELDS + ('branch',))
+    return frame, layouts
+
+
+def merge_ledgers(frame):
+    """
+    Merge rows of the same ledger across branches - names compared case- and
+    whitespace-insensitively, amounts summed, the first spelling kept
+
+    Returns:
+        tuple: (merged DataFrame of TB_FIELDS, per-branch DataFrame of
+        ledger (row of the merged frame), branch and BRANCH_AMOUNTS)
+    """
+    key = frame['ledger_name'].str.split().str.join(' ').str.casefold()
+    ledger = pd.Series(pd.factorize(key)[0], index=frame.index)
+    grouped = frame.groupby(ledger, sort=True)
+    merged = grouped[list(TrialBalanceFrame.AMOUNT_COLUMNS)].sum()
+    merged.insert(0, 'ledger_name', grouped['ledger_name'].first())
+    shares = (frame.assign(ledger=ledger)
+              .groupby(['ledger', 'branch'], sort=False)[list(BRANCH_AMOUNTS)].sum()
+              .reset_index())
+    return merged.reset_index(drop=True), shares
+
+
+def import_tb_files(company_id, file_paths, import_batch_id, mapping=None, mappings=None, branches=None,
+                    merge=False, max_workers=None, progress=None):
+    """
+    Import many trial balance files as one batch, in one transaction
+
+    Args:
+        mapping / mappings / branches / max_workers / progress: see read_tb_files
+        merge: One trial balance row per ledger name across the files
+            (otherwise one row per file row)
+
+    Returns:
+        dict: files, rows (read), ledgers (imported), branches, layouts ({signature: mapping})
+    """
+    frame, layouts = read_tb_files(file_paths, mapping, mappings, branches, max_workers, progress)
+    if not len(frame):
+        raise ValueError("No ledgers found in the selected files")
+
+    if merge:
+        entries, shares = merge_ledgers(frame)
+    else:
+        entries = frame[list(TB_FIELDS)]
+        shares = frame[['branch'] + list(BRANCH_AMOUNTS)].assign(ledger=range(len(frame)))
+
+    dialect = get_dialect()
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        tb_ids = TrialBalance.insert_entries(cursor, company_id, entries.to_dict('records'), import_batch_id,
+                                             returning_ids=True)
+        dialect.ensure_list_partition(cursor, 'trial_balance_branches', company_id)
+        dialect.bulk_insert_frame(cursor, 'trial_balance_branches', pd.DataFrame({
+            'company_id': company_id,
+            'import_batch_id': import_batch_id,
+            'tb_id': pd.Series(tb_ids).to_numpy()[shares['ledger'].to_numpy()],
+            'branch': shares['branch'].to_numpy(),
+            **{column: shares[column].round(2).to_numpy() for column in BRANCH_AMOUNTS},
+        }))
+
+        conn.commit()
+
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        raise e
+
+    finally:
+        if conn:
+            conn.close()
+
+    return {
+        'files': len(file_paths),
+        'rows': len(frame),
+        'ledgers': len(entries),
+        'branches': list(dict.fromkeys(frame['branch'])),
+        'layouts': layouts,
+    }
+
+
+def get_branch_balances(company_id, import_batch_id=None):
+    """
+    Branch share of each imported ledger
+
+    Returns:
+        list of (tb_id, ledger_name, branch, closing_balance_cy, closing_balance_py) tuples
+    """
+    sql = '''
+        SELECT b.tb_id, tb.ledger_name, b.branch, b.closing_balance_cy, b.closing_balance_py
+        FROM trial_balance_branches b
+        JOIN trial_balance tb ON tb.tb_id = b.tb_id AND tb.company_id = b.company_id
+        WHERE b.company_id = %s
+    '''
+    params = [company_id]
+    if import_batch_id:
+        sql += ' AND b.import_batch_id = %s'
+        params.append(import_batch_id)
+    sql += ' ORDER BY tb.ledger_name, b.branch'
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    rows = [(tb_id, name, branch, float(cy or 0), float(py or 0))
+            for tb_id, name, branch, cy, py in cursor.fetchall()]
+    conn.close()
+    return rows
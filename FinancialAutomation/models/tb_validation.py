@@ -0,0 +1,288 @@
+"""
+Trial Balance Validation
+Checks a whole trial balance batch and returns every finding as one issues table:
+
+    Totals not equal        total debits differ from total credits (per year)
+    Balance equation        opening + debit - credit differs from closing (per ledger and year)
+    Duplicate ledger        the same ledger name more than once
+    Similar ledger names    names equal apart from case, spacing and punctuation
+    Opening not PY closing  a balance sheet ledger's CY opening differs from its PY closing
+    P&L opening balance     a profit and loss ledger carries a CY opening balance
+    Unusual balance sign    e.g. a credit balance on an Assets ledger (mapped ledgers)
+
+The rules are vectorized over the columns of a TrialBalanceFrame. For a stored
+trial balance the database sums the totals and returns only the ledgers that
+break an amount rule, so a clean 100,000 ledger batch moves its names and little else.
+"""
+
+import string
+import numpy as np
+import pandas as pd
+from config.database import get_connection
+from config.db_connection import numeric_as_float
+from models.trial_balance import TrialBalance, TrialBalanceFrame
+
+ERROR = 'Error'
+WARNING = 'Warning'
+SEVERITY_ORDER = {ERROR: 0, WARNING: 1}
+
+ISSUE_COLUMNS = ['severity', 'rule', 'year', 'tb_id', 'ledger_name', 'amount', 'detail']
+
+# Columns the rules read
+VALIDATION_COLUMNS = [
+    'tb_id', 'ledger_name', 'type_bs_pl', 'major_head_id',
+    'opening_balance_cy', 'debit_cy', 'credit_cy', 'closing_balance_cy',
+    'opening_balance_py', 'debit_py', 'credit_py', 'closing_balance_py',
+]
+
+# Total debits may differ from total credits by less than this (rounding)
+TOTALS_TOLERANCE = 1.0
+# Per-ledger differences below this are rounding
+LEDGER_TOLERANCE = 0.01
+
+# Balance side of each major head category: 1 debit, -1 credit
+NORMAL_SIGN = {'Assets': 1, 'Expenses': 1, 'Equity': -1, 'Liabilities': -1, 'Income': -1}
+
+YEARS = ('cy', 'py')
+
+# Dropped from names before comparing them (line breaks separate the names being keyed)
+_PUNCTUATION = dict.fromkeys(map(ord, string.punctuation + ' \t\r\x0b\x0c\xa0\u2013\u2014\u2018\u2019\u201c\u201d'))
+
+
+def _issues(rule, severity, year, tb_ids, names, amounts, detail):
+    return pd.DataFrame({
+        'severity': severity, 'rule': rule, 'year': year,
+        'tb_id': tb_ids, 'ledger_name': names, 'amount': amounts, 'detail': detail,
+    }, columns=ISSUE_COLUMNS)
+
+
+def _check_totals(totals):
+    """totals: {year: (total debit, total credit)}"""
+    found = []
+    for year, (debit, credit) in totals.items():
+        if abs(debit - credit) >= TOTALS_TOLERANCE:
+            found.append(_issues('Totals not equal', ERROR, year.upper(), [0], [''], [round(debit - credit, 2)],
+                                 f"Debits ₹{debit:,.2f}, credits ₹{credit:,.2f}"))
+    return found
+
+
+def _check_balance_equation(frame, years):
+    """years: the years with opening, debit or credit amounts (not closing balances only)"""
+    found = []
+    for year in years:
+        difference = np.round(frame[f"opening_balance_{year}"] + frame[f"debit_{year}"]
+                              - frame[f"credit_{year}"] - frame[f"closing_balance_{year}"], 2)
+        rows = np.flatnonzero(np.abs(difference) >= LEDGER_TOLERANCE)
+        if len(rows):
+            found.append(_issues('Balance equation', ERROR, year.upper(), frame['tb_id'][rows],
+                                 frame['ledger_name'][rows], difference[rows],
+                                 'Opening + debit - credit differs from closing by this amount'))
+    return found
+
+
+def _check_names(tb_ids, names):
+    if not len(names):
+        return []
+    found = []
+    # Keyed in one pass over the joined names rather than one call per name; line breaks
+    # inside a name (Alt+Enter in Excel) are spaces to the key, so they cannot split it
+    names = np.array([name.strip() for name in names], dtype=object)
+    keys = '\n'.join(name.replace('\n', ' ') for name in names)
+    keys = keys.casefold().translate(_PUNCTUATION).split('\n')
+    key_codes, key_uniques = pd.factorize(np.array(keys, dtype=object))
+    name_codes, name_uniques = pd.factorize(names)
+
+    name_counts = np.bincount(name_codes)[name_codes]
+    exact = name_counts > 1
+    if exact.any():
+        found.append(_issues('Duplicate ledger', ERROR, '', tb_ids[exact], names[exact], 0.0,
+                             'Appears ' + name_counts[exact].astype(str).astype(object) + ' times'))
+
+    # Similar: the same name but for case, spacing and punctuation, spelt more than one way
+    pairs = np.unique(key_codes.astype(np.int64) * len(name_uniques) + name_codes)
+    spellings = np.bincount(pairs // len(name_uniques), minlength=len(key_uniques))[key_codes]
+    similar = (spellings > 1) & ~exact
+    if similar.any():
+        # Point each spelling at the alphabetically first other one
+        rank = np.empty(len(name_uniques), dtype=np.int64)
+        rank[np.argsort(name_uniques.astype(str))] = np.arange(len(name_uniques))
+        ranks = rank[name_codes]
+        lowest = np.full(len(key_uniques), len(name_uniques))
+        second = np.full(len(key_uniques), len(name_uniques))
+        np.minimum.at(lowest, key_codes, ranks)
+        np.minimum.at(second, key_codes[ranks != lowest[key_codes]], ranks[ranks != lowest[key_codes]])
+        by_rank = name_uniques.astype(str).astype(object)[np.argsort(rank)]
+        rows = np.flatnonzero(similar)
+        other = np.where(ranks[rows] == lowest[key_codes[rows]], second[key_codes[rows]], lowest[key_codes[rows]])
+        more = np.where(spellings[rows] > 2, ' and ' + (spellings[rows] - 2).astype(str).astype(object) + ' more', '')
+        found.append(_issues('Similar ledger names', WARNING, '', tb_ids[rows], names[rows], 0.0,
+                             "Similar to '" + by_rank[other] + "'" + more))
+    return found
+
+
+def _check_continuity(frame, has_py):
+    """has_py: the batch has previous year figures to carry forward"""
+    found = []
+    types = frame['type_bs_pl']
+    if has_py:
+        difference = np.round(frame['opening_balance_cy'] - frame['closing_balance_py'], 2)
+        rows = np.flatnonzero((types == 'BS') & (np.abs(difference) >= LEDGER_TOLERANCE))
+        if len(rows):
+            found.append(_issues('Opening not PY closing', WARNING, 'CY', frame['tb_id'][rows],
+                                 frame['ledger_name'][rows], difference[rows],
+                                 'CY opening less PY closing (balance sheet ledgers carry forward)'))
+
+    rows = np.flatnonzero((types == 'PL') & (np.abs(frame['opening_balance_cy']) >= LEDGER_TOLERANCE))
+    if len(rows):
+        found.append(_issues('P&L opening balance', WARNING, 'CY', frame['tb_id'][rows],
+                             frame['ledger_name'][rows], frame['opening_balance_cy'][rows],
+                             'Profit and loss ledgers start the year at nil'))
+    return found
+
+
+def _check_signs(frame, categories):
+    if not categories:
+        return []
+    heads, inverse = np.unique(frame['major_head_id'], return_inverse=True)
+    head_signs = np.array([NORMAL_SIGN.get(categories.get(int(head)), 0) for head in heads], dtype=np.int8)
+    head_names = np.array([categories.get(int(head)) or '' for head in heads], dtype=object)
+    signs = head_signs[inverse]
+
+    found = []
+    for year in YEARS:
+        closing = frame[f"closing_balance_{year}"]
+        rows = np.flatnonzero(signs * closing <= -LEDGER_TOLERANCE)
+        if len(rows):
+            side = np.where(closing[rows] < 0, 'Credit', 'Debit').astype(object)
+            found.append(_issues('Unusual balance sign', WARNING, year.upper(), frame['tb_id'][rows],
+                                 frame['ledger_name'][rows], closing[rows],
+                                 side + ' balance on ' + head_names[inverse[rows]] + ' ledger'))
+    return found
+
+
+def _collect(found):
+    if not found:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    return sort_issues(pd.concat(found, ignore_index=True))
+
+
+def sort_issues(issues):
+    """Errors first, then by rule and largest amount"""
+    order = issues.assign(_severity=issues['severity'].map(SEVERITY_ORDER), _size=-issues['amount'].abs())
+    order = order.sort_values(['_severity', 'rule', '_size', 'ledger_name', 'tb_id'], kind='stable')
+    return order[ISSUE_COLUMNS].reset_index(drop=True)
+
+
+def validate_frame(frame, categories=None):
+    """
+    Run every rule over a TrialBalanceFrame (e.g. rows about to be imported)
+
+    Args:
+        frame: TrialBalanceFrame with VALIDATION_COLUMNS
+        categories: {major_head_id: category} for the sign check (skipped if None)
+
+    Returns:
+        DataFrame of ISSUE_COLUMNS, errors first; tb_id 0 for batch-level issues
+    """
+    totals = {year: (frame.total(f"debit_{year}"), frame.total(f"credit_{year}")) for year in YEARS}
+    # A year imported as closing balances only has no equation to check
+    years = [year for year in YEARS
+             if any(frame[f"{name}_{year}"].any() for name in ('opening_balance', 'debit', 'credit'))]
+    has_py = 'py' in years or bool(frame['closing_balance_py'].any())
+    return _collect(_check_totals(totals) + _check_balance_equation(frame, years)
+                    + _check_names(frame['tb_id'], frame['ledger_name'])
+                    + _check_continuity(frame, has_py) + _check_signs(frame, categories))
+
+
+def get_categories(company_id):
+    """{major_head_id: category} of a company"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT major_head_id, category FROM major_heads WHERE company_id = %s', (company_id,))
+    categories = dict(cursor.fetchall())
+    conn.close()
+    return categories
+
+
+def validate_trial_balance(company_id, import_batch_id=None, adjusted=False):
+    """
+    Validate a company's stored trial balance (or one import batch)
+    adjusted=True validates the amounts after the applied adjustments.
+
+    Three queries: the totals, the ledgers breaking an amount rule, and the names.
+
+    Returns:
+        DataFrame of issues - see validate_frame
+    """
+    categories = get_categories(company_id)
+
+    def value(name):
+        return TrialBalance._value_sql(name, adjusted)
+
+    def scope(params):
+        from_sql, from_params = TrialBalance._from_sql(company_id, adjusted)
+        sql = f"FROM {from_sql} WHERE tb.company_id = %s"
+        params[:0] = from_params + [company_id]
+        if import_batch_id:
+            sql += " AND tb.import_batch_id = %s"
+            params.insert(len(from_params) + 1, import_batch_id)
+        return sql
+
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = numeric_as_float(conn.cursor())
+
+        params = []
+        sums = [f"SUM({value(f'{name}_{year}')})" for year in YEARS for name in ('debit', 'credit')]
+        sums += [f"SUM(ABS({value(f'{name}_{year}')}))" for year in YEARS
+                 for name in ('opening_balance', 'debit', 'credit')]
+        sums.append(f"SUM(ABS({value('closing_balance_py')}))")
+        cursor.execute(f"SELECT {', '.join(sums)} {scope(params)}", params)
+        result = [amount or 0.0 for amount in cursor.fetchone()]
+        totals = {'cy': (result[0], result[1]), 'py': (result[2], result[3])}
+        years = [year for year, movements in zip(YEARS, (result[4:7], result[7:10])) if any(movements)]
+        has_py = 'py' in years or bool(result[10])
+
+        # Only the ledgers breaking an amount rule leave the database
+        conditions, params = [], []
+        for year in years:
+            conditions.append(f"ABS(ROUND({value(f'opening_balance_{year}')} + {value(f'debit_{year}')} "
+                              f"- {value(f'credit_{year}')} - {value(f'closing_balance_{year}')}, 2)) >= %s")
+            params.append(LEDGER_TOLERANCE)
+        if has_py:
+            conditions.append(f"(tb.type_bs_pl = 'BS' AND ABS(ROUND({value('opening_balance_cy')} "
+                              f"- {value('closing_balance_py')}, 2)) >= %s)")
+            params.append(LEDGER_TOLERANCE)
+        conditions.append(f"(tb.type_bs_pl = 'PL' AND ABS({value('opening_balance_cy')}) >= %s)")
+        params.append(LEDGER_TOLERANCE)
+        for sign in (1, -1):
+            heads = [head for head, category in categories.items() if NORMAL_SIGN.get(category) == sign]
+            if heads:
+                closings = ' OR '.join(f"{sign} * {value(f'closing_balance_{year}')} <= %s" for year in YEARS)
+                conditions.append(f"(tb.major_head_id = ANY(%s) AND ({closings}))")
+                params += [heads] + [-LEDGER_TOLERANCE] * len(YEARS)
+        select = ', '.join(f"{value(name)} AS {name}" for name in VALIDATION_COLUMNS)
+        sql = f"SELECT {select} {scope(params)} AND ({' OR '.join(conditions)})"
+        cursor.execute(sql, params)
+        frame = TrialBalanceFrame.from_rows(cursor.fetchall(), VALIDATION_COLUMNS)
+
+        params = []
+        cursor.execute(f"SELECT tb.tb_id, tb.ledger_name {scope(params)}", params)
+        names = TrialBalanceFrame.from_rows(cursor.fetchall(), ['tb_id', 'ledger_name'])
+
+    finally:
+        if conn:
+            conn.close()
+
+    return _collect(_check_totals(totals) + _check_balance_equation(frame, years)
+                    + _check_names(names['tb_id'], names['ledger_name'])
+                    + _check_continuity(frame, has_py) + _check_signs(frame, categories))
+
+
+def summarize(issues):
+    """{(severity, rule): count} of an issues table, errors first"""
+    if not len(issues):
+        return {}
+    counts = issues.groupby(['severity', 'rule'], sort=False).size()
+    return dict(sorted(counts.items(), key=lambda item: (SEVERITY_ORDER[item[0][0]], item[0][1])))
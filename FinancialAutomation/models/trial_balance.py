@@ -3,13 +3,43 @@ Trial Balance Model
 Handles Trial Balance import, storage, and mapping with comparative year support
 """
 
-from config.database import get_connection
+import sys
+import numpy as np
+from config.database import get_connection, clear_company_partitions
+from config.db_connection import get_dialect, stream_query
+from models.adjustments import Adjustment
 from datetime import datetime
 
 
 class TrialBalance:
     """Model for Trial Balance entries with current and previous year data"""
     
+    __slots__ = (
+        'tb_id', 'company_id', 'ledger_name',
+        'opening_balance_cy', 'debit_cy', 'credit_cy', 'closing_balance_cy',
+        'opening_balance_py', 'debit_py', 'credit_py', 'closing_balance_py',
+        'type_bs_pl', 'major_head_id', 'minor_head_id', 'grouping_id',
+        'is_mapped', 'import_batch_id'
+    )
+    
+    # Column order of SELECTs (matches the constructor)
+    COLUMNS = [
+        'tb_id', 'company_id', 'ledger_name',
+        'opening_balance_cy', 'debit_cy', 'credit_cy', 'closing_balance_cy',
+        'opening_balance_py', 'debit_py', 'credit_py', 'closing_balance_py',
+        'type_bs_pl', 'major_head_id', 'minor_head_id', 'grouping_id',
+        'is_mapped', 'import_batch_id'
+    ]
+    
+    # Column order used by bulk_import
+    IMPORT_COLUMNS = [
+        'company_id', 'ledger_name',
+        'opening_balance_cy', 'debit_cy', 'credit_cy', 'closing_balance_cy',
+        'opening_balance_py', 'debit_py', 'credit_py', 'closing_balance_py',
+        'type_bs_pl', 'major_head_id', 'minor_head_id', 'grouping_id',
+        'is_mapped', 'import_batch_id', 'created_at', 'updated_at'
+    ]
+    
     def __init__(self, tb_id, company_id, ledger_name, 
                  opening_balance_cy=0, debit_cy=0, credit_cy=0, closing_balance_cy=0,
                  opening_balance_py=0, debit_py=0, credit_py=0, closing_balance_py=0,
@@ -50,6 +80,7 @@ class TrialBalance:
         try:
             conn = get_connection()
             cursor = conn.cursor()
+            get_dialect().ensure_list_partition(cursor, 'trial_balance', company_id)
             
             cursor.execute('''
                 INSERT INTO trial_balance (
@@ -80,81 +111,99 @@ class TrialBalance:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def _from_sql(company_id, adjusted=False):
+        """
+        FROM clause (trial_balance as "tb") and its params
+        Adjusted reads join the applied adjustment totals per row as "adj".
+        """
+        if not adjusted:
+            return "trial_balance tb", []
+        return f"trial_balance tb LEFT JOIN ({Adjustment.TOTALS_SQL}) adj ON adj.tb_id = tb.tb_id", [company_id]
+    
+    @staticmethod
+    def _value_sql(name, adjusted=False):
+        """SQL value of a column - the base value, or base plus applied adjustments"""
+        if adjusted and name in Adjustment.OVERLAY:
+            return Adjustment.OVERLAY[name]
+        return f"tb.{name}"
+    
+    @staticmethod
+    def _select_sql(company_id, import_batch_id=None, unmapped_only=False, columns=None, adjusted=False):
+        """SELECT for a company's entries, returns (sql, params)"""
+        columns = columns or TrialBalance.COLUMNS
+        unknown = set(columns) - set(TrialBalance.COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown trial balance columns: {', '.join(sorted(unknown))}")
+        select = ', '.join(f"{TrialBalance._value_sql(name, adjusted)} AS {name}" for name in columns)
+        from_sql, params = TrialBalance._from_sql(company_id, adjusted)
+        sql = f"SELECT {select} FROM {from_sql} WHERE tb.company_id = %s"
+        params.append(company_id)
+        if unmapped_only:
+            sql += " AND tb.is_mapped = 0"
+        if import_batch_id:
+            sql += " AND tb.import_batch_id = %s"
+            params.append(import_batch_id)
+        return sql + " ORDER BY tb.ledger_name", params
+    
+    @staticmethod
+    def iter_rows(company_id, import_batch_id=None, unmapped_only=False, itersize=None, columns=None,
+                  adjusted=False, as_float=False):
+        """
+        Stream raw row tuples in chunks with bounded memory
+        
+        Args:
+            columns: Columns to select (default: COLUMNS), rows follow this order
+            adjusted: Amounts include the applied adjustments (what the statements read)
+            as_float: Amounts as float instead of Decimal (columnar reads)
+        
+        Yields:
+            list of row tuples per chunk
+        """
+        sql, params = TrialBalance._select_sql(company_id, import_batch_id, unmapped_only, columns, adjusted)
+        return stream_query(sql, params, itersize, as_float)
+    
+    @staticmethod
+    def iter_by_company(company_id, import_batch_id=None, unmapped_only=False, itersize=None):
+        """Stream TrialBalance objects one at a time"""
+        for rows in TrialBalance.iter_rows(company_id, import_batch_id, unmapped_only, itersize):
+            for row in rows:
+                yield TrialBalance(*row)
+    
+    @staticmethod
+    def iter_batches(company_id, import_batch_id=None, unmapped_only=False, itersize=None, columns=None,
+                     adjusted=False):
+        """
+        Stream columnar batches for exports and aggregations
+        
+        Yields:
+            dict of column name -> tuple of values (one chunk of rows), amounts as float
+        """
+        names = columns or TrialBalance.COLUMNS
+        for rows in TrialBalance.iter_rows(company_id, import_batch_id, unmapped_only, itersize, names, adjusted,
+                                           as_float=True):
+            yield dict(zip(names, zip(*rows)))
+    
+    @staticmethod
+    def get_frame(company_id, import_batch_id=None, unmapped_only=False, columns=None, itersize=None,
+                  adjusted=False):
+        """
+        Load entries into a columnar TrialBalanceFrame (streamed, no per-row objects)
+        adjusted=True adds the applied adjustments to the amounts, as the statements use them.
+        """
+        return TrialBalanceFrame.from_batches(
+            TrialBalance.iter_batches(company_id, import_batch_id, unmapped_only, itersize, columns, adjusted),
+            columns)
+    
     @staticmethod
     def get_by_company(company_id, import_batch_id=None):
         """Get all trial balance entries for a company"""
-        conn = None
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            if import_batch_id:
-                cursor.execute('''
-                    SELECT tb_id, company_id, ledger_name,
-                           opening_balance_cy, debit_cy, credit_cy, closing_balance_cy,
-                           opening_balance_py, debit_py, credit_py, closing_balance_py,
-                           type_bs_pl, major_head_id, minor_head_id, grouping_id,
-                           is_mapped, import_batch_id
-                    FROM trial_balance
-                    WHERE company_id = %s AND import_batch_id = %s
-                    ORDER BY ledger_name
-                ''', (company_id, import_batch_id))
-            else:
-                cursor.execute('''
-                    SELECT tb_id, company_id, ledger_name,
-                           opening_balance_cy, debit_cy, credit_cy, closing_balance_cy,
-                           opening_balance_py, debit_py, credit_py, closing_balance_py,
-                           type_bs_pl, major_head_id, minor_head_id, grouping_id,
-                           is_mapped, import_batch_id
-                    FROM trial_balance
-                    WHERE company_id = %s
-                    ORDER BY ledger_name
-                ''', (company_id,))
-            
-            results = cursor.fetchall()
-            return [TrialBalance(*row) for row in results]
-        
-        finally:
-            if conn:
-                conn.close()
+        return list(TrialBalance.iter_by_company(company_id, import_batch_id))
     
     @staticmethod
     def get_unmapped(company_id, import_batch_id=None):
         """Get unmapped trial balance entries"""
-        conn = None
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            if import_batch_id:
-                cursor.execute('''
-                    SELECT tb_id, company_id, ledger_name,
-                           opening_balance_cy, debit_cy, credit_cy, closing_balance_cy,
-                           opening_balance_py, debit_py, credit_py, closing_balance_py,
-                           type_bs_pl, major_head_id, minor_head_id, grouping_id,
-                           is_mapped, import_batch_id
-                    FROM trial_balance
-                    WHERE company_id = %s AND is_mapped = 0 AND import_batch_id = %s
-                    ORDER BY ledger_name
-                ''', (company_id, import_batch_id))
-            else:
-                cursor.execute('''
-                    SELECT tb_id, company_id, ledger_name,
-                           opening_balance_cy, debit_cy, credit_cy, closing_balance_cy,
-                           opening_balance_py, debit_py, credit_py, closing_balance_py,
-                           type_bs_pl, major_head_id, minor_head_id, grouping_id,
-                           is_mapped, import_batch_id
-                    FROM trial_balance
-                    WHERE company_id = %s AND is_mapped = 0
-                    ORDER BY ledger_name
-                ''', (company_id,))
-            
-            results = cursor.fetchall()
-            return [TrialBalance(*row) for row in results]
-        
-        finally:
-            if conn:
-                conn.close()
+        return list(TrialBalance.iter_by_company(company_id, import_batch_id, unmapped_only=True))
     
     @staticmethod
     def update_mapping(tb_id, major_head_id, minor_head_id, grouping_id, type_bs_pl='BS'):
@@ -183,6 +232,36 @@ class TrialBalance:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def bulk_update_mapping(mappings, company_id=None):
+        """
+        Map many entries in one statement
+        mappings: iterable of (tb_id, major_head_id, minor_head_id, grouping_id, type_bs_pl)
+        company_id: Owner of the entries - lets PostgreSQL update only its partition
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            mappings = list(mappings)
+
+            get_dialect().bulk_update(
+                cursor, 'trial_balance', 'tb_id',
+                ['major_head_id', 'minor_head_id', 'grouping_id', 'type_bs_pl'], mappings,
+                extra_set='is_mapped = 1, updated_at = NOW()', company_id=company_id)
+
+            conn.commit()
+            return len(mappings)
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+
+        finally:
+            if conn:
+                conn.close()
+
     @staticmethod
     def update_values(tb_id, opening_balance_cy=None, debit_cy=None, credit_cy=None, 
                      closing_balance_cy=None, opening_balance_py=None, debit_py=None,
@@ -243,14 +322,18 @@ class TrialBalance:
                 conn.close()
     
     @staticmethod
-    def delete(tb_id):
-        """Delete trial balance entry"""
+    def delete(tb_id, company_id):
+        """Delete trial balance entry of a company"""
         conn = None
         try:
             conn = get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('DELETE FROM trial_balance WHERE tb_id = %s', (tb_id,))
+            # Filtering on the partition key confines each delete to the company's partition
+            cursor.execute('DELETE FROM adjustments WHERE company_id = %s AND tb_id = %s', (company_id, tb_id))
+            cursor.execute('DELETE FROM trial_balance_branches WHERE company_id = %s AND tb_id = %s',
+                           (company_id, tb_id))
+            cursor.execute('DELETE FROM trial_balance WHERE tb_id = %s AND company_id = %s', (tb_id, company_id))
             
             conn.commit()
         
@@ -271,11 +354,19 @@ class TrialBalance:
             conn = get_connection()
             cursor = conn.cursor()
             
+            # Adjustments, branch shares and journal lines kept for drill-down go with their trial balance batch
             if import_batch_id:
-                cursor.execute('DELETE FROM trial_balance WHERE company_id = %s AND import_batch_id = %s',
-                              (company_id, import_batch_id))
+                cursor.execute('''
+                    DELETE FROM adjustments WHERE company_id = %s AND tb_id IN (
+                        SELECT tb_id FROM trial_balance WHERE company_id = %s AND import_batch_id = %s)
+                ''', (company_id, company_id, import_batch_id))
+                for table in ('gl_journal_lines', 'trial_balance_branches', 'trial_balance'):
+                    cursor.execute(f'DELETE FROM {table} WHERE company_id = %s AND import_batch_id = %s',
+                                  (company_id, import_batch_id))
             else:
-                cursor.execute('DELETE FROM trial_balance WHERE company_id = %s', (company_id,))
+                cursor.execute('DELETE FROM adjustments WHERE company_id = %s', (company_id,))
+                # Everything goes - TRUNCATE of the company's partitions on PostgreSQL
+                clear_company_partitions(cursor, company_id)
             
             conn.commit()
         
@@ -289,9 +380,10 @@ class TrialBalance:
                 conn.close()
     
     @staticmethod
-    def validate_balance(company_id, import_batch_id=None):
+    def validate_balance(company_id, import_batch_id=None, adjusted=False):
         """
         Validate that trial balance is balanced for both current and previous year
+        adjusted=True checks the trial balance after the applied adjustments.
         Returns tuple: (cy_balanced, py_balanced, cy_diff, py_diff)
         """
         conn = None
@@ -299,26 +391,15 @@ class TrialBalance:
             conn = get_connection()
             cursor = conn.cursor()
             
+            from_sql, params = TrialBalance._from_sql(company_id, adjusted)
+            totals = ', '.join(f"SUM({TrialBalance._value_sql(name, adjusted)})"
+                               for name in ('debit_cy', 'credit_cy', 'debit_py', 'credit_py'))
+            sql = f"SELECT {totals} FROM {from_sql} WHERE tb.company_id = %s"
+            params.append(company_id)
             if import_batch_id:
-                cursor.execute('''
-                    SELECT 
-                        SUM(debit_cy) as total_debit_cy,
-                        SUM(credit_cy) as total_credit_cy,
-                        SUM(debit_py) as total_debit_py,
-                        SUM(credit_py) as total_credit_py
-                    FROM trial_balance
-                    WHERE company_id = %s AND import_batch_id = %s
-                ''', (company_id, import_batch_id))
-            else:
-                cursor.execute('''
-                    SELECT 
-                        SUM(debit_cy) as total_debit_cy,
-                        SUM(credit_cy) as total_credit_cy,
-                        SUM(debit_py) as total_debit_py,
-                        SUM(credit_py) as total_credit_py
-                    FROM trial_balance
-                    WHERE company_id = %s
-                ''', (company_id,))
+                sql += " AND tb.import_batch_id = %s"
+                params.append(import_batch_id)
+            cursor.execute(sql, params)
             
             result = cursor.fetchone()
             
@@ -407,10 +488,53 @@ class TrialBalance:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def insert_entries(cursor, company_id, entries, import_batch_id, returning_ids=False):
+        """
+        Bulk insert trial balance entries on an open cursor (the caller commits)
+        entries: iterable of dicts with keys matching column names
+        returning_ids: Return the new tb_ids in entry order instead of the count
+            (multi-row INSERT ... RETURNING instead of COPY on PostgreSQL)
+        """
+        now = datetime.now()
+        dialect = get_dialect()
+        dialect.ensure_list_partition(cursor, 'trial_balance', company_id)
+        rows = (
+            (
+                company_id,
+                entry.get('ledger_name', ''),
+                entry.get('opening_balance_cy', 0),
+                entry.get('debit_cy', 0),
+                entry.get('credit_cy', 0),
+                entry.get('closing_balance_cy', 0),
+                entry.get('opening_balance_py', 0),
+                entry.get('debit_py', 0),
+                entry.get('credit_py', 0),
+                entry.get('closing_balance_py', 0),
+                entry.get('type_bs_pl', 'BS'),
+                entry.get('major_head_id'),
+                entry.get('minor_head_id'),
+                entry.get('grouping_id'),
+                entry.get('is_mapped', 0),
+                import_batch_id,
+                now,
+                now
+            )
+            for entry in entries
+        )
+        if returning_ids:
+            result = [row[0] for row in dialect.bulk_insert_returning(
+                cursor, 'trial_balance', TrialBalance.IMPORT_COLUMNS, rows, ['tb_id'])]
+        else:
+            result = dialect.bulk_insert(cursor, 'trial_balance', TrialBalance.IMPORT_COLUMNS, rows)
+        # Plans of the adjusted reads depend on the row counts (only this company's partition changed)
+        dialect.analyze(cursor, dialect.list_partition('trial_balance', company_id))
+        return result
+    
     @staticmethod
     def bulk_import(company_id, entries, import_batch_id):
         """
-        Bulk import trial balance entries
+        Bulk import trial balance entries (COPY on PostgreSQL, executemany on SQLite)
         entries: list of dicts with keys matching column names
         """
         conn = None
@@ -418,38 +542,10 @@ class TrialBalance:
             conn = get_connection()
             cursor = conn.cursor()
             
-            for entry in entries:
-                cursor.execute('''
-                    INSERT INTO trial_balance (
-                        company_id, ledger_name,
-                        opening_balance_cy, debit_cy, credit_cy, closing_balance_cy,
-                        opening_balance_py, debit_py, credit_py, closing_balance_py,
-                        type_bs_pl, major_head_id, minor_head_id, grouping_id,
-                        is_mapped, import_batch_id, created_at, updated_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ''', (
-                    company_id,
-                    entry.get('ledger_name', ''),
-                    entry.get('opening_balance_cy', 0),
-                    entry.get('debit_cy', 0),
-                    entry.get('credit_cy', 0),
-                    entry.get('closing_balance_cy', 0),
-                    entry.get('opening_balance_py', 0),
-                    entry.get('debit_py', 0),
-                    entry.get('credit_py', 0),
-                    entry.get('closing_balance_py', 0),
-                    entry.get('type_bs_pl', 'BS'),
-                    entry.get('major_head_id'),
-                    entry.get('minor_head_id'),
-                    entry.get('grouping_id'),
-                    entry.get('is_mapped', 0),
-                    import_batch_id,
-                    datetime.now(),
-                    datetime.now()
-                ))
+            count = TrialBalance.insert_entries(cursor, company_id, entries, import_batch_id)
             
             conn.commit()
-            return len(entries)
+            return count
         
         except Exception as e:
             if conn:
@@ -459,3 +555,134 @@ class TrialBalance:
         finally:
             if conn:
                 conn.close()
+
+
+class TrialBalanceFrame:
+    """
+    Columnar trial balance - one typed NumPy array per column
+    
+    Amounts are float64, ids int64 (NULL stored as 0), is_mapped bool and
+    ledger names interned strings, so a large company costs a few arrays
+    instead of one Python object per ledger.
+    """
+    
+    __slots__ = ('columns',)
+    
+    AMOUNT_COLUMNS = (
+        'opening_balance_cy', 'debit_cy', 'credit_cy', 'closing_balance_cy',
+        'opening_balance_py', 'debit_py', 'credit_py', 'closing_balance_py'
+    )
+    ID_COLUMNS = ('tb_id', 'company_id', 'major_head_id', 'minor_head_id', 'grouping_id', 'import_batch_id')
+    
+    def __init__(self, columns):
+        self.columns = columns
+    
+    @staticmethod
+    def _to_array(name, values):
+        """Convert one column of raw values to its typed array"""
+        count = len(values)
+        if name in TrialBalanceFrame.AMOUNT_COLUMNS:
+            return np.fromiter((v or 0.0 for v in values), dtype=np.float64, count=count)
+        if name in TrialBalanceFrame.ID_COLUMNS:
+            return np.fromiter((v or 0 for v in values), dtype=np.int64, count=count)
+        if name == 'is_mapped':
+            return np.fromiter((bool(v) for v in values), dtype=bool, count=count)
+        if name == 'type_bs_pl':
+            return np.array([v or '' for v in values], dtype='U10')  # VARCHAR(10)
+        if name == 'ledger_name':
+            names = np.empty(count, dtype=object)
+            names[:] = [sys.intern(v or '') for v in values]
+            return names
+        raise ValueError(f"Unknown trial balance column: {name}")
+    
+    @classmethod
+    def from_batches(cls, batches, columns=None):
+        """
+        Build a frame from columnar batches (TrialBalance.iter_batches)
+        
+        Args:
+            columns: Column names, used for an empty frame (default: TrialBalance.COLUMNS)
+        """
+        parts = {}
+        for batch in batches:
+            for name, values in batch.items():
+                parts.setdefault(name, []).append(cls._to_array(name, values))
+        if not parts:
+            return cls({name: cls._to_array(name, ()) for name in (columns or TrialBalance.COLUMNS)})
+        return cls({name: np.concatenate(arrays) for name, arrays in parts.items()})
+    
+    @classmethod
+    def from_rows(cls, rows, columns=None):
+        """Build a frame from row tuples in `columns` order (default: TrialBalance.COLUMNS)"""
+        names = columns or TrialBalance.COLUMNS
+        rows = list(rows)
+        return cls.from_batches([dict(zip(names, zip(*rows)))] if rows else [], names)
+    
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+    
+    def __getitem__(self, name):
+        return self.columns[name]
+    
+    def __contains__(self, name):
+        return name in self.columns
+    
+    def __iter__(self):
+        return self.records()
+    
+    @property
+    def nbytes(self):
+        """Approximate memory used by the column arrays"""
+        total = 0
+        for name, array in self.columns.items():
+            total += array.nbytes
+            if array.dtype == object:
+                total += sum(sys.getsizeof(v) for v in set(array.tolist()))
+        return total
+    
+    # Filters - each returns a new frame
+    
+    def filter(self, mask):
+        """Rows where the boolean mask is True"""
+        return TrialBalanceFrame({name: array[mask] for name, array in self.columns.items()})
+    
+    def mapped(self, is_mapped=True):
+        """Mapped (or unmapped) entries"""
+        return self.filter(self.columns['is_mapped'] == is_mapped)
+    
+    def by_type(self, type_bs_pl):
+        """Balance Sheet ('BS') or Profit & Loss ('PL') entries"""
+        return self.filter(self.columns['type_bs_pl'] == type_bs_pl)
+    
+    def by_grouping(self, grouping_ids):
+        """Entries mapped to any of the given grouping ids"""
+        return self.filter(np.isin(self.columns['grouping_id'], np.fromiter(grouping_ids, dtype=np.int64)))
+    
+    # Aggregations
+    
+    def total(self, name):
+        """Sum of an amount column"""
+        return float(self.columns[name].sum())
+    
+    def group_totals(self, key, name):
+        """Sum of an amount column per key value, e.g. group_totals('grouping_id', 'closing_balance_cy')"""
+        keys, inverse = np.unique(self.columns[key], return_inverse=True)
+        sums = np.bincount(inverse, weights=self.columns[name], minlength=len(keys))
+        return {k.item() if hasattr(k, 'item') else k: float(s) for k, s in zip(keys, sums)}
+    
+    def records(self):
+        """Yield TrialBalance objects (for code that still works row by row)"""
+        columns = [self.columns.get(name) for name in TrialBalance.COLUMNS]
+        for i in range(len(self)):
+            values = []
+            for name, array in zip(TrialBalance.COLUMNS, columns):
+                if array is None:
+                    values.append(None)
+                    continue
+                value = array[i].item() if hasattr(array[i], 'item') else array[i]
+                if name in TrialBalanceFrame.ID_COLUMNS and not value:
+                    value = None
+                elif name == 'is_mapped':
+                    value = int(value)
+                values.append(value)
+            yield TrialBalance(*values)
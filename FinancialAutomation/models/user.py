@@ -33,6 +33,7 @@ class User:
             cursor.execute('''
                 INSERT INTO users (username, password_hash, email, full_name)
                 VALUES (%s, %s, %s, %s)
+                RETURNING user_id
             ''', (username, password_hash, email, full_name))
             
             user_id = cursor.fetchone()[0]
@@ -0,0 +1,219 @@
+"""
+Adjustments Test - audit adjustment batches overlaid on the imported trial balance
+"""
+
+import os
+import time
+
+import pandas as pd
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from config.database import initialize_database
+from models.adjustments import Adjustment
+from models.financial_statements import NotesGenerator
+from models.statement_cache import StatementCache
+from models.trial_balance import TrialBalance
+from models.tb_validation import validate_trial_balance
+from views.adjustments_dialog import AdjustmentsDialog
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+AMOUNTS = ['debit_cy', 'credit_cy', 'closing_balance_cy', 'debit_py', 'credit_py', 'closing_balance_py']
+
+
+def _totals(company_id, adjusted):
+    frame = TrialBalance.get_frame(company_id, columns=['tb_id'] + AMOUNTS, adjusted=adjusted)
+    return {name: frame.total(name) for name in AMOUNTS}
+
+
+def _import_mapped(company, count, seed):
+    """Import a synthetic trial balance with every ledger mapped to its grouping"""
+    entries, ledger_groupings = generate_ledgers(company['groupings'], count, seed=seed)
+    for entry in entries:
+        grouping = ledger_groupings[entry['ledger_name']]
+        entry.update(grouping_id=grouping['grouping_id'], minor_head_id=grouping['minor_head_id'], is_mapped=1)
+    TrialBalance.bulk_import(company['company_id'], entries, import_batch_id=1)
+    return entries
+
+
+def _cash_on_hand(company_id):
+    """CY and PY closing of the 'Cash on Hand' grouping as the notes read it"""
+    return NotesGenerator(company_id)._get_tb_total_by_grouping(['cash on hand'])
+
+
+def test_overlay_and_toggle():
+    """Applying and withdrawing a batch changes what the statements read, never the base rows"""
+    initialize_database()
+    company = seed_company(2000, seed=23)
+    company_id = company['company_id']
+    try:
+        entries = _import_mapped(company, 2000, 23)
+        frame = TrialBalance.get_frame(company_id, columns=['tb_id', 'grouping_id', 'ledger_name', 'type_bs_pl'])
+        cash_grouping = next(g['grouping_id'] for g in company['groupings'] if g['grouping_name'] == 'Cash on Hand')
+        cash_tb = int(frame['tb_id'][frame['grouping_id'] == cash_grouping][0])
+        other_tb = int(frame['tb_id'][(frame['grouping_id'] != cash_grouping) & (frame['type_bs_pl'] == 'BS')][0])
+
+        base = _totals(company_id, adjusted=False)
+        base_cash = _cash_on_hand(company_id)
+        base_balance = TrialBalance.validate_balance(company_id)
+
+        # Proposed entries are not in the adjusted trial balance
+        Adjustment.bulk_create(company_id, 'AJE-1', [
+            {'tb_id': cash_tb, 'debit': 1000, 'period': 'CY', 'narration': 'Unrecorded receipt'},
+            {'tb_id': other_tb, 'credit': 1000, 'period': 'CY'},
+            {'tb_id': cash_tb, 'credit': 250, 'period': 'py'},
+            {'tb_id': other_tb, 'debit': 250, 'period': 'PY'},
+        ])
+        assert _totals(company_id, adjusted=True) == base
+        version = StatementCache.get_data_version(company_id)
+        StatementCache.get_or_generate(company_id)
+
+        # Applying bumps the data version (cached statements go stale) and moves the notes
+        assert Adjustment.apply_batch(company_id, 'AJE-1') == 4
+        assert StatementCache.get_data_version(company_id) > version
+        assert StatementCache.load(company_id) is None
+        cash_cy, cash_py = _cash_on_hand(company_id)
+        # The PY credit also restates the CY opening of the balance sheet ledger
+        assert abs(cash_cy - (base_cash[0] + 1000 - 250)) < 0.01 and abs(cash_py - (base_cash[1] - 250)) < 0.01
+        adjusted = _totals(company_id, adjusted=True)
+        assert abs(adjusted['debit_cy'] - base['debit_cy'] - 1000) < 0.01
+        assert abs(adjusted['credit_py'] - base['credit_py'] - 250) < 0.01
+        assert abs(adjusted['closing_balance_cy'] - base['closing_balance_cy']) < 0.01  # Balanced entry
+        assert TrialBalance.validate_balance(company_id, adjusted=True)[2:] == base_balance[2:]
+
+        # The imported rows themselves are untouched
+        assert _totals(company_id, adjusted=False) == base
+        row = TrialBalance.get_frame(company_id, columns=['tb_id', 'debit_cy'])
+        assert row['debit_cy'][row['tb_id'] == cash_tb][0] == next(
+            e['debit_cy'] for e in entries if e['ledger_name'] == frame['ledger_name'][frame['tb_id'] == cash_tb][0])
+
+        # Withdrawing restores the base figures; rejected entries never count
+        assert Adjustment.withdraw_batch(company_id, 'AJE-1') == 4
+        assert _totals(company_id, adjusted=True) == base and _cash_on_hand(company_id) == base_cash
+        Adjustment.create(company_id, cash_tb, 'AJE-2', debit=500, status=Adjustment.APPLIED)
+        cy_balanced, py_balanced, cy_diff, _ = TrialBalance.validate_balance(company_id, adjusted=True)
+        assert base_balance[0] and not cy_balanced and py_balanced and abs(cy_diff - 500) < 1  # One-sided entry
+        Adjustment.set_status(company_id, 'AJE-2', Adjustment.REJECTED)
+        assert _totals(company_id, adjusted=True) == base
+
+        batches = {(name, status): (count, debit, credit)
+                   for name, status, count, debit, credit in Adjustment.get_batches(company_id)}
+        assert batches == {('AJE-1', 'proposed'): (4, 1250.0, 1250.0), ('AJE-2', 'rejected'): (1, 500.0, 0.0)}
+        assert [entry[3] for entry in Adjustment.get_by_batch(company_id, 'AJE-1')] == ['CY', 'CY', 'PY', 'PY']
+
+        try:
+            Adjustment.create(company_id, cash_tb, 'AJE-3', debit=1, period='NY')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown period accepted")
+
+        # Deleting the trial balance batch takes its adjustments along
+        TrialBalance.delete_by_company(company_id, 1)
+        assert Adjustment.get_batches(company_id) == []
+        print("✓ Adjustments applied, withdrawn and rejected without touching the imported rows")
+    finally:
+        delete_company(company_id)
+
+
+def test_py_adjustment_carried_forward():
+    """A PY entry on a balance sheet ledger moves its CY opening too - continuity still holds"""
+    initialize_database()
+    company = seed_company(500, seed=31)
+    company_id = company['company_id']
+    try:
+        _import_mapped(company, 500, 31)
+        columns = ['tb_id', 'type_bs_pl', 'opening_balance_cy', 'closing_balance_cy', 'closing_balance_py']
+        base = TrialBalance.get_frame(company_id, columns=columns)
+        bs_tb = int(base['tb_id'][base['type_bs_pl'] == 'BS'][0])
+        pl_tb = int(base['tb_id'][base['type_bs_pl'] == 'PL'][0])
+        base_issues = validate_trial_balance(company_id)
+        base_continuity = base_issues['rule'].isin(['Opening not PY closing', 'P&L opening balance'])
+        Adjustment.bulk_create(company_id, 'PY-1', [
+            {'tb_id': bs_tb, 'debit': 400, 'period': 'PY', 'narration': 'Prior period error'},
+            {'tb_id': pl_tb, 'credit': 400, 'period': 'PY'},
+        ], status=Adjustment.APPLIED)
+
+        adjusted = TrialBalance.get_frame(company_id, columns=columns, adjusted=True)
+        for tb_id, moved in ((bs_tb, 400), (pl_tb, 0)):
+            before, after = base['tb_id'] == tb_id, adjusted['tb_id'] == tb_id
+            for name in ('opening_balance_cy', 'closing_balance_cy'):
+                assert abs(adjusted[name][after][0] - base[name][before][0] - moved) < 0.01, (tb_id, name)
+        # No new continuity warnings (the synthetic balancing ledger has one of its own)
+        issues = validate_trial_balance(company_id, adjusted=True)
+        continuity = issues['rule'].isin(['Opening not PY closing', 'P&L opening balance'])
+        assert sorted(issues['tb_id'][continuity]) == sorted(base_issues['tb_id'][base_continuity]), issues
+        print("✓ PY adjustment carried into the CY opening")
+    finally:
+        delete_company(company_id)
+
+
+def test_adjusted_read_speed():
+    """The adjusted read joins only the applied totals - close to a plain read"""
+    initialize_database()
+    company = seed_company(50000, seed=29)
+    company_id = company['company_id']
+    try:
+        _import_mapped(company, 50000, 29)
+        tb_ids = TrialBalance.get_frame(company_id, columns=['tb_id'])['tb_id'].tolist()
+        Adjustment.bulk_create(company_id, 'Bulk', [
+            {'tb_id': tb_id, 'debit': 10 if i % 2 else 0, 'credit': 0 if i % 2 else 10}
+            for i, tb_id in enumerate(tb_ids[::10])
+        ], status=Adjustment.APPLIED)
+
+        timings = {}
+        for adjusted in (False, True):
+            started = time.perf_counter()
+            frame = TrialBalance.get_frame(company_id, columns=['grouping_id'] + AMOUNTS, adjusted=adjusted)
+            timings[adjusted] = time.perf_counter() - started
+            assert len(frame) == 50000
+        assert timings[True] < timings[False] * 3 + 0.5, timings
+        print(f"✓ 50,000 ledgers, 5,000 applied adjustments: base read {timings[False]:.2f}s, "
+              f"adjusted read {timings[True]:.2f}s")
+    finally:
+        delete_company(company_id)
+
+
+def test_dialog_import_and_apply():
+    """A batch imported by ledger name, applied from the dialog"""
+    initialize_database()
+    app = QApplication.instance() or QApplication([])
+    company = seed_company(200, seed=31)
+    company_id = company['company_id']
+    try:
+        entries = _import_mapped(company, 200, 31)
+        names = [entries[0]['ledger_name'], entries[1]['ledger_name']]
+
+        dialog = AdjustmentsDialog(company_id)
+        changes = []
+        dialog.adjustments_changed.connect(lambda: changes.append(True))
+
+        count, unknown = dialog.import_frame('Audit', pd.DataFrame({
+            'Ledger': names + ['No Such Ledger'], 'Dr': [100, None, 5], 'Cr': [None, 100, None]}))
+        assert count == 0 and unknown == ['No Such Ledger']
+
+        count, unknown = dialog.import_frame('Audit', pd.DataFrame({
+            'Ledger': names, 'Dr': [100, None], 'Cr': [None, 100], 'Period': ['CY', 'CY'],
+            'Narration': ['Reclass', None]}))
+        assert (count, unknown) == (2, [])
+        dialog.load_batches()
+        assert dialog.batch_table.rowCount() == 1 and dialog.batch_table.item(0, 1).text() == 'Proposed'
+
+        dialog.batch_table.setCurrentCell(0, 0)
+        dialog.apply_selected()
+        assert changes and dialog.batch_table.item(0, 1).text() == 'Applied'
+        assert Adjustment.get_batches(company_id)[0][:3] == ('Audit', Adjustment.APPLIED, 2)
+        dialog.close()
+        print("✓ Adjustment dialog: import by ledger name and apply")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_overlay_and_toggle()
+    test_py_adjustment_carried_forward()
+    test_adjusted_read_speed()
+    test_dialog_import_and_apply()
+    print("\n✅ All adjustments tests passed!")
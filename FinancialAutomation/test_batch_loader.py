@@ -0,0 +1,77 @@
+"""
+Batch Loader Test - get_many lookups and per-operation coalescing of get_by_id calls
+"""
+
+from config.database import initialize_database
+from config.instrumentation import track_action
+from models.batch_loader import BatchLoader
+from models.master_data import MajorHead, MinorHead, Grouping
+from models.ppe import PPE
+from models.cwip import CWIP
+from models.investments import Investment
+from utils.synthetic_data import seed_company, delete_company
+
+
+def test_get_many_matches_get_by_id():
+    """Every model's get_many returns what get_by_id returns, keyed by id"""
+    initialize_database()
+    company = seed_company(50, seed=5)
+    company_id = company['company_id']
+    try:
+        id_sets = {
+            MajorHead: [m.major_head_id for m in MajorHead.get_all_by_company(company_id)],
+            MinorHead: [m[0] for m in MinorHead.get_all(company_id=company_id)],
+            Grouping: [g[0] for g in Grouping.get_all(company_id=company_id)],
+            PPE: [p.ppe_id for p in PPE.get_all_by_company(company_id)],
+            CWIP: [c.cwip_id for c in CWIP.get_all_by_company(company_id)],
+            Investment: [i.investment_id for i in Investment.get_all_by_company(company_id)],
+        }
+        for model, ids in id_sets.items():
+            assert ids, model.__name__
+            found = model.get_many(ids + [None, -1])
+            assert sorted(found) == sorted(ids), model.__name__
+            for record_id in ids:
+                expected, actual = model.get_by_id(record_id), found[record_id]
+                if isinstance(expected, tuple):
+                    assert actual == expected
+                else:
+                    assert vars(actual) == vars(expected), model.__name__
+            assert model.get_many([]) == {}
+        print("✓ get_many matches get_by_id")
+    finally:
+        delete_company(company_id)
+
+
+def test_batch_loader_coalesces():
+    """Primed ids are fetched in one query per model and memoized, misses included"""
+    initialize_database()
+    company = seed_company(50, seed=6)
+    company_id = company['company_id']
+    try:
+        groupings = Grouping.get_all(company_id=company_id)
+        loader = BatchLoader()
+        with track_action("Batch load") as trace:
+            loader.prime(Grouping, [g[0] for g in groupings] + [-1])
+            loader.prime(MinorHead, [g[2] for g in groupings])
+            names = [loader.load(Grouping, g[0])[2] for g in groupings]
+            minors = [loader.load(MinorHead, g[2]) for g in groupings]
+            assert loader.load(Grouping, -1) is None
+            assert loader.load(Grouping, None) is None
+        assert names == [g[3] for g in groupings]
+        assert all(minor is not None for minor in minors)
+        assert loader.query_count == 2 and trace.query_count == 2
+
+        # Unprimed ids are fetched on demand; known ones come from memory
+        first = groupings[0][0]
+        assert loader.load_many(Grouping, [first, -1, None]) == [loader.load(Grouping, first), None, None]
+        assert loader.load(MajorHead, minors[0][1]) is not None  # minor tuple: (id, major_head_id, ...)
+        assert loader.query_count == 3
+        print("✓ Batch loader coalesces lookups")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_get_many_matches_get_by_id()
+    test_batch_loader_coalesces()
+    print("\n✅ All batch loader tests passed!")
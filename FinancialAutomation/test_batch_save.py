@@ -0,0 +1,167 @@
+"""
+Batch Save Test - input forms save new, edited and deleted rows in one transaction
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QTableWidgetItem, QWidget
+
+from config.database import initialize_database
+from config.db_connection import get_dialect
+from config.instrumentation import track_action
+from models.ppe import PPE
+from models.cwip import CWIP
+from models.investments import Investment
+from views.ppe_input_form import PPEInputForm
+from views.cwip_input_form import CWIPInputForm
+from views.investments_input_form import InvestmentsInputForm
+from utils.synthetic_data import create_empty_company, delete_company
+
+
+class _Window(QWidget):
+    """Stands in for MainWindow (PPEInputForm reads current_company_id from its parent)"""
+    current_company_id = None
+
+
+@contextmanager
+def _silenced_message_boxes():
+    """Answer every message box (Yes to questions) without showing it"""
+    names = ('information', 'warning', 'critical', 'question')
+    originals = {name: getattr(QMessageBox, name) for name in names}
+    for name in names:
+        answer = QMessageBox.Yes if name == 'question' else QMessageBox.Ok
+        setattr(QMessageBox, name, staticmethod(lambda *args, answer=answer, **kwargs: answer))
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(QMessageBox, name, original)
+
+
+def test_model_save_batch():
+    """5,000 new assets, edits and deletes in one transaction; IDs come back in order"""
+    initialize_database()
+    company_id = create_empty_company("Batch Save Test")
+    try:
+        entries = [{'asset_class': f"Asset {i:05d}", 'opening_gross_block_cy': 1000.0 + i,
+                    'additions_cy': 10.0, 'depreciation_for_year_cy': 5.0, 'useful_life_years': 10}
+                   for i in range(5000)]
+        started = time.perf_counter()
+        with track_action("Save PPE") as trace:
+            new_ids = PPE.save_batch(company_id, entries)
+        seconds = time.perf_counter() - started
+        assert len(new_ids) == 5000 and len(set(new_ids)) == 5000
+        assert seconds < 5, seconds
+        if get_dialect().name == 'postgresql':
+            assert trace.query_count <= 2, trace.query_count
+
+        saved = PPE.get_many(new_ids[:3])
+        assert [saved[i].asset_class for i in new_ids[:3]] == ["Asset 00000", "Asset 00001", "Asset 00002"]
+        assert saved[new_ids[0]].closing_gross_block_cy == 1010.0
+
+        # Edit one, delete two, add one - all or nothing
+        changed = dict(entries[0], ppe_id=new_ids[0], additions_cy=500.0)
+        added = PPE.save_batch(company_id, [{'asset_class': 'Added'}], [changed], new_ids[1:3])
+        assert len(added) == 1
+        assert PPE.get_by_id(new_ids[0]).closing_gross_block_cy == 1500.0
+        assert PPE.get_many(new_ids[1:3]) == {}
+
+        failed = False
+        try:
+            PPE.save_batch(company_id, [{'asset_class': None}], [dict(changed, additions_cy=0.0)])
+        except Exception:
+            failed = True  # asset_class is NOT NULL
+        assert failed
+        assert PPE.get_by_id(new_ids[0]).additions_cy == 500.0  # Rolled back
+
+        # Keys of another company's rows are left alone
+        other_id = create_empty_company("Batch Save Other")
+        try:
+            PPE.save_batch(other_id, changed_entries=[dict(changed, additions_cy=1.0)], deleted_ids=[new_ids[3]])
+        finally:
+            delete_company(other_id)
+        assert PPE.get_by_id(new_ids[0]).additions_cy == 500.0 and PPE.get_by_id(new_ids[3]) is not None
+
+        # Dates and blanks survive the typed bulk update
+        cwip_ids = CWIP.save_batch(company_id, [{'project_name': 'Plant', 'additions_cy': 100.0,
+                                                 'project_start_date': '2024-04-01'}])
+        CWIP.save_batch(company_id, changed_entries=[{'cwip_id': cwip_ids[0], 'project_name': 'Plant II',
+                                                      'additions_cy': 50.0, 'project_start_date': '',
+                                                      'expected_completion_date': '2025-03-31'}])
+        cwip = CWIP.get_by_id(cwip_ids[0])
+        assert cwip.project_name == 'Plant II' and cwip.closing_balance_cy == 50.0
+        assert not cwip.project_start_date and str(cwip.expected_completion_date) == '2025-03-31'
+        print(f"✓ save_batch: 5,000 assets in {seconds:.3f}s ({trace.query_count} statements)")
+    finally:
+        delete_company(company_id)
+
+
+def test_forms_track_dirty_rows():
+    """Forms send only modified, new and deleted rows, then show the assigned IDs"""
+    initialize_database()
+    app = QApplication.instance() or QApplication([])
+    company_id = create_empty_company("Batch Form Test")
+    try:
+        with _silenced_message_boxes():
+            _edit_and_save_forms(company_id)
+        print("✓ Forms save dirty, new and deleted rows in one batch")
+    finally:
+        delete_company(company_id)
+
+
+def _edit_and_save_forms(company_id):
+    """Add, edit and delete rows in the three forms and save each"""
+    window = _Window()
+    window.current_company_id = company_id
+    ppe_form = PPEInputForm(window)
+    for name in ('Land', 'Building', 'Vehicles'):
+        ppe_form.add_ppe_row()
+        ppe_form.table.setItem(ppe_form.table.rowCount() - 1, 0, QTableWidgetItem(name))
+    assert ppe_form.has_unsaved_changes()
+    ppe_form.save_all()
+    assert not ppe_form.has_unsaved_changes()
+    assert all(ppe_form.table.item(row, 21).text() for row in range(3))
+    assert sorted(p.asset_class for p in PPE.get_all_by_company(company_id)) == ['Building', 'Land', 'Vehicles']
+
+    ppe_form.table.item(0, 2).setText("250.00")  # Edit Land
+    ppe_form.table.selectRow(2)
+    ppe_form.delete_selected()  # Vehicles, deleted on save
+    assert ppe_form.has_unsaved_changes() and len(PPE.get_all_by_company(company_id)) == 3
+    with track_action("Save PPE form") as trace:
+        ppe_form.save_all()
+    assert {p.asset_class: p.additions_cy for p in PPE.get_all_by_company(company_id)} == \
+        {'Land': 250.0, 'Building': 0.0}
+    if get_dialect().name == 'postgresql':
+        assert trace.query_count <= 3, trace.query_count
+
+    cwip_form = CWIPInputForm()
+    cwip_form.set_company(company_id)
+    cwip_form.add_cwip_row(CWIP(project_name='Warehouse'))
+    cwip_form.table.item(0, cwip_form.COL_MODIFIED).setText("1")
+    cwip_form.save_all()
+    cwip_form.table.item(0, cwip_form.COL_PROJECT).setText("Warehouse 2")  # Name edits are dirty too
+    assert cwip_form.has_unsaved_changes()
+    cwip_form.save_all()
+    assert [c.project_name for c in CWIP.get_all_by_company(company_id)] == ['Warehouse 2']
+
+    inv_form = InvestmentsInputForm()
+    inv_form.set_company(company_id)
+    for tab, name in ((inv_form.non_current_tab, 'Sub Ltd'), (inv_form.current_tab, 'Liquid Fund')):
+        tab.add_investment_row(Investment(investment_particulars=name, classification=tab.classification))
+        tab.table.item(0, tab.COL_MODIFIED).setText("1")
+    inv_form.save_all()
+    saved = {i.investment_particulars: i for i in Investment.get_all_by_company(company_id)}
+    assert saved['Sub Ltd'].classification == Investment.NON_CURRENT
+    assert saved['Liquid Fund'].classification == Investment.CURRENT
+    assert inv_form.current_tab.table.item(0, inv_form.current_tab.COL_INV_ID).text() == \
+        str(saved['Liquid Fund'].investment_id)
+
+
+if __name__ == '__main__':
+    test_model_save_batch()
+    test_forms_track_dirty_rows()
+    print("\n✅ All batch save tests passed!")
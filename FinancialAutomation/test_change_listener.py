@@ -0,0 +1,85 @@
+"""
+Change Listener Test - NOTIFY on committed writes, one per company per statement (PostgreSQL)
+"""
+
+import queue
+
+import psycopg2
+
+from config.database import initialize_database, get_connection
+from config.db_connection import get_dialect
+from config.settings import POSTGRES_CONFIG
+from config.change_listener import ChangeListener
+from models.trial_balance import TrialBalance
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+
+def _drain(changes, company_id, timeout=2.0):
+    """Changes of one company until none arrive for a short while"""
+    received = []
+    try:
+        while True:
+            change = changes.get(timeout=timeout if not received else 0.3)
+            if change.company_id == company_id:
+                received.append(change)
+    except queue.Empty:
+        return received
+
+
+def test_change_notifications():
+    """Writes by this client and by another client are both delivered, flagged by origin"""
+    if get_dialect().name != 'postgresql':
+        print("✓ Skipped - notifications need PostgreSQL")
+        return
+
+    initialize_database()
+    company = seed_company(300, seed=21)
+    company_id = company['company_id']
+    changes = queue.Queue()
+    listener = ChangeListener(changes.put, poll_interval=0.1)
+    try:
+        assert listener.start()
+        assert listener.wait_until_listening(10)
+
+        # Bulk import through the pool - one notification for the whole COPY
+        entries, _ = generate_ledgers(company['groupings'], 300, seed=21)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+        received = _drain(changes, company_id)
+        assert [(c.table, c.operation, c.own) for c in received] == [('trial_balance', 'INSERT', True)]
+
+        # Another user's client (not our pool) edits a schedule
+        other = psycopg2.connect(**POSTGRES_CONFIG)
+        try:
+            cursor = other.cursor()
+            cursor.execute('UPDATE cwip_schedule SET additions_cy = additions_cy + 1 WHERE company_id = %s',
+                           (company_id,))
+            other.commit()
+        finally:
+            other.close()
+        received = _drain(changes, company_id)
+        assert len(received) == 1
+        change = received[0]
+        assert (change.table, change.operation, change.own) == ('cwip_schedule', 'UPDATE', False)
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT version FROM data_versions WHERE company_id = %s', (company_id,))
+        assert change.version == cursor.fetchone()[0]
+        conn.close()
+
+        # Rolled back writes are never announced
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM trial_balance WHERE company_id = %s', (company_id,))
+        conn.rollback()
+        conn.close()
+        assert _drain(changes, company_id, timeout=0.5) == []
+        print("✓ Change notifications")
+    finally:
+        listener.stop()
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_change_notifications()
+    print("\n✅ All change listener tests passed!")
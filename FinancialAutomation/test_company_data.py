@@ -0,0 +1,67 @@
+"""
+Company Data Test - concurrent prefetch of the datasets shown when a company is loaded
+"""
+
+import threading
+
+from config.database import initialize_database
+from config.instrumentation import track_action
+from models.company_data import COMPANY_DATASETS, prefetch_company
+from models.master_data import MinorHead
+from models.ppe import PPE
+from models.trial_balance import TrialBalance
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+
+def test_prefetch_company():
+    """Every dataset arrives once and matches the serial loaders"""
+    initialize_database()
+    company = seed_company(500, seed=11)
+    company_id = company['company_id']
+    try:
+        entries, _ = generate_ledgers(company['groupings'], 500, seed=11)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+
+        arrived = []
+        with track_action("Load Company") as trace:
+            results, errors = prefetch_company(
+                company_id, lambda name, value, error: arrived.append((name, threading.get_ident())))
+
+        assert errors == {}
+        assert sorted(name for name, _ in arrived) == sorted(COMPANY_DATASETS)
+        assert all(ident == threading.get_ident() for _, ident in arrived)  # Callbacks run on the caller's loop
+        assert trace.query_count >= len(COMPANY_DATASETS)  # Worker queries count against the action
+
+        assert results['company'].company_id == company_id
+        assert results['tb_stats'] == TrialBalance.get_summary_stats(company_id)
+        assert len(results['tb_frame']) == 500
+        assert results['minor_heads'] == MinorHead.get_all(company_id=company_id)
+        assert [p.ppe_id for p in results['ppe']] == [p.ppe_id for p in PPE.get_all_by_company(company_id)]
+        assert len(results['selection_sheet']) > 0
+        print("✓ Concurrent prefetch")
+
+        results, errors = prefetch_company(company_id, datasets=['company', 'cwip'])
+        assert set(results) == {'company', 'cwip'}
+        print("✓ Dataset subset")
+    finally:
+        delete_company(company_id)
+
+
+def test_prefetch_errors():
+    """A failing dataset is reported without losing the others"""
+    results, errors = prefetch_company(-1, datasets=['company', 'tb_stats'])
+    assert results['company'] is None and errors == {}
+
+    COMPANY_DATASETS['broken'] = lambda company_id: 1 / 0
+    try:
+        results, errors = prefetch_company(-1, datasets=['company', 'broken'])
+    finally:
+        del COMPANY_DATASETS['broken']
+    assert 'company' in results and isinstance(errors['broken'], ZeroDivisionError)
+    print("✓ Failed datasets reported")
+
+
+if __name__ == '__main__':
+    test_prefetch_company()
+    test_prefetch_errors()
+    print("\n✅ All company data tests passed!")
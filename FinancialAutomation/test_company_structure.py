@@ -0,0 +1,71 @@
+"""
+Company Structure Clone Test - master data and ledger mappings copied server-side
+"""
+
+from config.database import initialize_database, get_connection
+from config.instrumentation import track_action
+from models.trial_balance import TrialBalance
+from utils.company_structure import clone_company_structure
+from utils.synthetic_data import seed_company, generate_ledgers, create_empty_company, delete_company
+
+
+def _count(cursor, table, company_id):
+    cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE company_id = %s', (company_id,))
+    return cursor.fetchone()[0]
+
+
+def test_clone_company_structure():
+    """Hierarchy is copied with remapped ids; matching ledgers pick up the source mapping"""
+    initialize_database()
+    source = seed_company(200, seed=5)
+    source_id = source['company_id']
+    target_id = create_empty_company("Clone Target")
+    try:
+        entries, ledger_groupings = generate_ledgers(source['groupings'], 200, seed=5)
+        TrialBalance.bulk_import(source_id, entries, import_batch_id=1)
+        TrialBalance.bulk_import(target_id, entries[:50], import_batch_id=1)
+        mappings = [(tb.tb_id, g['major_head_id'], g['minor_head_id'], g['grouping_id'], g['type_bs_pl'])
+                    for tb in TrialBalance.get_by_company(source_id)
+                    for g in [ledger_groupings[tb.ledger_name]]]
+        TrialBalance.bulk_update_mapping(mappings)
+
+        with track_action("test:clone_company") as trace:
+            stats = clone_company_structure(source_id, target_id, include_mappings=True)
+        assert trace.query_count < 20, trace.query_count
+
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            for table in ('major_heads', 'minor_heads', 'groupings'):
+                assert stats[table] == _count(cursor, table, source_id) == _count(cursor, table, target_id)
+            assert stats['ledger_mappings'] == 50
+
+            # Every target row points at target master data with the same names as the source
+            cursor.execute('''
+                SELECT t.ledger_name, g.grouping_name, g.company_id, mn.company_id, mj.company_id
+                FROM trial_balance t
+                JOIN groupings g ON g.grouping_id = t.grouping_id
+                JOIN minor_heads mn ON mn.minor_head_id = t.minor_head_id
+                JOIN major_heads mj ON mj.major_head_id = t.major_head_id
+                WHERE t.company_id = %s
+            ''', (target_id,))
+            rows = cursor.fetchall()
+            assert len(rows) == 50
+            for ledger_name, grouping_name, *company_ids in rows:
+                assert grouping_name == ledger_groupings[ledger_name]['grouping_name']
+                assert company_ids == [target_id] * 3
+        finally:
+            conn.close()
+
+        # Cloning again keeps existing heads and adds nothing
+        stats = clone_company_structure(source_id, target_id, include_mappings=True)
+        assert stats == {'major_heads': 0, 'minor_heads': 0, 'groupings': 0, 'ledger_mappings': 0}, stats
+        print("✓ Company structure clone")
+    finally:
+        delete_company(target_id)
+        delete_company(source_id)
+
+
+if __name__ == '__main__':
+    test_clone_company_structure()
+    print("\n✅ All company structure tests passed!")
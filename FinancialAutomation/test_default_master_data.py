@@ -0,0 +1,65 @@
+"""
+Default Master Data Test - bulk seeding of the Schedule III template
+"""
+
+from config.database import initialize_database, get_connection
+from config.instrumentation import track_action
+from utils.default_master_data import initialize_default_master_data_for_company
+from utils.synthetic_data import create_empty_company, delete_company
+
+
+def test_default_master_data():
+    """Template tree is inserted with a handful of statements, parents resolved correctly"""
+    initialize_database()
+    company_id = create_empty_company("Default Master Data Test")
+    try:
+        with track_action("test:default_master_data") as trace:
+            stats = initialize_default_master_data_for_company(company_id)
+        assert stats == {"major_heads": 12, "minor_heads": 24, "groupings": 78}, stats
+        assert trace.query_count < 60, trace.query_count
+
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT major_head_name, major_head_id, display_order FROM major_heads '
+                           'WHERE company_id = %s', (company_id,))
+            majors = {name: (major_id, order) for name, major_id, order in cursor.fetchall()}
+            assert len(majors) == 12
+            assert majors["Non-Current Assets"][1] == 1 and majors["Other Expenses"][1] == 12
+
+            cursor.execute('SELECT minor_head_id, major_head_id FROM minor_heads '
+                           'WHERE company_id = %s AND minor_head_name = %s',
+                           (company_id, "Property, Plant and Equipment"))
+            ppe_id, ppe_major_id = cursor.fetchone()
+            assert ppe_major_id == majors["Non-Current Assets"][0]
+
+            cursor.execute('SELECT minor_head_id, major_head_id, display_order FROM groupings '
+                           'WHERE company_id = %s AND grouping_name = %s', (company_id, "Buildings"))
+            assert cursor.fetchone() == (ppe_id, ppe_major_id, 3)
+
+            cursor.execute('SELECT COUNT(*) FROM groupings WHERE company_id = %s', (company_id,))
+            assert cursor.fetchone()[0] == 78
+        finally:
+            conn.close()
+
+        # Seeding twice violates the unique names and leaves nothing half-written
+        try:
+            initialize_default_master_data_for_company(company_id)
+            assert False, "duplicate seeding should fail"
+        except Exception as e:
+            assert "Failed to initialize default master data" in str(e)
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM major_heads WHERE company_id = %s', (company_id,))
+            assert cursor.fetchone()[0] == 12
+        finally:
+            conn.close()
+        print("✓ Default master data seeding")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_default_master_data()
+    print("\n✅ All default master data tests passed!")
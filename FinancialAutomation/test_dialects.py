@@ -0,0 +1,144 @@
+"""
+SQL Dialect Test - statement translation and the embedded SQLite backend (no server needed)
+"""
+
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from config.dialects import SQLiteDialect, PostgresDialect, get_dialect_class
+from config.db_connection import open_sqlite_connection
+
+
+def test_sqlite_translation():
+    """%s / NOW() / SERIAL are rewritten, NOW() inside string literals is not"""
+    dialect = SQLiteDialect()
+    sql = dialect.adapt("UPDATE t SET a = %s, note = 'NOW() is ''now''', updated_at = now() WHERE id = %s")
+    assert sql == "UPDATE t SET a = ?, note = 'NOW() is ''now''', updated_at = CURRENT_TIMESTAMP WHERE id = ?", sql
+    assert dialect.adapt("id SERIAL PRIMARY KEY") == "id INTEGER PRIMARY KEY AUTOINCREMENT"
+    assert dialect.adapt("WHERE name LIKE %s || '%%'") == "WHERE name LIKE ? || '%'"
+
+    postgres = PostgresDialect()
+    assert postgres.adapt("SELECT %s") == "SELECT %s"
+    assert get_dialect_class('SQLite') is SQLiteDialect
+    print("✓ SQL translation")
+
+
+def test_upsert():
+    """ON CONFLICT statement"""
+    sql = SQLiteDialect().upsert('groupings', ['company_id', 'grouping_name', 'display_order'],
+                                 ['company_id', 'grouping_name'])
+    assert "ON CONFLICT (company_id, grouping_name) DO UPDATE SET display_order = excluded.display_order" in sql
+    print("✓ Upsert statement")
+
+
+def test_sqlite_backend():
+    """Round-trip types, RETURNING, bulk strategies and pragmas on a real SQLite file"""
+    dialect = SQLiteDialect()
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = open_sqlite_connection(os.path.join(tmp, 'test.db'))
+        try:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+
+            cursor = conn.cursor()
+            cursor.execute(dialect.adapt('''
+                CREATE TABLE items (
+                    item_id SERIAL PRIMARY KEY,
+                    name VARCHAR(50) UNIQUE NOT NULL,
+                    amount DECIMAL(15,2) DEFAULT 0,
+                    due_date DATE,
+                    is_active BOOLEAN DEFAULT TRUE,
+                    created_at TIMESTAMP DEFAULT NOW()
+                )
+            '''))
+
+            cursor.execute('INSERT INTO items (name, amount, due_date) VALUES (%s, %s, %s) RETURNING item_id',
+                           ('first', Decimal('10.50'), date(2025, 3, 31)))
+            first_id = cursor.fetchone()[0]
+
+            ids = dialect.bulk_insert_returning(cursor, 'items', ['name', 'amount'],
+                                                [('second', 1), ('third', 2)], ['item_id', 'name'])
+            assert [name for _, name in ids] == ['second', 'third']
+            assert dialect.bulk_insert(cursor, 'items', ['name', 'amount'], [('fourth', 3)]) == 1
+
+            dialect.bulk_update(cursor, 'items', 'item_id', ['amount'], [(first_id, 99.25)],
+                                extra_set='is_active = FALSE')
+            cursor.execute(dialect.upsert('items', ['name', 'amount'], ['name']), ('fourth', 4))
+            conn.commit()
+
+            cursor.execute('SELECT amount, due_date, is_active, created_at FROM items WHERE item_id = %s',
+                           (first_id,))
+            amount, due_date, is_active, created_at = cursor.fetchone()
+            assert amount == 99.25 and isinstance(amount, float)
+            assert due_date == date(2025, 3, 31)
+            assert is_active is False
+            assert created_at is not None
+
+            cursor.execute("SELECT amount FROM items WHERE name = 'fourth'")
+            assert cursor.fetchone()[0] == 4.0
+            cursor.execute('SELECT COUNT(*) FROM items WHERE is_active = TRUE')
+            assert cursor.fetchone()[0] == 3
+        finally:
+            conn.close()
+    print("✓ SQLite backend")
+
+
+def test_sqlite_nested_checkouts():
+    """An inner get_connection() commits or rolls back only its own work, inside the outer transaction"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'test.db')
+        conn = open_sqlite_connection(path)
+        reader = open_sqlite_connection(path)
+
+        def committed():
+            return [name for name, in reader.execute('SELECT name FROM items ORDER BY item_id')]
+
+        def names():
+            return [name for name, in conn.execute('SELECT name FROM items ORDER BY item_id')]
+
+        try:
+            conn.checkout()
+            conn.execute('CREATE TABLE items (item_id INTEGER PRIMARY KEY, name TEXT)')
+            conn.commit()
+            conn.execute("INSERT INTO items (name) VALUES ('outer')")
+
+            conn.checkout()  # Nested call while the outer level has uncommitted work
+            conn.execute("INSERT INTO items (name) VALUES ('discarded')")
+            conn.rollback()
+            conn.execute("INSERT INTO items (name) VALUES ('inner')")
+            conn.commit()
+            conn.execute("INSERT INTO items (name) VALUES ('not committed')")
+            conn.close()
+            assert names() == ['outer', 'inner'] and committed() == []
+
+            conn.commit()  # Outermost level
+            assert committed() == ['outer', 'inner']
+
+            conn.execute("INSERT INTO items (name) VALUES ('rolled back')")
+            conn.checkout()
+            conn.execute("INSERT INTO items (name) VALUES ('inner 2')")
+            conn.commit()
+            conn.close()
+            conn.rollback()
+            assert names() == committed() == ['outer', 'inner']
+
+            conn.checkout()  # Nothing pending - the inner level commits for itself
+            conn.execute("INSERT INTO items (name) VALUES ('own')")
+            conn.commit()
+            conn.close()
+            assert committed() == ['outer', 'inner', 'own']
+            conn.close()
+        finally:
+            reader.close()
+            conn.close_for_real()
+    print("✓ SQLite nested checkouts")
+
+
+if __name__ == '__main__':
+    test_sqlite_translation()
+    test_upsert()
+    test_sqlite_backend()
+    test_sqlite_nested_checkouts()
+    print("\n✅ All dialect tests passed!")
@@ -0,0 +1,67 @@
+"""
+Financials Tab Test - statements and notes render on demand and are cached (no database needed)
+"""
+
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from test_pdf_exporter import BS, PL, CF, NOTES
+
+app = QApplication.instance() or QApplication([])
+
+from views.financials_tab import FinancialsTab
+
+
+def _snapshot(notes):
+    return SimpleNamespace(balance_sheet=BS, profit_loss=PL, cash_flow=CF, notes=notes)
+
+
+def test_lazy_note_rendering():
+    """Only the visible tab and the selected note are rendered; unchanged notes are reused"""
+    tab = FinancialsTab()
+    rendered = []
+    original = tab._note_html
+    tab._note_html = lambda note_data: rendered.append(note_data['title']) or original(note_data)
+
+    tab.tabs.setCurrentIndex(3)
+    tab.show_snapshot(_snapshot(NOTES))
+    assert set(tab._pending) == {tab.bs_widget, tab.pl_widget, tab.cf_widget} and not tab._rendered
+    assert tab.notes_index.count() == len(NOTES)
+    assert rendered == ['Note 1: Property, Plant and Equipment']
+
+    tab.notes_index.setCurrentRow(2)
+    assert rendered[-1] == 'Note 11: Cash and Cash Equivalents'
+    assert 'Cash on Hand' in tab.notes_widget.toPlainText()
+
+    # Regenerated statements: only the changed note renders again, and only when viewed
+    changed = dict(NOTES)
+    changed[1] = dict(NOTES[1], total_cy=999.0)
+    tab.show_snapshot(_snapshot(changed))
+    assert len(rendered) == 2 and tab.notes_index.currentRow() == 2
+    tab.notes_index.setCurrentRow(0)
+    assert len(rendered) == 3
+    tab.notes_index.setCurrentRow(2)
+    assert len(rendered) == 3
+    print("✓ Lazy note rendering")
+
+
+def test_note_names_escaped():
+    """Ledger and grouping names with HTML characters show as text"""
+    tab = FinancialsTab()
+    note = {'title': 'Note 8: Inventories <Stock & Stores>',
+            'data': {'Stores & Spares': [{'particulars': 'Bolts <M8>', 'value_cy': 5.0, 'value_py': 4.0}]},
+            'total_cy': 5.0, 'total_py': 4.0}
+    tab.notes_widget.setHtml(tab._note_html(note))
+    text = tab.notes_widget.toPlainText()
+    assert 'Inventories <Stock & Stores>' in text and 'Stores & Spares' in text and 'Bolts <M8>' in text, text
+    print("✓ Note names escaped")
+
+
+if __name__ == '__main__':
+    test_lazy_note_rendering()
+    test_note_names_escaped()
+    print("\n✅ All financials tab tests passed!")
@@ -0,0 +1,138 @@
+"""
+Fixed Asset Register Test - Schedule II depreciation engine and roll-up into Note 1
+"""
+
+import time
+from datetime import date
+
+import numpy as np
+
+from config.database import initialize_database
+from models.fixed_assets import FixedAsset, AssetRegister, register_column
+from models.financial_statements import NotesGenerator
+from models.ppe import PPE
+from utils.synthetic_data import create_empty_company, delete_company
+
+FY_START, FY_END = date(2024, 4, 1), date(2025, 3, 31)  # create_empty_company's CY
+
+
+def test_depreciation_engine():
+    """SLM, WDV, pro-rata additions and disposals, non-depreciable land"""
+    register = AssetRegister.from_entries([
+        {'asset_class': 'Computers', 'cost': 90000, 'capitalization_date': '2022-04-01',
+         'residual_value_pct': 0},
+        {'asset_class': 'Plant & Machinery', 'cost': 100000, 'capitalization_date': '01/10/2024',
+         'depreciation_method': 'wdv'},
+        {'asset_class': 'Land', 'cost': 500000, 'capitalization_date': '2010-01-01'},
+        {'asset_class': 'Vehicles', 'cost': 80000, 'capitalization_date': '2020-04-01',
+         'disposal_date': '2024-10-01'},
+        {'asset_class': 'Computers', 'cost': 30000, 'capitalization_date': '2019-04-01',
+         'residual_value_pct': 0},
+    ])
+    years = register.depreciate(FY_START, FY_END)
+    cy, py = years['cy'], years['py']
+
+    # Computers (3 years, SLM, no residual): fully depreciated after three years
+    assert np.allclose(cy['depreciation_for_year'][[0, 4]], [30000.0, 0.0])
+    assert np.allclose(cy['opening_acc_depreciation'][[0, 4]], [60000.0, 30000.0])
+
+    # P&M (15 years, WDV, 5% residual): rate 18.10%, half a year in use
+    rate = 1 - 0.05 ** (1 / 15)
+    assert abs(cy['depreciation_for_year'][1] - 100000 * rate * 182 / 365) < 0.01
+    assert cy['additions'][1] == 100000 and cy['opening_gross_block'][1] == 0
+
+    # Land is not depreciated
+    assert cy['depreciation_for_year'][2] == 0 and cy['opening_gross_block'][2] == 500000
+
+    # Vehicles (8 years, SLM, 5% residual) sold on 1 Oct: 183 days of depreciation
+    assert py['depreciation_for_year'][3] == 9500.0
+    assert abs(cy['depreciation_for_year'][3] - 9500 * 183 / 365) < 0.01
+    assert cy['disposals_gross'][3] == 80000
+    assert abs(cy['acc_depr_on_disposals'][3] - (38000 + 9500 * 183 / 365)) < 0.01
+
+    # PY closing carries into CY opening, class by class
+    for entry in register.class_totals(FY_START, FY_END):
+        closing_py = PPE(**entry)
+        assert abs(closing_py.calculate_closing_gross_block_py() - entry['opening_gross_block_cy']) < 0.01
+        assert abs(closing_py.calculate_closing_acc_depreciation_py() - entry['opening_acc_depreciation_cy']) < 0.01
+
+    failed = False
+    try:
+        AssetRegister.from_entries([{'asset_class': 'Aircraft', 'cost': 1, 'capitalization_date': '2024-04-01'}])
+    except ValueError:
+        failed = True  # Not in the Schedule II table and no useful life given
+    assert failed
+    assert register_column('Date of Capitalisation') == 'capitalization_date'
+    print("✓ SLM/WDV depreciation, pro-rata and roll-forward")
+
+
+def _synthetic_register(count, seed=42):
+    """count assets over six classes, capitalized since 2005, about a tenth disposed"""
+    rng = np.random.default_rng(seed)
+    classes = ['Buildings', 'Plant & Machinery', 'Furniture & Fixtures', 'Vehicles', 'Computers', 'Land']
+    capitalized = np.datetime64('2005-04-01') + rng.integers(0, 7300, count)
+    disposed = capitalized + rng.integers(30, 4000, count)
+    sold = (rng.random(count) < 0.1) & (disposed <= np.datetime64('2025-03-31'))
+    methods = np.where(rng.random(count) < 0.3, 'WDV', 'SLM')
+    costs = rng.integers(1000, 5000000, count) / 100.0
+    return [{
+        'asset_code': f'FA{i:06d}',
+        'asset_class': classes[i % len(classes)],
+        'cost': costs[i],
+        'capitalization_date': str(capitalized[i]),
+        'disposal_date': str(disposed[i]) if sold[i] else None,
+        'depreciation_method': methods[i],
+    } for i in range(count)]
+
+
+def test_import_and_rollup():
+    """100,000 assets import, depreciate and roll up into ppe_schedule and Note 1"""
+    initialize_database()
+    company_id = create_empty_company("Fixed Asset Register Test")
+    try:
+        manual_id = PPE.create(company_id, 'Computers', opening_gross_block_cy=1.0)
+        other_id = PPE.create(company_id, 'Leasehold Improvements', opening_gross_block_cy=700.0)
+
+        entries = _synthetic_register(100000)
+        started = time.perf_counter()
+        count = FixedAsset.bulk_import(company_id, entries, import_batch_id=1)
+        imported = time.perf_counter() - started
+
+        started = time.perf_counter()
+        classes = FixedAsset.rollup_to_schedule(company_id)
+        rolled_up = time.perf_counter() - started
+        assert count == 100000 and FixedAsset.count_by_company(company_id) == 100000
+        assert rolled_up < 30, rolled_up
+
+        # Existing class rows are updated in place, unrelated rows left alone
+        assert classes['Computers'] == manual_id and len(classes) == 6
+        schedule = {p.asset_class: p for p in PPE.get_all_by_company(company_id)}
+        assert len(schedule) == 7 and schedule['Leasehold Improvements'].opening_gross_block_cy == 700.0
+
+        # Class rows match the register: cost of assets held at year end
+        register = FixedAsset.get_register(company_id)
+        held = (register['capitalization_date'] <= np.datetime64(FY_END)) & ~(
+            register['disposal_date'] <= np.datetime64(FY_END))
+        expected = register['cost'][held].sum() + 700.0
+        assert abs(sum(p.closing_gross_block_cy for p in schedule.values()) - expected) < 1.0
+        assert schedule['Land'].closing_acc_depreciation_cy == 0
+        assert schedule['Buildings'].useful_life_years == 60 and schedule['Computers'].useful_life_years == 3
+
+        # Note 1 reads the rolled up rows
+        note = NotesGenerator(company_id).generate_ppe_note()
+        assert abs(note['total_cy'] - sum(p.calculate_net_block_cy() for p in schedule.values())) < 0.01
+        assert note['total_cy'] > 0
+
+        # Re-import replaces the register; the roll-up is stable
+        FixedAsset.bulk_import(company_id, entries[:10], replace=True)
+        assert FixedAsset.count_by_company(company_id) == 10
+        assert FixedAsset.rollup_to_schedule(company_id)
+        print(f"✓ 100,000 assets: import {imported:.2f}s, depreciate and roll up {rolled_up:.2f}s")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_depreciation_engine()
+    test_import_and_rollup()
+    print("\n✅ All fixed asset register tests passed!")
@@ -0,0 +1,169 @@
+"""
+GL Journal Test - journal lines aggregated into a trial balance, with drill-down
+"""
+
+import os
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QTableWidget
+
+from config.database import initialize_database
+from models.gl_journal import GLJournal, JournalAggregator, SURPLUS_LEDGER, read_journal
+from models.trial_balance import TrialBalance
+from views.trial_balance_tab import JournalLinesDialog
+from utils.synthetic_data import create_empty_company, delete_company
+
+FY_START, FY_END = date(2024, 4, 1), date(2025, 3, 31)  # create_empty_company's CY
+
+
+def test_aggregation_periods():
+    """Lines before the PY build the opening, PY and CY movements, P&L ledgers reset"""
+    chunk = pd.DataFrame({
+        'ledger_name': ['Cash', ' Cash ', 'Sales', 'Cash', 'Rent', '', 'Cash', 'Rent'],
+        'posting_date': ['2023-01-15', '15/06/2023', '2024-05-01', '2024-05-01', '01-02-2025',
+                         '2024-05-01', '2025-04-02', 'not a date'],
+        'amount': ['1,000', -200, -500, 500, 300, 5, 7, 9],
+        'type_bs_pl': ['BS', 'BS', 'PL', 'BS', 'P&L', 'BS', 'BS', 'PL'],
+    })
+    aggregator = JournalAggregator(FY_START, FY_END)
+    lines = aggregator.add(chunk)
+    assert lines['line_no'].tolist() == [1, 2, 3, 4, 5, 7]  # Blank ledger and bad date dropped
+    assert (aggregator.line_count, aggregator.skipped, aggregator.after_year_end) == (6, 2, 1)
+
+    entries = {entry['ledger_name']: entry for entry in aggregator.entries()}
+    cash = entries['Cash']
+    assert (cash['opening_balance_py'], cash['credit_py'], cash['closing_balance_py']) == (1000.0, 200.0, 800.0)
+    assert (cash['opening_balance_cy'], cash['debit_cy'], cash['closing_balance_cy']) == (800.0, 500.0, 1300.0)
+    assert entries['Sales']['closing_balance_cy'] == -500.0 and entries['Sales']['type_bs_pl'] == 'PL'
+    assert entries['Rent']['opening_balance_cy'] == 0.0 and entries['Rent']['debit_cy'] == 300.0
+    print("✓ Period bucketing, signed amounts, date formats and P&L reset")
+
+
+def test_pl_carried_to_surplus():
+    """A balanced journal with P&L ledgers gives openings and closings that net to nil in both years"""
+    chunk = pd.DataFrame({
+        'ledger_name': ['Cash', 'Sales'] * 4,
+        'posting_date': ['2021-06-01'] * 2 + ['2022-06-01'] * 2 + ['2023-06-01'] * 2 + ['2024-06-01'] * 2,
+        'debit': [50, 0] * 4,
+        'credit': [0, 50] * 4,
+        'type_bs_pl': ['BS', 'PL'] * 4,
+    })
+    aggregator = JournalAggregator(FY_START, FY_END)
+    aggregator.add(chunk)
+    entries = aggregator.entries()
+    for column in ('opening_balance_py', 'closing_balance_py', 'opening_balance_cy', 'closing_balance_cy'):
+        assert abs(sum(entry[column] for entry in entries)) < 0.01, column
+
+    entries = {entry['ledger_name']: entry for entry in entries}
+    assert entries['Cash']['opening_balance_cy'] == 150.0 and entries['Sales']['opening_balance_cy'] == 0.0
+    surplus = entries[SURPLUS_LEDGER]
+    assert (surplus['opening_balance_py'], surplus['opening_balance_cy']) == (-100.0, -150.0)
+    assert surplus['type_bs_pl'] == 'BS'
+
+    # A surplus ledger already in the journal takes the carry forward
+    aggregator = JournalAggregator(FY_START, FY_END)
+    aggregator.add(pd.concat([chunk, pd.DataFrame({'ledger_name': [SURPLUS_LEDGER, 'Cash'],
+                                                    'posting_date': ['2022-01-01'] * 2, 'debit': [0, 10],
+                                                    'credit': [10, 0], 'type_bs_pl': ['BS', 'BS']})]))
+    entries = {entry['ledger_name']: entry for entry in aggregator.entries()}
+    assert len(entries) == 3 and entries[SURPLUS_LEDGER]['opening_balance_cy'] == -160.0
+    print("✓ P&L of earlier years carried into the surplus ledger")
+
+
+def _journal(voucher_count, ledger_count, seed=5):
+    """Balanced journal: each voucher debits one ledger and credits another, Apr 2022 - Apr 2025"""
+    rng = np.random.default_rng(seed)
+    days = np.datetime64('2022-04-01') + rng.integers(0, 3 * 365 + 20, voucher_count)
+    amounts = rng.integers(100, 10_000_000, voucher_count) / 100.0
+    debit_ledgers = rng.integers(0, ledger_count, voucher_count)
+    credit_ledgers = (debit_ledgers + rng.integers(1, ledger_count, voucher_count)) % ledger_count
+    names = np.array([f"Ledger {i:05d}" for i in range(ledger_count)], dtype=object)
+    vouchers = np.array([f"JV{i:07d}" for i in range(voucher_count)], dtype=object)
+    return pd.DataFrame({
+        'Voucher Date': np.repeat(days, 2).astype(str),
+        'Voucher No': np.repeat(vouchers, 2),
+        'Account Name': names[np.column_stack([debit_ledgers, credit_ledgers]).ravel()],
+        'Debit': np.column_stack([amounts, np.zeros(voucher_count)]).ravel(),
+        'Credit': np.column_stack([np.zeros(voucher_count), amounts]).ravel(),
+        'Narration': 'Synthetic entry',
+    })
+
+
+def test_import_journal_file():
+    """250,000 vouchers (500,000 lines) from CSV: balanced TB, lines kept for drill-down"""
+    initialize_database()
+    company_id = create_empty_company("GL Journal Test")
+    journal = _journal(250_000, 2_000)
+    path = os.path.join(tempfile.mkdtemp(), 'journal.csv')
+    journal.to_csv(path, index=False)
+    try:
+        started = time.perf_counter()
+        result = GLJournal.import_file(company_id, path, import_batch_id=7, chunk_rows=100_000)
+        seconds = time.perf_counter() - started
+        assert result['lines'] == 500_000 and result['skipped'] == 0 and result['after_year_end'] > 0
+        assert result['ledgers'] == 2_000 and GLJournal.count_by_company(company_id) == 500_000
+
+        # Balanced vouchers give a balanced TB in both years
+        cy_balanced, py_balanced, cy_diff, py_diff = TrialBalance.validate_balance(company_id, 7)
+        assert cy_balanced and py_balanced, (cy_diff, py_diff)
+
+        # Ledger totals match a plain pandas group-by
+        dates = pd.to_datetime(journal['Voucher Date'])
+        in_cy = (dates >= pd.Timestamp(FY_START)) & (dates <= pd.Timestamp(FY_END))
+        expected = journal[in_cy].groupby('Account Name')[['Debit', 'Credit']].sum()
+        frame = TrialBalance.get_frame(company_id, 7)
+        by_name = dict(zip(frame['ledger_name'], range(len(frame))))
+        for name in expected.index[:50]:
+            row = by_name[name]
+            assert abs(frame['debit_cy'][row] - expected.loc[name, 'Debit']) < 0.01
+            assert abs(frame['credit_cy'][row] - expected.loc[name, 'Credit']) < 0.01
+        assert abs(frame.total('closing_balance_cy')) < 1
+
+        # Drill-down from a TB row to its CY lines
+        tb_id = frame['tb_id'][by_name['Ledger 00042']]
+        lines = GLJournal.get_lines_for_tb(tb_id, 'cy')
+        assert abs(float(sum(line[4] for line in lines)) - frame['debit_cy'][by_name['Ledger 00042']]) < 0.01
+        assert all(FY_START <= pd.Timestamp(line[1]).date() <= FY_END for line in lines)
+        assert lines == sorted(lines, key=lambda line: (str(line[1]), line[0]))
+        assert len(GLJournal.get_lines_for_tb(tb_id, None)) > len(lines)
+        app = QApplication.instance() or QApplication([])
+        dialog = JournalLinesDialog("Ledger 00042 - CY journal lines", lines)
+        assert dialog.findChild(QTableWidget).rowCount() == len(lines)
+
+        # Clearing the batch removes its journal lines too
+        TrialBalance.delete_by_company(company_id, 7)
+        assert GLJournal.count_by_company(company_id) == 0
+        print(f"✓ 500,000 journal lines aggregated and stored in {seconds:.2f}s")
+    finally:
+        os.remove(path)
+        delete_company(company_id)
+
+
+def test_missing_columns():
+    """A file without a date column is rejected before anything is written"""
+    path = os.path.join(tempfile.mkdtemp(), 'journal.csv')
+    pd.DataFrame({'Ledger': ['Cash'], 'Amount': [1]}).to_csv(path, index=False)
+    try:
+        next(read_journal(path))
+    except ValueError as e:
+        assert 'posting_date' in str(e)
+    else:
+        raise AssertionError("missing date column accepted")
+    finally:
+        os.remove(path)
+    print("✓ Missing journal columns reported")
+
+
+if __name__ == '__main__':
+    test_aggregation_periods()
+    test_pl_carried_to_surplus()
+    test_import_journal_file()
+    test_missing_columns()
+    print("\n✅ All GL journal tests passed!")
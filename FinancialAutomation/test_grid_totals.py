@@ -0,0 +1,124 @@
+"""
+Grid Totals Test - running column totals and block paste in the input forms
+"""
+
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from config.database import initialize_database
+from models.ppe import PPE
+from views.grid_totals import parse_amount, parse_clipboard
+from views.ppe_input_form import PPEInputForm
+from views.cwip_input_form import CWIPInputForm
+from views.investments_input_form import InvestmentsInputForm
+from utils.synthetic_data import create_empty_company, delete_company
+
+
+class _Window(QWidget):
+    """Stands in for MainWindow (PPEInputForm reads current_company_id from its parent)"""
+    current_company_id = None
+
+
+def _column_sum(table, col):
+    """Total of a column the slow way"""
+    return sum(parse_amount(table.item(row, col).text()) for row in range(table.rowCount()))
+
+
+def _paste(form, row, col, block):
+    """Put a tab-separated block on the clipboard and paste it at (row, col), -1 appends"""
+    QApplication.clipboard().setText('\n'.join('\t'.join(cells) for cells in block) + '\n')
+    form.table.setCurrentCell(row, col)
+    form.paste_clipboard()
+
+
+def test_parsing():
+    """Amounts and clipboard blocks as copied from Excel"""
+    assert parse_amount('1,234.50') == 1234.5 and parse_amount('(500)') == -500.0
+    assert parse_amount('') == 0.0 and parse_amount('n/a') == 0.0
+    assert parse_clipboard('a\tb\r\nc\td\r\n') == [['a', 'b'], ['c', 'd']]
+    print("✓ Amount and clipboard parsing")
+
+
+def test_ppe_running_totals_and_paste():
+    """2,000 pasted rows: no itemChanged storm, totals match a full recount"""
+    initialize_database()
+    app = QApplication.instance() or QApplication([])
+    company_id = create_empty_company("Grid Totals Test")
+    try:
+        window = _Window()
+        window.current_company_id = company_id
+        form = PPEInputForm(window)
+        form.load_data([PPE(ppe_id=i, asset_class=f"Class {i}", opening_gross_block_cy=1000.0,
+                            closing_gross_block_cy=1000.0, depreciation_for_year_cy=100.0,
+                            closing_acc_depreciation_cy=100.0, opening_gross_block_py=900.0,
+                            closing_gross_block_py=900.0)
+                        for i in range(1, 501)])
+        assert form.totals[9] == 500 * 900.0 and form.totals[18] == 500 * 900.0
+
+        changes = []
+        form.table.itemChanged.connect(changes.append)
+        block = [[f"Pasted {i}", f"{i},000.00", "50", "(10)"] for i in range(2000)]
+        started = time.perf_counter()
+        _paste(form, -1, -1, block)
+        seconds = time.perf_counter() - started
+        assert not changes and seconds < 10, (len(changes), seconds)
+        assert form.table.rowCount() == 2500
+        assert form.table.item(2499, 0).text() == "Pasted 1999"
+        assert form.get_numeric_value(2499, 4) == 1999000.0 + 50 - (-10)  # Closing GB recalculated
+        assert abs(form.totals[9] - _column_sum(form.table, 9)) < 0.01
+        assert form.has_unsaved_changes()
+
+        # One edit: old net block out, new in
+        form.table.item(0, 6).setText("300.00")
+        assert form.get_numeric_value(0, 9) == 700.0
+        assert abs(form.totals[9] - _column_sum(form.table, 9)) < 0.01
+        assert form.summary_label_cy.text() == f"Current Year Net Block: ₹ {form.totals[9]:,.2f}"
+
+        _paste(form, 1, 2, [["5,000"]])  # Over an existing cell
+        assert form.get_numeric_value(1, 2) == 5000.0
+        assert abs(form.totals[9] - _column_sum(form.table, 9)) < 0.01
+
+        form.totals.remove_row(0)
+        assert abs(form.totals[9] - _column_sum(form.table, 9)) < 0.01
+        print(f"✓ PPE: 2,000-row paste in {seconds:.2f}s, totals kept incrementally")
+    finally:
+        delete_company(company_id)
+
+
+def test_cwip_and_investment_totals():
+    """Sorted tables paste in place; edited carrying amounts adjust the totals"""
+    initialize_database()
+    app = QApplication.instance() or QApplication([])
+    company_id = create_empty_company("Grid Totals Sorted Test")
+    try:
+        cwip_form = CWIPInputForm()
+        cwip_form.set_company(company_id)
+        _paste(cwip_form, -1, -1, [[f"Project {i:03d}", "100", "50", "25"] for i in range(300)])
+        assert cwip_form.table.rowCount() == 300
+        assert cwip_form.totals[cwip_form.COL_CLOSING_CY] == 300 * 125.0
+        assert cwip_form.total_cy_label.text() == f"CY: ₹ {300 * 125.0:,.2f}"
+
+        tab = InvestmentsInputForm().current_tab
+        tab.set_company(company_id)
+        _paste(tab, -1, -1, [[f"Fund {i}", "Mutual Funds", "Yes", "10", "5", "1000", "900",
+                            "1100", "950", "1000", "900"] for i in range(200)])
+        assert tab.totals[tab.COL_CARRYING_CY] == 200 * 1000.0
+        item = tab.table.item(0, tab.COL_CARRYING_CY)
+        item.setText("2,500.00")
+        assert tab.totals[tab.COL_CARRYING_CY] == 199 * 1000.0 + 2500.0
+        assert tab.total_cy_label.text() == f"CY: ₹ {199 * 1000.0 + 2500.0:,.2f}"
+        assert tab.get_row_data(0)['quantity_cy'] == 10
+        print("✓ CWIP and investments: paste and incremental totals")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_parsing()
+    test_ppe_running_totals_and_paste()
+    test_cwip_and_investment_totals()
+    print("\n✅ All grid totals tests passed!")
@@ -0,0 +1,302 @@
+"""
+Jobs Test - background jobs with structured progress, cancellation, own DB sessions and the job queue
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from config.database import initialize_database, get_connection
+from config import db_connection
+from config.db_connection import get_dialect
+from config.jobs import JobContext, JobCancelled, CancelToken, run_job, map_in_processes
+from models.trial_balance import TrialBalance
+from views.job_queue import Job, JobManager, JobQueueWidget
+from views.financials_tab import generate_statements_job, export_excel_job, export_pdf_job
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+app = QApplication.instance() or QApplication([])  # One for the module - the PDF export needs it alive
+
+
+def _count(context, rows, stop_at=None, token=None):
+    """Job counting `rows` rows one at a time; cancels its own token at stop_at"""
+    context.stage("Counting", rows)
+    for row in range(rows):
+        if row == stop_at:
+            token.cancel()
+        context.advance()
+    return rows
+
+
+def _wait(manager, app, timeout=30):
+    """Let the pool finish, then deliver the queued signals"""
+    assert manager.wait(timeout * 1000)
+    app.processEvents()
+
+
+def test_progress():
+    """Stages report done / total, percent and rate; reports are throttled"""
+    reports = []
+    assert run_job(_count, (200000,), report=reports.append) == 200000
+    assert reports[0].stage == "Counting" and reports[0].done == 0 and reports[0].total == 200000
+    last = reports[-1]
+    assert last.done == 200000 and last.percent == 100 and last.rate > 0
+    assert len(reports) < 1000  # Not one report per row
+    assert last.summary().startswith("Counting: 200,000 / 200,000 rows (")
+
+    # progress(done) and progress(done, total) callbacks, as the models call them
+    context = JobContext()
+    callback = context.callback(total=10)
+    callback(4)
+    assert (context.done, context.total) == (4, 10) and context.progress.percent == 40
+    callback(5, 20)
+    assert context.progress.percent == 25
+    context.stage("Saving")
+    assert context.progress.percent is None and context.progress.summary() == "Saving"
+    print(f"✓ Structured progress ({len(reports)} reports for 200,000 rows)")
+
+
+def test_cancel_inside_loop():
+    """A cancelled job stops at the next step of its loop"""
+    token = CancelToken()
+    try:
+        run_job(_count, (100000,), {'stop_at': 500, 'token': token}, token=token)
+    except JobCancelled:
+        pass
+    else:
+        raise AssertionError("cancelled job ran to the end")
+
+    calls = []
+    token = CancelToken()
+    remove = token.on_cancel(lambda: calls.append('first'))
+    token.on_cancel(lambda: calls.append('second'))
+    remove()
+    token.cancel()
+    token.cancel()
+    assert calls == ['second']
+    token.on_cancel(lambda: calls.append('late'))
+    assert calls == ['second', 'late']  # Registered after cancelling - called at once
+
+    # Callbacks handed to models raise inside their loops
+    context = JobContext(token)
+    try:
+        context.callback()(1)
+    except JobCancelled:
+        pass
+    else:
+        raise AssertionError("callback of a cancelled job did not raise")
+    print("✓ Cooperative cancellation inside loops")
+
+
+def _connection_job(context, started, release):
+    """Job reporting the identity of the connection it runs on (held until released)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT 1')
+    cursor.fetchone()
+    identity = conn.get_backend_pid() if get_dialect().name == 'postgresql' else id(conn)
+    started.release()
+    release.wait(10)
+    conn.close()
+    return identity
+
+
+def _slow_query_job(context):
+    """Job running one statement that takes far longer than the test waits"""
+    context.stage("Querying")
+    conn = get_connection()
+    cursor = conn.cursor()
+    if get_dialect().name == 'postgresql':
+        cursor.execute('SELECT pg_sleep(30)')
+    else:
+        cursor.execute('''
+            WITH RECURSIVE numbers(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM numbers WHERE n < 1000000000)
+            SELECT COUNT(*) FROM numbers
+        ''')
+    cursor.fetchall()
+    conn.close()
+
+
+def _leaking_job(context):
+    """Job that forgets to close its connection"""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT 1')
+
+
+def _open_connections():
+    """Pooled PostgreSQL connections checked out, or SQLite connections open"""
+    if db_connection._pg_pool is not None:
+        return len(db_connection._pg_pool._used)
+    return len(db_connection._sqlite_connections)
+
+
+def test_db_session_per_job():
+    """Concurrent jobs run on their own connections; cancelling aborts a running statement"""
+    initialize_database()
+    before = _open_connections()
+    manager = JobManager(max_threads=2)
+    started, release = threading.Semaphore(0), threading.Event()
+    jobs = [manager.submit(f"Connection {i}", _connection_job, started, release) for i in range(2)]
+    assert started.acquire(timeout=10) and started.acquire(timeout=10)  # Both running at once
+    release.set()
+    _wait(manager, app)
+    assert [job.status for job in jobs] == [Job.FINISHED] * 2, [job.error for job in jobs]
+    assert jobs[0].result != jobs[1].result
+
+    # Connections opened by a job - even one left open - are released when its session ends
+    manager.submit("Leak", _leaking_job)
+    _wait(manager, app)
+    assert _open_connections() == before, (_open_connections(), before)
+
+    job = manager.submit("Slow query", _slow_query_job)
+    while job.status != Job.RUNNING:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    started_cancel = time.perf_counter()
+    job.cancel()
+    _wait(manager, app)
+    cancelled_in = time.perf_counter() - started_cancel
+    assert job.status == Job.CANCELLED and cancelled_in < 5, (job.status, cancelled_in)
+    print(f"✓ Own session per job; running statement cancelled in {cancelled_in:.2f}s")
+
+
+def test_double_close():
+    """Closing a pooled connection twice hands it back to the pool once"""
+    initialize_database()
+    if get_dialect().name != 'postgresql':
+        print("✓ Double close (PostgreSQL pool only - skipped)")
+        return
+    before = _open_connections()
+    conn = get_connection()
+    conn.close()
+    conn.close()
+    first, second = get_connection(), get_connection()
+    try:
+        assert first is not second and _open_connections() == before + 2
+    finally:
+        first.close()
+        second.close()
+    assert _open_connections() == before
+    print("✓ Double close returns the connection once")
+
+
+def test_process_map():
+    """CPU-heavy steps fan out to worker processes, results in job order"""
+    done = []
+    results = map_in_processes(pow, [(2, 10), (3, 3), (5, 2)], 2, done.append)
+    assert results == [1024, 27, 25] and done == [1, 2, 3]
+
+    token = CancelToken()
+    context = JobContext(token)
+    progress = context.callback(total=3)
+
+    def cancel_first(count):
+        token.cancel()
+        progress(count)
+    try:
+        map_in_processes(pow, [(2, 10), (3, 3), (5, 2)], 1, cancel_first)
+    except JobCancelled:
+        pass
+    else:
+        raise AssertionError("process map not cancelled")
+    print("✓ Process pool map with cancellation")
+
+
+def test_statement_jobs():
+    """Generation and export report a step per statement, note and sheet, and stop when cancelled"""
+    initialize_database()
+    company = seed_company(2000, seed=61)
+    company_id = company['company_id']
+    try:
+        entries, _ = generate_ledgers(company['groupings'], 2000, seed=61)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+
+        token = CancelToken()
+        steps = []
+
+        def cancel_at_fifth(progress):
+            steps.append(progress.done)
+            if progress.done == 5:
+                token.cancel()
+        context = JobContext(token, cancel_at_fifth, interval=0)
+        try:
+            generate_statements_job(context, company_id)
+        except JobCancelled:
+            pass
+        else:
+            raise AssertionError("generation not cancelled")
+        assert max(steps) == 5  # Stopped inside the notes loop
+
+        reports = []
+        snapshot = run_job(generate_statements_job, (company_id,), report=reports.append)
+        generated = [report for report in reports if report.stage == "Generating statements"]
+        assert generated[-1].done == generated[-1].total == 3 + len(snapshot.notes) == 30
+        assert reports[-1].stage == "Saving to cache"
+
+        with tempfile.TemporaryDirectory() as directory:
+            reports = []
+            path = os.path.join(directory, 'statements.pdf')
+            exported, pages = run_job(export_pdf_job, (company_id, None, "Test Co", "2025-03-31", path),
+                                      report=reports.append)
+            assert exported.company_id == company_id and pages > 0 and os.path.getsize(path) > 0
+            assert [report.done for report in reports if report.stage == "Generating statements"] == [0]  # Cached
+            sections = [report for report in reports if report.stage == "Rendering PDF"]
+            assert sections[-1].done == sections[-1].total > 3
+
+            # PPE and CWIP notes hold lists of schedule rows
+            reports = []
+            path = os.path.join(directory, 'statements.xlsx')
+            run_job(export_excel_job, (company_id, snapshot, "Test Co", "2025-03-31", path), report=reports.append)
+            sheets = [report for report in reports if report.stage == "Writing workbook"]
+            assert sheets[-1].done == sheets[-1].total == 30 and os.path.getsize(path) > 0
+            assert any(isinstance(note['data'], list) for note in snapshot.notes.values())
+        print("✓ Statement generation and export jobs")
+    finally:
+        delete_company(company_id)
+
+
+def test_job_queue_widget():
+    """The queue lists each job with its status; Cancel stops a queued job"""
+    manager = JobManager(max_threads=1)
+    widget = JobQueueWidget(manager)
+    release = threading.Event()
+    blocker = manager.submit("Blocker", lambda context: release.wait(10))
+    counted = manager.submit("Count", _count, 1000)
+    queued = manager.submit("Never runs", _count, 1000)
+    failing = manager.submit("Fails", lambda context: 1 / 0)
+    results = []
+    finished = manager.submit("Finished callback", _count, 10, on_finished=results.append)
+    assert widget.table.rowCount() == 5
+    assert widget.table.cellWidget(2, 5).isEnabled()
+
+    widget.table.cellWidget(2, 5).click()  # Cancel "Never runs" while it waits
+    release.set()
+    _wait(manager, app)
+    assert [job.status for job in (blocker, counted, queued, failing, finished)] == \
+        [Job.FINISHED, Job.FINISHED, Job.CANCELLED, Job.FAILED, Job.FINISHED]
+    assert results == [10]
+    assert [widget.table.item(row, 1).text() for row in range(5)] == \
+        ['Finished', 'Finished', 'Cancelled', 'Failed', 'Finished']
+    assert 'division by zero' in widget.table.item(3, 3).text()
+    assert widget.table.item(1, 3).text().startswith("Counting: 1,000 / 1,000 rows")
+    assert not widget.table.cellWidget(1, 5).isEnabled() and widget.summary_label.text() == "No jobs running"
+
+    widget.clear_finished()
+    assert widget.table.rowCount() == 0 and manager.jobs == []
+    print("✓ Job queue widget")
+
+
+if __name__ == '__main__':
+    test_progress()
+    test_cancel_inside_loop()
+    test_db_session_per_job()
+    test_double_close()
+    test_process_map()
+    test_statement_jobs()
+    test_job_queue_widget()
+    print("\n✅ All job tests passed!")
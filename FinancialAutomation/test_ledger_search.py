@@ -0,0 +1,153 @@
+"""
+Ledger Search Test - indexed prefix, substring and amount filters in the mapping dialog
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from config.database import initialize_database
+from models.ledger_index import LedgerIndex, LedgerQuery
+from models.trial_balance import TrialBalance
+from views.trial_balance_mapping_dialog import (TrialBalanceMappingDialog, LedgerTableModel,
+                                                LedgerFilterProxyModel)
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+WORDS = ['Cash', 'Bank', 'Sundry', 'Debtors', 'Creditors', 'Salary', 'Rent', 'GST', 'TDS', 'Loan']
+
+
+def _ledgers(count, seed=7):
+    rng = random.Random(seed)
+    names = [f"{' '.join(rng.choice(WORDS) for _ in range(3))}  {i}" for i in range(count)]
+    return names, [round(rng.uniform(-1_000_000, 1_000_000), 2) for _ in range(count)]
+
+
+def test_query_parsing():
+    """Amount terms are split from the name text"""
+    query = LedgerQuery.parse('^Sundry   Debtors >=1,000 <5000')
+    assert query.prefix and query.text == 'sundry debtors'
+    assert (query.low, query.low_inclusive, query.high, query.high_inclusive) == (1000.0, True, 5000.0, False)
+    query = LedgerQuery.parse('5000..1000 rent')
+    assert (query.low, query.high, query.text) == (1000.0, 5000.0, 'rent')
+    assert LedgerQuery.parse('   ').is_empty and LedgerIndex(['a'], [1]).search('') is None
+    print("✓ Query parsing")
+
+
+def test_index_matches_scan():
+    """100,000 ledgers: every kind of filter agrees with a plain scan, in milliseconds"""
+    names, amounts = _ledgers(100000)
+    started = time.perf_counter()
+    index = LedgerIndex(names, amounts)
+    built = time.perf_counter() - started
+
+    lowered = [' '.join(name.lower().split()) for name in names]
+    cases = {
+        'cash': lambda i: 'cash' in lowered[i],
+        'a': lambda i: 'a' in lowered[i],
+        'sundry  DEBTORS': lambda i: 'sundry debtors' in lowered[i],
+        '99999': lambda i: '99999' in lowered[i],
+        '^bank rent': lambda i: lowered[i].startswith('bank rent'),
+        '>900000': lambda i: abs(amounts[i]) > 900000,
+        '<=1,000': lambda i: abs(amounts[i]) <= 1000,
+        '1000..5000': lambda i: 1000 <= abs(amounts[i]) <= 5000,
+        '^gst >500000': lambda i: lowered[i].startswith('gst') and abs(amounts[i]) > 500000,
+        'zzz': lambda i: False,
+    }
+    slowest = 0.0
+    for query, expected in cases.items():
+        started = time.perf_counter()
+        mask = index.search(query)
+        slowest = max(slowest, time.perf_counter() - started)
+        assert mask.nonzero()[0].tolist() == [i for i in range(len(names)) if expected(i)], query
+    assert slowest < 0.5, slowest
+    print(f"✓ 100,000 ledgers: index built in {built:.2f}s, slowest filter {slowest * 1000:.1f}ms")
+
+
+def test_proxy_filter_speed():
+    """Re-filtering 100,000 rows through the proxy model stays interactive"""
+    app = QApplication.instance() or QApplication([])
+    names, amounts = _ledgers(100000)
+    model = LedgerTableModel()
+    model.append_rows([(i, name, 'BS', amount, "❌ Not mapped", False)
+                       for i, (name, amount) in enumerate(zip(names, amounts))])
+    proxy = LedgerFilterProxyModel()
+    proxy.setSourceModel(model)
+
+    slowest = 0.0
+    for query in ['c', 'cash', 'cash bank', '^rent >500000', '']:
+        started = time.perf_counter()
+        mask = model.search_index().search(query)
+        proxy.set_mask(mask)
+        slowest = max(slowest, time.perf_counter() - started)
+        assert proxy.rowCount() == (100000 if mask is None else int(mask.sum())), query
+    assert slowest < 5, slowest
+    print(f"✓ Proxy: 100,000 rows re-filtered in at most {slowest * 1000:.0f}ms")
+
+
+def test_dialog_filtering():
+    """The dialog filters through the proxy, debounced, and maps the checked visible rows"""
+    initialize_database()
+    app = QApplication.instance() or QApplication([])
+    company = seed_company(3000, seed=11)
+    company_id = company['company_id']
+    try:
+        entries, _ = generate_ledgers(company['groupings'], 3000, seed=11)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+
+        dialog = TrialBalanceMappingDialog(company_id)
+        model, proxy = dialog.ledger_model, dialog.ledger_proxy
+        assert model.rowCount() == 3000 and proxy.rowCount() == 3000
+
+        # Typing only restarts the timer; the filter runs when it fires
+        dialog.filter_input.setText('^trade receivables')
+        assert proxy.rowCount() == 3000 and dialog.ledger_filter_timer.isActive()
+        dialog.ledger_filter_timer.timeout.emit()
+        dialog.ledger_filter_timer.stop()
+        expected = [e for e in entries if e['ledger_name'].lower().startswith('trade receivables')]
+        assert expected and proxy.rowCount() == len(expected)
+        assert all(proxy.index(row, 1).data().lower().startswith('trade receivables')
+                   for row in range(proxy.rowCount()))
+
+        dialog.filter_ledgers('>90000')
+        assert proxy.rowCount() == sum(abs(e['closing_balance_cy']) > 90000 for e in entries)
+        assert proxy.index(0, 3).data().startswith('₹ ')
+
+        # Select All checks only what the filter shows
+        dialog.filter_ledgers('^trade receivables')
+        dialog.select_all_ledgers()
+        assert model.checked_count == len(expected) == len(model.checked_ids())
+        dialog.select_none_ledgers()
+        assert model.checked_count == 0 and not model.checked_ids()
+        model.setData(model.index(5, 0), Qt.Checked, Qt.CheckStateRole)  # A checkbox click
+        assert model.checked_ids() == [model.tb_ids[5]]
+        model.setData(model.index(5, 0), Qt.Unchecked, Qt.CheckStateRole)
+        dialog.select_unmapped_ledgers()
+        assert model.checked_count == 3000
+
+        # An empty filter shows every row; the master tree keeps matching parents
+        dialog.filter_ledgers('')
+        assert proxy.rowCount() == 3000
+        dialog.filter_master_data('trade receivables')
+        shown = [item for item, _, _ in dialog.master_index if not item.isHidden()]
+        assert any(item.text(0).lower() == 'trade receivables' for item in shown)
+        assert all(item.parent() is None or not item.parent().isHidden() for item in shown)
+        assert len(shown) < len(dialog.master_index)
+        dialog.filter_master_data('')
+        assert not any(item.isHidden() for item, _, _ in dialog.master_index)
+        dialog.close()
+        print("✓ Dialog: debounced proxy filtering, select visible, master tree search")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_query_parsing()
+    test_index_matches_scan()
+    test_proxy_filter_speed()
+    test_dialog_filtering()
+    print("\n✅ All ledger search tests passed!")
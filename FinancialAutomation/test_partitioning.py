@@ -0,0 +1,203 @@
+"""
+Partitioning Test - one trial balance partition per company on PostgreSQL
+"""
+
+import time
+from datetime import date
+
+from config.database import initialize_database, get_connection, PARTITIONED_TABLES
+from config.db_connection import get_dialect
+from models.company_info import CompanyInfo
+from models.statement_cache import StatementCache
+from models.trial_balance import TrialBalance
+from utils.synthetic_data import seed_company, create_empty_company, generate_ledgers, delete_company
+
+
+def _partitions(company_id):
+    """Names of the company's partitions that exist"""
+    if get_dialect().name != 'postgresql':
+        return []
+    conn = get_connection()
+    cursor = conn.cursor()
+    names = []
+    for table in PARTITIONED_TABLES:
+        name = get_dialect().list_partition(table, company_id)
+        cursor.execute('SELECT to_regclass(%s)', (name,))
+        if cursor.fetchone()[0] is not None:
+            names.append(name)
+    conn.close()
+    return names
+
+
+def test_company_lifecycle():
+    """Partitions come with the company, a full clear truncates, deleting the company drops them"""
+    initialize_database()
+    partitioned = get_dialect().name == 'postgresql'
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO users (username, password_hash, email, full_name)
+        VALUES (%s, %s, %s, %s) RETURNING user_id
+    ''', ('partition_test', '!', 'partition_test@example.invalid', 'Partition Test'))
+    user_id = cursor.fetchone()[0]
+    conn.commit()
+    conn.close()
+
+    company = seed_company(500, seed=37)
+    company_id = None
+    try:
+        company_id = CompanyInfo.create(user_id, "Partitioned Ltd", date(2024, 4, 1), date(2025, 3, 31))
+        expected = [get_dialect().list_partition(table, company_id) for table in PARTITIONED_TABLES]
+        assert _partitions(company_id) == (expected if partitioned else [])
+
+        entries, _ = generate_ledgers(company['groupings'], 500, seed=37)
+        assert TrialBalance.bulk_import(company_id, entries, import_batch_id=1) == 500
+        if partitioned:
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {expected[0]}")
+            assert cursor.fetchone()[0] == 500
+            conn.close()
+
+        # Clearing everything (TRUNCATE on PostgreSQL) still makes cached statements stale
+        version = StatementCache.get_data_version(company_id)
+        TrialBalance.delete_by_company(company_id)
+        assert StatementCache.get_data_version(company_id) > version
+        assert len(TrialBalance.get_frame(company_id)) == 0
+        assert _partitions(company_id) == (expected if partitioned else [])
+
+        # Reload, then delete the company - its partitions go with it
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=2)
+        assert TrialBalance.validate_balance(company_id, 2)[:2] == (True, True)
+        CompanyInfo.delete(company_id)
+        assert CompanyInfo.get_by_id(company_id) is None and _partitions(company_id) == []
+        company_id = None
+        print(f"✓ Company partitions created, truncated and dropped ({get_dialect().name})")
+    finally:
+        if company_id:
+            delete_company(company_id)
+        delete_company(company['company_id'])
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM users WHERE user_id = %s', (user_id,))
+        conn.commit()
+        conn.close()
+
+
+def test_clear_leaves_other_companies():
+    """A full clear of one company never touches another company's ledgers"""
+    initialize_database()
+    first, second = create_empty_company("Partition A"), create_empty_company("Partition B")
+    company = seed_company(300, seed=41)
+    try:
+        entries, _ = generate_ledgers(company['groupings'], 300, seed=41)
+        for company_id in (first, second):
+            TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+        TrialBalance.delete_by_company(first)
+        assert len(TrialBalance.get_frame(first)) == 0 and len(TrialBalance.get_frame(second)) == 300
+        print("✓ Clearing one company keeps the others")
+    finally:
+        for company_id in (first, second, company['company_id']):
+            delete_company(company_id)
+
+
+def test_migrate_unpartitioned():
+    """A table created before partitioning is moved into per-company partitions"""
+    if get_dialect().name != 'postgresql':
+        print("✓ Skipped - partitions need PostgreSQL")
+        return
+
+    dialect = get_dialect()
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute('DROP TABLE IF EXISTS partition_probe')
+        # 'obsolete' is not in the new table - only the common columns move
+        cursor.execute('CREATE TABLE partition_probe (item_id SERIAL PRIMARY KEY, company_id INTEGER NOT NULL, '
+                       'name TEXT, obsolete TEXT)')
+        cursor.execute("INSERT INTO partition_probe (company_id, name) VALUES (7, 'a'), (7, 'b'), (9, 'c')")
+
+        legacy = dialect.rename_unpartitioned(cursor, 'partition_probe')
+        assert legacy == 'partition_probe_unpartitioned'
+        cursor.execute(f'''
+            CREATE TABLE partition_probe (
+                {dialect.partitioned_serial_key('item_id', 'company_id')},
+                company_id INTEGER NOT NULL,
+                name TEXT
+            ) {dialect.partition_by_list('company_id')}
+        ''')
+        dialect.move_rows(cursor, legacy, 'partition_probe', 'company_id')
+        assert dialect.rename_unpartitioned(cursor, 'partition_probe') is None  # Already partitioned
+
+        cursor.execute('SELECT item_id, company_id, name FROM partition_probe ORDER BY item_id')
+        assert cursor.fetchall() == [(1, 7, 'a'), (2, 7, 'b'), (3, 9, 'c')]
+        cursor.execute('SELECT COUNT(*) FROM partition_probe_p7')
+        assert cursor.fetchone()[0] == 2
+        cursor.execute('SELECT to_regclass(%s)', (legacy,))
+        assert cursor.fetchone()[0] is None
+
+        # The new serial carries on after the moved keys
+        dialect.ensure_list_partition(cursor, 'partition_probe', 9)
+        cursor.execute("INSERT INTO partition_probe (company_id, name) VALUES (9, 'd') RETURNING item_id")
+        assert cursor.fetchone()[0] == 4
+        print("✓ Unpartitioned table migrated, keys and sequence preserved")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _best_of(func, runs=3):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def test_latency_flat_with_tenants():
+    """One company's reads and full clear cost the same with 1 or 20 companies loaded"""
+    if get_dialect().name != 'postgresql':
+        print("✓ Skipped - partitions need PostgreSQL")
+        return
+
+    initialize_database()
+    company = seed_company(10000, seed=43)
+    company_id = company['company_id']
+    entries, _ = generate_ledgers(company['groupings'], 10000, seed=43)
+    tenants = []
+    try:
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+
+        def measure():
+            def reload():
+                TrialBalance.delete_by_company(company_id)
+                TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+            return {
+                'validate_balance': _best_of(lambda: TrialBalance.validate_balance(company_id)),
+                'get_frame': _best_of(lambda: TrialBalance.get_frame(company_id, columns=['tb_id', 'debit_cy'])),
+                'reload': _best_of(reload),
+            }
+
+        alone = measure()
+        for i in range(19):
+            tenant_id = create_empty_company(f"Tenant {i + 1}")
+            tenants.append(tenant_id)
+            TrialBalance.bulk_import(tenant_id, entries, import_batch_id=1)
+        crowded = measure()
+
+        for step, seconds in alone.items():
+            assert crowded[step] < seconds * 2 + 0.05, (step, alone, crowded)
+        print("✓ 10,000 ledgers alone vs among 200,000: " +
+              ', '.join(f"{step} {alone[step]:.3f}s / {crowded[step]:.3f}s" for step in alone))
+    finally:
+        for tenant_id in [company_id] + tenants:
+            delete_company(tenant_id)
+
+
+if __name__ == '__main__':
+    test_company_lifecycle()
+    test_clear_leaves_other_companies()
+    test_migrate_unpartitioned()
+    test_latency_flat_with_tenants()
+    print("\n✅ All partitioning tests passed!")
@@ -0,0 +1,83 @@
+"""
+PDF Exporter Test - statements and notes rendered page by page (no database needed)
+"""
+
+import os
+import re
+import tempfile
+
+from models.pdf_exporter import PDFExporter
+
+BS = {
+    'company_name': 'Test Ltd', 'fy_start': '2024-04-01', 'fy_end': '2025-03-31',
+    'assets': {
+        'non_current': {'ppe': {'cy': 1000.0, 'py': 900.0, 'note': 1}, 'total_cy': 1000.0, 'total_py': 900.0},
+        'current': {'cash_and_bank': {'cy': 500.0, 'py': 400.0, 'note': 11}, 'total_cy': 500.0, 'total_py': 400.0},
+        'total_cy': 1500.0, 'total_py': 1300.0,
+    },
+    'equity_and_liabilities': {
+        'equity': {'share_capital': {'cy': 1500.0, 'py': 1300.0, 'note': 16}, 'total_cy': 1500.0, 'total_py': 1300.0},
+        'total_cy': 1500.0, 'total_py': 1300.0,
+    },
+}
+PL = {
+    'revenue': {'cy': 800.0, 'py': 700.0}, 'other_income': {'cy': 0, 'py': 0},
+    'total_income_cy': 800.0, 'total_income_py': 700.0,
+    'expenses': {'depreciation': {'cy': 100.0, 'py': 90.0}},
+    'total_expenses_cy': 100.0, 'total_expenses_py': 90.0,
+    'profit_before_tax_cy': 700.0, 'profit_before_tax_py': 610.0, 'tax_cy': 0, 'tax_py': 0,
+    'profit_after_tax_cy': 700.0, 'profit_after_tax_py': 610.0,
+}
+ACTIVITY = {'profit_before_tax_cy': 700.0, 'profit_before_tax_py': 610.0,
+            'adjustments': {'depreciation': {'cy': 100.0, 'py': 90.0}},
+            'net_cash_cy': 800.0, 'net_cash_py': 700.0}
+CF = {
+    'operating_activities': ACTIVITY, 'investing_activities': {'net_cash_cy': 0, 'net_cash_py': 0},
+    'financing_activities': {'net_cash_cy': 0, 'net_cash_py': 0},
+    'net_increase_cy': 800.0, 'net_increase_py': 700.0, 'opening_cash_cy': 0, 'opening_cash_py': 0,
+    'closing_cash_cy': 800.0, 'closing_cash_py': 700.0,
+}
+NOTES = {
+    1: {'title': 'Note 1: Property, Plant and Equipment',
+        'data': [{'asset_class': f'Asset {i}', 'net_block_closing_cy': 10.0, 'net_block_closing_py': 9.0}
+                 for i in range(60)],
+        'total_cy': 1000.0, 'total_py': 900.0},
+    8: {'title': 'Note 8: Inventories',
+        'data': {'Raw Materials': [{'particulars': 'Steel', 'value_cy': 5.0, 'value_py': 4.0}]},
+        'total_cy': 5.0, 'total_py': 4.0},
+    11: {'title': 'Note 11: Cash and Cash Equivalents',
+         'data': {'cash_on_hand': {'cy': 500.0, 'py': 400.0}}, 'total_cy': 500.0, 'total_py': 400.0},
+    16: {'title': 'Note 16: Share Capital', 'data': {}, 'total_cy': 1500.0, 'total_py': 1300.0},
+}
+
+
+def _page_count(path):
+    with open(path, 'rb') as f:
+        return len(re.findall(rb'/Type\s*/Page\b', f.read()))
+
+
+def test_pdf_export():
+    """BS, P&L, CF and notes; long notes continue on following pages"""
+    exporter = PDFExporter('Test Ltd', '31-03-2025', max_workers=3)
+    title, _, _, rows = exporter._note_section(1, NOTES[1])
+    assert len(rows) == 61 and rows[0][1] == 'Asset 0' and rows[0][3] == 10.0
+    title, _, _, rows = exporter._note_section(8, NOTES[8])
+    assert [(r[0], r[1]) for r in rows] == [('section', 'Raw Materials'), ('item', 'Steel'), ('total', 'TOTAL')]
+
+    progress = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'statements.pdf')
+        pages = exporter.export(path, BS, PL, CF, NOTES, progress=lambda done, total: progress.append(done))
+        # BS + P&L + CF + two pages for note 1 + notes 8, 11, 16
+        assert pages == 8, pages
+        assert _page_count(path) == pages
+        assert progress == list(range(1, 8))
+
+        pages = exporter.export(path, BS, PL, CF, NOTES, note_numbers=[11, 16])
+        assert pages == 5 and _page_count(path) == 5
+    print("✓ PDF export")
+
+
+if __name__ == '__main__':
+    test_pdf_export()
+    print("\n✅ All PDF exporter tests passed!")
@@ -0,0 +1,142 @@
+"""
+Ratio Analysis Test - runs on hand-built statement dictionaries; the purchases test also
+generates a P&L from a synthetic trial balance
+"""
+
+from config.database import initialize_database
+from models.financial_statements import ProfitLossGenerator
+from models.ratio_analysis import RatioAnalyzer, RATIO_DEFINITIONS
+from models.trial_balance import TrialBalance
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+
+def make_statements(scale=1.0):
+    """Build minimal BS and P&L dictionaries shaped like the generator outputs"""
+    bs_data = {
+        'assets': {
+            'non_current': {'investments': {'cy': 100 * scale, 'py': 100 * scale}},
+            'current': {
+                'inventories': {'cy': 200 * scale, 'py': 100 * scale},
+                'investments': {'cy': 0, 'py': 0},
+                'trade_receivables': {'cy': 300 * scale, 'py': 300 * scale},
+                'total_cy': 1000 * scale, 'total_py': 800 * scale
+            }
+        },
+        'equity_and_liabilities': {
+            'equity': {'total_cy': 1000 * scale, 'total_py': 1000 * scale},
+            'non_current_liabilities': {'items': [{'particulars': 'Term Loan', 'amount_cy': 500 * scale, 'amount_py': 500 * scale}]},
+            'current_liabilities': {'trade_payables': {'cy': 100 * scale, 'py': 100 * scale},
+                                    'items': [], 'total_cy': 500 * scale, 'total_py': 500 * scale}
+        }
+    }
+    pl_data = {
+        'revenue': {'cy': 3000 * scale, 'py': 2000 * scale},
+        'other_income': {'cy': 10 * scale, 'py': 10 * scale},
+        'expenses': {
+            'depreciation': {'cy': 50 * scale, 'py': 50 * scale},
+            'employee_benefits': {'cy': 400 * scale, 'py': 400 * scale},
+            'finance_costs': {'cy': 40 * scale, 'py': 40 * scale},
+            'other_expenses': {'cy': 1000 * scale, 'py': 1000 * scale}
+        },
+        'profit_before_tax_cy': 200 * scale, 'profit_before_tax_py': 100 * scale,
+        'profit_after_tax_cy': 150 * scale, 'profit_after_tax_py': 75 * scale
+    }
+    return bs_data, pl_data
+
+
+def test_single_company():
+    """Ratios and variance flags for one company"""
+    bs_data, pl_data = make_statements()
+    ratios = {row['key']: row for row in RatioAnalyzer().analyze(bs_data, pl_data)}
+
+    assert len(ratios) == len(RATIO_DEFINITIONS)
+    assert ratios['current_ratio']['cy'] == 2.0
+    assert ratios['current_ratio']['py'] == 1.6
+    assert ratios['current_ratio']['variance_pct'] == 25.0
+    assert not ratios['current_ratio']['requires_explanation']  # exactly 25% is not "more than"
+
+    assert ratios['debt_equity_ratio']['cy'] == 0.5
+    assert ratios['net_profit_ratio']['cy'] == 5.0
+    assert ratios['net_profit_ratio']['requires_explanation']  # 5.0% vs 3.75%
+    assert ratios['inventory_turnover']['cy'] == 20.0  # 3000 / avg(200, 100)
+    print("✓ Single company ratios")
+
+
+def test_zero_denominator():
+    """Ratios that cannot be computed come back as None and are never flagged"""
+    bs_data, pl_data = make_statements()
+    bs_data['equity_and_liabilities']['current_liabilities']['total_cy'] = 0
+    ratios = {row['key']: row for row in RatioAnalyzer().analyze(bs_data, pl_data)}
+
+    assert ratios['current_ratio']['cy'] is None
+    assert ratios['current_ratio']['variance_pct'] is None
+    assert not ratios['current_ratio']['requires_explanation']
+    print("✓ Zero denominators handled")
+
+
+def test_trade_payables_purchases():
+    """Trade payables turnover uses the purchase lines of the P&L, and is left out without them"""
+    bs_data, pl_data = make_statements()
+    ratios = {row['key']: row for row in RatioAnalyzer().analyze(bs_data, pl_data)}
+    assert ratios['trade_payables_turnover']['cy'] is None  # Salaries and other expenses are not purchases
+    assert not ratios['trade_payables_turnover']['requires_explanation']
+
+    pl_data['expenses'].update(cost_of_materials_consumed={'cy': 600, 'py': 500},
+                               purchases_of_stock_in_trade={'cy': 250, 'py': 150},
+                               changes_in_inventories={'cy': -50, 'py': 0})
+    ratios = {row['key']: row for row in RatioAnalyzer().analyze(bs_data, pl_data)}
+    assert ratios['trade_payables_turnover']['cy'] == 8.0  # (600 + 250 - 50) / avg(100, 100)
+    assert ratios['trade_payables_turnover']['py'] == 6.5
+    print("✓ Trade payables turnover from purchases")
+
+
+def test_purchases_from_generated_pl():
+    """The generated P&L carries the purchase lines the turnover ratio reads"""
+    initialize_database()
+    company = seed_company(500, seed=37)
+    company_id = company['company_id']
+    try:
+        entries, ledger_groupings = generate_ledgers(company['groupings'], 500, seed=37)
+        for entry in entries:
+            grouping = ledger_groupings[entry['ledger_name']]
+            entry.update(grouping_id=grouping['grouping_id'], minor_head_id=grouping['minor_head_id'], is_mapped=1)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+        materials = [entry for entry in entries
+                     if ledger_groupings[entry['ledger_name']]['grouping_name'].endswith('Materials Consumed')]
+        assert materials
+        expected_cy = sum(entry['closing_balance_cy'] for entry in materials)
+        expected_py = sum(entry['closing_balance_py'] for entry in materials)
+
+        pl_data = ProfitLossGenerator(company_id).generate()
+        lines = pl_data['expenses']
+        assert abs(lines['cost_of_materials_consumed']['cy'] - expected_cy) < 0.01
+        assert 'purchases_of_stock_in_trade' not in lines  # No such ledgers in the chart
+
+        bs_data, _ = make_statements()  # Trade payables 100 in both years
+        ratios = {row['key']: row for row in RatioAnalyzer().analyze(bs_data, pl_data)}
+        assert abs(ratios['trade_payables_turnover']['cy'] - expected_cy / 100) < 0.001
+        assert abs(ratios['trade_payables_turnover']['py'] - expected_py / 100) < 0.001
+        print("✓ Purchases from the generated P&L")
+    finally:
+        delete_company(company_id)
+
+
+def test_batch_matches_single():
+    """Batch mode gives the same rows as analyzing each company on its own"""
+    analyzer = RatioAnalyzer()
+    statements = [make_statements(scale) for scale in (1.0, 2.5, 10.0)]
+    batch = analyzer.analyze_batch(statements)
+
+    assert len(batch) == 3
+    for (bs_data, pl_data), rows in zip(statements, batch):
+        assert rows == analyzer.analyze(bs_data, pl_data)
+    print("✓ Batch mode matches single-company mode")
+
+
+if __name__ == '__main__':
+    test_single_company()
+    test_zero_denominator()
+    test_trade_payables_purchases()
+    test_purchases_from_generated_pl()
+    test_batch_matches_single()
+    print("\n✅ All ratio analysis tests passed!")
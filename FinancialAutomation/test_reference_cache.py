@@ -0,0 +1,81 @@
+"""
+Reference Cache Test - LRU/TTL eviction, write invalidation and per-action hit counts
+"""
+
+import time
+
+from config.database import initialize_database
+from config.instrumentation import track_action
+from config.reference_cache import ReferenceCache, MASTER_DATA_CACHE
+from models.company_info import CompanyInfo
+from models.master_data import MajorHead
+from models.financial_statements import CashFlowGenerator
+from utils.synthetic_data import seed_company, delete_company
+
+
+def test_lru_and_ttl_eviction():
+    """Least recently used entries are evicted when full; expired ones are reloaded"""
+    cache = ReferenceCache('test', max_entries=2, ttl_seconds=0.2)
+    loads = []
+
+    def load(key):
+        return cache.get_or_load(key, lambda: loads.append(key) or [key])
+
+    load('a'), load('b'), load('a')  # 'b' is now least recently used
+    load('c')
+    assert cache.stats()['evictions'] == 1
+    load('a')
+    load('b')  # Evicted - loaded again
+    assert loads == ['a', 'b', 'c', 'b']
+
+    # Callers get copies
+    value = load('b')
+    value.append('changed')
+    assert load('b') == ['b']
+
+    # None is never cached
+    assert cache.get_or_load('missing', lambda: None) is None
+    assert cache.stats()['size'] == 2
+
+    time.sleep(0.25)
+    load('b')
+    stats = cache.stats()
+    assert stats['expirations'] == 1 and loads[-1] == 'b'
+    assert stats['hits'] == 4 and stats['misses'] == 6
+    print("✓ LRU and TTL eviction")
+
+
+def test_model_reads_and_invalidation():
+    """Generators share the cached company; model writes invalidate master data"""
+    initialize_database()
+    company = seed_company(30, seed=8)
+    company_id = company['company_id']
+    try:
+        with track_action("Cash flow") as trace:
+            CashFlowGenerator(company_id).generate()
+        # Three generators, one company_info query
+        assert trace.cache_hits >= 2
+        assert sum('FROM company_info' in q.statement for q in trace.queries) <= 1
+
+        heads = MajorHead.get_all_by_company(company_id)
+        heads[0].major_head_name = 'Changed by caller'
+        assert MajorHead.get_all_by_company(company_id)[0].major_head_name != 'Changed by caller'
+
+        invalidations = MASTER_DATA_CACHE.stats()['invalidations']
+        new_id = MajorHead.create(company_id, 'Cache Test Head', 'Assets')
+        assert MASTER_DATA_CACHE.stats()['invalidations'] == invalidations + 1
+        assert new_id in [m.major_head_id for m in MajorHead.get_all_by_company(company_id)]
+
+        MajorHead.delete(new_id)
+        assert MajorHead.get_by_id(new_id) is None
+        assert new_id not in [m.major_head_id for m in MajorHead.get_all_by_company(company_id)]
+        print("✓ Model reads cached and invalidated by writes")
+    finally:
+        delete_company(company_id)
+    assert CompanyInfo.get_by_id(company_id) is None
+
+
+if __name__ == '__main__':
+    test_lru_and_ttl_eviction()
+    test_model_reads_and_invalidation()
+    print("\n✅ All reference cache tests passed!")
@@ -0,0 +1,93 @@
+"""
+Statement Cache Test - generated statements reused until the company's data changes
+"""
+
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from config.database import initialize_database, get_connection
+from models.statement_cache import StatementCache
+from models.financial_statements import StatementSnapshot
+from utils.synthetic_data import seed_company, delete_company
+
+app = QApplication.instance() or QApplication([])
+
+from views.financials_tab import FinancialsTab
+
+
+def test_statement_cache():
+    """Cache hit at the same data version, miss after any write to a versioned table"""
+    initialize_database()
+    company = seed_company(100, seed=9)
+    company_id = company['company_id']
+    try:
+        version = StatementCache.get_data_version(company_id)
+        assert version > 0
+        assert StatementCache.load(company_id) is None
+
+        generated = StatementCache.get_or_generate(company_id)
+        cached = StatementCache.load(company_id)
+        assert cached is not None
+        assert cached.balance_sheet == generated.balance_sheet
+        assert cached.cash_flow == generated.cash_flow
+        assert cached.notes == generated.notes  # int note numbers and dates survive the round trip
+        assert StatementCache.get_data_version(company_id) == version
+
+        # Any write to a statement source bumps the version and invalidates the cache
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE cwip_schedule SET additions_cy = additions_cy + 1 WHERE company_id = %s',
+                           (company_id,))
+            conn.commit()
+        finally:
+            conn.close()
+        assert StatementCache.get_data_version(company_id) > version
+        assert StatementCache.load(company_id) is None
+
+        # Saved with a version read before a concurrent change - never served
+        stale_version = StatementCache.get_data_version(company_id) - 1
+        StatementCache.save(StatementSnapshot.generate(company_id), stale_version)
+        assert StatementCache.load(company_id) is None
+
+        refreshed = StatementCache.get_or_generate(company_id)
+        assert StatementCache.load(company_id).notes == refreshed.notes
+        print("✓ Statement cache")
+    finally:
+        delete_company(company_id)
+
+
+def test_open_company_with_warm_cache():
+    """Opening a company shows its cached statements without running the generators"""
+    initialize_database()
+    company = seed_company(100, seed=10)
+    company_id = company['company_id']
+    original = StatementSnapshot.__dict__['generate']
+    try:
+        StatementCache.get_or_generate(company_id)
+
+        generated = []
+        StatementSnapshot.generate = classmethod(lambda cls, *args, **kwargs: generated.append(args))
+        tab = FinancialsTab()
+        tab.start_generation = lambda announce: generated.append(announce)
+        tab.set_company(company_id)
+        assert not generated
+        assert tab.snapshot is not None and tab.snapshot.company_id == company_id
+        assert tab.bs_widget.toPlainText() and tab.notes_index.count() == len(tab.snapshot.notes)
+
+        tab.clear()
+        assert tab.company_id is None and tab.snapshot is None
+        assert not tab.bs_widget.toPlainText() and tab.notes_index.count() == 0
+        print("✓ Company opened from warm cache")
+    finally:
+        StatementSnapshot.generate = original
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_statement_cache()
+    test_open_company_with_warm_cache()
+    print("\n✅ All statement cache tests passed!")
@@ -0,0 +1,59 @@
+"""
+Synthetic Data Generator Test - ledger generation only, no database needed
+"""
+
+from utils.synthetic_data import CHART_OF_ACCOUNTS, generate_ledgers, parse_size
+
+
+def make_groupings():
+    """Groupings shaped like seed_company() output, with fake ids"""
+    groupings = []
+    for major_name, category, minor_name, type_bs_pl, side, names in CHART_OF_ACCOUNTS:
+        for name in names:
+            groupings.append({'grouping_id': len(groupings) + 1, 'grouping_name': name,
+                              'minor_head_id': 1, 'major_head_id': 1,
+                              'type_bs_pl': type_bs_pl, 'side': side})
+    return groupings
+
+
+def test_deterministic():
+    """Same seed gives identical ledgers, different seed does not"""
+    groupings = make_groupings()
+    first, _ = generate_ledgers(groupings, 500, seed=7)
+    second, _ = generate_ledgers(groupings, 500, seed=7)
+    other, _ = generate_ledgers(groupings, 500, seed=8)
+
+    assert first == second
+    assert first != other
+    assert len(first) == 500
+    print("✓ Generator is deterministic")
+
+
+def test_balanced():
+    """Generated trial balance balances for both years"""
+    entries, ledger_groupings = generate_ledgers(make_groupings(), 2000, seed=42)
+
+    for year in ('cy', 'py'):
+        debit = sum(e[f'debit_{year}'] for e in entries)
+        credit = sum(e[f'credit_{year}'] for e in entries)
+        opening = sum(e[f'opening_balance_{year}'] for e in entries)
+        assert abs(debit - credit) < 1, (year, debit, credit)
+        assert abs(opening) < 1, (year, opening)
+
+    assert len(ledger_groupings) == len(entries)
+    print("✓ Generated trial balance is balanced")
+
+
+def test_parse_size():
+    """Size labels"""
+    assert parse_size('1k') == 1_000
+    assert parse_size('1M') == 1_000_000
+    assert parse_size('2500') == 2500
+    print("✓ Size labels parsed")
+
+
+if __name__ == '__main__':
+    test_deterministic()
+    test_balanced()
+    test_parse_size()
+    print("\n✅ All synthetic data tests passed!")
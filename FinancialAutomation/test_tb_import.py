@@ -0,0 +1,183 @@
+"""
+TB Import Test - branch trial balance files read in parallel and loaded as one batch
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from config.database import initialize_database, get_connection
+from models.tb_import import (detect_mapping, header_signature, read_tb_files, merge_ledgers,
+                              import_tb_files, get_branch_balances, estimated_read_seconds,
+                              PARALLEL_MIN_SECONDS)
+from models.trial_balance import TrialBalance
+from config.jobs import run_job
+from views.trial_balance_tab import branch_import_job
+from utils.synthetic_data import create_empty_company, delete_company
+
+# Two header layouts branch offices send
+LAYOUT_A = {'ledger_name': 'Ledger Name', 'debit_cy': 'Debit CY', 'credit_cy': 'Credit CY',
+            'closing_balance_cy': 'Closing Balance CY', 'closing_balance_py': 'Closing Balance PY'}
+LAYOUT_B = {'ledger_name': 'Particulars', 'debit_cy': 'Dr Current', 'credit_cy': 'Cr Current',
+            'closing_balance_cy': 'Closing Current', 'closing_balance_py': 'Closing Previous'}
+
+
+def _write_branches(directory, branch_count, ledger_count, shared=0.5, seed=3):
+    """
+    One CSV per branch, alternating layouts. A `shared` fraction of the ledger names
+    is common to every branch (written in varying case and spacing), the rest are local.
+    """
+    rng = np.random.default_rng(seed)
+    common = int(ledger_count * shared)
+    paths = []
+    for branch in range(branch_count):
+        layout = LAYOUT_A if branch % 2 == 0 else LAYOUT_B
+        names = [f"Ledger {i:06d}" if branch % 3 else f"  LEDGER  {i:06d} " for i in range(common)]
+        names += [f"Branch {branch} Ledger {i:06d}" for i in range(ledger_count - common)]
+        debit = rng.integers(0, 1_000_000, ledger_count) / 100.0
+        credit = rng.integers(0, 1_000_000, ledger_count) / 100.0
+        frame = pd.DataFrame({
+            layout['ledger_name']: names,
+            layout['debit_cy']: debit,
+            layout['credit_cy']: credit,
+            layout['closing_balance_cy']: debit - credit,
+            layout['closing_balance_py']: rng.integers(-100_000, 100_000, ledger_count) / 100.0,
+        })
+        path = os.path.join(directory, f"Branch {branch:02d}.csv")
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def test_detect_mapping():
+    """Headers are mapped by the most specific rule and each header is used once"""
+    headers = ['Account Name', 'Debit PY', 'Debit', 'Credit', 'Closing Balance CY', 'Opening Balance CY']
+    mapping = detect_mapping(headers)
+    assert mapping == {'ledger_name': 'Account Name', 'debit_py': 'Debit PY', 'debit_cy': 'Debit',
+                       'credit_cy': 'Credit', 'closing_balance_cy': 'Closing Balance CY',
+                       'opening_balance_cy': 'Opening Balance CY'}, mapping
+    assert detect_mapping(LAYOUT_B.values()) == LAYOUT_B
+    assert header_signature(['Debit', ' LEDGER  name']) == header_signature(['ledger name', 'debit'])
+    print("✓ Column mapping detected per header layout")
+
+
+def test_merge_and_layouts():
+    """Files with different layouts read in parallel; ledgers merged by normalized name"""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_branches(directory, 4, 1000)
+        assert estimated_read_seconds(paths) < PARALLEL_MIN_SECONDS  # Read in-process by default
+        frame, layouts = read_tb_files(paths, max_workers=2)
+        assert len(frame) == 4000 and len(layouts) == 2
+        assert list(dict.fromkeys(frame['branch'])) == ['Branch 00', 'Branch 01', 'Branch 02', 'Branch 03']
+
+        merged, shares = merge_ledgers(frame)
+        assert len(merged) == 500 + 4 * 500  # Common names once, local names per branch
+        assert abs(merged['closing_balance_cy'].sum() - frame['closing_balance_cy'].sum()) < 0.01
+        first = merged.index[merged['ledger_name'] == '  LEDGER  000000 '.strip()]
+        assert len(first) == 1 and len(shares[shares['ledger'] == first[0]]) == 4
+
+        # A shared mapping is used where it fits, the other layout is still detected
+        frame, layouts = read_tb_files(paths, mapping=LAYOUT_B, max_workers=1)
+        assert len(frame) == 4000 and LAYOUT_B in layouts.values()
+
+        missing = os.path.join(directory, 'no_ledger.csv')
+        pd.DataFrame({'Amount': [1]}).to_csv(missing, index=False)
+        try:
+            read_tb_files([missing])
+        except ValueError as e:
+            assert 'no ledger name column' in str(e)
+        else:
+            raise AssertionError("file without a ledger column accepted")
+    print("✓ Two layouts detected, ledgers merged across branches")
+
+
+def test_import_branches():
+    """12 branches x 20,000 ledgers: parallel read, one batch, branch shares kept"""
+    initialize_database()
+    company_id = create_empty_company("Branch Import Test")
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = _write_branches(directory, 12, 20000, shared=0.9)
+
+            timings = {}
+            for workers in (1, 4):
+                started = time.perf_counter()
+                read_tb_files(paths, max_workers=workers)
+                timings[workers] = time.perf_counter() - started
+
+            result = import_tb_files(company_id, paths, import_batch_id=5, merge=True)
+            assert result['files'] == 12 and result['rows'] == 240000
+            assert result['ledgers'] == 18000 + 12 * 2000 and len(result['layouts']) == 2
+            frame = TrialBalance.get_frame(company_id, 5, columns=['tb_id', 'ledger_name', 'closing_balance_cy'])
+            assert len(frame) == result['ledgers']
+            source = pd.concat([pd.read_csv(path).iloc[:, 3] for path in paths])
+            assert abs(frame.total('closing_balance_cy') - source.sum()) < 1
+
+            # Branch shares add up to the merged ledger
+            shares = get_branch_balances(company_id, 5)
+            assert len(shares) == 18000 * 12 + 12 * 2000
+            tb_id = int(frame['tb_id'][frame['ledger_name'] == 'LEDGER  000007'][0])
+            ledger_shares = [share for share in shares if share[0] == tb_id]
+            assert len(ledger_shares) == 12 and {share[1] for share in ledger_shares} == {'LEDGER  000007'}
+            closing = frame['closing_balance_cy'][frame['tb_id'] == tb_id][0]
+            assert abs(sum(share[3] for share in ledger_shares) - closing) < 0.05
+
+            # Another company's delete never touches the ledger
+            TrialBalance.delete(tb_id, company_id + 100000)
+            assert len(get_branch_balances(company_id, 5)) == len(shares)
+
+            # Deleting a ledger takes its branch shares with it
+            TrialBalance.delete(tb_id, company_id)
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM trial_balance_branches WHERE company_id = %s AND tb_id = %s',
+                           (company_id, tb_id))
+            assert cursor.fetchone()[0] == 0
+            conn.close()
+            shares = get_branch_balances(company_id, 5)
+            assert len(shares) == 18000 * 12 + 12 * 2000 - 12
+
+            # Unmerged: one row per file row, each attributed to its branch
+            import_tb_files(company_id, paths[:2], import_batch_id=6)
+            assert len(TrialBalance.get_frame(company_id, 6, columns=['tb_id'])) == 40000
+            assert {share[2] for share in get_branch_balances(company_id, 6)} == {'Branch 00', 'Branch 01'}
+
+            TrialBalance.delete_by_company(company_id, 6)
+            assert get_branch_balances(company_id, 6) == [] and len(get_branch_balances(company_id, 5)) == len(shares)
+            TrialBalance.delete_by_company(company_id)
+            assert get_branch_balances(company_id) == []
+        print(f"✓ 240,000 rows from 12 branch files: read in {timings[1]:.2f}s with 1 process, "
+              f"{timings[4]:.2f}s with 4")
+    finally:
+        delete_company(company_id)
+
+
+def test_branch_job():
+    """The tab's job imports the files and reports the layouts it found"""
+    initialize_database()
+    company_id = create_empty_company("Branch Job Test")
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = _write_branches(directory, 3, 200)
+            progress = []
+            message = run_job(branch_import_job, (paths, None, company_id, 9, True), report=progress.append)
+            assert 'merged' in message and '2 different column layouts' in message
+            assert progress[-1].stage == "Reading branch files" and progress[-1].done == 3
+            assert progress[-1].total == 3 and progress[-1].unit == 'files'
+            assert len(TrialBalance.get_frame(company_id, 9, columns=['tb_id'])) == 100 + 3 * 100
+        print("✓ Branch import job")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_detect_mapping()
+    test_merge_and_layouts()
+    test_import_branches()
+    test_branch_job()
+    print("\n✅ All TB import tests passed!")
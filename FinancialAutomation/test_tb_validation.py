@@ -0,0 +1,175 @@
+"""
+TB Validation Test - rule set over a whole batch, returned as one issues table
+"""
+
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+
+from config.database import initialize_database
+from models.adjustments import Adjustment
+from models.trial_balance import TrialBalance, TrialBalanceFrame
+from models.tb_validation import (validate_frame, validate_trial_balance, get_categories, summarize,
+                                  VALIDATION_COLUMNS, ISSUE_COLUMNS)
+from views.tb_validation_dialog import TrialBalanceValidationDialog
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+CATEGORIES = {1: 'Assets', 2: 'Liabilities', 3: 'Income', 4: 'Expenses'}
+
+
+def _frame(rows):
+    """(tb_id, name, type, major head, o_cy, dr_cy, cr_cy, cl_cy, o_py, dr_py, cr_py, cl_py) rows"""
+    return TrialBalanceFrame.from_rows(rows, VALIDATION_COLUMNS)
+
+
+def _rules(issues):
+    return {(rule, tb_id) for rule, tb_id in zip(issues['rule'], issues['tb_id'])}
+
+
+def test_rules():
+    """Each rule flags exactly the ledgers that break it"""
+    issues = validate_frame(_frame([
+        (1, 'Cash', 'BS', 1, 100, 50, 30, 120, 0, 100, 0, 100),
+        (2, 'Bank', 'BS', 1, 0, 10, 0, 10, 0, 0, 0, 0),
+        (3, 'Sundry Creditors', 'BS', 2, -80, 0, 20, -90, 0, 0, 80, -80),   # Equation off by 10
+        (4, 'Sales', 'PL', 3, 0, 0, 500, -500, 0, 0, 400, -400),
+        (5, 'Rent', 'PL', 4, 25, 300, 0, 325, 0, 200, 0, 200),      # P&L opening balance
+        (6, 'Advance Tax', 'BS', 1, 0, 0, 60, -60, 0, 0, 0, 0),     # Credit balance on an asset
+        (7, 'SALES', 'PL', 3, 0, 0, 0, 0, 0, 0, 0, 0),              # Similar to 'Sales'
+        (8, 'Bank ', 'BS', 1, 0, 0, 0, 0, 0, 0, 0, 0),              # Duplicate of 'Bank' once stripped
+        (9, 'Loan - HDFC', 'BS', 2, -500, 0, 0, -500, -450, 0, 0, -450),  # CY opening differs from PY closing
+        (10, 'Loan HDFC', 'BS', 2, 0, 0, 0, 0, 0, 0, 0, 0),
+    ]), CATEGORIES)
+    assert list(issues.columns) == ISSUE_COLUMNS
+    assert _rules(issues) == {
+        ('Totals not equal', 0),
+        ('Balance equation', 3),
+        ('Duplicate ledger', 2), ('Duplicate ledger', 8),
+        ('Similar ledger names', 4), ('Similar ledger names', 7),
+        ('Similar ledger names', 9), ('Similar ledger names', 10),
+        ('Opening not PY closing', 9),
+        ('P&L opening balance', 5),
+        ('Unusual balance sign', 6),
+    }, sorted(_rules(issues))
+    assert list(issues['severity'][:4]) == ['Error'] * 4 and issues['severity'].iloc[-1] == 'Warning'
+    equation = issues[issues['rule'] == 'Balance equation'].iloc[0]
+    assert equation['year'] == 'CY' and equation['amount'] == -10
+    similar = issues[(issues['rule'] == 'Similar ledger names') & (issues['tb_id'] == 7)].iloc[0]
+    assert similar['detail'] == "Similar to 'Sales'"
+    sign = issues[issues['rule'] == 'Unusual balance sign'].iloc[0]
+    assert sign['detail'] == 'Credit balance on Assets ledger' and sign['amount'] == -60
+
+    # A trial balance of closing balances only has no equation to break
+    closing_only = validate_frame(_frame([(1, 'Cash', 'BS', 1, 0, 0, 0, 120, 0, 0, 0, 0),
+                                          (2, 'Capital', 'BS', 2, 0, 0, 0, -120, 0, 0, 0, 0)]), CATEGORIES)
+    assert len(closing_only) == 0 and summarize(closing_only) == {}
+
+    # Line breaks inside a name (Alt+Enter in Excel) do not split it into extra keys
+    wrapped = validate_frame(_frame([(1, 'Cash\nin hand', 'BS', 1, 0, 0, 0, 0, 0, 0, 0, 0),
+                                     (2, 'Cash in hand', 'BS', 1, 0, 0, 0, 0, 0, 0, 0, 0),
+                                     (3, 'Sales', 'PL', 3, 0, 0, 0, 0, 0, 0, 0, 0),
+                                     (4, 'sales\r\n', 'PL', 3, 0, 0, 0, 0, 0, 0, 0, 0)]), CATEGORIES)
+    assert _rules(wrapped) == {('Similar ledger names', tb_id) for tb_id in (1, 2, 3, 4)}, sorted(_rules(wrapped))
+    print("✓ Every rule flags the ledgers that break it")
+
+
+def _import_with_defects(count, seed):
+    """Synthetic mapped trial balance with known defects; returns (company, entries)"""
+    company = seed_company(count, seed=seed)
+    entries, ledger_groupings = generate_ledgers(company['groupings'], count, seed=seed)
+    for entry in entries:
+        grouping = ledger_groupings[entry['ledger_name']]
+        entry.update(major_head_id=grouping['major_head_id'], minor_head_id=grouping['minor_head_id'],
+                     grouping_id=grouping['grouping_id'], is_mapped=1)
+    for entry in entries[:5]:
+        entry['closing_balance_cy'] += 10
+    entries += [dict(entry, ledger_name=entry['ledger_name'].upper()) for entry in entries[5:8]]
+    entries += [dict(entries[8])]
+    TrialBalance.bulk_import(company['company_id'], entries, import_batch_id=1)
+    return company, entries
+
+
+def test_stored_matches_frame():
+    """The database-side run returns the same table as the rules over the full frame"""
+    initialize_database()
+    company, entries = _import_with_defects(3000, 51)
+    company_id = company['company_id']
+    try:
+        categories = get_categories(company_id)
+        for adjusted in (False, True):
+            issues = validate_trial_balance(company_id, adjusted=adjusted)
+            full = validate_frame(TrialBalance.get_frame(company_id, columns=VALIDATION_COLUMNS, adjusted=adjusted),
+                                  categories)
+            assert issues.equals(full), (summarize(issues), summarize(full))
+        counts = summarize(issues)
+        assert counts[('Error', 'Balance equation')] == 5 and counts[('Error', 'Duplicate ledger')] == 2
+        assert counts[('Warning', 'Similar ledger names')] == 6
+        assert counts[('Error', 'Totals not equal')] == 2  # The copied ledgers count twice in both years
+        assert len(validate_trial_balance(company_id, import_batch_id=2)) == 0
+
+        # A one-sided applied adjustment moves only the adjusted CY totals
+        tb_id = int(TrialBalance.get_frame(company_id, columns=['tb_id'])['tb_id'][0])
+        Adjustment.create(company_id, tb_id, 'AJE-1', debit=500, status=Adjustment.APPLIED)
+
+        def totals(issues):
+            rows = issues[issues['rule'] == 'Totals not equal']
+            return dict(zip(rows['year'], rows['amount']))
+        before, after = totals(issues), totals(validate_trial_balance(company_id, adjusted=True))
+        assert abs(after['CY'] - before['CY'] - 500) < 0.01 and after['PY'] == before['PY']
+        assert validate_trial_balance(company_id).equals(issues)
+        print(f"✓ Database-side validation matches the frame rules ({len(issues)} issues)")
+    finally:
+        delete_company(company_id)
+
+
+def test_100k_under_a_second():
+    """A clean 100,000 ledger batch validates in well under a second"""
+    initialize_database()
+    company = seed_company(100000, seed=53)
+    company_id = company['company_id']
+    try:
+        entries, _ = generate_ledgers(company['groupings'], 100000, seed=53)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            issues = validate_trial_balance(company_id)
+            timings.append(time.perf_counter() - started)
+        assert len(issues) <= 1, summarize(issues)  # At most the balancing ledger's carry forward
+        assert min(timings) < 1, timings
+        print(f"✓ 100,000 ledgers validated in {min(timings):.3f}s")
+    finally:
+        delete_company(company_id)
+
+
+def test_dialog():
+    """The dialog lists the issues and sorts any column"""
+    app = QApplication.instance() or QApplication([])
+    issues = validate_frame(_frame([
+        (1, 'Cash', 'BS', 1, 0, 0, 60, -60, 0, 0, 0, 0),
+        (2, 'Cash ', 'BS', 1, 0, 0, 0, 0, 0, 0, 0, 0),
+        (3, 'Capital', 'BS', 2, 0, 70, 0, 50, 0, 0, 0, 0),
+    ]), CATEGORIES)
+    dialog = TrialBalanceValidationDialog(None, issues)
+    model = dialog.model
+    assert model.rowCount() == len(issues) == 6
+    assert 'errors' in dialog.summary_label.text() and 'Unusual balance sign: 2' in dialog.summary_label.text()
+    model.sort(4, Qt.DescendingOrder)  # Amount, largest first (by size)
+    assert model.data(model.index(0, 4)) == '₹ -60.00' and model.data(model.index(0, 3)) == 'Cash'
+    model.sort(3, Qt.AscendingOrder)
+    ledgers = [model.data(model.index(row, 3)) for row in range(model.rowCount())]
+    assert ledgers == sorted(ledgers) and ledgers[0] == ''  # The totals row has no ledger
+    dialog.close()
+    print("✓ Validation dialog")
+
+
+if __name__ == '__main__':
+    test_rules()
+    test_stored_matches_frame()
+    test_100k_under_a_second()
+    test_dialog()
+    print("\n✅ All TB validation tests passed!")
@@ -0,0 +1,65 @@
+"""
+Trial Balance Frame Test - columnar representation, no database needed
+"""
+
+from models.trial_balance import TrialBalance, TrialBalanceFrame
+
+ROWS = [
+    # tb_id, company_id, ledger_name, ob_cy, dr_cy, cr_cy, cb_cy, ob_py, dr_py, cr_py, cb_py,
+    # type, major, minor, grouping, is_mapped, batch
+    (1, 7, 'Cash in Hand', 0, 150, 50, 100, 0, 80, 0, 80, 'BS', 1, 2, 10, 1, 1),
+    (2, 7, 'HDFC Bank', 0, 300, 100, 200, 0, 50, 0, 50, 'BS', 1, 2, 10, 1, 1),
+    (3, 7, 'Sales', 0, 0, 900, -900, 0, 0, 700, -700, 'PL', 3, 4, 20, 1, 1),
+    (4, 7, 'Suspense', 0, 10, 0, 10, 0, 0, 0, 0, 'BS', None, None, None, 0, 1),
+]
+
+
+def test_slots():
+    """Single rows carry no per-instance __dict__"""
+    entry = TrialBalance(*ROWS[0])
+    assert not hasattr(entry, '__dict__')
+    try:
+        entry.unknown_attribute = 1
+        assert False, "should not accept unknown attributes"
+    except AttributeError:
+        pass
+    print("✓ TrialBalance uses __slots__")
+
+
+def test_frame_filters():
+    """Typed columns and vectorized filters"""
+    frame = TrialBalanceFrame.from_rows(ROWS)
+    assert len(frame) == 4
+    assert frame['closing_balance_cy'].dtype.kind == 'f'
+    assert frame['grouping_id'].tolist() == [10, 10, 20, 0]
+
+    assert len(frame.mapped()) == 3
+    assert frame.mapped(False)['ledger_name'].tolist() == ['Suspense']
+    assert frame.by_type('PL').total('closing_balance_py') == -700
+    assert frame.by_grouping([10]).total('closing_balance_cy') == 300
+    assert frame.group_totals('grouping_id', 'debit_cy') == {0: 10.0, 10: 450.0, 20: 0.0}
+    assert frame.group_totals('type_bs_pl', 'closing_balance_cy') == {'BS': 310.0, 'PL': -900.0}
+
+    # Types are kept whole up to the column width (VARCHAR(10)), not cut to two characters
+    longer = TrialBalanceFrame.from_rows([ROWS[0][:11] + ('P&L',) + ROWS[0][12:]])
+    assert longer['type_bs_pl'].tolist() == ['P&L'] and len(longer.by_type('P&')) == 0
+    print("✓ Frame filters and totals")
+
+
+def test_frame_records():
+    """Rows round-trip back to TrialBalance objects, NULL ids stay None"""
+    records = list(TrialBalanceFrame.from_rows(ROWS))
+    assert [r.ledger_name for r in records] == [row[2] for row in ROWS]
+    assert records[3].grouping_id is None and records[3].is_mapped == 0
+    assert records[0].closing_balance_cy == 100.0
+
+    empty = TrialBalanceFrame.from_rows([])
+    assert len(empty) == 0 and empty.total('debit_cy') == 0
+    print("✓ Frame records")
+
+
+if __name__ == '__main__':
+    test_slots()
+    test_frame_filters()
+    test_frame_records()
+    print("\n✅ All trial balance frame tests passed!")
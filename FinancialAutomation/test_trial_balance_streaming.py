@@ -0,0 +1,52 @@
+"""
+Trial Balance Streaming Test - chunked reads through server-side cursors
+"""
+
+from decimal import Decimal
+
+from config.database import initialize_database
+from config.db_connection import get_dialect
+from models.trial_balance import TrialBalance
+from utils.synthetic_data import seed_company, generate_ledgers, delete_company
+
+
+def test_streaming_reads():
+    """Chunks are bounded by itersize and match the list API"""
+    initialize_database()
+    company = seed_company(2500, seed=3)
+    company_id = company['company_id']
+    try:
+        entries, _ = generate_ledgers(company['groupings'], 2500, seed=3)
+        TrialBalance.bulk_import(company_id, entries, import_batch_id=1)
+
+        chunks = list(TrialBalance.iter_rows(company_id, itersize=1000))
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+
+        streamed = [tb.ledger_name for tb in TrialBalance.iter_by_company(company_id, itersize=700)]
+        listed = [tb.ledger_name for tb in TrialBalance.get_by_company(company_id)]
+        assert streamed == listed and len(listed) == 2500
+
+        total = 0.0
+        for batch in TrialBalance.iter_batches(company_id, itersize=1000, columns=['closing_balance_cy']):
+            assert list(batch) == ['closing_balance_cy']
+            total += sum(batch['closing_balance_cy'])
+        assert abs(total - sum(e['closing_balance_cy'] for e in entries)) < 1
+
+        # Amounts are float in columnar reads only - raw rows keep PostgreSQL's exact Decimal
+        assert isinstance(batch['closing_balance_cy'][0], float)
+        raw = next(TrialBalance.iter_rows(company_id, itersize=10, columns=['closing_balance_cy']))[0][0]
+        assert isinstance(raw, Decimal if get_dialect().name == 'postgresql' else float), type(raw)
+
+        # Stopping early releases the connection
+        for _ in range(20):
+            next(TrialBalance.iter_by_company(company_id, itersize=10))
+
+        assert len(TrialBalance.get_unmapped(company_id)) == 2500
+        print("✓ Streaming reads")
+    finally:
+        delete_company(company_id)
+
+
+if __name__ == '__main__':
+    test_streaming_reads()
+    print("\n✅ All streaming tests passed!")
@@ -0,0 +1,142 @@
+"""Clone master data (and ledger mappings) from one company to another"""
+
+from config.database import get_connection
+from config.reference_cache import MASTER_DATA_CACHE
+
+# Temporary old id -> new id translation tables, one per hierarchy level
+_ID_MAPS = ('major_id_map', 'minor_id_map', 'grouping_id_map')
+
+
+def _drop_id_maps(cursor):
+    for table in _ID_MAPS:
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+def clone_company_structure(source_company_id, target_company_id, include_mappings=False):
+    """
+    Copy major heads, minor heads and groupings from a source company with
+    INSERT ... SELECT statements in one transaction. Heads the target already
+    has (same name under the same parent) are kept and reused.
+
+    Args:
+        source_company_id: Company to copy from
+        target_company_id: Company to copy into
+        include_mappings: Also map the target's unmapped trial balance ledgers
+                          the way same-named ledgers are mapped in the source
+
+    Returns:
+        dict: Number of rows created per table
+    """
+    if source_company_id == target_company_id:
+        raise ValueError("Source and target company must be different")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        stats = {}
+        _drop_id_maps(cursor)
+
+        # Major heads - unique by name within a company
+        cursor.execute('''
+            INSERT INTO major_heads (company_id, major_head_name, category,
+                                    opening_balance_cy, opening_balance_py, display_order, is_active)
+            SELECT %s, major_head_name, category, opening_balance_cy, opening_balance_py,
+                   display_order, is_active
+            FROM major_heads
+            WHERE company_id = %s
+            ON CONFLICT (company_id, major_head_name) DO NOTHING
+        ''', (target_company_id, source_company_id))
+        stats['major_heads'] = cursor.rowcount
+        cursor.execute('''
+            CREATE TEMP TABLE major_id_map AS
+            SELECT s.major_head_id AS old_id, t.major_head_id AS new_id
+            FROM major_heads s
+            JOIN major_heads t ON t.company_id = %s AND t.major_head_name = s.major_head_name
+            WHERE s.company_id = %s
+        ''', (target_company_id, source_company_id))
+
+        # Minor heads - unique by name within their major head
+        cursor.execute('''
+            INSERT INTO minor_heads (company_id, minor_head_name, major_head_id,
+                                    opening_balance_cy, opening_balance_py, display_order, is_active)
+            SELECT %s, s.minor_head_name, mj.new_id, s.opening_balance_cy, s.opening_balance_py,
+                   s.display_order, s.is_active
+            FROM minor_heads s
+            JOIN major_id_map mj ON mj.old_id = s.major_head_id
+            WHERE s.company_id = %s
+            ON CONFLICT (company_id, minor_head_name, major_head_id) DO NOTHING
+        ''', (target_company_id, source_company_id))
+        stats['minor_heads'] = cursor.rowcount
+        cursor.execute('''
+            CREATE TEMP TABLE minor_id_map AS
+            SELECT s.minor_head_id AS old_id, t.minor_head_id AS new_id
+            FROM minor_heads s
+            JOIN major_id_map mj ON mj.old_id = s.major_head_id
+            JOIN minor_heads t ON t.company_id = %s AND t.major_head_id = mj.new_id
+                              AND t.minor_head_name = s.minor_head_name
+            WHERE s.company_id = %s
+        ''', (target_company_id, source_company_id))
+
+        # Groupings - unique by name within their minor head
+        cursor.execute('''
+            INSERT INTO groupings (company_id, grouping_name, minor_head_id, major_head_id,
+                                  opening_balance_cy, opening_balance_py, display_order, is_active)
+            SELECT %s, s.grouping_name, mn.new_id, mj.new_id, s.opening_balance_cy, s.opening_balance_py,
+                   s.display_order, s.is_active
+            FROM groupings s
+            JOIN minor_id_map mn ON mn.old_id = s.minor_head_id
+            JOIN major_id_map mj ON mj.old_id = s.major_head_id
+            WHERE s.company_id = %s
+            ON CONFLICT (company_id, grouping_name, minor_head_id, major_head_id) DO NOTHING
+        ''', (target_company_id, source_company_id))
+        stats['groupings'] = cursor.rowcount
+        cursor.execute('''
+            CREATE TEMP TABLE grouping_id_map AS
+            SELECT s.grouping_id AS old_id, t.grouping_id AS new_id
+            FROM groupings s
+            JOIN minor_id_map mn ON mn.old_id = s.minor_head_id
+            JOIN major_id_map mj ON mj.old_id = s.major_head_id
+            JOIN groupings t ON t.company_id = %s AND t.minor_head_id = mn.new_id
+                            AND t.major_head_id = mj.new_id AND t.grouping_name = s.grouping_name
+            WHERE s.company_id = %s
+        ''', (target_company_id, source_company_id))
+
+        if include_mappings:
+            # One mapping per ledger name (the first mapped row in the source)
+            cursor.execute('''
+                UPDATE trial_balance AS t
+                SET major_head_id = m.major_head_id,
+                    minor_head_id = m.minor_head_id,
+                    grouping_id = m.grouping_id,
+                    type_bs_pl = m.type_bs_pl,
+                    is_mapped = 1,
+                    updated_at = NOW()
+                FROM (
+                    SELECT s.ledger_name, mj.new_id AS major_head_id, mn.new_id AS minor_head_id,
+                           gm.new_id AS grouping_id, s.type_bs_pl
+                    FROM trial_balance s
+                    JOIN major_id_map mj ON mj.old_id = s.major_head_id
+                    JOIN minor_id_map mn ON mn.old_id = s.minor_head_id
+                    JOIN grouping_id_map gm ON gm.old_id = s.grouping_id
+                    WHERE s.company_id = %s AND s.tb_id IN (
+                        SELECT MIN(tb_id) FROM trial_balance
+                        WHERE company_id = %s AND is_mapped = 1 AND grouping_id IS NOT NULL
+                        GROUP BY ledger_name
+                    )
+                ) AS m
+                WHERE t.company_id = %s AND t.is_mapped = 0 AND t.ledger_name = m.ledger_name
+            ''', (source_company_id, source_company_id, target_company_id))
+            stats['ledger_mappings'] = cursor.rowcount
+
+        _drop_id_maps(cursor)
+        conn.commit()
+        MASTER_DATA_CACHE.invalidate()
+        return stats
+
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to clone company structure: {str(e)}")
+
+    finally:
+        conn.close()
@@ -1,11 +1,161 @@
 """Default Master Data Template for Schedule III Compliance"""
 
-from models.master_data import MajorHead, MinorHead, Grouping
+from config.database import get_connection
+from config.db_connection import get_dialect
+from config.reference_cache import MASTER_DATA_CACHE
+
+# Standard Chart of Accounts: (major head, category, [(minor head, code, [groupings])])
+DEFAULT_CHART_OF_ACCOUNTS = [
+    # ASSETS
+    ("Non-Current Assets", "Assets", [
+        ("Property, Plant and Equipment", "PPE", [
+            "Land - Freehold", "Land - Leasehold", "Buildings", "Plant and Machinery",
+            "Furniture and Fixtures", "Vehicles", "Office Equipment", "Computers"]),
+        ("Capital Work-in-Progress", "CWIP", []),
+        ("Intangible Assets", "IA", [
+            "Goodwill", "Brands/Trademarks", "Computer Software", "Patents", "Copyrights", "Licenses"]),
+        ("Financial Assets - Investments", "NCA-INV", [
+            "Investment in Subsidiaries", "Investment in Associates", "Investment in Joint Ventures",
+            "Other Investments - Equity Instruments", "Other Investments - Debt Instruments"]),
+        ("Other Non-Current Assets", "ONCA", []),
+    ]),
+    ("Current Assets", "Assets", [
+        ("Inventories", "INV", [
+            "Raw Materials", "Work-in-Progress", "Finished Goods", "Stock-in-Trade (Traded Goods)",
+            "Stores and Spares", "Loose Tools", "Packing Materials"]),
+        ("Trade Receivables", "TR", [
+            "Unsecured - Considered Good", "Unsecured - Credit Impaired", "Unsecured - Doubtful"]),
+        ("Cash and Cash Equivalents", "CASH", [
+            "Cash on Hand", "Balances with Banks - Current Accounts",
+            "Balances with Banks - Deposit Accounts", "Cheques on Hand"]),
+        ("Other Current Assets", "OCA", []),
+    ]),
+    # EQUITY AND LIABILITIES
+    ("Equity", "Equity", [
+        ("Share Capital", "SC", ["Equity Share Capital", "Preference Share Capital"]),
+        ("Other Equity", "OE", [
+            "Securities Premium", "Retained Earnings", "General Reserve", "Capital Reserve", "Other Reserves"]),
+    ]),
+    ("Non-Current Liabilities", "Liabilities", [
+        ("Long-term Borrowings", "LTB", [
+            "Term Loans from Banks", "Term Loans from Financial Institutions", "Debentures", "Bonds"]),
+        ("Long-term Provisions", "LTP", [
+            "Provision for Employee Benefits - Gratuity",
+            "Provision for Employee Benefits - Leave Encashment"]),
+    ]),
+    ("Current Liabilities", "Liabilities", [
+        ("Short-term Borrowings", "STB", [
+            "Loans from Banks - Cash Credit", "Loans from Banks - Working Capital Demand Loan",
+            "Loans from Others"]),
+        ("Trade Payables", "TP", ["Due to Micro and Small Enterprises", "Due to Others"]),
+        ("Other Current Liabilities", "OCL", [
+            "Statutory Dues Payable", "Advances from Customers", "Other Payables"]),
+        ("Short-term Provisions", "STP", []),
+    ]),
+    # INCOME
+    ("Revenue from Operations", "Income", [
+        ("Sale of Products/Services", "REV", [
+            "Sale of Products", "Sale of Services", "Other Operating Revenues"]),
+    ]),
+    ("Other Income", "Income", [
+        ("Other Income", "OI", [
+            "Interest Income", "Dividend Income", "Profit on Sale of Investments", "Miscellaneous Income"]),
+    ]),
+    # EXPENSES
+    ("Cost of Materials Consumed", "Expenses", [
+        ("Raw Material Consumption", "CMC", []),
+    ]),
+    ("Employee Benefits Expense", "Expenses", [
+        ("Employee Costs", "EMP", [
+            "Salaries and Wages", "Contribution to Provident Fund", "Gratuity", "Staff Welfare Expenses"]),
+    ]),
+    ("Finance Costs", "Expenses", [
+        ("Interest and Finance Charges", "FC", [
+            "Interest on Term Loans", "Interest on Working Capital", "Interest on Others", "Bank Charges"]),
+    ]),
+    ("Depreciation and Amortization", "Expenses", [
+        ("Depreciation", "DEP", []),
+    ]),
+    ("Other Expenses", "Expenses", [
+        ("Administrative and Operating Expenses", "AOE", [
+            "Rent", "Electricity and Water", "Repairs and Maintenance", "Insurance",
+            "Printing and Stationery", "Telephone and Internet", "Legal and Professional Fees",
+            "Travelling and Conveyance", "Advertisement and Publicity"]),
+    ]),
+]
+
+
+def _compile_template(chart):
+    """
+    Flatten the chart into per-level rows (display orders assigned, parents by position)
+
+    Returns:
+        tuple: (majors, minors, groupings)
+            majors:    [(major_head_name, category, display_order)]
+            minors:    [(major index, minor_head_name, display_order)]
+            groupings: [(minor index, grouping_name, display_order)]
+    """
+    majors, minors, groupings = [], [], []
+    for major_order, (major_name, category, minor_heads) in enumerate(chart, 1):
+        major_index = len(majors)
+        majors.append((major_name, category, major_order))
+        for minor_order, (minor_name, _code, grouping_names) in enumerate(minor_heads, 1):
+            minor_index = len(minors)
+            minors.append((major_index, minor_name, minor_order))
+            for grouping_order, grouping_name in enumerate(grouping_names, 1):
+                groupings.append((minor_index, grouping_name, grouping_order))
+    return majors, minors, groupings
+
+
+# Compiled once at import
+_DEFAULT_TEMPLATE = _compile_template(DEFAULT_CHART_OF_ACCOUNTS)
+
+
+def seed_master_data(cursor, company_id, template=_DEFAULT_TEMPLATE):
+    """
+    Insert a compiled master data template with one bulk statement per level.
+    Runs on the caller's cursor - the caller owns the transaction.
+
+    Returns:
+        dict: Statistics about created items
+    """
+    dialect = get_dialect()
+    majors, minors, groupings = template
+
+    # New heads are appended after any the company already has
+    cursor.execute('SELECT COALESCE(MAX(display_order), 0) FROM major_heads WHERE company_id = %s',
+                   (company_id,))
+    order_offset = cursor.fetchone()[0]
+
+    rows = dialect.bulk_insert_returning(
+        cursor, 'major_heads', ['company_id', 'major_head_name', 'category', 'display_order'],
+        [(company_id, name, category, order_offset + order) for name, category, order in majors],
+        ['major_head_id', 'major_head_name'])
+    major_ids = {name: major_head_id for major_head_id, name in rows}
+    major_ids = [major_ids[name] for name, _, _ in majors]
+
+    rows = dialect.bulk_insert_returning(
+        cursor, 'minor_heads', ['company_id', 'minor_head_name', 'major_head_id', 'display_order'],
+        [(company_id, name, major_ids[major_index], order) for major_index, name, order in minors],
+        ['minor_head_id', 'major_head_id', 'minor_head_name'])
+    minor_ids = {(major_head_id, name): minor_head_id for minor_head_id, major_head_id, name in rows}
+    minor_parents = [(minor_ids[(major_ids[major_index], name)], major_ids[major_index])
+                     for major_index, name, _ in minors]
+
+    dialect.bulk_insert(
+        cursor, 'groupings',
+        ['company_id', 'grouping_name', 'minor_head_id', 'major_head_id', 'display_order'],
+        [(company_id, name) + minor_parents[minor_index] + (order,)
+         for minor_index, name, order in groupings])
+
+    return {"major_heads": len(majors), "minor_heads": len(minors), "groupings": len(groupings)}
+
 
 def initialize_default_master_data_for_company(company_id):
     """
     Initialize default Schedule III compliant master data for a new company.
-    This creates a standard Chart of Accounts with Major Heads, Minor Heads, and Groupings.
+    This creates a standard Chart of Accounts with Major Heads, Minor Heads, and Groupings
+    in a single transaction.
     
     Args:
         company_id: The company ID to create master data for
@@ -13,504 +163,16 @@ def initialize_default_master_data_for_company(company_id):
     Returns:
         dict: Statistics about created items
     """
-    
-    stats = {"major_heads": 0, "minor_heads": 0, "groupings": 0}
-    
+    conn = get_connection()
     try:
-        # ASSETS
-        assets_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Non-Current Assets",
-            category="Assets",
-            description="Assets held for long-term use"
-        )
-        stats["major_heads"] += 1
-        
-        # Property, Plant & Equipment
-        ppe_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=assets_id,
-            minor_head_name="Property, Plant and Equipment",
-            code="PPE"
-        )
-        stats["minor_heads"] += 1
-        
-        ppe_groupings = [
-            "Land - Freehold",
-            "Land - Leasehold",
-            "Buildings",
-            "Plant and Machinery",
-            "Furniture and Fixtures",
-            "Vehicles",
-            "Office Equipment",
-            "Computers"
-        ]
-        for grouping_name in ppe_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=ppe_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Capital Work-in-Progress
-        cwip_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=assets_id,
-            minor_head_name="Capital Work-in-Progress",
-            code="CWIP"
-        )
-        stats["minor_heads"] += 1
-        
-        # Intangible Assets
-        intangible_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=assets_id,
-            minor_head_name="Intangible Assets",
-            code="IA"
-        )
-        stats["minor_heads"] += 1
-        
-        intangible_groupings = [
-            "Goodwill",
-            "Brands/Trademarks",
-            "Computer Software",
-            "Patents",
-            "Copyrights",
-            "Licenses"
-        ]
-        for grouping_name in intangible_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=intangible_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Financial Assets - Investments
-        investments_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=assets_id,
-            minor_head_name="Financial Assets - Investments",
-            code="NCA-INV"
-        )
-        stats["minor_heads"] += 1
-        
-        investment_groupings = [
-            "Investment in Subsidiaries",
-            "Investment in Associates",
-            "Investment in Joint Ventures",
-            "Other Investments - Equity Instruments",
-            "Other Investments - Debt Instruments"
-        ]
-        for grouping_name in investment_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=investments_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Other Non-Current Assets
-        other_nca_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=assets_id,
-            minor_head_name="Other Non-Current Assets",
-            code="ONCA"
-        )
-        stats["minor_heads"] += 1
-        
-        # CURRENT ASSETS
-        current_assets_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Current Assets",
-            category="Assets"
-        )
-        stats["major_heads"] += 1
-        
-        # Inventories
-        inventories_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=current_assets_id,
-            minor_head_name="Inventories",
-            code="INV"
-        )
-        stats["minor_heads"] += 1
-        
-        inventory_groupings = [
-            "Raw Materials",
-            "Work-in-Progress",
-            "Finished Goods",
-            "Stock-in-Trade (Traded Goods)",
-            "Stores and Spares",
-            "Loose Tools",
-            "Packing Materials"
-        ]
-        for grouping_name in inventory_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=inventories_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Trade Receivables
-        trade_receivables_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=current_assets_id,
-            minor_head_name="Trade Receivables",
-            code="TR"
-        )
-        stats["minor_heads"] += 1
-        
-        tr_groupings = [
-            "Unsecured - Considered Good",
-            "Unsecured - Credit Impaired",
-            "Unsecured - Doubtful"
-        ]
-        for grouping_name in tr_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=trade_receivables_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Cash and Cash Equivalents
-        cash_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=current_assets_id,
-            minor_head_name="Cash and Cash Equivalents",
-            code="CASH"
-        )
-        stats["minor_heads"] += 1
-        
-        cash_groupings = [
-            "Cash on Hand",
-            "Balances with Banks - Current Accounts",
-            "Balances with Banks - Deposit Accounts",
-            "Cheques on Hand"
-        ]
-        for grouping_name in cash_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=cash_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Other Current Assets
-        other_ca_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=current_assets_id,
-            minor_head_name="Other Current Assets",
-            code="OCA"
-        )
-        stats["minor_heads"] += 1
-        
-        # EQUITY
-        equity_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Equity",
-            category="Equity"
-        )
-        stats["major_heads"] += 1
-        
-        # Share Capital
-        share_capital_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=equity_id,
-            minor_head_name="Share Capital",
-            code="SC"
-        )
-        stats["minor_heads"] += 1
-        
-        sc_groupings = [
-            "Equity Share Capital",
-            "Preference Share Capital"
-        ]
-        for grouping_name in sc_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=share_capital_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Other Equity
-        other_equity_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=equity_id,
-            minor_head_name="Other Equity",
-            code="OE"
-        )
-        stats["minor_heads"] += 1
-        
-        oe_groupings = [
-            "Securities Premium",
-            "Retained Earnings",
-            "General Reserve",
-            "Capital Reserve",
-            "Other Reserves"
-        ]
-        for grouping_name in oe_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=other_equity_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # LIABILITIES - NON-CURRENT
-        ncl_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Non-Current Liabilities",
-            category="Liabilities"
-        )
-        stats["major_heads"] += 1
-        
-        # Long-term Borrowings
-        lt_borrowings_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=ncl_id,
-            minor_head_name="Long-term Borrowings",
-            code="LTB"
-        )
-        stats["minor_heads"] += 1
-        
-        ltb_groupings = [
-            "Term Loans from Banks",
-            "Term Loans from Financial Institutions",
-            "Debentures",
-            "Bonds"
-        ]
-        for grouping_name in ltb_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=lt_borrowings_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Long-term Provisions
-        lt_provisions_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=ncl_id,
-            minor_head_name="Long-term Provisions",
-            code="LTP"
-        )
-        stats["minor_heads"] += 1
-        
-        ltp_groupings = [
-            "Provision for Employee Benefits - Gratuity",
-            "Provision for Employee Benefits - Leave Encashment"
-        ]
-        for grouping_name in ltp_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=lt_provisions_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # LIABILITIES - CURRENT
-        cl_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Current Liabilities",
-            category="Liabilities"
-        )
-        stats["major_heads"] += 1
-        
-        # Short-term Borrowings
-        st_borrowings_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=cl_id,
-            minor_head_name="Short-term Borrowings",
-            code="STB"
-        )
-        stats["minor_heads"] += 1
-        
-        stb_groupings = [
-            "Loans from Banks - Cash Credit",
-            "Loans from Banks - Working Capital Demand Loan",
-            "Loans from Others"
-        ]
-        for grouping_name in stb_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=st_borrowings_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Trade Payables
-        trade_payables_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=cl_id,
-            minor_head_name="Trade Payables",
-            code="TP"
-        )
-        stats["minor_heads"] += 1
-        
-        tp_groupings = [
-            "Due to Micro and Small Enterprises",
-            "Due to Others"
-        ]
-        for grouping_name in tp_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=trade_payables_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Other Current Liabilities
-        ocl_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=cl_id,
-            minor_head_name="Other Current Liabilities",
-            code="OCL"
-        )
-        stats["minor_heads"] += 1
-        
-        ocl_groupings = [
-            "Statutory Dues Payable",
-            "Advances from Customers",
-            "Other Payables"
-        ]
-        for grouping_name in ocl_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=ocl_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Short-term Provisions
-        st_provisions_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=cl_id,
-            minor_head_name="Short-term Provisions",
-            code="STP"
-        )
-        stats["minor_heads"] += 1
-        
-        # INCOME
-        income_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Revenue from Operations",
-            category="Income"
-        )
-        stats["major_heads"] += 1
-        
-        # Revenue
-        revenue_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=income_id,
-            minor_head_name="Sale of Products/Services",
-            code="REV"
-        )
-        stats["minor_heads"] += 1
-        
-        revenue_groupings = [
-            "Sale of Products",
-            "Sale of Services",
-            "Other Operating Revenues"
-        ]
-        for grouping_name in revenue_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=revenue_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Other Income
-        other_income_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Other Income",
-            category="Income"
-        )
-        stats["major_heads"] += 1
-        
-        oi_minor_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=other_income_id,
-            minor_head_name="Other Income",
-            code="OI"
-        )
-        stats["minor_heads"] += 1
-        
-        oi_groupings = [
-            "Interest Income",
-            "Dividend Income",
-            "Profit on Sale of Investments",
-            "Miscellaneous Income"
-        ]
-        for grouping_name in oi_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=oi_minor_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # EXPENSES
-        expenses_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Cost of Materials Consumed",
-            category="Expenses"
-        )
-        stats["major_heads"] += 1
-        
-        cmc_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=expenses_id,
-            minor_head_name="Raw Material Consumption",
-            code="CMC"
-        )
-        stats["minor_heads"] += 1
-        
-        # Employee Benefits
-        emp_exp_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Employee Benefits Expense",
-            category="Expenses"
-        )
-        stats["major_heads"] += 1
-        
-        emp_minor_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=emp_exp_id,
-            minor_head_name="Employee Costs",
-            code="EMP"
-        )
-        stats["minor_heads"] += 1
-        
-        emp_groupings = [
-            "Salaries and Wages",
-            "Contribution to Provident Fund",
-            "Gratuity",
-            "Staff Welfare Expenses"
-        ]
-        for grouping_name in emp_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=emp_minor_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Finance Costs
-        finance_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Finance Costs",
-            category="Expenses"
-        )
-        stats["major_heads"] += 1
-        
-        fc_minor_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=finance_id,
-            minor_head_name="Interest and Finance Charges",
-            code="FC"
-        )
-        stats["minor_heads"] += 1
-        
-        fc_groupings = [
-            "Interest on Term Loans",
-            "Interest on Working Capital",
-            "Interest on Others",
-            "Bank Charges"
-        ]
-        for grouping_name in fc_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=fc_minor_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
-        # Depreciation
-        dep_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Depreciation and Amortization",
-            category="Expenses"
-        )
-        stats["major_heads"] += 1
-        
-        dep_minor_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=dep_id,
-            minor_head_name="Depreciation",
-            code="DEP"
-        )
-        stats["minor_heads"] += 1
-        
-        # Other Expenses
-        other_exp_id = MajorHead.create(
-            company_id=company_id,
-            major_head_name="Other Expenses",
-            category="Expenses"
-        )
-        stats["major_heads"] += 1
-        
-        oe_minor_id = MinorHead.create(
-            company_id=company_id,
-            major_head_id=other_exp_id,
-            minor_head_name="Administrative and Operating Expenses",
-            code="AOE"
-        )
-        stats["minor_heads"] += 1
-        
-        aoe_groupings = [
-            "Rent",
-            "Electricity and Water",
-            "Repairs and Maintenance",
-            "Insurance",
-            "Printing and Stationery",
-            "Telephone and Internet",
-            "Legal and Professional Fees",
-            "Travelling and Conveyance",
-            "Advertisement and Publicity"
-        ]
-        for grouping_name in aoe_groupings:
-            Grouping.create(company_id=company_id, minor_head_id=oe_minor_id, grouping_name=grouping_name)
-            stats["groupings"] += 1
-        
+        stats = seed_master_data(conn.cursor(), company_id)
+        conn.commit()
+        MASTER_DATA_CACHE.invalidate()
         return stats
     
     except Exception as e:
+        conn.rollback()
         raise Exception(f"Failed to initialize default master data: {str(e)}")
+    
+    finally:
+        conn.close()
@@ -0,0 +1,367 @@
+"""
+Synthetic Company Data Generator
+Builds deterministic large companies (master data, PPE, CWIP, investments,
+inventories and trial balance ledgers) for benchmarking.
+"""
+
+import random
+from datetime import date
+from config.database import get_connection, create_company_partitions, clear_company_partitions
+from config.db_connection import get_dialect
+from config.reference_cache import invalidate_tables
+
+# Named sizes accepted by the benchmark suite
+SIZES = {
+    '1k': 1_000,
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+BENCHMARK_USERNAME = 'benchmark_user'
+
+# (major head, category, minor head, type_bs_pl, normal side, groupings)
+CHART_OF_ACCOUNTS = [
+    ("Non-Current Assets", "Assets", "Property, Plant and Equipment", "BS", "Dr",
+     ["Buildings", "Plant and Machinery", "Furniture and Fixtures", "Vehicles", "Computers"]),
+    ("Non-Current Assets", "Assets", "Non-Current Investments", "BS", "Dr",
+     ["Investment in Equity Instruments", "Investment in Mutual Funds"]),
+    ("Current Assets", "Assets", "Inventories", "BS", "Dr",
+     ["Raw Materials", "Work-in-Progress", "Finished Goods", "Stores and Spares"]),
+    ("Current Assets", "Assets", "Trade Receivables", "BS", "Dr",
+     ["Trade Receivables - Secured", "Trade Receivables - Unsecured"]),
+    ("Current Assets", "Assets", "Cash and Cash Equivalents", "BS", "Dr",
+     ["Cash on Hand", "Balances with Banks"]),
+    ("Current Assets", "Assets", "Short-term Loans and Advances", "BS", "Dr",
+     ["Advances to Suppliers", "Prepaid Expenses"]),
+    ("Equity", "Equity", "Share Capital", "BS", "Cr",
+     ["Equity Share Capital"]),
+    ("Equity", "Equity", "Other Equity", "BS", "Cr",
+     ["General Reserve", "Retained Earnings"]),
+    ("Non-Current Liabilities", "Liabilities", "Long-term Borrowings", "BS", "Cr",
+     ["Term Loans from Banks", "Loans from Related Parties"]),
+    ("Current Liabilities", "Liabilities", "Short-term Borrowings", "BS", "Cr",
+     ["Cash Credit from Banks"]),
+    ("Current Liabilities", "Liabilities", "Trade Payables", "BS", "Cr",
+     ["Trade Payables - MSME", "Trade Payables - Others"]),
+    ("Current Liabilities", "Liabilities", "Other Current Liabilities", "BS", "Cr",
+     ["Statutory Dues Payable", "Advances from Customers"]),
+    ("Revenue from Operations", "Income", "Sale of Products and Services", "PL", "Cr",
+     ["Sale of Products", "Sale of Services"]),
+    ("Other Income", "Income", "Other Income", "PL", "Cr",
+     ["Interest Income", "Dividend Income"]),
+    ("Cost of Materials Consumed", "Expenses", "Materials Consumed", "PL", "Dr",
+     ["Raw Materials Consumed", "Packing Materials Consumed"]),
+    ("Employee Benefits Expense", "Expenses", "Employee Costs", "PL", "Dr",
+     ["Salaries and Wages", "Contribution to Provident Fund", "Staff Welfare Expenses"]),
+    ("Finance Costs", "Expenses", "Interest and Finance Charges", "PL", "Dr",
+     ["Interest on Term Loans", "Bank Charges"]),
+    ("Other Expenses", "Expenses", "Administrative and Operating Expenses", "PL", "Dr",
+     ["Rent", "Electricity and Water", "Repairs and Maintenance", "Legal and Professional Fees",
+      "Travelling and Conveyance"]),
+]
+
+# Ledger used to absorb the rounding difference so generated TBs always balance
+BALANCING_GROUPING = "Retained Earnings"
+
+PPE_CLASSES = ["Land - Freehold", "Buildings", "Plant and Machinery", "Furniture and Fixtures",
+               "Vehicles", "Office Equipment", "Computers", "Leasehold Improvements"]
+
+INVENTORY_CATEGORIES = ["Raw Materials", "Work-in-Progress", "Finished Goods",
+                        "Stock-in-Trade", "Stores and Spares", "Loose Tools"]
+
+
+def parse_size(size):
+    """Accept '10k' / '1m' style labels or plain integers"""
+    if isinstance(size, int):
+        return size
+    label = str(size).strip().lower()
+    if label in SIZES:
+        return SIZES[label]
+    return int(label.replace('_', ''))
+
+
+def _amount(rng, low, high):
+    """Random amount rounded to paise"""
+    return round(rng.uniform(low, high), 2)
+
+
+def generate_ledgers(groupings, count, seed=42):
+    """
+    Generate a balanced trial balance of `count` ledgers spread over the groupings.
+
+    Args:
+        groupings: List of dicts from seed_company() (grouping_name, type_bs_pl, side, ...)
+        count: Number of ledgers
+        seed: Random seed - same seed, groupings and count give identical output
+
+    Returns:
+        tuple: (entries for TrialBalance.bulk_import, {ledger_name: grouping dict})
+    """
+    rng = random.Random(f"{seed}:{count}")
+    entries = []
+    ledger_groupings = {}
+    balancing = next(g for g in groupings if g['grouping_name'] == BALANCING_GROUPING)
+
+    totals = {'opening_cy': 0.0, 'debit_cy': 0.0, 'credit_cy': 0.0,
+              'opening_py': 0.0, 'debit_py': 0.0, 'credit_py': 0.0}
+
+    for index in range(max(count - 1, 0)):
+        grouping = groupings[rng.randrange(len(groupings))]
+        sign = 1 if grouping['side'] == 'Dr' else -1
+        ledger_name = f"{grouping['grouping_name']} - {index + 1:07d}"
+
+        opening_py = sign * _amount(rng, 0, 50_000) if grouping['type_bs_pl'] == 'BS' else 0.0
+        debit_py = _amount(rng, 0, 100_000)
+        credit_py = _amount(rng, 0, 100_000)
+        closing_py = round(opening_py + debit_py - credit_py, 2)
+
+        # CY opens where PY closed for balance sheet ledgers; P&L ledgers reset
+        opening_cy = closing_py if grouping['type_bs_pl'] == 'BS' else 0.0
+        debit_cy = _amount(rng, 0, 100_000)
+        credit_cy = _amount(rng, 0, 100_000)
+        closing_cy = round(opening_cy + debit_cy - credit_cy, 2)
+
+        entries.append({
+            'ledger_name': ledger_name,
+            'opening_balance_cy': opening_cy, 'debit_cy': debit_cy,
+            'credit_cy': credit_cy, 'closing_balance_cy': closing_cy,
+            'opening_balance_py': opening_py, 'debit_py': debit_py,
+            'credit_py': credit_py, 'closing_balance_py': closing_py,
+            'type_bs_pl': grouping['type_bs_pl'],
+        })
+        ledger_groupings[ledger_name] = grouping
+
+        totals['opening_cy'] += opening_cy
+        totals['debit_cy'] += debit_cy
+        totals['credit_cy'] += credit_cy
+        totals['opening_py'] += opening_py
+        totals['debit_py'] += debit_py
+        totals['credit_py'] += credit_py
+
+    # Balancing ledger: equal debits and credits, openings net to zero
+    opening_py = round(-totals['opening_py'], 2)
+    opening_cy = round(-totals['opening_cy'], 2)
+    diff_cy = round(totals['debit_cy'] - totals['credit_cy'], 2)
+    diff_py = round(totals['debit_py'] - totals['credit_py'], 2)
+    debit_cy, credit_cy = (0.0, diff_cy) if diff_cy > 0 else (-diff_cy, 0.0)
+    debit_py, credit_py = (0.0, diff_py) if diff_py > 0 else (-diff_py, 0.0)
+    ledger_name = f"{BALANCING_GROUPING} - Balancing"
+    entries.append({
+        'ledger_name': ledger_name,
+        'opening_balance_cy': opening_cy, 'debit_cy': debit_cy,
+        'credit_cy': credit_cy, 'closing_balance_cy': round(opening_cy + debit_cy - credit_cy, 2),
+        'opening_balance_py': opening_py, 'debit_py': debit_py,
+        'credit_py': credit_py, 'closing_balance_py': round(opening_py + debit_py - credit_py, 2),
+        'type_bs_pl': 'BS',
+    })
+    ledger_groupings[ledger_name] = balancing
+
+    return entries, ledger_groupings
+
+
+def _get_benchmark_user(cursor):
+    """Get or create the user that owns synthetic companies"""
+    cursor.execute('SELECT user_id FROM users WHERE username = %s', (BENCHMARK_USERNAME,))
+    row = cursor.fetchone()
+    if row:
+        return row[0]
+    cursor.execute('''
+        INSERT INTO users (username, password_hash, email, full_name)
+        VALUES (%s, %s, %s, %s)
+        RETURNING user_id
+    ''', (BENCHMARK_USERNAME, '!', 'benchmark@example.invalid', 'Benchmark User'))
+    return cursor.fetchone()[0]
+
+
+def create_empty_company(entity_name):
+    """Create a company with no master data (e.g. for timing default master data seeding)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        user_id = _get_benchmark_user(cursor)
+        cursor.execute('''
+            INSERT INTO company_info (user_id, entity_name, fy_start_date, fy_end_date)
+            VALUES (%s, %s, %s, %s)
+            RETURNING company_id
+        ''', (user_id, entity_name, date(2024, 4, 1), date(2025, 3, 31)))
+        company_id = cursor.fetchone()[0]
+        create_company_partitions(cursor, company_id)
+        conn.commit()
+        invalidate_tables('company_info')
+        return company_id
+
+    except Exception as e:
+        conn.rollback()
+        raise e
+
+    finally:
+        conn.close()
+
+
+def seed_company(ledger_count, seed=42):
+    """
+    Create a synthetic company with full master data and input schedules in one transaction.
+    Trial balance ledgers are not inserted - use generate_ledgers() and import them.
+
+    Returns:
+        dict: company_id and the list of grouping dicts
+    """
+    rng = random.Random(f"{seed}:{ledger_count}:schedules")
+    dialect = get_dialect()
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        user_id = _get_benchmark_user(cursor)
+        cursor.execute('''
+            INSERT INTO company_info (user_id, entity_name, fy_start_date, fy_end_date, turnover, rounding_level)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING company_id
+        ''', (user_id, f"Synthetic Ltd ({ledger_count:,} ledgers, seed {seed})",
+              date(2024, 4, 1), date(2025, 3, 31), 5_000_000_000, '100000'))
+        company_id = cursor.fetchone()[0]
+        create_company_partitions(cursor, company_id)
+
+        # Master data - one row per distinct head, ids resolved with RETURNING
+        major_ids = {}
+        for major_name, category, *_ in CHART_OF_ACCOUNTS:
+            if major_name not in major_ids:
+                cursor.execute('''
+                    INSERT INTO major_heads (company_id, major_head_name, category, display_order)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING major_head_id
+                ''', (company_id, major_name, category, len(major_ids) + 1))
+                major_ids[major_name] = cursor.fetchone()[0]
+
+        groupings = []
+        for order, (major_name, category, minor_name, type_bs_pl, side, grouping_names) in enumerate(CHART_OF_ACCOUNTS, 1):
+            major_head_id = major_ids[major_name]
+            cursor.execute('''
+                INSERT INTO minor_heads (company_id, minor_head_name, major_head_id, display_order)
+                VALUES (%s, %s, %s, %s)
+                RETURNING minor_head_id
+            ''', (company_id, minor_name, major_head_id, order))
+            minor_head_id = cursor.fetchone()[0]
+
+            rows = dialect.bulk_insert_returning(
+                cursor, 'groupings',
+                ['company_id', 'grouping_name', 'minor_head_id', 'major_head_id', 'display_order'],
+                [(company_id, name, minor_head_id, major_head_id, i) for i, name in enumerate(grouping_names, 1)],
+                ['grouping_id', 'grouping_name'])
+            for grouping_id, grouping_name in rows:
+                groupings.append({
+                    'grouping_id': grouping_id,
+                    'grouping_name': grouping_name,
+                    'minor_head_id': minor_head_id,
+                    'major_head_id': major_head_id,
+                    'type_bs_pl': type_bs_pl,
+                    'side': side,
+                })
+
+        # Input schedules scale gently with company size
+        scale = max(1, ledger_count // 10_000)
+
+        ppe_rows = []
+        for asset_class in PPE_CLASSES:
+            gross_py = _amount(rng, 1e6, 5e7)
+            add_py, add_cy = _amount(rng, 0, 5e6), _amount(rng, 0, 5e6)
+            disp_py, disp_cy = _amount(rng, 0, 1e6), _amount(rng, 0, 1e6)
+            dep_open_py = round(gross_py * rng.uniform(0.1, 0.5), 2)
+            dep_py, dep_cy = round(gross_py * 0.1, 2), round(gross_py * 0.09, 2)
+            dep_disp_py, dep_disp_cy = round(disp_py * 0.4, 2), round(disp_cy * 0.4, 2)
+            gross_cy = round(gross_py + add_py - disp_py, 2)
+            dep_open_cy = round(dep_open_py + dep_py - dep_disp_py, 2)
+            ppe_rows.append((
+                company_id, asset_class,
+                gross_cy, add_cy, disp_cy, round(gross_cy + add_cy - disp_cy, 2),
+                dep_open_cy, dep_cy, dep_disp_cy, round(dep_open_cy + dep_cy - dep_disp_cy, 2),
+                gross_py, add_py, disp_py, gross_cy,
+                dep_open_py, dep_py, dep_disp_py, dep_open_cy,
+                10.0, 10
+            ))
+        dialect.bulk_insert(cursor, 'ppe_schedule', [
+            'company_id', 'asset_class',
+            'opening_gross_block_cy', 'additions_cy', 'disposals_gross_cy', 'closing_gross_block_cy',
+            'opening_acc_depreciation_cy', 'depreciation_for_year_cy', 'acc_depr_on_disposals_cy',
+            'closing_acc_depreciation_cy',
+            'opening_gross_block_py', 'additions_py', 'disposals_gross_py', 'closing_gross_block_py',
+            'opening_acc_depreciation_py', 'depreciation_for_year_py', 'acc_depr_on_disposals_py',
+            'closing_acc_depreciation_py',
+            'depreciation_rate', 'useful_life_years'
+        ], ppe_rows)
+
+        cwip_rows = []
+        for i in range(5 * scale):
+            open_py, add_py, cap_py = _amount(rng, 0, 1e7), _amount(rng, 0, 5e6), _amount(rng, 0, 3e6)
+            close_py = round(open_py + add_py - cap_py, 2)
+            add_cy, cap_cy = _amount(rng, 0, 5e6), _amount(rng, 0, 3e6)
+            cwip_rows.append((company_id, f"Project {i + 1:04d}",
+                              close_py, add_cy, cap_cy, round(close_py + add_cy - cap_cy, 2),
+                              open_py, add_py, cap_py, close_py,
+                              date(2023, 1 + i % 12, 1), date(2026, 1 + i % 12, 1)))
+        dialect.bulk_insert(cursor, 'cwip_schedule', [
+            'company_id', 'project_name',
+            'opening_balance_cy', 'additions_cy', 'capitalized_cy', 'closing_balance_cy',
+            'opening_balance_py', 'additions_py', 'capitalized_py', 'closing_balance_py',
+            'project_start_date', 'expected_completion_date'
+        ], cwip_rows)
+
+        investment_rows = []
+        for i in range(10 * scale):
+            classification = 'Non-Current' if i % 3 else 'Current'
+            cost_py, cost_cy = _amount(rng, 1e5, 1e7), _amount(rng, 1e5, 1e7)
+            investment_rows.append((company_id, f"Investment {i + 1:05d}", classification,
+                                    'Equity Instruments' if i % 2 else 'Mutual Funds', bool(i % 2),
+                                    rng.randint(100, 10_000), rng.randint(100, 10_000),
+                                    cost_cy, cost_py, cost_cy, cost_py, cost_cy, cost_py, cost_cy, cost_py))
+        dialect.bulk_insert(cursor, 'investments', [
+            'company_id', 'investment_particulars', 'classification', 'investment_type', 'is_quoted',
+            'quantity_cy', 'quantity_py', 'cost_cy', 'cost_py', 'fair_value_cy', 'fair_value_py',
+            'carrying_amount_cy', 'carrying_amount_py', 'market_value_cy', 'market_value_py'
+        ], investment_rows)
+
+        inventory_rows = []
+        for i in range(6 * scale):
+            inventory_rows.append((company_id, INVENTORY_CATEGORIES[i % len(INVENTORY_CATEGORIES)],
+                                   f"Item {i + 1:05d}", rng.randint(10, 5000), rng.randint(10, 5000), 'Nos',
+                                   _amount(rng, 1e4, 5e6), _amount(rng, 1e4, 5e6)))
+        dialect.bulk_insert(cursor, 'inventories', [
+            'company_id', 'category', 'particulars', 'quantity_cy', 'quantity_py', 'unit', 'value_cy', 'value_py'
+        ], inventory_rows)
+
+        conn.commit()
+        invalidate_tables('company_info', 'major_heads', 'minor_heads', 'groupings')
+        return {'company_id': company_id, 'groupings': groupings}
+
+    except Exception as e:
+        conn.rollback()
+        raise e
+
+    finally:
+        conn.close()
+
+
+def delete_company(company_id):
+    """Remove a synthetic company and everything seeded for it"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        clear_company_partitions(cursor, company_id, drop=True)
+        for table in ('adjustments', 'groupings', 'minor_heads', 'major_heads', 'fixed_assets',
+                      'ppe_schedule', 'cwip_schedule', 'investments', 'inventories', 'selection_sheet',
+                      'statement_cache'):
+            cursor.execute(f'DELETE FROM {table} WHERE company_id = %s', (company_id,))
+        cursor.execute('DELETE FROM company_info WHERE company_id = %s', (company_id,))
+        cursor.execute('DELETE FROM data_versions WHERE company_id = %s', (company_id,))
+        conn.commit()
+        invalidate_tables('company_info', 'major_heads', 'minor_heads', 'groupings')
+
+    except Exception as e:
+        conn.rollback()
+        raise e
+
+    finally:
+        conn.close()
@@ -0,0 +1,162 @@
+"""Adjustments Dialog - audit adjustment batches applied over the imported trial balance"""
+
+import os
+import pandas as pd
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QMessageBox, QFileDialog, QInputDialog)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+from models.adjustments import Adjustment
+from models.gl_journal import journal_column
+from config.instrumentation import track_action
+
+
+class AdjustmentsDialog(QDialog):
+    """List adjustment batches and apply, withdraw, reject or delete them"""
+
+    # Emitted when the adjusted trial balance changes
+    adjustments_changed = pyqtSignal()
+
+    STATUS_COLORS = {
+        Adjustment.PROPOSED: QColor(200, 120, 0),
+        Adjustment.APPLIED: QColor(0, 128, 0),
+        Adjustment.REJECTED: QColor(128, 128, 128),
+    }
+
+    def __init__(self, company_id, parent=None):
+        super().__init__(parent)
+        self.company_id = company_id
+        self.batches = []
+        self.setWindowTitle("Audit Adjustments")
+        self.resize(800, 450)
+        self.init_ui()
+        self.load_batches()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        info = QLabel("Applied batches are added to the trial balance the statements are generated from. "
+                      "The imported trial balance itself is never changed.")
+        info.setWordWrap(True)
+        layout.addWidget(info)
+
+        self.batch_table = QTableWidget(0, 5)
+        self.batch_table.setHorizontalHeaderLabels(["Batch", "Status", "Entries", "Debit", "Credit"])
+        self.batch_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.batch_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.batch_table.verticalHeader().setVisible(False)
+        self.batch_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.batch_table)
+
+        buttons = QHBoxLayout()
+        import_btn = QPushButton("📥 Import Batch...")
+        import_btn.setToolTip("CSV or Excel with Ledger, Debit, Credit and optional Period (CY/PY) and Narration")
+        import_btn.clicked.connect(self.import_batch)
+        buttons.addWidget(import_btn)
+
+        for text, handler in (("✔ Apply", self.apply_selected), ("↩ Withdraw", self.withdraw_selected),
+                              ("✗ Reject", self.reject_selected), ("🗑 Delete", self.delete_selected)):
+            button = QPushButton(text)
+            button.clicked.connect(handler)
+            buttons.addWidget(button)
+        buttons.addStretch()
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def load_batches(self):
+        """Reload the batch list"""
+        self.batches = Adjustment.get_batches(self.company_id)
+        self.batch_table.setRowCount(len(self.batches))
+        for row, (name, status, entries, debit, credit) in enumerate(self.batches):
+            self.batch_table.setItem(row, 0, QTableWidgetItem(name))
+            status_item = QTableWidgetItem(status.title())
+            status_item.setForeground(self.STATUS_COLORS.get(status, QColor(0, 0, 0)))
+            self.batch_table.setItem(row, 1, status_item)
+            self.batch_table.setItem(row, 2, QTableWidgetItem(f"{entries:,}"))
+            for col, amount in ((3, debit), (4, credit)):
+                item = QTableWidgetItem(f"₹{amount:,.2f}")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.batch_table.setItem(row, col, item)
+
+    def selected_batch(self):
+        """Name of the selected batch, None when nothing is selected"""
+        row = self.batch_table.currentRow()
+        if row < 0 or row >= len(self.batches):
+            QMessageBox.warning(self, "No Batch Selected", "Please select an adjustment batch first.")
+            return None
+        return self.batches[row][0]
+
+    def change_batch(self, action, change):
+        """Run change(company_id, batch_name) on the selected batch and refresh"""
+        batch_name = self.selected_batch()
+        if batch_name is None:
+            return
+        with track_action(action):
+            change(self.company_id, batch_name)
+        self.load_batches()
+        self.adjustments_changed.emit()
+
+    def apply_selected(self):
+        self.change_batch("Apply Adjustments", Adjustment.apply_batch)
+
+    def withdraw_selected(self):
+        self.change_batch("Withdraw Adjustments", Adjustment.withdraw_batch)
+
+    def reject_selected(self):
+        self.change_batch("Reject Adjustments",
+                          lambda company_id, batch_name: Adjustment.set_status(
+                              company_id, batch_name, Adjustment.REJECTED))
+
+    def delete_selected(self):
+        batch_name = self.selected_batch()
+        if batch_name is None:
+            return
+        reply = QMessageBox.question(
+            self, "Confirm Delete", f"Delete every entry of adjustment batch '{batch_name}'?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.change_batch("Delete Adjustments", Adjustment.delete_batch)
+
+    def import_batch(self):
+        """Read a batch of entries from CSV or Excel, as proposed adjustments"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Adjustment Batch", "", "Adjustment Files (*.csv *.xlsx *.xls)"
+        )
+        if not file_path:
+            return
+        default_name = os.path.splitext(os.path.basename(file_path))[0]
+        batch_name, ok = QInputDialog.getText(self, "Batch Name", "Adjustment batch name:", text=default_name)
+        if not ok or not batch_name.strip():
+            return
+
+        try:
+            frame = pd.read_csv(file_path) if file_path.lower().endswith('.csv') else pd.read_excel(file_path)
+            count, unknown = self.import_frame(batch_name.strip(), frame)
+        except Exception as e:
+            QMessageBox.critical(self, "Import Failed", f"Could not import adjustments:\n{str(e)}")
+            return
+
+        if unknown:
+            shown = '\n'.join(unknown[:20]) + (f"\n... and {len(unknown) - 20} more" if len(unknown) > 20 else "")
+            QMessageBox.warning(self, "Unknown Ledgers",
+                                f"Nothing was imported - these ledgers are not in the trial balance:\n\n{shown}")
+            return
+        self.load_batches()
+        QMessageBox.information(self, "Imported", f"Imported {count:,} proposed entries into '{batch_name}'.")
+
+    def import_frame(self, batch_name, frame):
+        """Add a DataFrame of entries as a proposed batch, returns (count, unknown ledgers)"""
+        frame = frame.rename(columns={header: journal_column(header) for header in frame.columns})
+        for required in ('ledger_name', 'debit', 'credit'):
+            if required not in frame.columns:
+                raise ValueError(f"Missing column: {required}")
+        frame = frame.astype(object).where(frame.notna(), None)
+        with track_action("Import Adjustments"):
+            return Adjustment.create_by_ledger(self.company_id, batch_name, frame.to_dict('records'))
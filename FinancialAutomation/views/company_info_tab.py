@@ -484,29 +484,7 @@ class CompanyInfoTab(QWidget):
             company = CompanyInfo.get_by_user_id(user_id)
             
             if company:
-                # Populate form
-                self.entity_name_input.setText(company.entity_name)
-                self.address_input.setText(company.address or "")
-                self.cin_input.setText(company.cin_no or "")
-                
-                # Parse dates
-                from datetime import datetime
-                fy_start = datetime.strptime(company.fy_start_date, '%Y-%m-%d')
-                fy_end = datetime.strptime(company.fy_end_date, '%Y-%m-%d')
-                
-                self.fy_start_input.setDate(QDate(fy_start.year, fy_start.month, fy_start.day))
-                self.fy_end_input.setDate(QDate(fy_end.year, fy_end.month, fy_end.day))
-                
-                # Set preferences
-                self.currency_combo.setCurrentText(company.currency)
-                self.number_format_combo.setCurrentText(company.number_format)
-                self.negative_format_combo.setCurrentText(company.negative_format)
-                self.font_combo.setCurrentText(company.default_font)
-                self.font_size_spinner.setValue(company.default_font_size)
-                self.zeros_blank_check.setChecked(company.show_zeros_as_blank == 1)
-                
-                # Store current company
-                self.current_company = company
+                self.show_company(company)
                 
                 QMessageBox.information(
                     self, "Data Loaded",
@@ -521,6 +499,31 @@ class CompanyInfoTab(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Load Error", f"Could not load data:\n{str(e)}")
     
+    def show_company(self, company):
+        """Populate the form from a loaded company"""
+        self.entity_name_input.setText(company.entity_name)
+        self.address_input.setText(company.address or "")
+        self.cin_input.setText(company.cin_no or "")
+        
+        # Parse dates (date objects on PostgreSQL, ISO strings on older databases)
+        from datetime import datetime
+        fy_start = datetime.strptime(str(company.fy_start_date)[:10], '%Y-%m-%d')
+        fy_end = datetime.strptime(str(company.fy_end_date)[:10], '%Y-%m-%d')
+        
+        self.fy_start_input.setDate(QDate(fy_start.year, fy_start.month, fy_start.day))
+        self.fy_end_input.setDate(QDate(fy_end.year, fy_end.month, fy_end.day))
+        
+        # Set preferences
+        self.currency_combo.setCurrentText(company.currency)
+        self.number_format_combo.setCurrentText(company.number_format)
+        self.negative_format_combo.setCurrentText(company.negative_format)
+        self.font_combo.setCurrentText(company.default_font)
+        self.font_size_spinner.setValue(company.default_font_size)
+        self.zeros_blank_check.setChecked(company.show_zeros_as_blank == 1)
+        
+        # Store current company
+        self.current_company = company
+    
     def clear_form(self):
         """Clear all form fields"""
         self.entity_name_input.clear()
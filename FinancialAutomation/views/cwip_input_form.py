@@ -4,12 +4,14 @@ Capital Work in Progress (CWIP) Input Form - Schedule III Note 2
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
     QPushButton, QLabel, QMessageBox, QHeaderView, QDialog, QFormLayout,
-    QLineEdit, QDateEdit
+    QLineEdit, QDateEdit, QApplication, QShortcut
 )
 from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtGui import QColor, QFont, QKeySequence
 from models.cwip import CWIP
+from views.grid_totals import ColumnTotals, parse_amount, parse_clipboard
 from datetime import datetime
+from typing import List, Optional
 import traceback
 
 
@@ -82,9 +84,14 @@ class CWIPInputForm(QWidget):
     COL_CWIP_ID = 11  # Hidden
     COL_MODIFIED = 12  # Hidden
     
+    AMOUNT_COLUMNS = (COL_OPENING_CY, COL_ADDITIONS_CY, COL_CAPITALIZED_CY,
+                      COL_OPENING_PY, COL_ADDITIONS_PY, COL_CAPITALIZED_PY)
+    TEXT_COLUMNS = (COL_PROJECT, COL_START_DATE, COL_COMPLETION_DATE)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.company_id = None
+        self.deleted_ids = set()  # Saved projects removed from the table, deleted on save
         self.init_ui()
     
     def init_ui(self):
@@ -170,6 +177,11 @@ class CWIPInputForm(QWidget):
         
         # Connect cell change to auto-calculate
         self.table.itemChanged.connect(self.on_item_changed)
+        self.totals = ColumnTotals(self.table, (self.COL_CLOSING_CY, self.COL_CLOSING_PY))
+        
+        # Ctrl+V pastes a block copied from Excel
+        paste_shortcut = QShortcut(QKeySequence.Paste, self.table, self.paste_clipboard)
+        paste_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
         
         layout.addWidget(self.table)
         
@@ -192,12 +204,12 @@ class CWIPInputForm(QWidget):
         
         layout.addLayout(summary_layout)
     
-    def set_company(self, company_id: int):
-        """Set the company and load CWIP data"""
+    def set_company(self, company_id: int, cwip_list: Optional[List[CWIP]] = None):
+        """Set the company and load CWIP data (cwip_list: already loaded projects)"""
         self.company_id = company_id
-        self.load_data()
+        self.load_data(cwip_list)
     
-    def load_data(self):
+    def load_data(self, cwip_list: Optional[List[CWIP]] = None):
         """Load CWIP data for the company"""
         if not self.company_id:
             return
@@ -205,12 +217,16 @@ class CWIPInputForm(QWidget):
         try:
             # Block signals to prevent triggering calculations during load
             self.table.blockSignals(True)
+            self.table.setSortingEnabled(False)  # Re-sorted once below, not per cell
             
             # Clear table
             self.table.setRowCount(0)
+            self.totals.clear()
+            self.deleted_ids.clear()
             
             # Load CWIP data
-            cwip_list = CWIP.get_all_by_company(self.company_id)
+            if cwip_list is None:
+                cwip_list = CWIP.get_all_by_company(self.company_id)
             
             for cwip in cwip_list:
                 self.add_cwip_row(cwip)
@@ -219,13 +235,17 @@ class CWIPInputForm(QWidget):
             self.update_summary()
             
             # Unblock signals
+            self.table.setSortingEnabled(True)
             self.table.blockSignals(False)
             
         except Exception as e:
+            self.table.setSortingEnabled(True)
+            self.table.blockSignals(False)
             QMessageBox.critical(self, "Error", f"Failed to load CWIP data:\n{str(e)}")
     
     def add_cwip_row(self, cwip: CWIP):
         """Add a CWIP row to the table"""
+        was_blocked = self.table.blockSignals(True)  # Building the row is not an edit
         row = self.table.rowCount()
         self.table.insertRow(row)
         
@@ -252,10 +272,10 @@ class CWIPInputForm(QWidget):
         self.set_calculated_item(row, self.COL_CLOSING_PY, closing_py)
         
         # Dates (editable)
-        start_date_item = QTableWidgetItem(cwip.project_start_date or "")
+        start_date_item = QTableWidgetItem(str(cwip.project_start_date or ""))
         self.table.setItem(row, self.COL_START_DATE, start_date_item)
         
-        completion_date_item = QTableWidgetItem(cwip.expected_completion_date or "")
+        completion_date_item = QTableWidgetItem(str(cwip.expected_completion_date or ""))
         self.table.setItem(row, self.COL_COMPLETION_DATE, completion_date_item)
         
         # Hidden columns
@@ -264,6 +284,13 @@ class CWIPInputForm(QWidget):
         
         modified_item = QTableWidgetItem("0")
         self.table.setItem(row, self.COL_MODIFIED, modified_item)
+        self.table.blockSignals(was_blocked)
+    
+    def has_unsaved_changes(self) -> bool:
+        """True if any row was edited, added or deleted since the last save"""
+        return bool(self.deleted_ids) or any(
+            self.table.item(row, self.COL_MODIFIED) and self.table.item(row, self.COL_MODIFIED).text() == "1"
+            for row in range(self.table.rowCount()))
     
     def set_amount_item(self, row: int, col: int, value: float):
         """Set an editable amount cell"""
@@ -278,30 +305,37 @@ class CWIPInputForm(QWidget):
         item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Make read-only
         item.setBackground(QColor("#F0F0F0"))  # Gray background
         item.setForeground(QColor("#2196F3"))  # Blue text
-        self.table.setItem(row, col, item)
+        self.totals.set_item(row, col, item)
     
     def on_item_changed(self, item):
         """Handle cell changes and recalculate"""
-        if item.column() in [
-            self.COL_OPENING_CY, self.COL_ADDITIONS_CY, self.COL_CAPITALIZED_CY,
-            self.COL_OPENING_PY, self.COL_ADDITIONS_PY, self.COL_CAPITALIZED_PY
-        ]:
+        if item.column() in self.TEXT_COLUMNS:
             # Mark as modified
-            modified_item = self.table.item(item.row(), self.COL_MODIFIED)
-            if modified_item:
-                modified_item.setText("1")
+            self.mark_modified(item.row())
+        
+        elif item.column() in self.AMOUNT_COLUMNS:
+            # Mark as modified
+            self.mark_modified(item.row())
             
-            # Recalculate row
+            # Recalculate row (adjusts the running totals)
             self.recalculate_row(item.row())
             
             # Update summary
             self.update_summary()
     
+    def mark_modified(self, row: int):
+        """Set a row's Modified flag without firing itemChanged"""
+        modified_item = self.table.item(row, self.COL_MODIFIED)
+        if modified_item:
+            was_blocked = self.table.blockSignals(True)
+            modified_item.setText("1")
+            self.table.blockSignals(was_blocked)
+    
     def recalculate_row(self, row: int):
         """Recalculate closing balances for a row"""
         try:
             # Block signals to prevent recursive calls
-            self.table.blockSignals(True)
+            was_blocked = self.table.blockSignals(True)
             
             # Get CY amounts
             opening_cy = self.get_float_value(row, self.COL_OPENING_CY)
@@ -322,10 +356,10 @@ class CWIPInputForm(QWidget):
             self.set_calculated_item(row, self.COL_CLOSING_PY, closing_py)
             
             # Unblock signals
-            self.table.blockSignals(False)
+            self.table.blockSignals(was_blocked)
             
         except Exception as e:
-            self.table.blockSignals(False)
+            self.table.blockSignals(was_blocked)
             print(f"Error recalculating row: {e}")
     
     def get_float_value(self, row: int, col: int) -> float:
@@ -340,13 +374,9 @@ class CWIPInputForm(QWidget):
         return 0.0
     
     def update_summary(self):
-        """Update the summary totals"""
-        total_cy = 0.0
-        total_py = 0.0
-        
-        for row in range(self.table.rowCount()):
-            total_cy += self.get_float_value(row, self.COL_CLOSING_CY)
-            total_py += self.get_float_value(row, self.COL_CLOSING_PY)
+        """Display the running summary totals"""
+        total_cy = self.totals[self.COL_CLOSING_CY]
+        total_py = self.totals[self.COL_CLOSING_PY]
         
         self.total_cy_label.setText(f"CY: ₹ {total_cy:,.2f}")
         self.total_py_label.setText(f"PY: ₹ {total_py:,.2f}")
@@ -394,93 +424,109 @@ class CWIPInputForm(QWidget):
         
         if reply == QMessageBox.Yes:
             for row in sorted(selected_rows, reverse=True):
-                # Get CWIP ID
+                # Saved projects are deleted from the database with the next save
                 cwip_id_item = self.table.item(row, self.COL_CWIP_ID)
                 if cwip_id_item and cwip_id_item.text():
-                    cwip_id = int(cwip_id_item.text())
-                    CWIP.delete(cwip_id)
+                    self.deleted_ids.add(int(cwip_id_item.text()))
                 
                 # Remove row
-                self.table.removeRow(row)
+                self.totals.remove_row(row)
             
             self.update_summary()
-            QMessageBox.information(self, "Success", "Projects deleted successfully!")
+            QMessageBox.information(self, "Deleted", "Projects removed - click Save All to apply.")
+    
+    def paste_clipboard(self):
+        """Paste a block copied from Excel (rows are added as needed)"""
+        if not self.company_id:
+            return
+        
+        rows = parse_clipboard(QApplication.clipboard().text())
+        if not rows:
+            return
+        
+        # At the current cell, or as new rows at the end when no cell is current
+        start_row = self.table.currentRow() if self.table.currentRow() >= 0 else self.table.rowCount()
+        start_col = max(self.table.currentColumn(), 0)
+        
+        # One pass with signals and sorting off: each row is recalculated once, the totals once at the end
+        was_blocked = self.table.blockSignals(True)
+        self.table.setSortingEnabled(False)
+        try:
+            while self.table.rowCount() < start_row + len(rows):
+                self.add_cwip_row(CWIP(project_name=""))
+            
+            for offset, values in enumerate(rows):
+                row = start_row + offset
+                for col, text in enumerate(values, start_col):
+                    if col in self.TEXT_COLUMNS:
+                        self.table.setItem(row, col, QTableWidgetItem(text.strip()))
+                    elif col in self.AMOUNT_COLUMNS:
+                        self.set_amount_item(row, col, parse_amount(text))
+                self.mark_modified(row)
+                self.recalculate_row(row)
+        finally:
+            self.table.setSortingEnabled(True)
+            self.table.blockSignals(was_blocked)
+        
+        self.totals.recount()
+        self.update_summary()
+    
+    def get_row_data(self, row: int) -> dict:
+        """create()/update() arguments for a table row"""
+        start_date_item = self.table.item(row, self.COL_START_DATE)
+        completion_date_item = self.table.item(row, self.COL_COMPLETION_DATE)
+        return {
+            'project_name': self.table.item(row, self.COL_PROJECT).text(),
+            'opening_balance_cy': self.get_float_value(row, self.COL_OPENING_CY),
+            'additions_cy': self.get_float_value(row, self.COL_ADDITIONS_CY),
+            'capitalized_cy': self.get_float_value(row, self.COL_CAPITALIZED_CY),
+            'opening_balance_py': self.get_float_value(row, self.COL_OPENING_PY),
+            'additions_py': self.get_float_value(row, self.COL_ADDITIONS_PY),
+            'capitalized_py': self.get_float_value(row, self.COL_CAPITALIZED_PY),
+            'project_start_date': start_date_item.text() if start_date_item else None,
+            'expected_completion_date': completion_date_item.text() if completion_date_item else None
+        }
     
     def save_all(self):
-        """Save all CWIP projects"""
+        """Save new, edited and deleted projects in one transaction"""
         if not self.company_id:
             QMessageBox.warning(self, "Warning", "No company selected.")
             return
         
         try:
-            saved_count = 0
-            
+            new_rows, new_entries, changed_rows, changed_entries = [], [], [], []
             for row in range(self.table.rowCount()):
                 # Check if modified
                 modified_item = self.table.item(row, self.COL_MODIFIED)
                 if not modified_item or modified_item.text() != "1":
                     continue
                 
-                # Get data
-                project_name = self.table.item(row, self.COL_PROJECT).text()
-                
-                opening_cy = self.get_float_value(row, self.COL_OPENING_CY)
-                additions_cy = self.get_float_value(row, self.COL_ADDITIONS_CY)
-                capitalized_cy = self.get_float_value(row, self.COL_CAPITALIZED_CY)
-                
-                opening_py = self.get_float_value(row, self.COL_OPENING_PY)
-                additions_py = self.get_float_value(row, self.COL_ADDITIONS_PY)
-                capitalized_py = self.get_float_value(row, self.COL_CAPITALIZED_PY)
-                
-                start_date_item = self.table.item(row, self.COL_START_DATE)
-                start_date = start_date_item.text() if start_date_item else None
-                
-                completion_date_item = self.table.item(row, self.COL_COMPLETION_DATE)
-                completion_date = completion_date_item.text() if completion_date_item else None
-                
-                # Get CWIP ID
+                data = self.get_row_data(row)
                 cwip_id_item = self.table.item(row, self.COL_CWIP_ID)
-                cwip_id = int(cwip_id_item.text()) if cwip_id_item and cwip_id_item.text() else None
-                
-                if cwip_id:
-                    # Update existing
-                    CWIP.update(
-                        cwip_id=cwip_id,
-                        project_name=project_name,
-                        opening_balance_cy=opening_cy,
-                        additions_cy=additions_cy,
-                        capitalized_cy=capitalized_cy,
-                        opening_balance_py=opening_py,
-                        additions_py=additions_py,
-                        capitalized_py=capitalized_py,
-                        project_start_date=start_date,
-                        expected_completion_date=completion_date
-                    )
+                if cwip_id_item and cwip_id_item.text():
+                    data['cwip_id'] = int(cwip_id_item.text())
+                    changed_rows.append(row)
+                    changed_entries.append(data)
                 else:
-                    # Create new
-                    new_id = CWIP.create(
-                        company_id=self.company_id,
-                        project_name=project_name,
-                        opening_balance_cy=opening_cy,
-                        additions_cy=additions_cy,
-                        capitalized_cy=capitalized_cy,
-                        opening_balance_py=opening_py,
-                        additions_py=additions_py,
-                        capitalized_py=capitalized_py,
-                        project_start_date=start_date,
-                        expected_completion_date=completion_date
-                    )
-                    # Update CWIP ID in table
-                    cwip_id_item.setText(str(new_id))
-                
-                # Reset modified flag
-                modified_item.setText("0")
-                saved_count += 1
+                    new_rows.append(row)
+                    new_entries.append(data)
             
-            if saved_count > 0:
-                QMessageBox.information(self, "Success", f"Saved {saved_count} project(s) successfully!")
-            else:
+            if not (new_entries or changed_entries or self.deleted_ids):
                 QMessageBox.information(self, "Info", "No changes to save.")
+                return
+            
+            new_ids = CWIP.save_batch(self.company_id, new_entries, changed_entries, self.deleted_ids)
+            
+            # Update CWIP IDs and reset modified flags
+            self.table.blockSignals(True)
+            for row, new_id in zip(new_rows, new_ids):
+                self.table.item(row, self.COL_CWIP_ID).setText(str(new_id))
+            for row in new_rows + changed_rows:
+                self.table.item(row, self.COL_MODIFIED).setText("0")
+            self.table.blockSignals(False)
+            self.deleted_ids.clear()
+            
+            QMessageBox.information(self, "Success", f"Saved {len(new_rows) + len(changed_rows)} project(s) successfully!")
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save:\n{str(e)}\n{traceback.format_exc()}")
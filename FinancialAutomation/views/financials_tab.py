@@ -1,12 +1,57 @@
 """Financials Tab - Financial Statements Display"""
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTabWidget, QTextEdit, QMessageBox)
+                             QTabWidget, QTextEdit, QMessageBox, QSplitter, QListWidget,
+                             QListWidgetItem)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-from models.financial_statements import (BalanceSheetGenerator, ProfitLossGenerator, 
-                                        NotesGenerator, CashFlowGenerator)
-import traceback
+from models.financial_statements import StatementSnapshot
+from models.statement_cache import StatementCache
+from models.pdf_exporter import PDFExporter
+from config.instrumentation import track_action
+from views.job_queue import get_job_manager
+import os
+from html import escape
+
+
+def generate_statements_job(context, company_id):
+    """Job: generate BS, P&L, Cash Flow and Notes once and cache them"""
+    context.stage("Generating statements", unit='statements')
+    data_version = StatementCache.get_data_version(company_id)
+    snapshot = StatementSnapshot.generate(company_id, progress=context.callback())
+    context.stage("Saving to cache")
+    StatementCache.save(snapshot, data_version)
+    return snapshot
+
+
+def export_excel_job(context, company_id, snapshot, company_name, fy_end, file_path):
+    """Job: write the statements (generated first if there are none yet) to an Excel workbook"""
+    from models.excel_exporter import ExcelExporter
+    
+    if snapshot is None:
+        context.stage("Generating statements", unit='statements')
+        snapshot = StatementCache.get_or_generate(company_id, progress=context.callback())
+    
+    context.stage("Writing workbook", unit='sheets')
+    exporter = ExcelExporter(company_name, fy_end)
+    exporter.create_workbook(snapshot.balance_sheet, snapshot.profit_loss, snapshot.cash_flow,
+                             snapshot.notes, progress=context.callback())
+    context.stage("Saving file")
+    exporter.save(file_path)
+    return snapshot
+
+
+def export_pdf_job(context, company_id, snapshot, company_name, fy_end, file_path):
+    """Job: render the statements (generated first if there are none yet) to a PDF; returns (snapshot, pages)"""
+    if snapshot is None:
+        context.stage("Generating statements", unit='statements')
+        snapshot = StatementCache.get_or_generate(company_id, progress=context.callback())
+    
+    context.stage("Rendering PDF", unit='sections')
+    exporter = PDFExporter(company_name, fy_end)
+    pages = exporter.export(file_path, snapshot.balance_sheet, snapshot.profit_loss,
+                            snapshot.cash_flow, snapshot.notes, progress=context.callback())
+    return snapshot, pages
 
 
 class FinancialsTab(QWidget):
@@ -16,6 +61,14 @@ class FinancialsTab(QWidget):
         super().__init__(parent)
         self.parent_window = parent
         self.company_id = None
+        self.snapshot = None  # Last generated StatementSnapshot
+        # Statement tabs render when first shown and only when their data changed
+        self._pending = {}   # widget -> (display method, data) not yet rendered
+        self._rendered = {}  # widget -> data currently rendered
+        # Notes render one at a time on selection; {note_num: (note_data, html)}
+        self.notes = {}
+        self._note_cache = {}
+        self._shown_note = None  # (note_num, html) in the viewer
         self.init_ui()
     
     def init_ui(self):
@@ -38,8 +91,12 @@ class FinancialsTab(QWidget):
         self.export_btn = QPushButton("📤 Export to Excel")
         self.export_btn.clicked.connect(self.export_excel)
         
+        self.export_pdf_btn = QPushButton("📄 Export to PDF")
+        self.export_pdf_btn.clicked.connect(self.export_pdf)
+        
         btn_layout.addWidget(self.generate_btn)
         btn_layout.addWidget(self.export_btn)
+        btn_layout.addWidget(self.export_pdf_btn)
         btn_layout.addStretch()
         
         layout.addLayout(btn_layout)
@@ -65,21 +122,70 @@ class FinancialsTab(QWidget):
         self.cf_widget.setFont(QFont("Courier New", 10))
         self.tabs.addTab(self.cf_widget, "💵 Cash Flow")
         
-        # Notes Tab
+        # Notes Tab - note index on the left, selected note on the right
+        notes_splitter = QSplitter(Qt.Horizontal)
+        self.notes_index = QListWidget()
+        self.notes_index.currentRowChanged.connect(self.show_selected_note)
+        notes_splitter.addWidget(self.notes_index)
+        
         self.notes_widget = QTextEdit()
         self.notes_widget.setReadOnly(True)
         self.notes_widget.setFont(QFont("Courier New", 10))
-        self.tabs.addTab(self.notes_widget, "📋 Notes to Accounts")
+        notes_splitter.addWidget(self.notes_widget)
+        notes_splitter.setSizes([250, 650])
+        self.tabs.addTab(notes_splitter, "📋 Notes to Accounts")
         
+        self.tabs.currentChanged.connect(self.render_current_tab)
         layout.addWidget(self.tabs)
         
         self.setLayout(layout)
     
     def set_company(self, company_id: int):
         """Set the company"""
+        self.clear()
         self.company_id = company_id
-        # Auto-generate when company is set
-        self.generate_statements()
+        self.load_statements()
+    
+    def clear(self):
+        """Forget the company and blank the statements (no company selected)"""
+        self.company_id = None
+        self.snapshot = None
+        self._pending = {}
+        self._rendered = {}
+        self._note_cache = {}
+        self._shown_note = None
+        for widget in (self.bs_widget, self.pl_widget, self.cf_widget):
+            widget.clear()
+        self.notes = {}
+        self.notes_index.blockSignals(True)
+        self.notes_index.clear()
+        self.notes_index.blockSignals(False)
+        self.notes_widget.clear()
+    
+    def load_statements(self):
+        """Show cached statements instantly; generate only if the data changed since they were cached"""
+        try:
+            with track_action("Load Statements"):
+                snapshot = StatementCache.load(self.company_id)
+                if snapshot is not None:
+                    self.snapshot = snapshot
+                    self.show_snapshot(snapshot)
+        except Exception as e:
+            print(f"⚠️ Statement cache unavailable: {e}")
+            snapshot = None
+        
+        if snapshot is None:
+            self.start_generation(announce=False)
+    
+    def invalidate(self):
+        """Forget the statements in memory (the data they were built from changed)"""
+        self.snapshot = None
+    
+    def get_snapshot(self):
+        """Return the last generated statements for the current company, generating if needed"""
+        if self.snapshot is None or self.snapshot.company_id != self.company_id:
+            self.snapshot = StatementCache.get_or_generate(self.company_id)
+        return self.snapshot
     
     def generate_all(self):
         """Generate all financials - called from parent"""
@@ -90,32 +196,60 @@ class FinancialsTab(QWidget):
         if not self.company_id:
             QMessageBox.warning(self, "Warning", "No company selected.")
             return
+        self.start_generation(announce=True)
+    
+    def start_generation(self, announce: bool):
+        """Generate BS, P&L, Cash Flow and Notes once in the background - shared with export and ratio analysis"""
+        self.generate_btn.setEnabled(False)
+        job = get_job_manager().submit(
+            "Generate Statements", generate_statements_job, self.company_id,
+            on_finished=lambda snapshot: self.statements_generated(snapshot, announce),
+            on_failed=lambda error: QMessageBox.critical(self, "Error", f"Failed to generate statements:\n{error}"))
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_: self.generate_btn.setEnabled(True))
+    
+    def statements_generated(self, snapshot, announce=True):
+        """Show statements generated by the background job (unless another company was selected meanwhile)"""
+        if snapshot.company_id != self.company_id:
+            return
+        self.snapshot = snapshot
+        self.show_snapshot(snapshot)
         
-        try:
-            # Generate Balance Sheet
-            bs_gen = BalanceSheetGenerator(self.company_id)
-            bs_data = bs_gen.generate()
-            self.display_balance_sheet(bs_data)
-            
-            # Generate P&L
-            pl_gen = ProfitLossGenerator(self.company_id)
-            pl_data = pl_gen.generate()
-            self.display_profit_loss(pl_data)
-            
-            # Generate Cash Flow
-            cf_gen = CashFlowGenerator(self.company_id)
-            cf_data = cf_gen.generate()
-            self.display_cash_flow(cf_data)
-            
-            # Generate Notes
-            notes_gen = NotesGenerator(self.company_id)
-            notes_data = notes_gen.generate_all_notes()
-            self.display_notes(notes_data)
-            
+        if announce:
             QMessageBox.information(self, "Success", "Financial statements generated successfully!\n\nAll Schedule III notes (1-27) have been generated.")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate statements:\n{str(e)}\n{traceback.format_exc()}")
+    
+    def current_snapshot(self):
+        """Statements already generated for the current company, or None (jobs generate them)"""
+        if self.snapshot is not None and self.snapshot.company_id == self.company_id:
+            return self.snapshot
+        return None
+    
+    def keep_snapshot(self, snapshot):
+        """Reuse statements an export job generated, if they are still for the current company"""
+        if snapshot.company_id == self.company_id:
+            self.snapshot = snapshot
+    
+    def show_snapshot(self, snapshot):
+        """Queue the statements for display - only the visible tab is rendered now"""
+        self._schedule(self.bs_widget, self.display_balance_sheet, snapshot.balance_sheet)
+        self._schedule(self.pl_widget, self.display_profit_loss, snapshot.profit_loss)
+        self._schedule(self.cf_widget, self.display_cash_flow, snapshot.cash_flow)
+        self.display_notes(snapshot.notes)
+        self.render_current_tab()
+    
+    def _schedule(self, widget, display, data):
+        if self._rendered.get(widget) == data:
+            self._pending.pop(widget, None)  # Unchanged - keep the existing layout
+        else:
+            self._pending[widget] = (display, data)
+    
+    def render_current_tab(self, index=None):
+        """Render the visible statement tab if its data changed since it was last shown"""
+        widget = self.tabs.currentWidget()
+        if widget in self._pending:
+            display, data = self._pending.pop(widget)
+            display(data)
+            self._rendered[widget] = data
     
     def display_balance_sheet(self, data: dict):
         """Display Balance Sheet"""
@@ -257,6 +391,17 @@ class FinancialsTab(QWidget):
     
     def display_profit_loss(self, data: dict):
         """Display Profit & Loss Statement"""
+        # Purchase lines are only in the P&L when the trial balance has them
+        purchase_rows = ''.join(f"""
+        <tr>
+            <td style='padding-left: 20px;'>{label}</td>
+            <td align='right'>{data['expenses'][key]['cy']:,.2f}</td>
+            <td align='right'>{data['expenses'][key]['py']:,.2f}</td>
+        </tr>""" for key, label in (('cost_of_materials_consumed', 'Cost of Materials Consumed'),
+                                    ('purchases_of_stock_in_trade', 'Purchases of Stock-in-Trade'),
+                                    ('changes_in_inventories', 'Changes in Inventories'))
+                                if key in data['expenses'])
+        
         html = f"""
         <h2 style='text-align: center;'>{data['company_name']}</h2>
         <h3 style='text-align: center;'>STATEMENT OF PROFIT AND LOSS</h3>
@@ -291,7 +436,7 @@ class FinancialsTab(QWidget):
             <td><b>IV. Expenses:</b></td>
             <td></td>
             <td></td>
-        </tr>
+        </tr>{purchase_rows}
         <tr>
             <td style='padding-left: 20px;'>Employee Benefits Expense</td>
             <td align='right'>{data['expenses']['employee_benefits']['cy']:,.2f}</td>
@@ -446,8 +591,8 @@ class FinancialsTab(QWidget):
             </tr>
             <tr>
                 <td>Purchase/(Sale) of Investments</td>
-                <td class='right'>{investing['investments_net_cy']:,.2f}</td>
-                <td class='right'>{investing['investments_net_py']:,.2f}</td>
+                <td class='right'>{investing['investments_cy']:,.2f}</td>
+                <td class='right'>{investing['investments_py']:,.2f}</td>
             </tr>
             <tr class='total'>
                 <td>Net Cash used in Investing Activities (B)</td>
@@ -466,8 +611,8 @@ class FinancialsTab(QWidget):
             </tr>
             <tr>
                 <td>Proceeds from/(Repayment of) Borrowings</td>
-                <td class='right'>{financing['borrowings_net_cy']:,.2f}</td>
-                <td class='right'>{financing['borrowings_net_py']:,.2f}</td>
+                <td class='right'>{financing['borrowings_cy']:,.2f}</td>
+                <td class='right'>{financing['borrowings_py']:,.2f}</td>
             </tr>
             <tr>
                 <td>Dividends Paid</td>
@@ -502,68 +647,82 @@ class FinancialsTab(QWidget):
         self.cf_widget.setHtml(html)
     
     def display_notes(self, notes: dict):
-        """Display Notes to Accounts with detailed breakdowns"""
+        """Rebuild the note index; the selected note is rendered when shown"""
+        self.notes = notes or {}
+        # Drop cached pages of notes that no longer exist
+        for note_num in list(self._note_cache):
+            if note_num not in self.notes:
+                del self._note_cache[note_num]
+        
+        current = self.notes_index.currentItem()
+        current_num = current.data(Qt.UserRole) if current else None
+        
+        self.notes_index.blockSignals(True)
+        self.notes_index.clear()
+        for note_num, note_data in sorted(self.notes.items()):
+            item = QListWidgetItem(f"{note_data['title']}  ({note_data.get('total_cy', 0):,.2f})")
+            item.setData(Qt.UserRole, note_num)
+            self.notes_index.addItem(item)
+            if note_num == current_num:
+                self.notes_index.setCurrentItem(item)
+        self.notes_index.blockSignals(False)
+        
+        if self.notes_index.currentRow() < 0 and self.notes_index.count():
+            self.notes_index.setCurrentRow(0)
+        else:
+            self.show_selected_note()
+    
+    def show_selected_note(self, row=None):
+        """Show the selected note, rendering it only on first view or after its data changed"""
+        item = self.notes_index.currentItem()
+        if item is None:
+            self.notes_widget.clear()
+            self._shown_note = None
+            return
+        
+        note_num = item.data(Qt.UserRole)
+        note_data = self.notes[note_num]
+        cached = self._note_cache.get(note_num)
+        if cached is None or cached[0] != note_data:
+            cached = (note_data, self._note_html(note_data))
+            self._note_cache[note_num] = cached
+        
+        if self._shown_note != (note_num, cached[1]):
+            self.notes_widget.setHtml(cached[1])
+            self._shown_note = (note_num, cached[1])
+    
+    def _note_html(self, note_data: dict) -> str:
+        """HTML for a single note"""
         html = """
         <style>
             table { border-collapse: collapse; width: 100%; margin: 10px 0; }
             th, td { border: 1px solid #ddd; padding: 6px; text-align: left; }
             th { background-color: #4CAF50; color: white; }
-            .note-header { background-color: #2196F3; color: white; padding: 10px; margin-top: 15px; }
+            .note-header { background-color: #2196F3; color: white; padding: 10px; }
+            .note-section { font-weight: bold; background-color: #f0f0f0; }
             .note-total { background-color: #FFD700; font-weight: bold; }
             .right { text-align: right; }
-            .ageing-table { font-size: 0.9em; }
         </style>
-        
-        <h2 style='text-align: center;'>NOTES TO ACCOUNTS</h2>
-        <p style='text-align: center; color: #666;'>As required under Schedule III of Companies Act, 2013</p>
-        <hr>
         """
-        
-        for note_num, note_data in sorted(notes.items()):
-            html += f"<div class='note-header'><h3 style='margin:0;'>Note {note_num}: {note_data['title']}</h3></div>"
-            
-            # Display data based on structure
-            if 'data' in note_data and note_data['data']:
-                html += "<table>"
-                html += "<tr><th>Particulars</th><th class='right'>Current Year (₹)</th><th class='right'>Previous Year (₹)</th></tr>"
-                
-                for key, value in note_data['data'].items():
-                    if isinstance(value, dict):
-                        # Nested structure (e.g., ageing schedules)
-                        html += f"<tr><td colspan='3' style='font-weight: bold; background-color: #f0f0f0;'>{key}</td></tr>"
-                        for sub_key, sub_value in value.items():
-                            if isinstance(sub_value, dict) and 'cy' in sub_value and 'py' in sub_value:
-                                html += f"<tr><td style='padding-left: 20px;'>{sub_key}</td>"
-                                html += f"<td class='right'>{sub_value['cy']:,.2f}</td>"
-                                html += f"<td class='right'>{sub_value['py']:,.2f}</td></tr>"
-                            elif isinstance(sub_value, (int, float)):
-                                html += f"<tr><td style='padding-left: 20px;'>{sub_key}</td>"
-                                html += f"<td class='right' colspan='2'>{sub_value:,.2f}</td></tr>"
-                    elif isinstance(value, (int, float)):
-                        html += f"<tr><td>{key}</td><td class='right' colspan='2'>{value:,.2f}</td></tr>"
-                    else:
-                        html += f"<tr><td>{key}</td><td colspan='2'>{value}</td></tr>"
-                
-                # Total row
-                html += f"<tr class='note-total'><td>Total</td>"
-                html += f"<td class='right'>{note_data['total_cy']:,.2f}</td>"
-                html += f"<td class='right'>{note_data['total_py']:,.2f}</td></tr>"
-                html += "</table>"
-            else:
-                # Simple totals only
-                html += "<table>"
-                html += f"<tr class='note-total'><td>Total</td>"
-                html += f"<td class='right'>{note_data.get('total_cy', 0):,.2f}</td>"
-                html += f"<td class='right'>{note_data.get('total_py', 0):,.2f}</td></tr>"
-                html += "</table>"
-            
-            html += "<br>"
-        
-        html += f"<p style='margin-top: 30px; text-align: center; color: #666;'>"
-        html += f"Total Notes Generated: {len(notes)}<br>"
-        html += f"Complete Schedule III Compliance</p>"
-        
-        self.notes_widget.setHtml(html)
+        html += f"<div class='note-header'><h3 style='margin:0;'>{escape(str(note_data['title']))}</h3></div>"
+        html += "<table>"
+        html += "<tr><th>Particulars</th><th class='right'>Current Year (₹)</th><th class='right'>Previous Year (₹)</th></tr>"
+        
+        rows = []
+        for style, label, _note, cy, py, indent in PDFExporter.note_rows(note_data):
+            padding = f" style='padding-left: {6 + 20 * indent}px;'" if indent else ""
+            if style == 'section':
+                rows.append(f"<tr class='note-section'><td colspan='3'{padding}>{escape(str(label))}</td></tr>")
+                continue
+            css = " class='note-total'" if style == 'total' else ""
+            cy_text = f"{cy:,.2f}" if cy is not None else ""
+            py_text = f"{py:,.2f}" if py is not None else ""
+            rows.append(f"<tr{css}><td{padding}>{escape(str(label))}</td>"
+                        f"<td class='right'>{cy_text}</td><td class='right'>{py_text}</td></tr>")
+        html += "".join(rows)
+        html += "</table>"
+        html += "<p style='color: #666;'>As required under Schedule III of Companies Act, 2013</p>"
+        return html
     
     def export_excel(self):
         """Export to Excel with Schedule III formatting and formula linking"""
@@ -573,10 +732,7 @@ class FinancialsTab(QWidget):
         
         try:
             from PyQt5.QtWidgets import QFileDialog
-            from models.excel_exporter import ExcelExporter
-            from models.financial_statements import BalanceSheetGenerator, ProfitLossGenerator, CashFlowGenerator, NotesGenerator
             from models.company_info import CompanyInfo
-            import os
             
             # Get company info
             company = CompanyInfo.get_by_id(self.company_id)
@@ -596,37 +752,86 @@ class FinancialsTab(QWidget):
             if not file_path:
                 return  # User cancelled
             
-            # Generate all financial data
-            QMessageBox.information(self, "Generating...", "Please wait while generating financial statements...")
-            
-            bs_gen = BalanceSheetGenerator(self.company_id)
-            pl_gen = ProfitLossGenerator(self.company_id)
-            cf_gen = CashFlowGenerator(self.company_id)
-            notes_gen = NotesGenerator(self.company_id)
-            
-            bs_data = bs_gen.generate()
-            pl_data = pl_gen.generate()
-            cf_data = cf_gen.generate()
-            notes = notes_gen.generate_all_notes()
+        except Exception as e:
+            QMessageBox.critical(self, "Export Failed", f"Failed to export to Excel:\n\n{str(e)}")
+            return
+        
+        # Reuse the displayed statements, generate only if nothing is on screen yet
+        self.export_btn.setEnabled(False)
+        job = get_job_manager().submit(
+            f"Export {os.path.basename(file_path)}", export_excel_job, self.company_id, self.current_snapshot(),
+            company.entity_name, company.fy_end_date, file_path,
+            on_finished=lambda snapshot: self.excel_exported(snapshot, file_path),
+            on_failed=lambda error: QMessageBox.critical(self, "Export Failed",
+                                                         f"Failed to export to Excel:\n\n{error}"))
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_: self.export_btn.setEnabled(True))
+    
+    def excel_exported(self, snapshot, file_path):
+        """Report a finished Excel export"""
+        self.keep_snapshot(snapshot)
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Financial statements exported successfully!\n\n"
+            f"File: {os.path.basename(file_path)}\n"
+            f"Location: {os.path.dirname(file_path)}\n\n"
+            f"The Excel file includes:\n"
+            f"• Balance Sheet with formula links to Notes\n"
+            f"• Profit & Loss Statement\n"
+            f"• Cash Flow Statement\n"
+            f"• All {len(snapshot.notes)} Notes to Accounts\n\n"
+            f"All financial statements are formatted per Schedule III."
+        )
+    
+    def export_pdf(self):
+        """Export statements and notes to a print-ready PDF"""
+        if not self.company_id:
+            QMessageBox.warning(self, "No Company", "Please select a company first.")
+            return
+        
+        try:
+            from PyQt5.QtWidgets import QFileDialog
+            from models.company_info import CompanyInfo
             
-            # Create Excel workbook
-            exporter = ExcelExporter(company.entity_name, company.fy_end_date)
-            exporter.create_workbook(bs_data, pl_data, cf_data, notes)
-            exporter.save(file_path)
+            company = CompanyInfo.get_by_id(self.company_id)
+            if not company:
+                QMessageBox.warning(self, "Error", "Company not found.")
+                return
             
-            QMessageBox.information(
+            default_filename = f"{company.entity_name.replace(' ', '_')}_Financials_{company.fy_end_date}.pdf"
+            file_path, _ = QFileDialog.getSaveFileName(
                 self,
-                "Success",
-                f"Financial statements exported successfully!\n\n"
-                f"File: {os.path.basename(file_path)}\n"
-                f"Location: {os.path.dirname(file_path)}\n\n"
-                f"The Excel file includes:\n"
-                f"• Balance Sheet with formula links to Notes\n"
-                f"• Profit & Loss Statement\n"
-                f"• Cash Flow Statement\n"
-                f"• All {len(notes)} Notes to Accounts\n\n"
-                f"All financial statements are formatted per Schedule III."
+                "Save Financial Statements",
+                default_filename,
+                "PDF Files (*.pdf);;All Files (*)"
             )
             
+            if not file_path:
+                return  # User cancelled
+            
         except Exception as e:
-            QMessageBox.critical(self, "Export Failed", f"Failed to export to Excel:\n\n{str(e)}")
+            QMessageBox.critical(self, "Export Failed", f"Failed to export to PDF:\n\n{str(e)}")
+            return
+        
+        self.export_pdf_btn.setEnabled(False)
+        job = get_job_manager().submit(
+            f"Export {os.path.basename(file_path)}", export_pdf_job, self.company_id, self.current_snapshot(),
+            company.entity_name, str(company.fy_end_date), file_path,
+            on_finished=lambda result: self.pdf_exported(*result, file_path),
+            on_failed=lambda error: QMessageBox.critical(self, "Export Failed",
+                                                         f"Failed to export to PDF:\n\n{error}"))
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_: self.export_pdf_btn.setEnabled(True))
+    
+    def pdf_exported(self, snapshot, pages, file_path):
+        """Report a finished PDF export"""
+        self.keep_snapshot(snapshot)
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Financial statements exported successfully!\n\n"
+            f"File: {os.path.basename(file_path)}\n"
+            f"Location: {os.path.dirname(file_path)}\n"
+            f"Pages: {pages}"
+        )
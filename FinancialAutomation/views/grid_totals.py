@@ -0,0 +1,107 @@
+"""
+Grid Totals - running column totals and block paste for the input-form grids
+
+Totals are adjusted cell by cell (old value out, new value in) instead of
+re-walking the table on every edit, so editing or pasting n rows costs O(n).
+"""
+
+from PyQt5.QtCore import Qt
+
+# Item data role holding the value a cell currently contributes to its column total
+COUNTED_ROLE = Qt.UserRole + 1
+
+
+def parse_amount(text) -> float:
+    """Amount typed or pasted into a cell ('1,234.50', '(500)' and blanks allowed)"""
+    text = str(text or '').strip().replace(',', '').replace('₹', '').strip()
+    if not text:
+        return 0.0
+    negative = text.startswith('(') and text.endswith(')')
+    try:
+        value = float(text.strip('()'))
+    except ValueError:
+        return 0.0
+    return -value if negative else value
+
+
+def parse_clipboard(text: str):
+    """Rows of cells from tab-separated clipboard text (as copied from Excel)"""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    while lines and not lines[-1].strip():
+        lines.pop()  # Excel ends the block with a newline
+    return [line.split('\t') for line in lines]
+
+
+class ColumnTotals:
+    """
+    Running totals of some columns of a QTableWidget
+
+    Every write to a totalled column goes through set_item(), user edits through
+    cell_changed() and row removals through remove_row(); each adjusts the total
+    by the difference between the cell's new and previously counted value.
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = tuple(columns)
+        self.totals = dict.fromkeys(self.columns, 0.0)
+
+    def __getitem__(self, col) -> float:
+        return self.totals[col]
+
+    @staticmethod
+    def _counted(item) -> float:
+        """Value an item currently contributes (0 for empty cells)"""
+        if item is None:
+            return 0.0
+        value = item.data(COUNTED_ROLE)
+        return value if value is not None else 0.0
+
+    def set_item(self, row: int, col: int, item):
+        """Put an item in the table, replacing the old cell's contribution"""
+        if col in self.totals:
+            value = parse_amount(item.text())
+            item.setData(COUNTED_ROLE, value)  # Not in the table yet - no itemChanged
+            self.totals[col] += value - self._counted(self.table.item(row, col))
+        self.table.setItem(row, col, item)
+
+    def cell_changed(self, item) -> bool:
+        """Account for an edited cell, returns True if a total changed"""
+        col = item.column()
+        if col not in self.totals:
+            return False
+        value = parse_amount(item.text())
+        counted = self._counted(item)
+        if value == counted:
+            return False
+        self.totals[col] += value - counted
+        was_blocked = self.table.blockSignals(True)
+        item.setData(COUNTED_ROLE, value)
+        self.table.blockSignals(was_blocked)
+        return True
+
+    def remove_row(self, row: int):
+        """Remove a table row and its contribution"""
+        for col in self.columns:
+            self.totals[col] -= self._counted(self.table.item(row, col))
+        self.table.removeRow(row)
+
+    def clear(self):
+        """Zero the totals (call when the table is emptied)"""
+        self.totals = dict.fromkeys(self.columns, 0.0)
+
+    def recount(self):
+        """Recompute the totals from the whole table (after bulk loads, removes rounding drift)"""
+        self.clear()
+        was_blocked = self.table.blockSignals(True)
+        try:
+            for row in range(self.table.rowCount()):
+                for col in self.columns:
+                    item = self.table.item(row, col)
+                    if item is not None:
+                        value = parse_amount(item.text())
+                        if item.data(COUNTED_ROLE) != value:
+                            item.setData(COUNTED_ROLE, value)
+                        self.totals[col] += value
+        finally:
+            self.table.blockSignals(was_blocked)
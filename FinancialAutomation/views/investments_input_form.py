@@ -5,12 +5,15 @@ Non-Current Investments (Notes 3, 4) and Current Investments (Notes 13, 14)
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
     QPushButton, QLabel, QMessageBox, QHeaderView, QDialog, QFormLayout,
-    QLineEdit, QComboBox, QCheckBox, QSpinBox, QDoubleSpinBox, QTabWidget
+    QLineEdit, QComboBox, QCheckBox, QSpinBox, QDoubleSpinBox, QTabWidget,
+    QApplication, QShortcut
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtGui import QColor, QFont, QKeySequence
 from models.investments import Investment
+from views.grid_totals import ColumnTotals, parse_amount, parse_clipboard
 from datetime import datetime
+from typing import List, Optional
 import traceback
 
 
@@ -93,11 +96,15 @@ class InvestmentTableWidget(QWidget):
     COL_INV_ID = 13  # Hidden
     COL_MODIFIED = 14  # Hidden
     
+    TEXT_COLUMNS = (COL_PARTICULARS, COL_TYPE, COL_QUOTED)
+    QUANTITY_COLUMNS = (COL_QTY_CY, COL_QTY_PY)
+    
     def __init__(self, classification, parent=None):
         super().__init__(parent)
         self.classification = classification
         self.company_id = None
         self.parent_form = parent
+        self.deleted_ids = set()  # Saved investments removed from the table, deleted on save
         self.init_ui()
     
     def init_ui(self):
@@ -161,6 +168,11 @@ class InvestmentTableWidget(QWidget):
         
         # Connect cell change
         self.table.itemChanged.connect(self.on_item_changed)
+        self.totals = ColumnTotals(self.table, (self.COL_CARRYING_CY, self.COL_CARRYING_PY))
+        
+        # Ctrl+V pastes a block copied from Excel
+        paste_shortcut = QShortcut(QKeySequence.Paste, self.table, self.paste_clipboard)
+        paste_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
         
         layout.addWidget(self.table)
         
@@ -183,12 +195,12 @@ class InvestmentTableWidget(QWidget):
         
         layout.addLayout(summary_layout)
     
-    def set_company(self, company_id: int):
-        """Set the company and load investment data"""
+    def set_company(self, company_id: int, investments: Optional[List[Investment]] = None):
+        """Set the company and load investment data (investments: already loaded, any classification)"""
         self.company_id = company_id
-        self.load_data()
+        self.load_data(investments)
     
-    def load_data(self):
+    def load_data(self, investments: Optional[List[Investment]] = None):
         """Load investment data for the company"""
         if not self.company_id:
             return
@@ -196,12 +208,18 @@ class InvestmentTableWidget(QWidget):
         try:
             # Block signals
             self.table.blockSignals(True)
+            self.table.setSortingEnabled(False)  # Re-sorted once below, not per cell
             
             # Clear table
             self.table.setRowCount(0)
+            self.totals.clear()
+            self.deleted_ids.clear()
             
             # Load investments
-            investments = Investment.get_all_by_company(self.company_id, self.classification)
+            if investments is None:
+                investments = Investment.get_all_by_company(self.company_id, self.classification)
+            else:
+                investments = [inv for inv in investments if inv.classification == self.classification]
             
             for inv in investments:
                 self.add_investment_row(inv)
@@ -210,13 +228,17 @@ class InvestmentTableWidget(QWidget):
             self.update_summary()
             
             # Unblock signals
+            self.table.setSortingEnabled(True)
             self.table.blockSignals(False)
             
         except Exception as e:
+            self.table.setSortingEnabled(True)
+            self.table.blockSignals(False)
             QMessageBox.critical(self, "Error", f"Failed to load investments:\n{str(e)}")
     
     def add_investment_row(self, inv: Investment):
         """Add an investment row to the table"""
+        was_blocked = self.table.blockSignals(True)  # Building the row is not an edit
         row = self.table.rowCount()
         self.table.insertRow(row)
         
@@ -253,12 +275,19 @@ class InvestmentTableWidget(QWidget):
         
         modified_item = QTableWidgetItem("0")
         self.table.setItem(row, self.COL_MODIFIED, modified_item)
+        self.table.blockSignals(was_blocked)
+    
+    def has_unsaved_changes(self) -> bool:
+        """True if any row was edited, added or deleted since the last save"""
+        return bool(self.deleted_ids) or any(
+            self.table.item(row, self.COL_MODIFIED) and self.table.item(row, self.COL_MODIFIED).text() == "1"
+            for row in range(self.table.rowCount()))
     
     def set_amount_item(self, row: int, col: int, value: float):
         """Set an editable amount cell"""
         item = QTableWidgetItem(f"{value:,.2f}")
         item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.table.setItem(row, col, item)
+        self.totals.set_item(row, col, item)
     
     def set_int_item(self, row: int, col: int, value: int):
         """Set an editable integer cell"""
@@ -268,15 +297,24 @@ class InvestmentTableWidget(QWidget):
     
     def on_item_changed(self, item):
         """Handle cell changes"""
+        if item.column() == self.COL_MODIFIED:
+            return
+        
         # Mark as modified
-        modified_item = self.table.item(item.row(), self.COL_MODIFIED)
-        if modified_item:
-            modified_item.setText("1")
+        self.mark_modified(item.row())
         
-        # Update summary if carrying amount changed
-        if item.column() in [self.COL_CARRYING_CY, self.COL_CARRYING_PY]:
+        # Update summary if carrying amount changed (old value out, new value in)
+        if self.totals.cell_changed(item):
             self.update_summary()
     
+    def mark_modified(self, row: int):
+        """Set a row's Modified flag without firing itemChanged"""
+        modified_item = self.table.item(row, self.COL_MODIFIED)
+        if modified_item:
+            was_blocked = self.table.blockSignals(True)
+            modified_item.setText("1")
+            self.table.blockSignals(was_blocked)
+    
     def get_float_value(self, row: int, col: int) -> float:
         """Get float value from a cell"""
         item = self.table.item(row, col)
@@ -298,13 +336,9 @@ class InvestmentTableWidget(QWidget):
         return 0
     
     def update_summary(self):
-        """Update the summary totals"""
-        total_cy = 0.0
-        total_py = 0.0
-        
-        for row in range(self.table.rowCount()):
-            total_cy += self.get_float_value(row, self.COL_CARRYING_CY)
-            total_py += self.get_float_value(row, self.COL_CARRYING_PY)
+        """Display the running summary totals"""
+        total_cy = self.totals[self.COL_CARRYING_CY]
+        total_py = self.totals[self.COL_CARRYING_PY]
         
         self.total_cy_label.setText(f"CY: ₹ {total_cy:,.2f}")
         self.total_py_label.setText(f"PY: ₹ {total_py:,.2f}")
@@ -353,103 +387,109 @@ class InvestmentTableWidget(QWidget):
         
         if reply == QMessageBox.Yes:
             for row in sorted(selected_rows, reverse=True):
-                # Get investment ID
+                # Saved investments are deleted from the database with the next save
                 inv_id_item = self.table.item(row, self.COL_INV_ID)
                 if inv_id_item and inv_id_item.text():
-                    inv_id = int(inv_id_item.text())
-                    Investment.delete(inv_id)
+                    self.deleted_ids.add(int(inv_id_item.text()))
                 
                 # Remove row
-                self.table.removeRow(row)
+                self.totals.remove_row(row)
             
             self.update_summary()
-            QMessageBox.information(self, "Success", "Investments deleted successfully!")
+            QMessageBox.information(self, "Deleted", "Investments removed - click Save All to apply.")
     
-    def save_all(self):
-        """Save all investments"""
+    def paste_clipboard(self):
+        """Paste a block copied from Excel (rows are added as needed)"""
         if not self.company_id:
-            return 0
+            return
         
-        saved_count = 0
+        rows = parse_clipboard(QApplication.clipboard().text())
+        if not rows:
+            return
         
+        # At the current cell, or as new rows at the end when no cell is current
+        start_row = self.table.currentRow() if self.table.currentRow() >= 0 else self.table.rowCount()
+        start_col = max(self.table.currentColumn(), 0)
+        
+        # One pass with signals and sorting off, the totals recomputed once at the end
+        was_blocked = self.table.blockSignals(True)
+        self.table.setSortingEnabled(False)
         try:
-            for row in range(self.table.rowCount()):
-                # Check if modified
-                modified_item = self.table.item(row, self.COL_MODIFIED)
-                if not modified_item or modified_item.text() != "1":
-                    continue
-                
-                # Get data
-                particulars = self.table.item(row, self.COL_PARTICULARS).text()
-                inv_type = self.table.item(row, self.COL_TYPE).text()
-                quoted_item = self.table.item(row, self.COL_QUOTED)
-                is_quoted = quoted_item.text().lower() == "yes" if quoted_item else False
-                
-                qty_cy = self.get_int_value(row, self.COL_QTY_CY)
-                qty_py = self.get_int_value(row, self.COL_QTY_PY)
-                
-                cost_cy = self.get_float_value(row, self.COL_COST_CY)
-                cost_py = self.get_float_value(row, self.COL_COST_PY)
-                fair_cy = self.get_float_value(row, self.COL_FAIR_VALUE_CY)
-                fair_py = self.get_float_value(row, self.COL_FAIR_VALUE_PY)
-                carrying_cy = self.get_float_value(row, self.COL_CARRYING_CY)
-                carrying_py = self.get_float_value(row, self.COL_CARRYING_PY)
-                market_cy = self.get_float_value(row, self.COL_MARKET_CY)
-                market_py = self.get_float_value(row, self.COL_MARKET_PY)
-                
-                # Get investment ID
-                inv_id_item = self.table.item(row, self.COL_INV_ID)
-                inv_id = int(inv_id_item.text()) if inv_id_item and inv_id_item.text() else None
-                
-                if inv_id:
-                    # Update existing
-                    Investment.update(
-                        investment_id=inv_id,
-                        investment_particulars=particulars,
-                        classification=self.classification,
-                        investment_type=inv_type,
-                        is_quoted=is_quoted,
-                        quantity_cy=qty_cy,
-                        quantity_py=qty_py,
-                        cost_cy=cost_cy,
-                        cost_py=cost_py,
-                        fair_value_cy=fair_cy,
-                        fair_value_py=fair_py,
-                        carrying_amount_cy=carrying_cy,
-                        carrying_amount_py=carrying_py,
-                        market_value_cy=market_cy,
-                        market_value_py=market_py
-                    )
-                else:
-                    # Create new
-                    new_id = Investment.create(
-                        company_id=self.company_id,
-                        investment_particulars=particulars,
-                        classification=self.classification,
-                        investment_type=inv_type,
-                        is_quoted=is_quoted,
-                        quantity_cy=qty_cy,
-                        quantity_py=qty_py,
-                        cost_cy=cost_cy,
-                        cost_py=cost_py,
-                        fair_value_cy=fair_cy,
-                        fair_value_py=fair_py,
-                        carrying_amount_cy=carrying_cy,
-                        carrying_amount_py=carrying_py,
-                        market_value_cy=market_cy,
-                        market_value_py=market_py
-                    )
-                    # Update investment ID in table
-                    inv_id_item.setText(str(new_id))
-                
-                # Reset modified flag
-                modified_item.setText("0")
-                saved_count += 1
-                
-        except Exception as e:
-            raise e
+            while self.table.rowCount() < start_row + len(rows):
+                self.add_investment_row(Investment(investment_particulars="", classification=self.classification))
+            
+            for offset, values in enumerate(rows):
+                row = start_row + offset
+                for col, text in enumerate(values, start_col):
+                    if col in self.TEXT_COLUMNS:
+                        self.table.setItem(row, col, QTableWidgetItem(text.strip()))
+                    elif col in self.QUANTITY_COLUMNS:
+                        self.set_int_item(row, col, int(parse_amount(text)))
+                    elif col <= self.COL_MARKET_PY:
+                        self.set_amount_item(row, col, parse_amount(text))
+                self.mark_modified(row)
+        finally:
+            self.table.setSortingEnabled(True)
+            self.table.blockSignals(was_blocked)
+        
+        self.totals.recount()
+        self.update_summary()
+    
+    def get_row_data(self, row: int) -> dict:
+        """create()/update() arguments for a table row"""
+        quoted_item = self.table.item(row, self.COL_QUOTED)
+        return {
+            'investment_particulars': self.table.item(row, self.COL_PARTICULARS).text(),
+            'classification': self.classification,
+            'investment_type': self.table.item(row, self.COL_TYPE).text(),
+            'is_quoted': quoted_item.text().lower() == "yes" if quoted_item else False,
+            'quantity_cy': self.get_int_value(row, self.COL_QTY_CY),
+            'quantity_py': self.get_int_value(row, self.COL_QTY_PY),
+            'cost_cy': self.get_float_value(row, self.COL_COST_CY),
+            'cost_py': self.get_float_value(row, self.COL_COST_PY),
+            'fair_value_cy': self.get_float_value(row, self.COL_FAIR_VALUE_CY),
+            'fair_value_py': self.get_float_value(row, self.COL_FAIR_VALUE_PY),
+            'carrying_amount_cy': self.get_float_value(row, self.COL_CARRYING_CY),
+            'carrying_amount_py': self.get_float_value(row, self.COL_CARRYING_PY),
+            'market_value_cy': self.get_float_value(row, self.COL_MARKET_CY),
+            'market_value_py': self.get_float_value(row, self.COL_MARKET_PY)
+        }
+    
+    def get_changes(self):
+        """
+        Modified rows to save
+        
+        Returns:
+            tuple: (new rows, their create() arguments, edited rows, their update() arguments)
+        """
+        new_rows, new_entries, changed_rows, changed_entries = [], [], [], []
+        for row in range(self.table.rowCount()):
+            # Check if modified
+            modified_item = self.table.item(row, self.COL_MODIFIED)
+            if not modified_item or modified_item.text() != "1":
+                continue
+            
+            data = self.get_row_data(row)
+            inv_id_item = self.table.item(row, self.COL_INV_ID)
+            if inv_id_item and inv_id_item.text():
+                data['investment_id'] = int(inv_id_item.text())
+                changed_rows.append(row)
+                changed_entries.append(data)
+            else:
+                new_rows.append(row)
+                new_entries.append(data)
         
-        return saved_count
+        return new_rows, new_entries, changed_rows, changed_entries
+    
+    def mark_saved(self, new_rows, new_ids, changed_rows):
+        """Record the IDs of the inserted rows and reset the modified flags after a save"""
+        self.table.blockSignals(True)
+        for row, new_id in zip(new_rows, new_ids):
+            self.table.item(row, self.COL_INV_ID).setText(str(new_id))
+        for row in list(new_rows) + list(changed_rows):
+            self.table.item(row, self.COL_MODIFIED).setText("0")
+        self.table.blockSignals(False)
+        self.deleted_ids.clear()
 
 
 class InvestmentsInputForm(QWidget):
@@ -506,29 +546,43 @@ class InvestmentsInputForm(QWidget):
         
         layout.addWidget(self.tabs)
     
-    def set_company(self, company_id: int):
-        """Set the company and load data"""
+    def set_company(self, company_id: int, investments: Optional[List[Investment]] = None):
+        """Set the company and load data (investments: already loaded, both classifications)"""
         self.company_id = company_id
-        self.non_current_tab.set_company(company_id)
-        self.current_tab.set_company(company_id)
+        self.non_current_tab.set_company(company_id, investments)
+        self.current_tab.set_company(company_id, investments)
+    
+    def has_unsaved_changes(self) -> bool:
+        """True if either tab has unsaved edits"""
+        return self.non_current_tab.has_unsaved_changes() or self.current_tab.has_unsaved_changes()
     
     def save_all(self):
-        """Save all investments from both tabs"""
+        """Save the changes of both tabs in one transaction"""
         if not self.company_id:
             QMessageBox.warning(self, "Warning", "No company selected.")
             return
         
         try:
-            # Save both tabs
-            non_current_saved = self.non_current_tab.save_all()
-            current_saved = self.current_tab.save_all()
-            
-            total_saved = non_current_saved + current_saved
+            tabs = [self.non_current_tab, self.current_tab]
+            changes = [tab.get_changes() for tab in tabs]
+            new_entries = [entry for change in changes for entry in change[1]]
+            changed_entries = [entry for change in changes for entry in change[3]]
+            deleted_ids = set().union(*(tab.deleted_ids for tab in tabs))
             
-            if total_saved > 0:
-                QMessageBox.information(self, "Success", f"Saved {total_saved} investment(s) successfully!")
-            else:
+            if not (new_entries or changed_entries or deleted_ids):
                 QMessageBox.information(self, "Info", "No changes to save.")
+                return
+            
+            new_ids = Investment.save_batch(self.company_id, new_entries, changed_entries, deleted_ids)
+            
+            # New IDs come back in entry order: non-current tab first
+            offset = 0
+            for tab, (new_rows, _, changed_rows, _) in zip(tabs, changes):
+                tab.mark_saved(new_rows, new_ids[offset:offset + len(new_rows)], changed_rows)
+                offset += len(new_rows)
+            
+            QMessageBox.information(self, "Success",
+                                    f"Saved {len(new_entries) + len(changed_entries)} investment(s) successfully!")
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save:\n{str(e)}\n{traceback.format_exc()}")
@@ -0,0 +1,255 @@
+"""Job Queue - long operations run as background jobs on a thread pool, with progress and Cancel"""
+
+import traceback
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QProgressBar, QHeaderView, QAbstractItemView, QLabel)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor
+from config.jobs import CancelToken, JobCancelled, run_job
+from config.settings import JOB_THREADS
+
+
+class JobSignals(QObject):
+    """Signals of one Job (a QRunnable is not a QObject); delivered on the GUI thread"""
+    started = pyqtSignal()
+    progress = pyqtSignal(object)  # JobProgress
+    finished = pyqtSignal(object)  # What the job function returned
+    failed = pyqtSignal(str)       # Error message
+    cancelled = pyqtSignal()
+
+
+class Job(QRunnable):
+    """
+    One background operation: func(context, *args, **kwargs) run with config.jobs.run_job,
+    in its own database session
+    """
+
+    QUEUED = 'Queued'
+    RUNNING = 'Running'
+    FINISHED = 'Finished'
+    FAILED = 'Failed'
+    CANCELLED = 'Cancelled'
+
+    def __init__(self, name, func, args=(), kwargs=None):
+        super().__init__()
+        self.setAutoDelete(False)  # Kept by the manager for the queue view
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.token = CancelToken()
+        self.signals = JobSignals()
+        self.status = Job.QUEUED
+        self.progress = None  # Last JobProgress reported
+        self.result = None
+        self.error = None
+
+    @property
+    def active(self):
+        return self.status in (Job.QUEUED, Job.RUNNING)
+
+    def cancel(self):
+        """Stop the job at its next check (a queued job never starts)"""
+        self.token.cancel()
+
+    def run(self):
+        if self.token.cancelled:
+            self.status = Job.CANCELLED
+            self.signals.cancelled.emit()
+            return
+
+        self.status = Job.RUNNING
+        self.signals.started.emit()
+        try:
+            self.result = run_job(self.func, self.args, self.kwargs, self.token, self._report, action=self.name)
+        except JobCancelled:
+            self.status = Job.CANCELLED
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.error = str(e)
+            self.status = Job.FAILED
+            self.signals.failed.emit(self.error)
+        else:
+            self.status = Job.FINISHED
+            self.signals.finished.emit(self.result)
+
+    def _report(self, progress):
+        self.progress = progress
+        self.signals.progress.emit(progress)
+
+
+class JobManager(QObject):
+    """Runs jobs on its own QThreadPool and keeps the list the queue view shows"""
+
+    job_added = pyqtSignal(object)
+    job_changed = pyqtSignal(object)
+
+    def __init__(self, max_threads=JOB_THREADS, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.jobs = []
+
+    def submit(self, name, func, *args, on_finished=None, on_failed=None, on_cancelled=None, **kwargs):
+        """
+        Queue func(context, *args, **kwargs) as a job
+
+        Args:
+            on_finished / on_failed / on_cancelled: Optional callbacks, run on the GUI thread
+                with the result / the error message / nothing
+
+        Returns:
+            Job
+        """
+        job = Job(name, func, args, kwargs)
+        for signal in (job.signals.started, job.signals.progress, job.signals.finished,
+                       job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_, job=job: self.job_changed.emit(job))
+        if on_finished:
+            job.signals.finished.connect(on_finished)
+        if on_failed:
+            job.signals.failed.connect(on_failed)
+        if on_cancelled:
+            job.signals.cancelled.connect(on_cancelled)
+
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        self.pool.start(job)
+        return job
+
+    def active_jobs(self):
+        return [job for job in self.jobs if job.active]
+
+    def cancel_all(self):
+        for job in self.active_jobs():
+            job.cancel()
+
+    def clear_finished(self):
+        """Forget the jobs that are no longer queued or running"""
+        self.jobs = self.active_jobs()
+
+    def wait(self, msecs=-1):
+        """Block until every job has ended (True) or msecs passed (False)"""
+        return self.pool.waitForDone(msecs)
+
+
+_manager = None
+
+
+def get_job_manager():
+    """The application's job manager (created with the first job)"""
+    global _manager
+    if _manager is None:
+        _manager = JobManager()
+    return _manager
+
+
+class JobQueueWidget(QWidget):
+    """Table of the jobs with their stage, progress and rate; Cancel per job"""
+
+    HEADERS = ["Job", "Status", "Progress", "Details", "Time", ""]
+    STATUS_COLORS = {Job.FAILED: QColor("#d32f2f"), Job.CANCELLED: QColor("#7f8c8d"),
+                     Job.FINISHED: QColor("#27ae60")}
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.rows = {}  # Job -> table row
+        self.init_ui()
+        manager.job_added.connect(self.add_job)
+        manager.job_changed.connect(self.update_job)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.summary_label = QLabel()
+        buttons.addWidget(self.summary_label)
+        buttons.addStretch()
+
+        self.cancel_all_btn = QPushButton("Cancel All")
+        self.cancel_all_btn.clicked.connect(self.manager.cancel_all)
+        buttons.addWidget(self.cancel_all_btn)
+
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.clear_finished)
+        buttons.addWidget(clear_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        """Rebuild the table from the manager's job list"""
+        self.table.setRowCount(0)
+        self.rows = {}
+        for job in self.manager.jobs:
+            self.add_job(job)
+        self.update_summary()
+
+    def add_job(self, job):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[job] = row
+        self.table.setItem(row, 0, QTableWidgetItem(job.name))
+        self.table.setItem(row, 1, QTableWidgetItem())
+        self.table.setCellWidget(row, 2, QProgressBar())
+        self.table.setItem(row, 3, QTableWidgetItem())
+        self.table.setItem(row, 4, QTableWidgetItem())
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(job.cancel)
+        self.table.setCellWidget(row, 5, cancel_btn)
+        self.update_job(job)
+
+    def update_job(self, job):
+        """Show a job's status, stage progress and rate"""
+        row = self.rows.get(job)
+        if row is None:
+            return
+        status = self.table.item(row, 1)
+        status.setText(job.status)
+        status.setForeground(self.STATUS_COLORS.get(job.status, QColor("#2c3e50")))
+
+        bar = self.table.cellWidget(row, 2)
+        percent = job.progress.percent if job.progress else None
+        if job.status == Job.FINISHED:
+            bar.setRange(0, 100)
+            bar.setValue(100)
+        elif job.status == Job.RUNNING and percent is None:
+            bar.setRange(0, 0)  # Busy - the stage total is not known yet
+        else:
+            bar.setRange(0, 100)
+            bar.setValue(percent or 0)
+
+        if job.status == Job.FAILED:
+            details = job.error
+        elif job.progress is not None:
+            details = job.progress.summary()
+        else:
+            details = ""
+        self.table.item(row, 3).setText(details)
+        self.table.item(row, 3).setToolTip(details)
+        self.table.item(row, 4).setText(f"{job.progress.elapsed:,.1f}s" if job.progress else "")
+        self.table.cellWidget(row, 5).setEnabled(job.active)
+        self.update_summary()
+
+    def update_summary(self):
+        active = len(self.manager.active_jobs())
+        self.summary_label.setText(f"{active} running or queued" if active else "No jobs running")
+        self.cancel_all_btn.setEnabled(active > 0)
+
+    def clear_finished(self):
+        self.manager.clear_finished()
+        self.refresh()
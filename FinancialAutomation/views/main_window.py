@@ -3,24 +3,69 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QTabWidget, QMenuBar, QMenu, QAction, QStatusBar,
                             QLabel, QMessageBox, QToolBar, QPushButton, QFileDialog,
-                            QComboBox)
-from PyQt5.QtCore import Qt
+                            QComboBox, QDockWidget)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from controllers.auth_controller import AuthController
 from models.license import License
 from models.company_info import CompanyInfo
+from models.company_data import prefetch_company, CHANGE_DATASETS
+from config import instrumentation
+from config.instrumentation import track_action
+from config.reference_cache import get_cache_stats, invalidate_tables
+from config.change_listener import ChangeListener
+from config.settings import CHANGE_LISTENER_ENABLED
+from views.job_queue import get_job_manager, JobQueueWidget
 import json
 import os
 
+
+class CompanyLoadWorker(QThread):
+    """Worker thread that loads all datasets of a company concurrently"""
+    
+    dataset_loaded = pyqtSignal(int, str, object)
+    dataset_failed = pyqtSignal(int, str, str)
+    
+    def __init__(self, company_id, datasets=None):
+        super().__init__()
+        self.company_id = company_id
+        self.datasets = datasets  # None loads everything; a list refreshes just those
+    
+    def run(self):
+        """Load the company; each dataset is emitted as soon as it arrives"""
+        def deliver(name, value, error):
+            if error is None:
+                self.dataset_loaded.emit(self.company_id, name, value)
+            else:
+                self.dataset_failed.emit(self.company_id, name, str(error))
+        
+        with track_action("Load Company" if self.datasets is None else "Refresh Changed Data"):
+            prefetch_company(self.company_id, deliver, self.datasets)
+
+
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Emitted (possibly from a worker thread) when a traced UI action finishes
+    action_traced = pyqtSignal(object)
+    
+    # Emitted from the change listener thread when another user's write is committed
+    data_changed = pyqtSignal(object)
+    
+    # Changes arriving within this window are refreshed together
+    CHANGE_REFRESH_DELAY_MS = 300
+    
     def __init__(self, user):
         super().__init__()
         print(f"MainWindow.__init__ started for user: {user.username}")
         self.user = user
         self.current_company_id = None
         self.current_company = None
+        self.company_data = {}  # Datasets prefetched for the current company
+        self.company_load_errors = {}
+        self.load_workers = []
+        self.pending_refresh = set()  # Datasets changed by other users, refreshed together
+        self.change_listener = None
         self.session_file = os.path.join(os.path.dirname(__file__), '..', f'.session_{user.user_id}.json')
         
         try:
@@ -31,6 +76,8 @@ class MainWindow(QMainWindow):
             # License status check disabled for v1.0 (re-enabled in v1.1)
             # self.check_license_status()
             
+            self.start_change_listener()
+            
             print("Loading last session...")
             self.load_last_session()
             print("Last session loaded")
@@ -53,6 +100,9 @@ class MainWindow(QMainWindow):
         font = QFont("Bookman Old Style", 11)
         self.setFont(font)
         
+        # Background jobs panel (its toggle goes in the Tools menu)
+        self.create_job_queue()
+        
         # Create menu bar
         self.create_menu_bar()
         
@@ -235,6 +285,13 @@ class MainWindow(QMainWindow):
         aging_action.triggered.connect(self.show_aging_schedules)
         tools_menu.addAction(aging_action)
         
+        tools_menu.addSeparator()
+        
+        jobs_action = self.job_dock.toggleViewAction()
+        jobs_action.setText("Background Jobs")
+        jobs_action.setShortcut("Ctrl+J")
+        tools_menu.addAction(jobs_action)
+        
         # Help menu
         help_menu = menubar.addMenu("&Help")
         
@@ -429,6 +486,16 @@ class MainWindow(QMainWindow):
         self.financials_tab = FinancialsTab(self)
         self.tab_widget.addTab(self.financials_tab, "Financial Statements")
     
+    def create_job_queue(self):
+        """Dock listing background jobs (imports, generation, exports) with progress and Cancel"""
+        self.jobs = get_job_manager()
+        self.job_dock = QDockWidget("Background Jobs", self)
+        self.job_dock.setObjectName("job_queue")
+        self.job_dock.setWidget(JobQueueWidget(self.jobs))
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.job_dock)
+        self.job_dock.hide()
+        self.jobs.job_added.connect(lambda job: self.job_dock.show())
+    
     def create_status_bar(self):
         """Create status bar"""
         self.status_bar = QStatusBar()
@@ -446,6 +513,45 @@ class MainWindow(QMainWindow):
         self.company_status_label = QLabel("  No company selected")
         self.company_status_label.setStyleSheet("color: #e74c3c; font-weight: bold; padding: 0 10px;")
         self.status_bar.addPermanentWidget(self.company_status_label)
+        
+        # Query count / DB time of the last traced action
+        self.db_stats_label = QLabel("")
+        self.db_stats_label.setStyleSheet("color: #7f8c8d; padding: 0 10px;")
+        self.status_bar.addPermanentWidget(self.db_stats_label)
+        self.action_traced.connect(self.show_action_stats)
+        self.action_listener = self.action_traced.emit  # Kept to unregister in closeEvent
+        instrumentation.add_action_listener(self.action_listener)
+        
+        # Background jobs running
+        self.jobs_label = QLabel("")
+        self.jobs_label.setStyleSheet("color: #2980b9; padding: 0 10px;")
+        self.status_bar.addPermanentWidget(self.jobs_label)
+        self.jobs.job_added.connect(self.show_job_count)
+        self.jobs.job_changed.connect(self.show_job_count)
+    
+    def show_job_count(self, job=None):
+        """Number of background jobs still queued or running"""
+        active = self.jobs.active_jobs()
+        if not active:
+            self.jobs_label.setText("")
+        elif len(active) == 1:
+            progress = active[0].progress
+            self.jobs_label.setText(f"⚙ {active[0].name}" + (f" - {progress.summary()}" if progress else ""))
+        else:
+            self.jobs_label.setText(f"⚙ {len(active)} jobs running")
+    
+    def show_action_stats(self, trace):
+        """Show the last action's query count and DB time; tooltip lists the slowest statements"""
+        self.db_stats_label.setText(f"⏱ {trace.summary()}")
+        
+        tooltip = [f"{trace.name} - {trace.query_count} queries, {trace.slow_query_count} slow"]
+        for query in trace.slowest():
+            tooltip.append(f"{query.duration_ms:,.1f} ms | {query.rowcount} rows | {query.statement[:120]}")
+        tooltip.append(f"Reference cache this action: {trace.cache_hits} hits / {trace.cache_misses} misses")
+        for name, stats in get_cache_stats().items():
+            tooltip.append(f"  {name}: {stats['size']} entries, {stats['hits']} hits / {stats['misses']} misses "
+                           f"({stats['hit_rate']:.0%}), {stats['evictions']} evicted")
+        self.db_stats_label.setToolTip("\n".join(tooltip))
     
     def update_status_bar(self, message):
         """Update status bar message"""
@@ -516,41 +622,176 @@ class MainWindow(QMainWindow):
             self.save_session(company_id)
     
     def load_company(self, company_id):
-        """Load selected company data"""
+        """Load selected company data - all datasets are fetched concurrently and
+        fed to the tabs as they arrive"""
+        self.current_company_id = company_id
+        self.company_data = {}
+        self.company_load_errors = {}
+        self.pending_refresh = set()
+        self.update_status_bar("Loading company...")
+        
+        worker = CompanyLoadWorker(company_id)
+        worker.dataset_loaded.connect(self.on_company_dataset_loaded)
+        worker.dataset_failed.connect(self.on_company_dataset_failed)
+        worker.finished.connect(lambda: self.on_company_load_finished(worker))
+        self.load_workers.append(worker)
+        worker.start()
+    
+    def on_company_dataset_loaded(self, company_id, name, value):
+        """Show one prefetched dataset in the tabs that use it"""
+        if company_id != self.current_company_id:
+            return  # Another company was selected meanwhile
+        
+        data = self.company_data
+        data[name] = value
         try:
-            company = CompanyInfo.get_by_id(company_id)
-            
-            if company:
-                self.current_company_id = company_id
-                self.current_company = company
-                
-                # Update UI
-                self.company_status_label.setText(f"  Active: {company.entity_name}")
+            if name == 'company':
+                if value is None:
+                    return  # Reported when loading finishes
+                self.current_company = value
+                self.company_status_label.setText(f"  Active: {value.entity_name}")
                 self.company_status_label.setStyleSheet("color: #27ae60; font-weight: bold; padding: 0 10px;")
-                self.update_status_bar(f"Loaded company: {company.entity_name}")
-                
-                # Refresh all tabs with company data
-                self.refresh_all_tabs()
-                
-                # Save session
-                self.save_session(company_id)
-                
+                self.update_status_bar(f"Loaded company: {value.entity_name}")
+                if hasattr(self, 'company_info_tab'):
+                    self.company_info_tab.show_company(value)
+                if hasattr(self, 'financials_tab'):
+                    self.financials_tab.set_company(value.company_id)
+            
+            elif name in ('tb_frame', 'tb_stats'):
+                if hasattr(self, 'trial_balance_tab') and 'tb_frame' in data and 'tb_stats' in data:
+                    self.trial_balance_tab.show_data(data['tb_frame'], data['tb_stats'])
+            
+            elif name in ('major_heads', 'minor_heads', 'groupings'):
+                hierarchy = ('major_heads', 'minor_heads', 'groupings')
+                if hasattr(self, 'master_data_tab') and all(key in data for key in hierarchy):
+                    self.master_data_tab.load_data(tuple(data[key] for key in hierarchy))
+            
+            elif name == 'ppe' and hasattr(self, 'input_forms_tab'):
+                self.input_forms_tab.ppe_form.load_data(value)
+            
+            elif name == 'cwip' and hasattr(self, 'input_forms_tab'):
+                self.input_forms_tab.cwip_form.set_company(company_id, value)
+            
+            elif name == 'investments' and hasattr(self, 'input_forms_tab'):
+                self.input_forms_tab.investments_form.set_company(company_id, value)
+            
+            elif name == 'selection_sheet' and hasattr(self, 'selection_sheet_tab'):
+                self.selection_sheet_tab.set_company(company_id, value)
+        
+        except Exception as e:
+            self.company_load_errors[name] = str(e)
+    
+    def on_company_dataset_failed(self, company_id, name, error):
+        """Remember a dataset that could not be loaded"""
+        if company_id == self.current_company_id:
+            print(f"❌ Failed to load {name}: {error}")
+            self.company_load_errors[name] = error
+    
+    def start_change_listener(self):
+        """Listen for other users' changes (PostgreSQL only) and refresh just what they touched"""
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.refresh_changed_data)
+        self.data_changed.connect(self.on_data_changed)
+        
+        if CHANGE_LISTENER_ENABLED:
+            self.change_listener = ChangeListener(self.data_changed.emit)
+            if not self.change_listener.start():
+                self.change_listener = None  # Embedded database - single user
+    
+    def on_data_changed(self, change):
+        """Invalidate what a committed write of another user made stale"""
+        if not change.own:
+            invalidate_tables(change.table)  # Reference data is shared by every company view
+        if change.own or change.company_id != self.current_company_id:
+            return  # Our own edits are already on screen; other companies are loaded on selection
+        
+        if hasattr(self, 'financials_tab') and self.financials_tab.company_id == change.company_id:
+            self.financials_tab.invalidate()
+        
+        self.pending_refresh.update(CHANGE_DATASETS.get(change.table, ()))
+        if self.pending_refresh:
+            self.refresh_timer.start(self.CHANGE_REFRESH_DELAY_MS)
+    
+    def refresh_changed_data(self):
+        """Reload the datasets other users changed; forms with unsaved edits are left alone"""
+        datasets, self.pending_refresh = self.pending_refresh, set()
+        if not self.current_company_id or not datasets:
+            return
+        
+        if hasattr(self, 'input_forms_tab'):
+            forms = {'ppe': self.input_forms_tab.ppe_form, 'cwip': self.input_forms_tab.cwip_form,
+                     'investments': self.input_forms_tab.investments_form}
+            kept = sorted(name for name, form in forms.items() if name in datasets and form.has_unsaved_changes())
+            if kept:
+                datasets -= set(kept)
+                self.update_status_bar(f"⚠️ Another user changed {', '.join(kept)} - save or reload to see it")
+        if not datasets:
+            return
+        
+        worker = CompanyLoadWorker(self.current_company_id, sorted(datasets))
+        worker.dataset_loaded.connect(self.on_company_dataset_loaded)
+        worker.dataset_failed.connect(self.on_company_dataset_failed)
+        worker.finished.connect(lambda: self.on_company_load_finished(worker))
+        self.load_workers.append(worker)
+        worker.start()
+    
+    def on_company_load_finished(self, worker):
+        """All datasets of a company have arrived"""
+        self.load_workers.remove(worker)
+        if worker.company_id != self.current_company_id:
+            return
+        
+        if worker.datasets is not None:
+            if not self.company_load_errors:
+                self.update_status_bar(f"Refreshed after changes by another user: {', '.join(worker.datasets)}")
+            self.company_load_errors = {}
+            return
+        
+        company = self.company_data.get('company')
+        if 'company' in self.company_load_errors:
+            QMessageBox.critical(self, "Error",
+                                 f"Failed to load company:\n{self.company_load_errors['company']}")
+        elif not company:
+            self.clear_company()
+            QMessageBox.warning(self, "Error", "Company not found")
+        else:
+            # Save session
+            self.save_session(company.company_id)
+            
+            if self.company_load_errors:
+                QMessageBox.warning(
+                    self, "Company Loaded",
+                    f"Loaded {company.entity_name}, but some data could not be loaded:\n\n" +
+                    "\n".join(f"{name}: {error}" for name, error in self.company_load_errors.items())
+                )
+            else:
                 QMessageBox.information(
                     self, "Company Loaded",
                     f"Successfully loaded:\n\n"
                     f"Entity: {company.entity_name}\n"
                     f"FY: {company.fy_start_date} to {company.fy_end_date}"
                 )
-            else:
-                QMessageBox.warning(self, "Error", "Company not found")
-        
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load company:\n{str(e)}")
+    
+    def closeEvent(self, event):
+        """Stop listening, cancel background jobs and let company loads in progress finish
+        before the window goes away"""
+        instrumentation.remove_action_listener(self.action_listener)
+        if self.change_listener is not None:
+            self.change_listener.stop()
+        self.jobs.cancel_all()
+        self.jobs.wait()
+        for worker in list(self.load_workers):
+            worker.wait()
+        super().closeEvent(event)
     
     def clear_company(self):
         """Clear current company selection"""
         self.current_company_id = None
         self.current_company = None
+        self.company_data = {}
+        if hasattr(self, 'financials_tab'):
+            self.financials_tab.clear()
         self.company_status_label.setText("  No company selected")
         self.company_status_label.setStyleSheet("color: #e74c3c; font-weight: bold; padding: 0 10px;")
         self.update_status_bar("No company selected")
@@ -699,7 +940,11 @@ class MainWindow(QMainWindow):
     
     def export_to_pdf(self):
         """Export to PDF"""
-        QMessageBox.information(self, "Export", "PDF export coming soon!")
+        if self.current_company_id:
+            self.financials_tab.company_id = self.current_company_id
+            self.financials_tab.export_pdf()
+        else:
+            QMessageBox.warning(self, "No Company", "Please create or open a company first")
     
     def validate_data(self):
         """Validate data"""
@@ -709,8 +954,25 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No Company", "Please create or open a company first")
     
     def show_ratio_analysis(self):
-        """Show ratio analysis"""
-        QMessageBox.information(self, "Ratios", "Ratio analysis coming soon!")
+        """Show ratio analysis computed from the generated statements"""
+        if not self.current_company_id:
+            QMessageBox.warning(self, "No Company", "Please create or open a company first")
+            return
+
+        try:
+            from models.ratio_analysis import RatioAnalyzer
+            from views.ratio_analysis_dialog import RatioAnalysisDialog
+
+            with track_action("Ratio Analysis"):
+                # Reuse statements already generated in the Financials tab
+                self.financials_tab.company_id = self.current_company_id
+                snapshot = self.financials_tab.get_snapshot()
+                ratios = RatioAnalyzer().analyze_snapshot(snapshot)
+
+            dialog = RatioAnalysisDialog(ratios, self.current_company.entity_name, self)
+            dialog.exec_()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to compute ratios:\n{str(e)}")
     
     def show_aging_schedules(self):
         """Show aging schedules"""
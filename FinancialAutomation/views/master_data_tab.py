@@ -3,13 +3,31 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QLineEdit, QComboBox, QTreeWidget, 
                              QTreeWidgetItem, QMessageBox, QDialog, QFormLayout,
-                             QGroupBox, QSplitter, QTextEdit, QFileDialog)
+                             QGroupBox, QSplitter, QTextEdit, QFileDialog, QCheckBox,
+                             QDialogButtonBox)
 from PyQt5.QtCore import Qt
 from models.master_data import MajorHead, MinorHead, Grouping
+from models.company_info import CompanyInfo
+from utils.company_structure import clone_company_structure
+from utils.default_master_data import initialize_default_master_data_for_company
+from views.job_queue import get_job_manager
 import openpyxl
 from openpyxl.styles import Font, PatternFill
 import os
 
+
+def clone_job(context, source_company_id, target_company_id, include_mappings):
+    """Job: copy another company's master data (and optionally ledger mappings)"""
+    context.stage("Copying master data")
+    return clone_company_structure(source_company_id, target_company_id, include_mappings=include_mappings)
+
+
+def seed_chart_job(context, company_id):
+    """Job: create the standard Schedule III chart of accounts"""
+    context.stage("Creating standard chart of accounts")
+    return initialize_default_master_data_for_company(company_id)
+
+
 class MasterDataTab(QWidget):
     """Master Data Management Tab with Full CRUD Operations"""
     
@@ -192,6 +210,15 @@ class MasterDataTab(QWidget):
         export_btn.clicked.connect(self.export_to_excel)
         ie_layout.addWidget(export_btn)
         
+        self.clone_btn = QPushButton("📋 Clone from Company")
+        self.clone_btn.clicked.connect(self.clone_from_company)
+        ie_layout.addWidget(self.clone_btn)
+        
+        self.seed_btn = QPushButton("📚 Load Standard Chart")
+        self.seed_btn.clicked.connect(self.load_standard_chart)
+        self.seed_btn.setToolTip("Create the standard Schedule III major heads, minor heads and groupings")
+        ie_layout.addWidget(self.seed_btn)
+        
         ie_group.setLayout(ie_layout)
         layout.addWidget(ie_group)
         
@@ -201,6 +228,7 @@ class MasterDataTab(QWidget):
             "• Click tree items to edit/delete<br>"
             "• Major → Minor → Grouping hierarchy<br>"
             "• Import/Export for bulk operations<br>"
+            "• Clone to copy another company's structure<br>"
             "• All fields marked * are required"
         )
         help_text.setWordWrap(True)
@@ -278,8 +306,14 @@ class MasterDataTab(QWidget):
                     # minor tuple: (minor_head_id, company_id, major_head_id, minor_head_name, ...)
                     self.parent_minor_combo.addItem(f"{minor[3]}", minor[0])
     
-    def load_data(self):
-        """Load all data into tree view"""
+    def load_data(self, hierarchy=None):
+        """
+        Load all data into tree view
+        
+        Args:
+            hierarchy: Already loaded (major_heads, minor_heads, groupings) of the
+                       current company; fetched here when not given
+        """
         self.tree.clear()
         
         if not self.current_company_id:
@@ -287,12 +321,24 @@ class MasterDataTab(QWidget):
             self.stats_label.setStyleSheet("padding: 5px; background-color: #ffe0e0; color: #d32f2f;")
             return
         
+        if hierarchy is None:
+            hierarchy = (MajorHead.get_all_by_company(self.current_company_id),
+                         MinorHead.get_all(company_id=self.current_company_id),
+                         Grouping.get_all(company_id=self.current_company_id))
+        major_heads, all_minor_heads, all_groupings = hierarchy
+        
+        # Children by parent id - result order is kept within each parent
+        minors_by_major = {}
+        for minor in all_minor_heads:
+            minors_by_major.setdefault(minor[2], []).append(minor)
+        groupings_by_minor = {}
+        for grouping in all_groupings:
+            groupings_by_minor.setdefault(grouping[2], []).append(grouping)
+        
         major_count = 0
         minor_count = 0
         grouping_count = 0
         
-        # Load major heads for current company
-        major_heads = MajorHead.get_all_by_company(self.current_company_id)
         for major in major_heads:
             major_count += 1
             
@@ -304,10 +350,9 @@ class MasterDataTab(QWidget):
             major_item.setForeground(0, Qt.blue)
             major_item.setData(0, Qt.UserRole, {"type": "major", "id": major.major_head_id})
             
-            # Load minor heads for this major
-            minor_heads = MinorHead.get_all(company_id=self.current_company_id, major_head_id=major.major_head_id)
-            for minor in minor_heads:
-                # minor tuple: (minor_head_id, company_id, major_head_id, minor_head_name, opening_balance_cy, opening_balance_py, code, description)
+            # Minor heads of this major
+            # minor tuple: (minor_head_id, company_id, major_head_id, minor_head_name, opening_balance_cy, opening_balance_py, code, description)
+            for minor in minors_by_major.get(major.major_head_id, []):
                 minor_id, _, _, minor_name, _, _, minor_code, _ = minor
                 minor_count += 1
                 
@@ -319,10 +364,9 @@ class MasterDataTab(QWidget):
                 minor_item.setForeground(0, Qt.darkGreen)
                 minor_item.setData(0, Qt.UserRole, {"type": "minor", "id": minor_id, "major_id": major.major_head_id})
                 
-                # Load groupings for this minor
-                groupings = Grouping.get_all(company_id=self.current_company_id, minor_head_id=minor_id)
-                for grouping in groupings:
-                    # grouping tuple: (grouping_id, company_id, minor_head_id, grouping_name, opening_balance_cy, opening_balance_py, code, description)
+                # Groupings of this minor
+                # grouping tuple: (grouping_id, company_id, minor_head_id, grouping_name, opening_balance_cy, opening_balance_py, code, description)
+                for grouping in groupings_by_minor.get(minor_id, []):
                     grouping_id, _, _, group_name, _, _, group_code, _ = grouping
                     grouping_count += 1
                     
@@ -620,6 +664,83 @@ class MasterDataTab(QWidget):
         self.selected_grouping_id = None
         self.selected_item_id = None
     
+    def clone_from_company(self):
+        """Copy master data (and optionally ledger mappings) from another company"""
+        if not self.current_company_id:
+            QMessageBox.warning(self, "No Company", "Please select a company first.")
+            return
+        
+        user = getattr(self.parent_window, 'user', None)
+        companies = []
+        if user:
+            companies = [c for c in CompanyInfo.get_all_by_user(user.user_id)
+                         if c.company_id != self.current_company_id]
+        if not companies:
+            QMessageBox.information(self, "Clone", "No other company to clone from.")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Clone Company Structure")
+        form = QFormLayout()
+        source_combo = QComboBox()
+        for company in companies:
+            source_combo.addItem(company.entity_name, company.company_id)
+        form.addRow("Source Company:", source_combo)
+        mappings_check = QCheckBox("Also map unmapped ledgers with the same names")
+        form.addRow("", mappings_check)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+        dialog.setLayout(form)
+        
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        
+        source_name = source_combo.currentText()
+        self.start_job(f"Clone master data from {source_name}", clone_job,
+                       source_combo.currentData(), self.current_company_id, mappings_check.isChecked(),
+                       title=f"Copied from {source_name}")
+    
+    def load_standard_chart(self):
+        """Create the standard Schedule III chart of accounts for the company"""
+        if not self.current_company_id:
+            QMessageBox.warning(self, "No Company", "Please select a company first.")
+            return
+        
+        reply = QMessageBox.question(
+            self, "Load Standard Chart",
+            "Create the standard Schedule III major heads, minor heads and groupings for this company?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.start_job("Load standard chart of accounts", seed_chart_job, self.current_company_id,
+                           title="Standard chart of accounts created")
+    
+    def start_job(self, name, func, *args, title):
+        """Run a master data job in the background; the tree reloads when it finishes"""
+        self.set_job_buttons_enabled(False)
+        job = get_job_manager().submit(
+            name, func, *args,
+            on_finished=lambda stats: self.master_data_created(stats, title),
+            on_failed=lambda error: QMessageBox.critical(self, "Error", error))
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_: self.set_job_buttons_enabled(True))
+    
+    def set_job_buttons_enabled(self, enabled):
+        self.clone_btn.setEnabled(enabled)
+        self.seed_btn.setEnabled(enabled)
+    
+    def master_data_created(self, stats, title):
+        """Report the heads and groupings a master data job created"""
+        message = (f"Major Heads: {stats['major_heads']}\n"
+                   f"Minor Heads: {stats['minor_heads']}\n"
+                   f"Groupings: {stats['groupings']}")
+        if 'ledger_mappings' in stats:
+            message += f"\nLedgers mapped: {stats['ledger_mappings']}"
+        QMessageBox.information(self, "Master Data", f"{title}:\n\n{message}")
+        self.load_data()
+    
     def export_to_excel(self):
         """Export master data to Excel"""
         file_path, _ = QFileDialog.getSaveFileName(
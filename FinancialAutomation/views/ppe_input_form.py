@@ -4,10 +4,15 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QTableWidget, QTableWidgetItem, QMessageBox,
                              QHeaderView, QGroupBox, QComboBox, QDoubleSpinBox,
                              QSpinBox, QLineEdit, QDialog, QFormLayout, QFileDialog,
-                             QAbstractItemView)
+                             QAbstractItemView, QApplication, QShortcut)
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QFont, QColor, QKeySequence
 from models.ppe import PPE
+from models.fixed_assets import FixedAsset, register_column
+from config.instrumentation import track_action
+from views.grid_totals import ColumnTotals, parse_amount, parse_clipboard
+from datetime import datetime
+import pandas as pd
 import openpyxl
 from openpyxl.styles import Font as ExcelFont, PatternFill, Alignment
 import os
@@ -15,9 +20,13 @@ import os
 class PPEInputForm(QWidget):
     """Property, Plant & Equipment input form with CY & PY support"""
     
+    CALCULATED_COLUMNS = (4, 8, 9, 13, 17, 18)  # Closing and net block values
+    SUMMARY_COLUMNS = (9, 18)  # Net block CY / PY
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent
+        self.deleted_ids = set()  # Saved rows removed from the table, deleted on save
         self.init_ui()
         self.load_data()
     
@@ -91,7 +100,7 @@ class PPEInputForm(QWidget):
         delete_btn.setStyleSheet("padding: 8px 16px; background-color: #f44336; color: white;")
         layout.addWidget(delete_btn)
         
-        import_btn = QPushButton("📥 Import Excel")
+        import_btn = QPushButton("📥 Import Asset Register")
         import_btn.clicked.connect(self.import_excel)
         layout.addWidget(import_btn)
         
@@ -158,6 +167,11 @@ class PPEInputForm(QWidget):
         """)
         
         self.table.itemChanged.connect(self.on_item_changed)
+        self.totals = ColumnTotals(self.table, self.SUMMARY_COLUMNS)
+        
+        # Ctrl+V pastes a block copied from Excel
+        paste_shortcut = QShortcut(QKeySequence.Paste, self.table, self.paste_clipboard)
+        paste_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
     
     def create_summary_section(self):
         """Create summary section showing totals"""
@@ -177,17 +191,20 @@ class PPEInputForm(QWidget):
         group.setLayout(layout)
         return group
     
-    def load_data(self):
-        """Load PPE data from database"""
+    def load_data(self, ppe_list=None):
+        """Load PPE data from database (or display an already loaded list)"""
         if not self.current_company_id:
             self.update_status("⚠️ No company selected", error=True)
             return
         
         self.table.blockSignals(True)
         self.table.setRowCount(0)
+        self.totals.clear()
+        self.deleted_ids.clear()
         
         try:
-            ppe_list = PPE.get_all_by_company(self.current_company_id)
+            if ppe_list is None:
+                ppe_list = PPE.get_all_by_company(self.current_company_id)
             
             for ppe in ppe_list:
                 self.add_ppe_row(ppe)
@@ -201,6 +218,7 @@ class PPEInputForm(QWidget):
     
     def add_ppe_row(self, ppe=None):
         """Add a row to the table"""
+        was_blocked = self.table.blockSignals(True)  # Building the row is not an edit
         row = self.table.rowCount()
         self.table.insertRow(row)
         
@@ -249,12 +267,18 @@ class PPEInputForm(QWidget):
             # Empty row for new entry
             self.table.setItem(row, 0, QTableWidgetItem(""))
             for col in range(1, 21):
-                if col not in [4, 8, 9, 13, 17, 18]:  # Skip calculated columns
+                if col not in self.CALCULATED_COLUMNS:
                     self.set_numeric_item(row, col, 0.0)
                 else:
                     self.set_numeric_item(row, col, 0.0, readonly=True, calculated=True)
             self.table.setItem(row, 21, QTableWidgetItem(""))  # No ID for new row
             self.table.setItem(row, 22, QTableWidgetItem("1"))  # Mark as modified
+        self.table.blockSignals(was_blocked)
+    
+    def has_unsaved_changes(self):
+        """True if any row was edited, added or deleted since the last save"""
+        return bool(self.deleted_ids) or any(self.table.item(row, 22) and self.table.item(row, 22).text() == "1"
+                                             for row in range(self.table.rowCount()))
     
     def set_numeric_item(self, row, col, value, readonly=False, calculated=False):
         """Set a numeric item in the table"""
@@ -267,7 +291,7 @@ class PPEInputForm(QWidget):
                 item.setBackground(QColor("#f0f0f0"))
                 item.setForeground(QColor("#1976d2"))
         
-        self.table.setItem(row, col, item)
+        self.totals.set_item(row, col, item)
     
     def on_item_changed(self, item):
         """Handle item change - recalculate closing values"""
@@ -275,21 +299,27 @@ class PPEInputForm(QWidget):
         col = item.column()
         
         # Skip if it's a calculated column
-        if col in [4, 8, 9, 13, 17, 18, 21, 22]:
+        if col in self.CALCULATED_COLUMNS + (21, 22):
             return
         
         # Mark row as modified
-        modified_item = self.table.item(row, 22)
-        if modified_item:
-            modified_item.setText("1")
+        self.mark_modified(row)
         
-        # Recalculate closing values for this row
+        # Recalculate closing values for this row (adjusts the running totals)
         self.recalculate_row(row)
         self.calculate_summary()
     
+    def mark_modified(self, row):
+        """Set a row's Modified flag without firing itemChanged"""
+        modified_item = self.table.item(row, 22)
+        if modified_item:
+            was_blocked = self.table.blockSignals(True)
+            modified_item.setText("1")
+            self.table.blockSignals(was_blocked)
+    
     def recalculate_row(self, row):
         """Recalculate closing values for a row"""
-        self.table.blockSignals(True)
+        was_blocked = self.table.blockSignals(True)
         
         try:
             # CY Closing Gross Block = Opening + Additions - Disposals
@@ -331,7 +361,7 @@ class PPEInputForm(QWidget):
         except Exception as e:
             print(f"Error recalculating row {row}: {e}")
         finally:
-            self.table.blockSignals(False)
+            self.table.blockSignals(was_blocked)
     
     def get_numeric_value(self, row, col):
         """Get numeric value from table cell"""
@@ -345,13 +375,9 @@ class PPEInputForm(QWidget):
         return 0.0
     
     def calculate_summary(self):
-        """Calculate and display summary totals"""
-        total_net_cy = 0.0
-        total_net_py = 0.0
-        
-        for row in range(self.table.rowCount()):
-            total_net_cy += self.get_numeric_value(row, 9)
-            total_net_py += self.get_numeric_value(row, 18)
+        """Display the running summary totals"""
+        total_net_cy = self.totals[9]
+        total_net_py = self.totals[18]
         
         self.summary_label_cy.setText(f"Current Year Net Block: ₹ {total_net_cy:,.2f}")
         self.summary_label_py.setText(f"Previous Year Net Block: ₹ {total_net_py:,.2f}")
@@ -371,6 +397,41 @@ class PPEInputForm(QWidget):
                 self.table.setItem(row, 0, QTableWidgetItem(asset_class))
                 self.table.setItem(row, 22, QTableWidgetItem("1"))  # Mark as modified
     
+    def paste_clipboard(self):
+        """Paste a block copied from Excel (rows are added as needed)"""
+        if not self.current_company_id:
+            return
+        
+        rows = parse_clipboard(QApplication.clipboard().text())
+        if not rows:
+            return
+        
+        # At the current cell, or as new rows at the end when no cell is current
+        start_row = self.table.currentRow() if self.table.currentRow() >= 0 else self.table.rowCount()
+        start_col = max(self.table.currentColumn(), 0)
+        
+        # One pass with signals blocked: each row is recalculated once, the totals once at the end
+        was_blocked = self.table.blockSignals(True)
+        try:
+            while self.table.rowCount() < start_row + len(rows):
+                self.add_ppe_row()
+            
+            for offset, values in enumerate(rows):
+                row = start_row + offset
+                for col, text in enumerate(values, start_col):
+                    if col == 0:
+                        self.table.setItem(row, 0, QTableWidgetItem(text.strip()))
+                    elif col <= 20 and col not in self.CALCULATED_COLUMNS:
+                        self.set_numeric_item(row, col, parse_amount(text))
+                self.mark_modified(row)
+                self.recalculate_row(row)
+        finally:
+            self.table.blockSignals(was_blocked)
+        
+        self.totals.recount()
+        self.calculate_summary()
+        self.update_status(f"✓ Pasted {len(rows)} row(s)")
+    
     def delete_selected(self):
         """Delete selected rows"""
         selected_rows = set(item.row() for item in self.table.selectedItems())
@@ -388,29 +449,45 @@ class PPEInputForm(QWidget):
         if reply == QMessageBox.No:
             return
         
-        # Delete from database and table
+        # Saved rows are deleted from the database with the next save
         for row in sorted(selected_rows, reverse=True):
             ppe_id_item = self.table.item(row, 21)
             if ppe_id_item and ppe_id_item.text():
-                try:
-                    PPE.delete(int(ppe_id_item.text()))
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Failed to delete: {str(e)}")
+                self.deleted_ids.add(int(ppe_id_item.text()))
             
-            self.table.removeRow(row)
+            self.totals.remove_row(row)
         
         self.calculate_summary()
-        QMessageBox.information(self, "Success", f"Deleted {len(selected_rows)} asset class(es)")
+        QMessageBox.information(self, "Deleted",
+                                f"Removed {len(selected_rows)} asset class(es) - click Save All Changes to apply")
+    
+    def get_row_data(self, row):
+        """create()/update() arguments for a table row"""
+        return {
+            'asset_class': self.table.item(row, 0).text().strip(),
+            'opening_gross_block_cy': self.get_numeric_value(row, 1),
+            'additions_cy': self.get_numeric_value(row, 2),
+            'disposals_gross_cy': self.get_numeric_value(row, 3),
+            'opening_acc_depreciation_cy': self.get_numeric_value(row, 5),
+            'depreciation_for_year_cy': self.get_numeric_value(row, 6),
+            'acc_depr_on_disposals_cy': self.get_numeric_value(row, 7),
+            'opening_gross_block_py': self.get_numeric_value(row, 10),
+            'additions_py': self.get_numeric_value(row, 11),
+            'disposals_gross_py': self.get_numeric_value(row, 12),
+            'opening_acc_depreciation_py': self.get_numeric_value(row, 14),
+            'depreciation_for_year_py': self.get_numeric_value(row, 15),
+            'acc_depr_on_disposals_py': self.get_numeric_value(row, 16),
+            'depreciation_rate': self.get_numeric_value(row, 19),
+            'useful_life_years': int(self.get_numeric_value(row, 20))
+        }
     
     def save_all(self):
-        """Save all changes to database"""
+        """Save new, edited and deleted rows in one transaction"""
         if not self.current_company_id:
             QMessageBox.warning(self, "No Company", "Please select a company first")
             return
         
-        saved_count = 0
-        error_count = 0
-        
+        new_rows, new_entries, changed_rows, changed_entries = [], [], [], []
         for row in range(self.table.rowCount()):
             modified_item = self.table.item(row, 22)
             if not modified_item or modified_item.text() != "1":
@@ -420,63 +497,93 @@ class PPEInputForm(QWidget):
             if not asset_class_item or not asset_class_item.text().strip():
                 continue  # Skip empty rows
             
-            try:
-                asset_class = asset_class_item.text().strip()
-                ppe_id_item = self.table.item(row, 21)
-                ppe_id = int(ppe_id_item.text()) if ppe_id_item and ppe_id_item.text() else None
-                
-                # Get all values
-                data = {
-                    'asset_class': asset_class,
-                    'opening_gross_block_cy': self.get_numeric_value(row, 1),
-                    'additions_cy': self.get_numeric_value(row, 2),
-                    'disposals_gross_cy': self.get_numeric_value(row, 3),
-                    'opening_acc_depreciation_cy': self.get_numeric_value(row, 5),
-                    'depreciation_for_year_cy': self.get_numeric_value(row, 6),
-                    'acc_depr_on_disposals_cy': self.get_numeric_value(row, 7),
-                    'opening_gross_block_py': self.get_numeric_value(row, 10),
-                    'additions_py': self.get_numeric_value(row, 11),
-                    'disposals_gross_py': self.get_numeric_value(row, 12),
-                    'opening_acc_depreciation_py': self.get_numeric_value(row, 14),
-                    'depreciation_for_year_py': self.get_numeric_value(row, 15),
-                    'acc_depr_on_disposals_py': self.get_numeric_value(row, 16),
-                    'depreciation_rate': self.get_numeric_value(row, 19),
-                    'useful_life_years': int(self.get_numeric_value(row, 20))
-                }
-                
-                if ppe_id:
-                    # Update existing
-                    PPE.update(ppe_id, **data)
-                else:
-                    # Create new
-                    new_id = PPE.create(self.current_company_id, **data)
-                    self.table.setItem(row, 21, QTableWidgetItem(str(new_id)))
-                
-                # Mark as saved
-                self.table.setItem(row, 22, QTableWidgetItem("0"))
-                saved_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                print(f"Error saving row {row}: {e}")
-        
-        if error_count > 0:
-            QMessageBox.warning(
-                self, "Partial Save",
-                f"Saved {saved_count} entries, {error_count} errors occurred"
-            )
-        else:
-            QMessageBox.information(self, "Success", f"Saved {saved_count} PPE entries successfully!")
+            data = self.get_row_data(row)
+            ppe_id_item = self.table.item(row, 21)
+            if ppe_id_item and ppe_id_item.text():
+                data['ppe_id'] = int(ppe_id_item.text())
+                changed_rows.append(row)
+                changed_entries.append(data)
+            else:
+                new_rows.append(row)
+                new_entries.append(data)
+        
+        if not (new_entries or changed_entries or self.deleted_ids):
+            QMessageBox.information(self, "Info", "No changes to save.")
+            return
         
-        self.load_data()
+        try:
+            new_ids = PPE.save_batch(self.current_company_id, new_entries, changed_entries, self.deleted_ids)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save PPE entries (nothing was saved):\n{str(e)}")
+            return
+        
+        # Mark as saved
+        self.table.blockSignals(True)
+        for row, new_id in zip(new_rows, new_ids):
+            self.table.setItem(row, 21, QTableWidgetItem(str(new_id)))
+        for row in new_rows + changed_rows:
+            self.table.setItem(row, 22, QTableWidgetItem("0"))
+        self.table.blockSignals(False)
+        deleted_count = len(self.deleted_ids)
+        self.deleted_ids.clear()
+        
+        message = f"Saved {len(new_rows) + len(changed_rows)} PPE entries successfully!"
+        if deleted_count:
+            message += f" Deleted {deleted_count}."
+        QMessageBox.information(self, "Success", message)
     
     def import_excel(self):
-        """Import PPE data from Excel"""
-        QMessageBox.information(
-            self, "Import Excel",
-            "Excel import feature will be implemented.\n\n"
-            "Format: Asset Class, Opening GB CY, Additions CY, etc."
+        """Import an asset-level fixed asset register and roll it up into the asset class rows"""
+        if not self.current_company_id:
+            QMessageBox.warning(self, "No Company", "Please select a company first")
+            return
+        
+        if self.has_unsaved_changes():
+            QMessageBox.warning(self, "Unsaved Changes", "Please save or refresh the schedule before importing")
+            return
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Fixed Asset Register", "",
+            "Excel/CSV Files (*.xlsx *.xls *.csv);;All Files (*)"
+        )
+        
+        if not file_path:
+            return
+        
+        reply = QMessageBox.question(
+            self, "Import Fixed Asset Register",
+            "The register replaces any previously imported register.\n\n"
+            "Columns: Asset Class, Cost, Capitalization Date and optionally Asset Code, Asset Name, "
+            "Disposal Date, Depreciation Method (SLM/WDV), Useful Life Years (default: Schedule II), "
+            "Residual Value Pct (default: 5).\n\n"
+            "Depreciation is computed for the CY and PY and the totals replace the matching asset class rows. "
+            "Continue?",
+            QMessageBox.Yes | QMessageBox.No
         )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
+        try:
+            if file_path.lower().endswith('.csv'):
+                df = pd.read_csv(file_path)
+            else:
+                df = pd.read_excel(file_path)
+            df.columns = [register_column(column) for column in df.columns]
+        
+            with track_action("Import Asset Register"):
+                count = FixedAsset.bulk_import(self.current_company_id, df.to_dict('records'),
+                                               int(datetime.now().timestamp()), replace=True)
+                classes = FixedAsset.rollup_to_schedule(self.current_company_id)
+        
+            self.load_data()
+            QMessageBox.information(
+                self, "Success",
+                f"Imported {count:,} assets and updated {len(classes)} asset classes"
+            )
+        
+        except Exception as e:
+            QMessageBox.critical(self, "Import Error", f"Failed to import asset register:\n{str(e)}")
     
     def export_schedule_iii(self):
         """Export data in Schedule III format"""
@@ -0,0 +1,103 @@
+"""Ratio Analysis Dialog - Schedule III ratios with variance explanations"""
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt
+from models.ratio_analysis import VARIANCE_THRESHOLD
+
+
+class RatioAnalysisDialog(QDialog):
+    """Display ratios computed by RatioAnalyzer; rows above the variance threshold need a reason"""
+
+    COLUMNS = ["Ratio", "Formula", "Current Year", "Previous Year", "Variance %", "Reason for Variance"]
+
+    def __init__(self, ratios, company_name="", parent=None):
+        super().__init__(parent)
+        self.ratios = ratios
+        self.setWindowTitle("Ratio Analysis - Schedule III")
+        self.resize(1100, 500)
+        self.init_ui(company_name)
+        self.load_ratios()
+
+    def init_ui(self, company_name):
+        """Initialize UI"""
+        layout = QVBoxLayout()
+
+        header = QLabel(f"📈 Ratio Analysis - {company_name}")
+        header.setFont(QFont("Bookman Old Style", 14, QFont.Bold))
+        header.setStyleSheet("color: #2c3e50; padding: 10px;")
+        layout.addWidget(header)
+
+        flagged = sum(1 for ratio in self.ratios if ratio['requires_explanation'])
+        info = QLabel(
+            f"Ratios with a change of more than {VARIANCE_THRESHOLD:.0f}% compared to the previous year "
+            f"require an explanation. {flagged} ratio(s) flagged."
+        )
+        info.setWordWrap(True)
+        info.setStyleSheet("padding: 5px; background-color: #fff3e0; border-radius: 5px;")
+        layout.addWidget(info)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Stretch)
+        self.table.setColumnWidth(0, 220)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def load_ratios(self):
+        """Fill the table from the ratio rows"""
+        self.table.setRowCount(len(self.ratios))
+
+        for row, ratio in enumerate(self.ratios):
+            self.set_readonly_item(row, 0, ratio['name'])
+            self.set_readonly_item(row, 1, ratio['formula'])
+            self.set_readonly_item(row, 2, self.format_value(ratio['cy'], ratio['unit']), numeric=True)
+            self.set_readonly_item(row, 3, self.format_value(ratio['py'], ratio['unit']), numeric=True)
+            variance = "N/A" if ratio['variance_pct'] is None else f"{ratio['variance_pct']:,.2f}%"
+            self.set_readonly_item(row, 4, variance, numeric=True)
+
+            # Reason column stays editable for flagged ratios
+            reason_item = QTableWidgetItem("")
+            if ratio['requires_explanation']:
+                for col in range(5):
+                    self.table.item(row, col).setBackground(QColor("#ffebee"))
+                reason_item.setBackground(QColor("#fffde7"))
+            else:
+                reason_item.setFlags(reason_item.flags() & ~Qt.ItemIsEditable)
+            self.table.setItem(row, 5, reason_item)
+
+    def set_readonly_item(self, row, col, text, numeric=False):
+        """Set a read-only cell"""
+        item = QTableWidgetItem(text)
+        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        if numeric:
+            item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.table.setItem(row, col, item)
+
+    @staticmethod
+    def format_value(value, unit):
+        """Format a ratio value for display"""
+        if value is None:
+            return "N/A"
+        if unit == '%':
+            return f"{value:,.2f}%"
+        return f"{value:,.2f}"
+
+    def get_explanations(self):
+        """Return {ratio key: reason} for flagged ratios"""
+        explanations = {}
+        for row, ratio in enumerate(self.ratios):
+            if ratio['requires_explanation']:
+                explanations[ratio['key']] = self.table.item(row, 5).text().strip()
+        return explanations
@@ -8,6 +8,30 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                             QMessageBox, QComboBox, QAbstractItemView)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont
+from views.job_queue import get_job_manager
+
+
+def recommendations_job(context, company_id, initialize=False):
+    """
+    Job: update the system recommendations from the Trial Balance
+    
+    Args:
+        initialize: Create the default notes first (if not already done)
+    
+    Returns:
+        int: Notes recommended
+    """
+    from models.selection_sheet import SelectionSheet
+    
+    if initialize:
+        context.stage("Initializing notes")
+        SelectionSheet.initialize_default_notes(company_id)
+    
+    context.stage("Updating recommendations", unit='notes')
+    SelectionSheet.update_system_recommendations(company_id, progress=context.callback())
+    
+    all_notes = SelectionSheet.get_all_for_company(company_id)
+    return len([n for n in all_notes if n.system_recommendation == 'Yes'])
 
 
 class SelectionSheetTab(QWidget):
@@ -97,12 +121,12 @@ class SelectionSheetTab(QWidget):
         
         self.setLayout(layout)
     
-    def set_company(self, company_id: int):
-        """Set the active company"""
+    def set_company(self, company_id: int, entries=None):
+        """Set the active company (entries: already loaded selection sheet)"""
         self.company_id = company_id
-        self.load_selection_sheet()
+        self.load_selection_sheet(entries)
     
-    def load_selection_sheet(self):
+    def load_selection_sheet(self, entries=None):
         """Load selection sheet data"""
         if not self.company_id:
             self.status_label.setText("No company selected.")
@@ -111,11 +135,12 @@ class SelectionSheetTab(QWidget):
         try:
             from models.selection_sheet import SelectionSheet
             
-            # Initialize if needed
-            SelectionSheet.initialize_default_notes(self.company_id)
-            
-            # Load all entries
-            entries = SelectionSheet.get_all_for_company(self.company_id)
+            if entries is None:
+                # Initialize if needed
+                SelectionSheet.initialize_default_notes(self.company_id)
+                
+                # Load all entries
+                entries = SelectionSheet.get_all_for_company(self.company_id)
             
             # Populate table
             self.table.setRowCount(len(entries))
@@ -242,28 +267,26 @@ class SelectionSheetTab(QWidget):
             QMessageBox.warning(self, "No Company", "Please select a company first.")
             return
         
-        try:
-            from models.selection_sheet import SelectionSheet
-            
-            QMessageBox.information(
-                self,
-                "Updating...",
-                "Analyzing Trial Balance to update recommendations..."
-            )
-            
-            SelectionSheet.update_system_recommendations(self.company_id)
-            
-            # Reload table
-            self.load_selection_sheet()
-            
-            QMessageBox.information(
-                self,
-                "Success",
-                "System recommendations updated based on Trial Balance data."
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to update recommendations:\n{str(e)}")
+        # Analyze the Trial Balance in the background - progress shows in the job queue
+        self.refresh_btn.setEnabled(False)
+        job = get_job_manager().submit(
+            "Update Recommendations", recommendations_job, self.company_id,
+            on_finished=self.recommendations_updated,
+            on_failed=lambda error: QMessageBox.critical(self, "Error",
+                                                         f"Failed to update recommendations:\n{error}"))
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_: self.refresh_btn.setEnabled(True))
+    
+    def recommendations_updated(self, recommended):
+        """Reload the table once the recommendations job finished"""
+        self.load_selection_sheet()
+        
+        QMessageBox.information(
+            self,
+            "Success",
+            f"System recommendations updated based on Trial Balance data.\n\n"
+            f"{recommended} notes are recommended."
+        )
     
     def select_all_recommended(self):
         """Select all system recommended notes"""
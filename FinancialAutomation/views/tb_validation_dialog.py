@@ -0,0 +1,129 @@
+"""Trial Balance Validation Dialog - the issues found by the validation rules, sortable by any column"""
+
+import numpy as np
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableView,
+                             QHeaderView, QAbstractItemView, QCheckBox)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+from models.tb_validation import validate_trial_balance, summarize, ERROR, ISSUE_COLUMNS
+from config.instrumentation import track_action
+
+
+class IssuesTableModel(QAbstractTableModel):
+    """Issues table, one array per column; sorting reorders a row index instead of the items"""
+
+    HEADERS = ["Severity", "Rule", "Year", "Ledger", "Amount", "Detail"]
+    COLUMNS = ['severity', 'rule', 'year', 'ledger_name', 'amount', 'detail']
+    SEVERITY_COLORS = {ERROR: QColor("#d32f2f")}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = {name: np.array([], dtype=object) for name in ISSUE_COLUMNS}
+        self.order = np.arange(0)
+
+    def set_issues(self, issues):
+        """Show an issues table (tb_validation), in its own order"""
+        self.beginResetModel()
+        self.columns = {name: issues[name].to_numpy() for name in ISSUE_COLUMNS}
+        self.order = np.arange(len(issues))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        row, name = self.order[index.row()], self.COLUMNS[index.column()]
+        if role == Qt.DisplayRole:
+            value = self.columns[name][row]
+            if name == 'amount':
+                return f"₹ {value:,.2f}" if value else ""
+            return str(value)
+        if role == Qt.ForegroundRole and name == 'severity':
+            return self.SEVERITY_COLORS.get(self.columns['severity'][row])
+        if role == Qt.TextAlignmentRole and name == 'amount':
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """One stable argsort of the column (amounts by size)"""
+        values = self.columns[self.COLUMNS[column]]
+        keys = np.abs(values.astype(float)) if self.COLUMNS[column] == 'amount' else values.astype(str)
+        self.layoutAboutToBeChanged.emit()
+        self.order = np.argsort(keys, kind='stable')
+        if order == Qt.DescendingOrder:
+            self.order = self.order[::-1]
+        self.layoutChanged.emit()
+
+
+class TrialBalanceValidationDialog(QDialog):
+    """Run the validation rules over a company's trial balance and list the issues"""
+
+    def __init__(self, company_id, issues=None, parent=None):
+        super().__init__(parent)
+        self.company_id = company_id
+        self.setWindowTitle("Trial Balance Validation")
+        self.resize(950, 550)
+        self.init_ui()
+        if issues is None:
+            self.run_validation()
+        else:
+            self.show_issues(issues)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.model = IssuesTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.adjusted_check = QCheckBox("After applied adjustments")
+        self.adjusted_check.setToolTip("Validate the trial balance the statements are generated from")
+        self.adjusted_check.toggled.connect(self.run_validation)
+        buttons.addWidget(self.adjusted_check)
+        buttons.addStretch()
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def run_validation(self):
+        """Validate again (with or without the applied adjustments)"""
+        with track_action("Validate Trial Balance"):
+            issues = validate_trial_balance(self.company_id, adjusted=self.adjusted_check.isChecked())
+        self.show_issues(issues)
+
+    def show_issues(self, issues):
+        self.model.set_issues(issues)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        counts = summarize(issues)
+        if not counts:
+            self.summary_label.setText("✓ No issues found - the trial balance is ready for financial statement "
+                                       "generation.")
+            return
+        errors = sum(count for (severity, _), count in counts.items() if severity == ERROR)
+        lines = [f"{'✗' if severity == ERROR else '⚠'} {rule}: {count:,}" for (severity, rule), count in counts.items()]
+        self.summary_label.setText(f"{errors:,} errors, {len(issues) - errors:,} warnings\n" + '\n'.join(lines))
@@ -3,25 +3,177 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QTreeWidget, QTreeWidgetItem, QSplitter,
                              QMessageBox, QComboBox, QLineEdit, QGroupBox,
-                             QCheckBox, QProgressDialog, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QAbstractItemView)
-from PyQt5.QtCore import Qt, pyqtSignal
+                             QCheckBox, QProgressDialog, QTableView,
+                             QHeaderView, QAbstractItemView, QApplication)
+from PyQt5.QtCore import (Qt, pyqtSignal, QAbstractTableModel, QSortFilterProxyModel,
+                          QModelIndex, QTimer)
 from PyQt5.QtGui import QFont, QColor
 from models.master_data import MajorHead, MinorHead, Grouping
+from models.trial_balance import TrialBalance
+from models.batch_loader import BatchLoader
+from models.ledger_index import LedgerIndex, normalize
 from config.database import get_connection
 
+
+class LedgerTableModel(QAbstractTableModel):
+    """Ledgers of the mapping dialog, one Python list per column (no item per cell)"""
+    
+    HEADERS = ["Select", "Ledger Name", "BS/PL", "Closing Bal (CY)", "Current Mapping"]
+    
+    # Emitted when ledgers are checked or unchecked
+    checked_changed = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._reset_columns()
+    
+    def _reset_columns(self):
+        self.tb_ids = []
+        self.names = []
+        self.types = []
+        self.closings = []
+        self.mappings = []
+        self.mapped = []
+        self.checked = []
+        self.checked_count = 0
+        self._index = None
+    
+    def clear(self):
+        """Remove all ledgers"""
+        self.beginResetModel()
+        self._reset_columns()
+        self.endResetModel()
+    
+    def append_rows(self, rows):
+        """Append (tb_id, name, type_bs_pl, closing_cy, mapping_text, is_mapped) rows"""
+        if not rows:
+            return
+        first = len(self.tb_ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for tb_id, name, type_bs_pl, closing_cy, mapping_text, is_mapped in rows:
+            self.tb_ids.append(tb_id)
+            self.names.append(name or "")
+            self.types.append(type_bs_pl)
+            self.closings.append(float(closing_cy or 0))
+            self.mappings.append(mapping_text)
+            self.mapped.append(bool(is_mapped))
+            self.checked.append(False)
+        self.endInsertRows()
+    
+    def search_index(self):
+        """LedgerIndex over the loaded rows, rebuilt only when rows were added since"""
+        if self._index is None or self._index.size != len(self.names):
+            self._index = LedgerIndex(self.names, self.closings)
+        return self._index
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tb_ids)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if col == 1:
+                return self.names[row]
+            if col == 2:
+                return self.types[row]
+            if col == 3:
+                return f"₹ {self.closings[row]:,.2f}"
+            if col == 4:
+                return self.mappings[row]
+        elif role == Qt.CheckStateRole and col == 0:
+            return Qt.Checked if self.checked[row] else Qt.Unchecked
+        elif role == Qt.BackgroundRole and col == 1 and self.mapped[row]:
+            return QColor("#c8e6c9")  # Light green for mapped
+        elif role == Qt.ForegroundRole and col == 4:
+            return QColor("#2e7d32") if self.mapped[row] else QColor("#d32f2f")  # Dark green / red
+        elif role == Qt.TextAlignmentRole and col == 3:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+    
+    def flags(self, index):
+        if index.column() == 0:
+            return Qt.ItemIsUserCheckable | Qt.ItemIsEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        self.set_checked([index.row()], value == Qt.Checked)
+        return True
+    
+    def set_checked(self, rows, checked=True):
+        """Check or uncheck many rows with one dataChanged"""
+        for row in rows:
+            if self.checked[row] != checked:
+                self.checked[row] = checked
+                self.checked_count += 1 if checked else -1
+        if self.tb_ids:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.tb_ids) - 1, 0),
+                                  [Qt.CheckStateRole])
+        self.checked_changed.emit()
+    
+    def checked_ids(self):
+        """tb_ids of the checked ledgers"""
+        return [tb_id for tb_id, checked in zip(self.tb_ids, self.checked) if checked]
+
+
+class LedgerFilterProxyModel(QSortFilterProxyModel):
+    """Shows the source rows set in a boolean mask (None shows every row)"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mask = None
+    
+    def set_mask(self, mask):
+        """
+        Replace the filter mask
+        
+        A reset rebuilds the proxy mapping in one pass; invalidateFilter() would
+        emit a rowsRemoved/rowsInserted pair per hidden range, which is far slower
+        on large tables.
+        """
+        self.beginResetModel()
+        self.mask = mask
+        self.endResetModel()
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.mask is None:
+            return True
+        # Rows streamed in after the mask was built stay hidden until it is rebuilt
+        return source_row < len(self.mask) and bool(self.mask[source_row])
+    
+    def source_rows(self):
+        """Source rows currently shown"""
+        if self.mask is None:
+            return range(self.sourceModel().rowCount())
+        return self.mask.nonzero()[0].tolist()
+
+
 class TrialBalanceMappingDialog(QDialog):
     """Dialog for mapping Trial Balance ledgers to Master Data hierarchy"""
     
     # Signal emitted when mapping is saved
     mapping_saved = pyqtSignal()
     
+    # Filters run this long after the last keystroke
+    FILTER_DEBOUNCE_MS = 200
+    
     def __init__(self, company_id, parent=None):
         super().__init__(parent)
         self.company_id = company_id
         self.unmapped_ledgers = []
         self.master_data_tree = {}  # Cache for master data hierarchy
         self.selected_ledger_ids = []
+        self.ledger_load_id = 0  # Bumped on every load so a superseded streaming load stops
+        self.master_index = []  # (tree item, normalized name, parent position) in tree order
         self.init_ui()
         self.load_data()
     
@@ -96,8 +248,19 @@ class TrialBalanceMappingDialog(QDialog):
         filter_layout.addWidget(filter_label)
         
         self.filter_input = QLineEdit()
-        self.filter_input.setPlaceholderText("Search ledger names...")
-        self.filter_input.textChanged.connect(self.filter_ledgers)
+        self.filter_input.setPlaceholderText("Search ledgers: name, ^prefix, >100000, 1000..5000")
+        self.filter_input.setToolTip(
+            "cash - name contains \"cash\"\n"
+            "^sundry - name starts with \"sundry\"\n"
+            ">100000, <=500 - closing balance (either sign)\n"
+            "1000..5000 - closing balance between\n"
+            "Terms combine: ^sundry >50000"
+        )
+        self.ledger_filter_timer = QTimer(self)
+        self.ledger_filter_timer.setSingleShot(True)
+        self.ledger_filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.ledger_filter_timer.timeout.connect(lambda: self.filter_ledgers(self.filter_input.text()))
+        self.filter_input.textChanged.connect(self.ledger_filter_timer.start)
         filter_layout.addWidget(self.filter_input)
         
         self.show_all_check = QCheckBox("Show All (including mapped)")
@@ -106,22 +269,23 @@ class TrialBalanceMappingDialog(QDialog):
         
         layout.addLayout(filter_layout)
         
-        # Ledgers table
-        self.ledgers_table = QTableWidget()
-        self.ledgers_table.setColumnCount(6)
-        self.ledgers_table.setHorizontalHeaderLabels([
-            "Select", "Ledger Name", "BS/PL", "Closing Bal (CY)", "Current Mapping", "TB ID"
-        ])
+        # Ledgers table - model/view so 100k ledgers filter without touching each row
+        self.ledger_model = LedgerTableModel(self)
+        self.ledger_model.checked_changed.connect(self.on_ledger_selection_changed)
+        self.ledger_proxy = LedgerFilterProxyModel(self)
+        self.ledger_proxy.setSourceModel(self.ledger_model)
+        
+        self.ledgers_table = QTableView()
+        self.ledgers_table.setModel(self.ledger_proxy)
         self.ledgers_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.ledgers_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.ledgers_table.verticalHeader().setVisible(False)
+        self.ledgers_table.verticalHeader().setDefaultSectionSize(24)  # Uniform rows, no per-row sizing
         self.ledgers_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.ledgers_table.setColumnWidth(0, 60)
         self.ledgers_table.setColumnWidth(2, 60)
         self.ledgers_table.setColumnWidth(3, 120)
         self.ledgers_table.setColumnWidth(4, 200)
-        self.ledgers_table.setColumnHidden(5, True)  # Hide TB ID column
-        self.ledgers_table.itemSelectionChanged.connect(self.on_ledger_selection_changed)
         layout.addWidget(self.ledgers_table)
         
         # Quick select buttons
@@ -155,7 +319,12 @@ class TrialBalanceMappingDialog(QDialog):
         
         self.master_search_input = QLineEdit()
         self.master_search_input.setPlaceholderText("Search major/minor/grouping...")
-        self.master_search_input.textChanged.connect(self.filter_master_data)
+        self.master_filter_timer = QTimer(self)
+        self.master_filter_timer.setSingleShot(True)
+        self.master_filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.master_filter_timer.timeout.connect(
+            lambda: self.filter_master_data(self.master_search_input.text()))
+        self.master_search_input.textChanged.connect(self.master_filter_timer.start)
         search_layout.addWidget(self.master_search_input)
         
         layout.addLayout(search_layout)
@@ -204,78 +373,47 @@ class TrialBalanceMappingDialog(QDialog):
     
     def load_ledgers(self):
         """Load trial balance ledgers"""
-        self.ledgers_table.setRowCount(0)
+        self.ledger_model.clear()
+        self.ledger_proxy.set_mask(None)
         
         if not self.company_id:
             self.update_status("⚠️ No company selected", error=True)
             return
         
-        conn = get_connection()
-        cursor = conn.cursor()
+        self.ledger_load_id += 1
+        load_id = self.ledger_load_id
+        total = 0
+        mapped_count = 0
+        loader = BatchLoader()  # Mapping names: one query per level per chunk, memoized across chunks
         
         try:
-            # Load ledgers (unmapped or all based on checkbox)
-            if self.show_all_check.isChecked():
-                cursor.execute('''
-                    SELECT tb_id, ledger_name, type_bs_pl, closing_balance_cy,
-                           major_head_id, minor_head_id, grouping_id, is_mapped
-                    FROM trial_balance
-                    WHERE company_id = ?
-                    ORDER BY ledger_name
-                ''', (self.company_id,))
-            else:
-                cursor.execute('''
-                    SELECT tb_id, ledger_name, type_bs_pl, closing_balance_cy,
-                           major_head_id, minor_head_id, grouping_id, is_mapped
-                    FROM trial_balance
-                    WHERE company_id = ? AND is_mapped = 0
-                    ORDER BY ledger_name
-                ''', (self.company_id,))
-            
-            ledgers = cursor.fetchall()
+            # Stream ledgers (unmapped or all based on checkbox) so the first rows show immediately
+            chunks = TrialBalance.iter_rows(
+                self.company_id, unmapped_only=not self.show_all_check.isChecked(),
+                columns=['tb_id', 'ledger_name', 'type_bs_pl', 'closing_balance_cy',
+                         'major_head_id', 'minor_head_id', 'grouping_id', 'is_mapped'])
             
-            for ledger in ledgers:
-                tb_id, name, type_bs_pl, closing_cy, major_id, minor_id, grouping_id, is_mapped = ledger
-                
-                row = self.ledgers_table.rowCount()
-                self.ledgers_table.insertRow(row)
-                
-                # Checkbox
-                check_item = QTableWidgetItem()
-                check_item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-                check_item.setCheckState(Qt.Unchecked)
-                self.ledgers_table.setItem(row, 0, check_item)
-                
-                # Ledger name
-                name_item = QTableWidgetItem(name)
-                if is_mapped:
-                    name_item.setBackground(QColor("#c8e6c9"))  # Light green for mapped
-                self.ledgers_table.setItem(row, 1, name_item)
-                
-                # BS/PL
-                type_item = QTableWidgetItem(type_bs_pl)
-                self.ledgers_table.setItem(row, 2, type_item)
+            for ledgers in chunks:
+                if load_id != self.ledger_load_id:
+                    chunks.close()  # A newer load started while events were processed
+                    return
                 
-                # Closing balance
-                balance_item = QTableWidgetItem(f"₹ {closing_cy:,.2f}")
-                balance_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.ledgers_table.setItem(row, 3, balance_item)
+                loader.prime(MajorHead, (ledger[4] for ledger in ledgers))
+                loader.prime(MinorHead, (ledger[5] for ledger in ledgers))
+                loader.prime(Grouping, (ledger[6] for ledger in ledgers))
                 
-                # Current mapping
-                mapping_text = self.get_mapping_text(major_id, minor_id, grouping_id)
-                mapping_item = QTableWidgetItem(mapping_text)
-                if is_mapped:
-                    mapping_item.setForeground(QColor("#2e7d32"))  # Dark green
-                else:
-                    mapping_item.setForeground(QColor("#d32f2f"))  # Red
-                self.ledgers_table.setItem(row, 4, mapping_item)
+                rows = []
+                for tb_id, name, type_bs_pl, closing_cy, major_id, minor_id, grouping_id, is_mapped in ledgers:
+                    mapping_text = self.get_mapping_text(major_id, minor_id, grouping_id, loader)
+                    rows.append((tb_id, name, type_bs_pl, closing_cy, mapping_text, is_mapped == 1))
+                    if is_mapped == 1:
+                        mapped_count += 1
+                self.ledger_model.append_rows(rows)
                 
-                # TB ID (hidden)
-                id_item = QTableWidgetItem(str(tb_id))
-                self.ledgers_table.setItem(row, 5, id_item)
+                total += len(ledgers)
+                self.update_status(f"⏳ Loading ledgers... {total:,}")
+                QApplication.processEvents()
             
-            total = len(ledgers)
-            mapped_count = sum(1 for l in ledgers if l[7] == 1)
             unmapped_count = total - mapped_count
             
             self.update_status(
@@ -284,30 +422,33 @@ class TrialBalanceMappingDialog(QDialog):
                 f"⚠️ {unmapped_count} unmapped"
             )
             
+            # Re-apply a filter typed while the ledgers were streaming in
+            if self.filter_input.text().strip():
+                self.filter_ledgers(self.filter_input.text())
+            
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load ledgers:\n{str(e)}")
-        finally:
-            conn.close()
     
-    def get_mapping_text(self, major_id, minor_id, grouping_id):
-        """Get readable mapping text"""
+    def get_mapping_text(self, major_id, minor_id, grouping_id, loader=None):
+        """Get readable mapping text (pass the operation's BatchLoader when called in a loop)"""
         if not major_id:
             return "❌ Not mapped"
         
+        loader = loader or BatchLoader()
         parts = []
         
         if major_id:
-            major = MajorHead.get_by_id(major_id)
+            major = loader.load(MajorHead, major_id)
             if major:
                 parts.append(major[1])  # major_head_name
         
         if minor_id:
-            minor = MinorHead.get_by_id(minor_id)
+            minor = loader.load(MinorHead, minor_id)
             if minor:
                 parts.append(minor[2])  # minor_head_name
         
         if grouping_id:
-            grouping = Grouping.get_by_id(grouping_id)
+            grouping = loader.load(Grouping, grouping_id)
             if grouping:
                 parts.append(grouping[2])  # grouping_name
         
@@ -316,6 +457,7 @@ class TrialBalanceMappingDialog(QDialog):
     def load_master_data(self):
         """Load master data hierarchy into tree"""
         self.master_tree.clear()
+        self.master_index = []
         
         if not self.company_id:
             return
@@ -337,6 +479,7 @@ class TrialBalanceMappingDialog(QDialog):
                     "minor_id": None,
                     "grouping_id": None
                 })
+                major_pos = self.add_to_master_index(major_item, None)
                 
                 # Load minor heads
                 minors = MinorHead.get_all(company_id=self.company_id, major_head_id=major.major_head_id)
@@ -355,6 +498,7 @@ class TrialBalanceMappingDialog(QDialog):
                         "minor_id": minor_id,
                         "grouping_id": None
                     })
+                    minor_pos = self.add_to_master_index(minor_item, major_pos)
                     
                     # Load groupings
                     groupings = Grouping.get_all(company_id=self.company_id, minor_head_id=minor_id)
@@ -372,12 +516,18 @@ class TrialBalanceMappingDialog(QDialog):
                             "minor_id": minor_id,
                             "grouping_id": grouping_id
                         })
+                        self.add_to_master_index(grouping_item, minor_pos)
             
             self.master_tree.expandAll()
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load master data:\n{str(e)}")
     
+    def add_to_master_index(self, item, parent_pos):
+        """Record a tree item for filtering, returns its position"""
+        self.master_index.append((item, normalize(item.text(0)), parent_pos))
+        return len(self.master_index) - 1
+    
     def on_master_item_clicked(self, item, column):
         """Handle master data item click"""
         data = item.data(0, Qt.UserRole)
@@ -416,12 +566,7 @@ class TrialBalanceMappingDialog(QDialog):
             return
         
         # Get checked ledgers
-        checked_tb_ids = []
-        for row in range(self.ledgers_table.rowCount()):
-            check_item = self.ledgers_table.item(row, 0)
-            if check_item and check_item.checkState() == Qt.Checked:
-                tb_id = int(self.ledgers_table.item(row, 5).text())
-                checked_tb_ids.append(tb_id)
+        checked_tb_ids = self.ledger_model.checked_ids()
         
         if not checked_tb_ids:
             QMessageBox.warning(self, "Warning", "Please select at least one ledger to map!")
@@ -445,14 +590,14 @@ class TrialBalanceMappingDialog(QDialog):
             for tb_id in checked_tb_ids:
                 cursor.execute('''
                     UPDATE trial_balance
-                    SET major_head_id = ?,
-                        minor_head_id = ?,
-                        grouping_id = ?,
+                    SET major_head_id = %s,
+                        minor_head_id = %s,
+                        grouping_id = %s,
                         is_mapped = 1,
                         updated_at = CURRENT_TIMESTAMP
-                    WHERE tb_id = ?
+                    WHERE tb_id = %s AND company_id = %s
                 ''', (mapping_data["major_id"], mapping_data["minor_id"], 
-                      mapping_data["grouping_id"], tb_id))
+                      mapping_data["grouping_id"], tb_id, self.company_id))
             
             conn.commit()
             QMessageBox.information(
@@ -472,12 +617,7 @@ class TrialBalanceMappingDialog(QDialog):
     def clear_selected_mappings(self):
         """Clear mappings for selected ledgers"""
         # Get checked ledgers
-        checked_tb_ids = []
-        for row in range(self.ledgers_table.rowCount()):
-            check_item = self.ledgers_table.item(row, 0)
-            if check_item and check_item.checkState() == Qt.Checked:
-                tb_id = int(self.ledgers_table.item(row, 5).text())
-                checked_tb_ids.append(tb_id)
+        checked_tb_ids = self.ledger_model.checked_ids()
         
         if not checked_tb_ids:
             QMessageBox.warning(self, "Warning", "Please select at least one ledger!")
@@ -504,8 +644,8 @@ class TrialBalanceMappingDialog(QDialog):
                         grouping_id = NULL,
                         is_mapped = 0,
                         updated_at = CURRENT_TIMESTAMP
-                    WHERE tb_id = ?
-                ''', (tb_id,))
+                    WHERE tb_id = %s AND company_id = %s
+                ''', (tb_id, self.company_id))
             
             conn.commit()
             QMessageBox.information(self, "Success", f"Cleared {len(checked_tb_ids)} mapping(s)!")
@@ -539,7 +679,7 @@ class TrialBalanceMappingDialog(QDialog):
                     grouping_id = NULL,
                     is_mapped = 0,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE company_id = ?
+                WHERE company_id = %s
             ''', (self.company_id,))
             
             conn.commit()
@@ -559,66 +699,51 @@ class TrialBalanceMappingDialog(QDialog):
         self.accept()
     
     def filter_ledgers(self, text):
-        """Filter ledgers table by search text"""
-        for row in range(self.ledgers_table.rowCount()):
-            name_item = self.ledgers_table.item(row, 1)
-            if name_item:
-                should_show = text.lower() in name_item.text().lower()
-                self.ledgers_table.setRowHidden(row, not should_show)
+        """Filter ledgers by name (substring or ^prefix) and closing balance range"""
+        mask = self.ledger_model.search_index().search(text)
+        self.ledger_proxy.set_mask(mask)
+        if mask is not None:
+            self.update_status(
+                f"🔍 {int(mask.sum()):,} of {self.ledger_model.rowCount():,} ledgers match \"{text.strip()}\""
+            )
     
     def filter_master_data(self, text):
-        """Filter master data tree by search text"""
-        def filter_item(item, text):
-            item_text = item.text(0).lower()
-            matches = text.lower() in item_text
-            
-            # Check children
-            has_matching_child = False
-            for i in range(item.childCount()):
-                child_matches = filter_item(item.child(i), text)
-                has_matching_child = has_matching_child or child_matches
-            
-            # Show item if it matches or has matching children
-            should_show = matches or has_matching_child or not text
-            item.setHidden(not should_show)
-            
-            return should_show
-        
-        # Filter all top-level items
-        for i in range(self.master_tree.topLevelItemCount()):
-            filter_item(self.master_tree.topLevelItem(i), text)
+        """Filter master data tree by search text (matches keep their parents visible)"""
+        text = normalize(text)
+        visible = [not text] * len(self.master_index)
+        if text:
+            for pos, (item, name, parent_pos) in enumerate(self.master_index):
+                if text in name:
+                    visible[pos] = True
+                    # Parents come before their children, stop at the first one already shown
+                    while parent_pos is not None and not visible[parent_pos]:
+                        visible[parent_pos] = True
+                        parent_pos = self.master_index[parent_pos][2]
+        
+        self.master_tree.setUpdatesEnabled(False)
+        try:
+            for (item, _, _), show in zip(self.master_index, visible):
+                item.setHidden(not show)
+        finally:
+            self.master_tree.setUpdatesEnabled(True)
     
     def select_all_ledgers(self):
         """Select all visible ledgers"""
-        for row in range(self.ledgers_table.rowCount()):
-            if not self.ledgers_table.isRowHidden(row):
-                check_item = self.ledgers_table.item(row, 0)
-                if check_item:
-                    check_item.setCheckState(Qt.Checked)
+        self.ledger_model.set_checked(self.ledger_proxy.source_rows(), True)
     
     def select_none_ledgers(self):
         """Deselect all ledgers"""
-        for row in range(self.ledgers_table.rowCount()):
-            check_item = self.ledgers_table.item(row, 0)
-            if check_item:
-                check_item.setCheckState(Qt.Unchecked)
+        self.ledger_model.set_checked(range(self.ledger_model.rowCount()), False)
     
     def select_unmapped_ledgers(self):
         """Select only unmapped ledgers"""
-        for row in range(self.ledgers_table.rowCount()):
-            mapping_item = self.ledgers_table.item(row, 4)
-            check_item = self.ledgers_table.item(row, 0)
-            if check_item and mapping_item:
-                is_unmapped = "Not mapped" in mapping_item.text()
-                check_item.setCheckState(Qt.Checked if is_unmapped else Qt.Unchecked)
+        model = self.ledger_model
+        model.set_checked([row for row, mapped in enumerate(model.mapped) if mapped], False)
+        model.set_checked([row for row, mapped in enumerate(model.mapped) if not mapped], True)
     
     def on_ledger_selection_changed(self):
         """Handle ledger selection change"""
-        selected_count = sum(
-            1 for row in range(self.ledgers_table.rowCount())
-            if self.ledgers_table.item(row, 0) and 
-            self.ledgers_table.item(row, 0).checkState() == Qt.Checked
-        )
+        selected_count = self.ledger_model.checked_count
         if selected_count > 0:
             self.update_status(f"📌 {selected_count} ledger(s) selected for mapping")
     
@@ -6,98 +6,151 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QTableWidget, QTableWidgetItem, QLabel, QFileDialog,
                              QMessageBox, QGroupBox, QFormLayout, QComboBox,
                              QProgressBar, QSpinBox, QCheckBox, QTextEdit,
-                             QSplitter, QHeaderView, QAbstractItemView)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                             QSplitter, QHeaderView, QAbstractItemView, QDialog)
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor
 from models.trial_balance import TrialBalance
+from models.gl_journal import GLJournal
+from models.tb_import import import_tb_files, detect_mapping
+from models.tb_validation import validate_trial_balance
 from models.company_info import CompanyInfo
+from models.company_data import TB_TABLE_COLUMNS
 from models.master_data import MajorHead, MinorHead, Grouping
+from views.tb_validation_dialog import TrialBalanceValidationDialog
+from views.job_queue import Job, get_job_manager
+from config.instrumentation import track_action
 import pandas as pd
 import os
 from datetime import datetime
 
 
-class ImportWorker(QThread):
-    """Worker thread for importing trial balance data"""
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(bool, str, list)
+def tb_import_job(context, file_path, column_mapping, company_id, import_batch_id):
+    """Job: import one trial balance file with the column mapping chosen in the tab"""
+    context.stage("Reading file")
+    # Read file based on extension
+    if file_path.endswith('.csv'):
+        df = pd.read_csv(file_path)
+    elif file_path.endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(file_path)
+    else:
+        raise ValueError("Unsupported file format. Use CSV or Excel.")
     
-    def __init__(self, file_path, column_mapping, company_id, import_batch_id):
-        super().__init__()
-        self.file_path = file_path
-        self.column_mapping = column_mapping
-        self.company_id = company_id
-        self.import_batch_id = import_batch_id
+    # Validate required columns
+    required = ['ledger_name']
+    for req in required:
+        if req not in column_mapping or not column_mapping[req]:
+            raise ValueError(f"Required column '{req}' not mapped!")
+    
+    # Process entries
+    entries = []
+    context.stage("Processing rows", len(df))
     
-    def run(self):
+    for index, row in df.iterrows():
         try:
-            # Read file based on extension
-            if self.file_path.endswith('.csv'):
-                df = pd.read_csv(self.file_path)
-            elif self.file_path.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(self.file_path)
-            else:
-                self.finished.emit(False, "Unsupported file format. Use CSV or Excel.", [])
-                return
-            
-            # Validate required columns
-            required = ['ledger_name']
-            for req in required:
-                if req not in self.column_mapping or not self.column_mapping[req]:
-                    self.finished.emit(False, f"Required column '{req}' not mapped!", [])
-                    return
+            entry = {
+                'ledger_name': str(row[column_mapping['ledger_name']]).strip(),
+                'opening_balance_cy': float(row[column_mapping.get('opening_balance_cy', 0)]) if column_mapping.get('opening_balance_cy') else 0,
+                'debit_cy': float(row[column_mapping.get('debit_cy', 0)]) if column_mapping.get('debit_cy') else 0,
+                'credit_cy': float(row[column_mapping.get('credit_cy', 0)]) if column_mapping.get('credit_cy') else 0,
+                'closing_balance_cy': float(row[column_mapping.get('closing_balance_cy', 0)]) if column_mapping.get('closing_balance_cy') else 0,
+                'opening_balance_py': float(row[column_mapping.get('opening_balance_py', 0)]) if column_mapping.get('opening_balance_py') else 0,
+                'debit_py': float(row[column_mapping.get('debit_py', 0)]) if column_mapping.get('debit_py') else 0,
+                'credit_py': float(row[column_mapping.get('credit_py', 0)]) if column_mapping.get('credit_py') else 0,
+                'closing_balance_py': float(row[column_mapping.get('closing_balance_py', 0)]) if column_mapping.get('closing_balance_py') else 0,
+                'type_bs_pl': 'BS',
+                'is_mapped': 0
+            }
             
-            # Process entries
-            entries = []
-            total_rows = len(df)
-            
-            for index, row in df.iterrows():
-                try:
-                    entry = {
-                        'ledger_name': str(row[self.column_mapping['ledger_name']]).strip(),
-                        'opening_balance_cy': float(row[self.column_mapping.get('opening_balance_cy', 0)]) if self.column_mapping.get('opening_balance_cy') else 0,
-                        'debit_cy': float(row[self.column_mapping.get('debit_cy', 0)]) if self.column_mapping.get('debit_cy') else 0,
-                        'credit_cy': float(row[self.column_mapping.get('credit_cy', 0)]) if self.column_mapping.get('credit_cy') else 0,
-                        'closing_balance_cy': float(row[self.column_mapping.get('closing_balance_cy', 0)]) if self.column_mapping.get('closing_balance_cy') else 0,
-                        'opening_balance_py': float(row[self.column_mapping.get('opening_balance_py', 0)]) if self.column_mapping.get('opening_balance_py') else 0,
-                        'debit_py': float(row[self.column_mapping.get('debit_py', 0)]) if self.column_mapping.get('debit_py') else 0,
-                        'credit_py': float(row[self.column_mapping.get('credit_py', 0)]) if self.column_mapping.get('credit_py') else 0,
-                        'closing_balance_py': float(row[self.column_mapping.get('closing_balance_py', 0)]) if self.column_mapping.get('closing_balance_py') else 0,
-                        'type_bs_pl': 'BS',
-                        'is_mapped': 0
-                    }
-                    
-                    # Skip if ledger name is empty
-                    if entry['ledger_name'] and entry['ledger_name'] != 'nan':
-                        entries.append(entry)
-                    
-                    # Update progress
-                    progress_pct = int(((index + 1) / total_rows) * 100)
-                    self.progress.emit(progress_pct)
-                
-                except Exception as e:
-                    print(f"Error processing row {index}: {str(e)}")
-                    continue
-            
-            # Bulk import
-            if entries:
-                TrialBalance.bulk_import(self.company_id, entries, self.import_batch_id)
-                self.finished.emit(True, f"Successfully imported {len(entries)} entries", entries)
-            else:
-                self.finished.emit(False, "No valid entries found in file", [])
+            # Skip if ledger name is empty
+            if entry['ledger_name'] and entry['ledger_name'] != 'nan':
+                entries.append(entry)
         
         except Exception as e:
-            self.finished.emit(False, f"Import failed: {str(e)}", [])
+            print(f"Error processing row {index}: {str(e)}")
+        
+        # Update progress (stops here if the job was cancelled)
+        context.advance()
+    
+    # Bulk import
+    if not entries:
+        raise ValueError("No valid entries found in file")
+    context.stage("Saving ledgers", len(entries), 'ledgers')
+    TrialBalance.bulk_import(company_id, entries, import_batch_id)
+    context.update(len(entries))
+    return f"Successfully imported {len(entries)} entries"
+
+
+def journal_import_job(context, file_path, company_id, import_batch_id, keep_lines):
+    """Job: build a trial balance batch from a GL journal file"""
+    context.stage("Reading journal lines", unit='lines')
+    result = GLJournal.import_file(company_id, file_path, import_batch_id,
+                                   keep_lines=keep_lines, progress=context.callback())
+    message = f"Built {result['ledgers']:,} ledgers from {result['lines']:,} journal lines"
+    if result['skipped']:
+        message += f"\n{result['skipped']:,} lines without a ledger name or valid date were skipped"
+    if result['after_year_end']:
+        message += f"\n{result['after_year_end']:,} lines dated after the financial year were ignored"
+    return message
+
+
+def branch_import_job(context, file_paths, column_mapping, company_id, import_batch_id, merge):
+    """Job: import one trial balance file per branch as one batch"""
+    context.stage("Reading branch files", len(file_paths), 'files')
+    result = import_tb_files(company_id, file_paths, import_batch_id,
+                             mapping=column_mapping, merge=merge, progress=context.callback())
+    message = (f"Imported {result['ledgers']:,} ledgers from {result['rows']:,} rows "
+               f"in {result['files']} branch files")
+    if merge:
+        message += "\nLedgers with the same name were merged across branches"
+    if len(result['layouts']) > 1:
+        message += f"\n{len(result['layouts'])} different column layouts were detected"
+    return message
+
+
+class JournalLinesDialog(QDialog):
+    """Journal lines behind one trial balance ledger"""
+    
+    def __init__(self, title, lines, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(900, 500)
+        
+        layout = QVBoxLayout()
+        table = QTableWidget(len(lines), 6)
+        table.setHorizontalHeaderLabels(["Date", "Voucher", "Narration", "Debit", "Credit", "Line"])
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setAlternatingRowColors(True)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        
+        for row, (line_no, posting_date, voucher_no, narration, debit, credit) in enumerate(lines):
+            table.setItem(row, 0, QTableWidgetItem(str(posting_date)))
+            table.setItem(row, 1, QTableWidgetItem(voucher_no or ""))
+            table.setItem(row, 2, QTableWidgetItem(narration or ""))
+            for col, amount in ((3, debit), (4, credit)):
+                item = QTableWidgetItem(f"₹{amount:,.2f}" if amount else "")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, col, item)
+            table.setItem(row, 5, QTableWidgetItem(str(line_no)))
+        layout.addWidget(table)
+        
+        total_debit = sum(line[4] for line in lines)
+        total_credit = sum(line[5] for line in lines)
+        layout.addWidget(QLabel(f"{len(lines):,} lines | Debit ₹{total_debit:,.2f} | Credit ₹{total_credit:,.2f}"))
+        self.setLayout(layout)
 
 
 class TrialBalanceTab(QWidget):
     """Trial Balance Import and Mapping Tab with comparative year support"""
     
+    JOURNAL_DRILLDOWN_LIMIT = 10000  # Lines shown when drilling into a ledger
+    
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
         self.current_file_path = None
         self.column_mapping = {}
+        self.tb_ids = []  # tb_id of each data table row (for journal drill-down)
         self.import_batch_id = int(datetime.now().timestamp())
         self.init_ui()
     
@@ -185,6 +238,37 @@ class TrialBalanceTab(QWidget):
         
         layout.addLayout(file_layout)
         
+        # GL journal import - builds the TB from journal lines
+        journal_layout = QHBoxLayout()
+        self.journal_btn = QPushButton("📒 Build TB from GL Journal...")
+        self.journal_btn.setToolTip(
+            "Import general ledger journal lines (CSV, Parquet or Excel with ledger, date and "
+            "debit/credit or amount columns) and sum them into opening, debit, credit and "
+            "closing balances for the current and previous year"
+        )
+        self.journal_btn.clicked.connect(self.import_journal)
+        journal_layout.addWidget(self.journal_btn)
+        
+        self.keep_lines_check = QCheckBox("Keep journal lines for drill-down")
+        self.keep_lines_check.setChecked(True)
+        journal_layout.addWidget(self.keep_lines_check)
+        layout.addLayout(journal_layout)
+        
+        # One TB file per branch - read in parallel, loaded as one batch
+        branch_layout = QHBoxLayout()
+        self.branch_btn = QPushButton("🏢 Import Branch TB Files...")
+        self.branch_btn.setToolTip(
+            "Import one trial balance file per branch as a single batch. Files are read in "
+            "parallel with the column mapping below, or the mapping detected from each file's headers"
+        )
+        self.branch_btn.clicked.connect(self.import_branch_files)
+        branch_layout.addWidget(self.branch_btn)
+        
+        self.merge_branches_check = QCheckBox("Merge ledgers with the same name across branches")
+        self.merge_branches_check.setChecked(True)
+        branch_layout.addWidget(self.merge_branches_check)
+        layout.addLayout(branch_layout)
+        
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
@@ -280,6 +364,8 @@ class TrialBalanceTab(QWidget):
         self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.data_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.data_table.setAlternatingRowColors(True)
+        self.data_table.setToolTip("Double-click a ledger to see its journal lines")
+        self.data_table.cellDoubleClicked.connect(self.show_journal_lines)
         
         layout.addWidget(self.data_table)
         
@@ -301,6 +387,8 @@ class TrialBalanceTab(QWidget):
         self.validate_btn = QPushButton("✔ Validate Balance")
         self.validate_btn.clicked.connect(self.validate_balance)
         self.validate_btn.setStyleSheet("padding: 10px 20px;")
+        self.validate_btn.setToolTip("Check totals, each ledger's opening + Dr - Cr = closing, duplicate names, "
+                                     "PY to CY continuity and balance signs")
         layout.addWidget(self.validate_btn)
         
         # Map button
@@ -309,6 +397,13 @@ class TrialBalanceTab(QWidget):
         self.map_btn.setStyleSheet("padding: 10px 20px;")
         layout.addWidget(self.map_btn)
         
+        # Audit adjustments
+        self.adjustments_btn = QPushButton("🧾 Audit Adjustments")
+        self.adjustments_btn.clicked.connect(self.open_adjustments_dialog)
+        self.adjustments_btn.setStyleSheet("padding: 10px 20px;")
+        self.adjustments_btn.setToolTip("Apply or withdraw adjustment batches without changing the imported trial balance")
+        layout.addWidget(self.adjustments_btn)
+        
         # Update Notes Recommendations button
         self.update_notes_btn = QPushButton("📋 Update Note Recommendations")
         self.update_notes_btn.clicked.connect(self.update_note_recommendations)
@@ -376,19 +471,15 @@ class TrialBalanceTab(QWidget):
         if not hasattr(self, 'ledger_combo'):
             return
         
-        mapping_rules = {
-            'ledger_name': ['ledger', 'account', 'particulars', 'name', 'ledger name', 'account name'],
-            'opening_balance_cy': ['opening cy', 'opening balance cy', 'ob cy', 'opening current'],
-            'debit_cy': ['debit cy', 'dr cy', 'debit current', 'dr current', 'debit'],
-            'credit_cy': ['credit cy', 'cr cy', 'credit current', 'cr current', 'credit'],
-            'closing_balance_cy': ['closing cy', 'closing balance cy', 'cb cy', 'closing current', 'balance'],
-            'opening_balance_py': ['opening py', 'opening balance py', 'ob py', 'opening previous'],
-            'debit_py': ['debit py', 'dr py', 'debit previous', 'dr previous'],
-            'credit_py': ['credit py', 'cr py', 'credit previous', 'cr previous'],
-            'closing_balance_py': ['closing py', 'closing balance py', 'cb py', 'closing previous']
-        }
-        
-        combos = {
+        combos = self.mapping_combos()
+        headers = [combos['ledger_name'].itemData(i) for i in range(1, combos['ledger_name'].count())]
+        for field, header in detect_mapping(headers).items():
+            combo = combos[field]
+            combo.setCurrentIndex(combo.findData(header))
+    
+    def mapping_combos(self):
+        """{trial balance field: column combo box}"""
+        return {
             'ledger_name': self.ledger_combo,
             'opening_balance_cy': self.opening_cy_combo,
             'debit_cy': self.debit_cy_combo,
@@ -399,14 +490,6 @@ class TrialBalanceTab(QWidget):
             'credit_py': self.credit_py_combo,
             'closing_balance_py': self.closing_py_combo
         }
-        
-        for field, combo in combos.items():
-            rules = mapping_rules.get(field, [])
-            for i in range(combo.count()):
-                col_name = combo.itemText(i).lower()
-                if any(rule in col_name for rule in rules):
-                    combo.setCurrentIndex(i)
-                    break
     
     def import_data(self):
         """Import trial balance data"""
@@ -415,17 +498,7 @@ class TrialBalanceTab(QWidget):
             return
         
         # Get column mapping
-        self.column_mapping = {
-            'ledger_name': self.ledger_combo.currentData(),
-            'opening_balance_cy': self.opening_cy_combo.currentData(),
-            'debit_cy': self.debit_cy_combo.currentData(),
-            'credit_cy': self.credit_cy_combo.currentData(),
-            'closing_balance_cy': self.closing_cy_combo.currentData(),
-            'opening_balance_py': self.opening_py_combo.currentData(),
-            'debit_py': self.debit_py_combo.currentData(),
-            'credit_py': self.credit_py_combo.currentData(),
-            'closing_balance_py': self.closing_py_combo.currentData()
-        }
+        self.column_mapping = {field: combo.currentData() for field, combo in self.mapping_combos().items()}
         
         if not self.column_mapping['ledger_name']:
             QMessageBox.warning(self, "Mapping Required", "Please map the 'Ledger Name' column")
@@ -454,69 +527,190 @@ class TrialBalanceTab(QWidget):
         # Generate new batch ID
         self.import_batch_id = int(datetime.now().timestamp())
         
-        # Start import worker thread
+        # Import as a background job
+        self.import_btn.setEnabled(False)
+        self.start_job(f"Import {os.path.basename(self.current_file_path)}", tb_import_job,
+                       self.current_file_path, self.column_mapping, company.company_id, self.import_batch_id,
+                       on_done=self.import_finished)
+    
+    def start_job(self, name, func, *args, on_done):
+        """Run func as a background job; the progress bar follows it and on_done(job) runs when it ends"""
+        self.progress_bar.setRange(0, 0)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        job = get_job_manager().submit(name, func, *args)
+        job.signals.progress.connect(self.update_progress)
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_: on_done(job))
+        return job
+    
+    def update_progress(self, progress):
+        """Update progress bar (busy while the stage total is unknown)"""
+        if progress.percent is None:
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(progress.percent)
+        self.progress_bar.setFormat(f"{progress.stage} - %p%")
+    
+    def job_ended(self, job, title):
+        """Hide the progress bar and report how an import job ended; True if it succeeded"""
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+        
+        if job.status == Job.FINISHED:
+            QMessageBox.information(self, f"{title} Complete", job.result)
+            self.refresh_data()
+            return True
+        if job.status == Job.FAILED:
+            QMessageBox.critical(self, f"{title} Failed", f"{title} failed: {job.error}")
+        return False
+    
+    def import_finished(self, job):
+        """Handle import completion"""
+        self.import_btn.setEnabled(True)
+        self.job_ended(job, "Import")
+    
+    def import_branch_files(self):
+        """Import one trial balance file per branch as a single batch"""
+        company_id = self.parent_window.current_company_id if hasattr(self.parent_window, 'current_company_id') else None
+        
+        if not company_id:
+            QMessageBox.warning(self, "No Company Selected", "Please select a company first.")
+            return
+        
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select Branch Trial Balance Files", "",
+            "Trial Balance Files (*.csv *.xlsx *.xls);;All Files (*.*)"
+        )
+        if not file_paths:
+            return
+        
+        # The mapping set up below applies to files with the same headers; others are auto-detected
+        column_mapping = None
+        if self.current_file_path:
+            column_mapping = {field: combo.currentData() for field, combo in self.mapping_combos().items()}
+        
+        # Generate new batch ID
+        self.import_batch_id = int(datetime.now().timestamp())
+        
+        self.branch_btn.setEnabled(False)
         self.import_btn.setEnabled(False)
         
-        self.worker = ImportWorker(
-            self.current_file_path,
-            self.column_mapping,
-            company.company_id,
-            self.import_batch_id
+        self.start_job(f"Import {len(file_paths)} branch files", branch_import_job,
+                       file_paths, column_mapping, company_id, self.import_batch_id,
+                       self.merge_branches_check.isChecked(), on_done=self.branch_import_finished)
+    
+    def branch_import_finished(self, job):
+        """Handle branch import completion"""
+        self.branch_btn.setEnabled(True)
+        self.import_btn.setEnabled(self.current_file_path is not None)
+        self.job_ended(job, "Branch Import")
+    
+    def import_journal(self):
+        """Build a trial balance batch from a GL journal file"""
+        company_id = self.parent_window.current_company_id if hasattr(self.parent_window, 'current_company_id') else None
+        
+        if not company_id:
+            QMessageBox.warning(self, "No Company Selected", "Please select a company first.")
+            return
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select GL Journal File", "",
+            "Journal Files (*.csv *.parquet *.xlsx *.xls);;All Files (*.*)"
         )
-        self.worker.progress.connect(self.update_progress)
-        self.worker.finished.connect(self.import_finished)
-        self.worker.start()
+        if not file_path:
+            return
+        
+        # Generate new batch ID
+        self.import_batch_id = int(datetime.now().timestamp())
+        self.journal_file_name = os.path.basename(file_path)
+        
+        # Line count is unknown until the file is read - busy indicator
+        self.journal_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        
+        job = self.start_job(f"Import journal {self.journal_file_name}", journal_import_job,
+                             file_path, company_id, self.import_batch_id,
+                             self.keep_lines_check.isChecked(), on_done=self.journal_import_finished)
+        job.signals.progress.connect(self.journal_progress)
     
-    def update_progress(self, value):
-        """Update progress bar"""
-        self.progress_bar.setValue(value)
+    def journal_progress(self, progress):
+        """Show journal lines read so far"""
+        self.file_label.setText(f"{self.journal_file_name}: {progress.done:,} journal lines read "
+                                f"({progress.rate:,.0f}/s)...")
     
-    def import_finished(self, success, message, entries):
-        """Handle import completion"""
-        self.progress_bar.setVisible(False)
-        self.import_btn.setEnabled(True)
+    def journal_import_finished(self, job):
+        """Handle journal import completion"""
+        self.journal_btn.setEnabled(True)
+        self.import_btn.setEnabled(self.current_file_path is not None)
+        self.file_label.setText(self.journal_file_name)
+        self.job_ended(job, "Journal Import")
+    
+    def show_journal_lines(self, row, column):
+        """Drill down from a trial balance row to its journal lines (PY columns show the PY)"""
+        if row >= len(self.tb_ids):
+            return
+        year = 'py' if column in (4, 5, 6) else 'cy'
+        lines = GLJournal.get_lines_for_tb(self.tb_ids[row], year, limit=self.JOURNAL_DRILLDOWN_LIMIT)
+        ledger_name = self.data_table.item(row, 0).text()
         
-        if success:
-            QMessageBox.information(self, "Import Complete", message)
-            self.refresh_data()
-        else:
-            QMessageBox.critical(self, "Import Failed", message)
+        if not lines:
+            QMessageBox.information(
+                self, "No Journal Lines",
+                f"No {year.upper()} journal lines are stored for '{ledger_name}'.\n\n"
+                "Lines are kept when the trial balance is built from a GL journal."
+            )
+            return
+        
+        title = f"{ledger_name} - {year.upper()} journal lines"
+        if len(lines) == self.JOURNAL_DRILLDOWN_LIMIT:
+            title += f" (first {self.JOURNAL_DRILLDOWN_LIMIT:,})"
+        JournalLinesDialog(title, lines, self).exec_()
     
     def refresh_data(self):
         """Refresh trial balance data display"""
+        with track_action("Refresh Trial Balance"):
+            self.load_table()
+    
+    def load_table(self):
+        """Load trial balance entries and statistics into the table"""
         user_id = self.parent_window.user.user_id if hasattr(self.parent_window, 'user') else 1
         company = CompanyInfo.get_by_user_id(user_id)
         
         if not company:
             self.update_statistics({})
             self.data_table.setRowCount(0)
+            self.tb_ids = []
             return
         
-        # Get trial balance data
-        tb_entries = TrialBalance.get_by_company(company.company_id)
-        
-        # Update statistics
+        # Get trial balance data (columnar - no object per ledger)
+        frame = TrialBalance.get_frame(company.company_id, columns=TB_TABLE_COLUMNS)
         stats = TrialBalance.get_summary_stats(company.company_id)
+        self.show_data(frame, stats)
+    
+    def show_data(self, frame, stats):
+        """Display a loaded trial balance frame (TB_TABLE_COLUMNS) and its statistics"""
+        # Update statistics
         self.update_statistics(stats)
         
         # Update table
-        self.data_table.setRowCount(len(tb_entries))
-        
-        for row, entry in enumerate(tb_entries):
-            self.data_table.setItem(row, 0, QTableWidgetItem(entry.ledger_name))
-            self.data_table.setItem(row, 1, QTableWidgetItem(f"₹{entry.debit_cy:,.2f}"))
-            self.data_table.setItem(row, 2, QTableWidgetItem(f"₹{entry.credit_cy:,.2f}"))
-            self.data_table.setItem(row, 3, QTableWidgetItem(f"₹{entry.closing_balance_cy:,.2f}"))
-            self.data_table.setItem(row, 4, QTableWidgetItem(f"₹{entry.debit_py:,.2f}"))
-            self.data_table.setItem(row, 5, QTableWidgetItem(f"₹{entry.credit_py:,.2f}"))
-            self.data_table.setItem(row, 6, QTableWidgetItem(f"₹{entry.closing_balance_py:,.2f}"))
-            self.data_table.setItem(row, 7, QTableWidgetItem(entry.type_bs_pl))
+        self.data_table.setRowCount(len(frame))
+        
+        amount_columns = [frame[name].tolist() for name in
+                          ('debit_cy', 'credit_cy', 'closing_balance_cy', 'debit_py', 'credit_py', 'closing_balance_py')]
+        types = frame['type_bs_pl'].tolist()
+        mapped = frame['is_mapped'].tolist()
+        self.tb_ids = frame['tb_id'].tolist() if 'tb_id' in frame else []
+        
+        for row, ledger_name in enumerate(frame['ledger_name']):
+            self.data_table.setItem(row, 0, QTableWidgetItem(ledger_name))
+            for col, values in enumerate(amount_columns, 1):
+                self.data_table.setItem(row, col, QTableWidgetItem(f"₹{values[row]:,.2f}"))
+            self.data_table.setItem(row, 7, QTableWidgetItem(types[row]))
             
             # Mapped status
-            mapped_item = QTableWidgetItem("✓ Mapped" if entry.is_mapped else "✗ Unmapped")
-            if entry.is_mapped:
+            mapped_item = QTableWidgetItem("✓ Mapped" if mapped[row] else "✗ Unmapped")
+            if mapped[row]:
                 mapped_item.setForeground(QColor(0, 128, 0))
             else:
                 mapped_item.setForeground(QColor(255, 0, 0))
@@ -553,7 +747,7 @@ class TrialBalanceTab(QWidget):
         self.stats_text.setPlainText(text)
     
     def validate_balance(self):
-        """Validate trial balance"""
+        """Validate the trial balance - totals, per-ledger equations, names, continuity and signs"""
         user_id = self.parent_window.user.user_id if hasattr(self.parent_window, 'user') else 1
         company = CompanyInfo.get_by_user_id(user_id)
         
@@ -561,22 +755,11 @@ class TrialBalanceTab(QWidget):
             QMessageBox.warning(self, "No Data", "No company information found")
             return
         
-        cy_balanced, py_balanced, cy_diff, py_diff = TrialBalance.validate_balance(company.company_id)
-        
-        message = "TRIAL BALANCE VALIDATION RESULTS:\n\n"
-        message += f"CURRENT YEAR (CY):\n"
-        message += f"  Status: {'✓ BALANCED' if cy_balanced else '✗ NOT BALANCED'}\n"
-        message += f"  Difference: ₹{cy_diff:,.2f}\n\n"
-        message += f"PREVIOUS YEAR (PY):\n"
-        message += f"  Status: {'✓ BALANCED' if py_balanced else '✗ NOT BALANCED'}\n"
-        message += f"  Difference: ₹{py_diff:,.2f}\n\n"
+        with track_action("Validate Balance"):
+            issues = validate_trial_balance(company.company_id)
         
-        if cy_balanced and py_balanced:
-            message += "Both years are balanced and ready for financial statement generation!"
-            QMessageBox.information(self, "Validation Success", message)
-        else:
-            message += "⚠ Please verify your trial balance data before proceeding."
-            QMessageBox.warning(self, "Validation Warning", message)
+        dialog = TrialBalanceValidationDialog(company.company_id, issues, self)
+        dialog.exec_()
     
     def open_mapping_dialog(self):
         """Open mapping dialog for unmapped items"""
@@ -592,10 +775,29 @@ class TrialBalanceTab(QWidget):
         
         # Open the mapping dialog
         from views.trial_balance_mapping_dialog import TrialBalanceMappingDialog
-        dialog = TrialBalanceMappingDialog(company_id, self)
+        with track_action("Open Mapping Dialog"):
+            dialog = TrialBalanceMappingDialog(company_id, self)
         dialog.mapping_saved.connect(self.refresh_data)
         dialog.exec_()
     
+    def open_adjustments_dialog(self):
+        """Open the audit adjustment batches of the current company"""
+        company_id = self.parent_window.current_company_id if hasattr(self.parent_window, 'current_company_id') else None
+        
+        if not company_id:
+            QMessageBox.warning(self, "No Company Selected", "Please select a company first.")
+            return
+        
+        from views.adjustments_dialog import AdjustmentsDialog
+        dialog = AdjustmentsDialog(company_id, self)
+        dialog.adjustments_changed.connect(self.adjustments_changed)
+        dialog.exec_()
+    
+    def adjustments_changed(self):
+        """Statements shown elsewhere were generated before the adjustments changed"""
+        if hasattr(self.parent_window, 'financials_tab'):
+            self.parent_window.financials_tab.invalidate()
+    
     def export_unmapped(self):
         """Export unmapped items to Excel"""
         user_id = self.parent_window.user.user_id if hasattr(self.parent_window, 'user') else 1
@@ -682,37 +884,39 @@ class TrialBalanceTab(QWidget):
             )
             return
         
-        try:
-            from models.selection_sheet import SelectionSheet
-            
-            # Initialize notes if not already done
-            SelectionSheet.initialize_default_notes(company_id)
-            
-            # Update system recommendations
-            SelectionSheet.update_system_recommendations(company_id)
-            
-            # Get recommended notes count
-            all_notes = SelectionSheet.get_all_for_company(company_id)
-            recommended = [n for n in all_notes if n.system_recommendation == 'Yes']
-            
-            QMessageBox.information(
-                self,
-                "Note Recommendations Updated",
-                f"Selection Sheet updated successfully!\n\n"
-                f"System has recommended {len(recommended)} notes based on your Trial Balance.\n\n"
-                f"Please go to the Selection Sheet tab to review and adjust the selections."
-            )
-            
-            # Switch to Selection Sheet tab if available
-            if hasattr(self.parent_window, 'tab_widget'):
-                for i in range(self.parent_window.tab_widget.count()):
-                    if 'Selection Sheet' in self.parent_window.tab_widget.tabText(i):
-                        self.parent_window.tab_widget.setCurrentIndex(i)
-                        break
-            
-        except Exception as e:
+        # Initialize notes if not already done, then update the recommendations in the background
+        from views.selection_sheet_tab import recommendations_job
+        self.update_notes_btn.setEnabled(False)
+        self.start_job("Update Note Recommendations", recommendations_job, company_id, True,
+                       on_done=self.note_recommendations_updated)
+    
+    def note_recommendations_updated(self, job):
+        """Report the recommended notes and switch to the Selection Sheet"""
+        self.update_notes_btn.setEnabled(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+        
+        if job.status == Job.FAILED:
             QMessageBox.critical(
                 self,
                 "Error",
-                f"Failed to update note recommendations:\n{str(e)}"
+                f"Failed to update note recommendations:\n{job.error}"
             )
+            return
+        if job.status != Job.FINISHED:
+            return
+        
+        QMessageBox.information(
+            self,
+            "Note Recommendations Updated",
+            f"Selection Sheet updated successfully!\n\n"
+            f"System has recommended {job.result} notes based on your Trial Balance.\n\n"
+            f"Please go to the Selection Sheet tab to review and adjust the selections."
+        )
+        
+        # Switch to Selection Sheet tab if available
+        if hasattr(self.parent_window, 'tab_widget'):
+            for i in range(self.parent_window.tab_widget.count()):
+                if 'Selection Sheet' in self.parent_window.tab_widget.tabText(i):
+                    self.parent_window.tab_widget.setCurrentIndex(i)
+                    break